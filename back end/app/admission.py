@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Awaitable, Callable
+
+from app.metrics import MetricsRegistry
+from app.metrics import metrics_registry
+
+ADMISSION_WAIT_BUCKETS_MS = (10.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0, 5000.0, 10000.0, 30000.0)
+
+REJECT_USER_LIMIT = "user_limit"
+REJECT_QUEUE_FULL = "queue_full"
+REJECT_QUEUE_TIMEOUT = "queue_timeout"
+
+_REJECT_MESSAGES = {
+    REJECT_USER_LIMIT: "Too many live sessions are open for this user. Close another session and try again.",
+    REJECT_QUEUE_FULL: "The assistant is at capacity right now. Please try again in a minute.",
+    REJECT_QUEUE_TIMEOUT: "The assistant is still at capacity. Please try again in a minute.",
+}
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str) -> None:
+        super().__init__(_REJECT_MESSAGES[reason])
+        self.reason = reason
+        self.message = _REJECT_MESSAGES[reason]
+
+
+@dataclass
+class AdmissionTicket:
+    user_id: str
+    waited_ms: float = 0.0
+    queued_at_position: int | None = None
+    released: bool = False
+
+
+@dataclass
+class _Waiter:
+    user_id: str
+    granted: asyncio.Future[AdmissionTicket]
+    moved: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class AdmissionController:
+    """Caps concurrent live sessions per worker, and per user, in front of ``/ws/live``.
+
+    A session that finds the worker full waits in a bounded FIFO queue and
+    hears its position whenever it changes; a released slot goes straight to
+    the head of the queue. A session is rejected outright when its user
+    already holds ``max_sessions_per_user`` sessions (active or queued), when
+    the queue is full, or when it waited longer than ``queue_timeout_s``.
+    ``max_sessions=0`` disables the global cap.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_sessions: int,
+        max_sessions_per_user: int,
+        max_queue: int,
+        queue_timeout_s: float,
+        registry: MetricsRegistry = metrics_registry,
+    ) -> None:
+        self.max_sessions = max_sessions
+        self.max_sessions_per_user = max_sessions_per_user
+        self.max_queue = max_queue
+        self.queue_timeout_s = queue_timeout_s
+        self.active = 0
+        self._registry = registry
+        self._sessions_by_user: dict[str, int] = {}
+        self._waiters: deque[_Waiter] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "active": self.active,
+            "queued": self.queued,
+            "maxSessions": self.max_sessions,
+            "maxSessionsPerUser": self.max_sessions_per_user,
+            "maxQueue": self.max_queue,
+        }
+
+    def try_admit(self, user_id: str) -> AdmissionTicket | None:
+        """Admits straight away when there is room, returns None when the session would have to queue."""
+        if self._sessions_by_user.get(user_id, 0) >= self.max_sessions_per_user > 0:
+            self._reject(REJECT_USER_LIMIT)
+        if self._waiters or not self._has_capacity():
+            return None
+        return self._grant(user_id)
+
+    async def admit(
+        self,
+        user_id: str,
+        on_queued: Callable[[int], Awaitable[None]] | None = None,
+    ) -> AdmissionTicket:
+        ticket = self.try_admit(user_id)
+        if ticket is not None:
+            return ticket
+        if len(self._waiters) >= self.max_queue:
+            self._reject(REJECT_QUEUE_FULL)
+
+        waiter = _Waiter(user_id=user_id, granted=asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        self._sessions_by_user[user_id] = self._sessions_by_user.get(user_id, 0) + 1
+        self._registry.increment("admission_queued_total")
+        queued_at = perf_counter()
+        deadline = queued_at + self.queue_timeout_s
+        first_position = len(self._waiters)
+        reported_position: int | None = None
+        try:
+            while not waiter.granted.done():
+                position = self._waiters.index(waiter) + 1
+                if position != reported_position and on_queued is not None:
+                    reported_position = position
+                    await on_queued(position)
+                    continue
+                waiter.moved.clear()
+                remaining_s = deadline - perf_counter()
+                if remaining_s <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(waiter.moved.wait(), timeout=remaining_s)
+                except asyncio.TimeoutError:
+                    break
+        except BaseException:
+            self._leave_queue(waiter)
+            raise
+
+        if not waiter.granted.done():
+            self._leave_queue(waiter)
+            self._reject(REJECT_QUEUE_TIMEOUT)
+        ticket = waiter.granted.result()
+        ticket.waited_ms = (perf_counter() - queued_at) * 1000
+        ticket.queued_at_position = first_position
+        self._registry.histogram("admission_wait_ms", buckets=ADMISSION_WAIT_BUCKETS_MS).observe(ticket.waited_ms)
+        return ticket
+
+    def release(self, ticket: AdmissionTicket) -> None:
+        if ticket.released:
+            return
+        ticket.released = True
+        self.active -= 1
+        self._forget_user_session(ticket.user_id)
+        if self._waiters and self._has_capacity():
+            waiter = self._waiters.popleft()
+            # The waiter already counts toward its user's sessions from the moment it queued.
+            self.active += 1
+            waiter.granted.set_result(AdmissionTicket(user_id=waiter.user_id))
+            self._registry.increment("admission_admitted_total")
+            waiter.moved.set()
+            for remaining in self._waiters:
+                remaining.moved.set()
+
+    def _has_capacity(self) -> bool:
+        return self.max_sessions <= 0 or self.active < self.max_sessions
+
+    def _grant(self, user_id: str) -> AdmissionTicket:
+        self.active += 1
+        self._sessions_by_user[user_id] = self._sessions_by_user.get(user_id, 0) + 1
+        self._registry.increment("admission_admitted_total")
+        return AdmissionTicket(user_id=user_id)
+
+    def _leave_queue(self, waiter: _Waiter) -> None:
+        if waiter.granted.done():
+            # Granted in the same tick it gave up: hand the slot on.
+            if not waiter.granted.cancelled():
+                self.release(waiter.granted.result())
+            return
+        waiter.granted.cancel()
+        self._waiters.remove(waiter)
+        self._forget_user_session(waiter.user_id)
+        for remaining in self._waiters:
+            remaining.moved.set()
+
+    def _forget_user_session(self, user_id: str) -> None:
+        count = self._sessions_by_user.get(user_id, 0) - 1
+        if count > 0:
+            self._sessions_by_user[user_id] = count
+        else:
+            self._sessions_by_user.pop(user_id, None)
+
+    def _reject(self, reason: str) -> None:
+        self._registry.increment("admission_rejected_total", labels={"reason": reason})
+        raise AdmissionRejected(reason)
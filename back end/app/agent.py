@@ -4,6 +4,14 @@ from typing import Any
 
 from google.adk.agents import Agent
 
+# Native-audio Live models speak directly and only accept the AUDIO response modality.
+AUDIO_ONLY_LIVE_MODEL_MARKER = "native-audio"
+
+
+def live_model_supports_text_replies(model: str) -> bool:
+    """False for Live models that can only answer in audio and reject a TEXT response modality."""
+    return AUDIO_ONLY_LIVE_MODEL_MARKER not in model.lower()
+
 
 def build_instruction(profile_summary: str | None = None) -> str:
     base_instruction = (
@@ -23,6 +31,8 @@ def build_instruction(profile_summary: str | None = None) -> str:
         "Always save one structured adherence report after enough detail is collected. "
         "Only tell the user that adherence was logged if save_adherence_report returns saved=true. "
         "If save_adherence_report returns saved=false, explain briefly that save failed, share the reason, and retry using the exact schedule item id from get_today_schedule or get_current_schedule_item. "
+        "When users ask about past symptoms, feelings, or notes (for example when they last mentioned a symptom), call search_adherence_notes and answer from the returned snippets and dates. "
+        "For multi-day adherence questions (for example how the past week went), call get_adherence_history instead of repeated get_today_schedule calls. "
         "If concerning symptoms are reported during adherence follow-up, provide immediate emergency or urgent-care safety guidance."
     )
     personalization = (
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import struct
+from typing import Collection, Protocol
+
+import numpy as np
+
+PCM16 = "pcm16"
+MULAW = "mulaw"
+IMA_ADPCM = "ima_adpcm"
+AUDIO_ENCODINGS = (PCM16, MULAW, IMA_ADPCM)
+
+_MULAW_BIAS = 0x84
+_MULAW_CLIP_14BIT = 8159
+_MULAW_SEGMENT_ENDS = np.array([0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF], dtype=np.int32)
+
+_IMA_STEP_TABLE = np.array(
+    [
+        7, 8, 9, 10, 11, 12, 13, 14, 16, 17, 19, 21, 23, 25, 28, 31, 34, 37, 41, 45, 50, 55, 60, 66, 73, 80, 88,
+        97, 107, 118, 130, 143, 157, 173, 190, 209, 230, 253, 279, 307, 337, 371, 408, 449, 494, 544, 598, 658,
+        724, 796, 876, 963, 1060, 1166, 1282, 1411, 1552, 1707, 1878, 2066, 2272, 2499, 2749, 3024, 3327, 3660,
+        4026, 4428, 4871, 5358, 5894, 6484, 7132, 7845, 8630, 9493, 10442, 11487, 12635, 13899, 15289, 16818,
+        18500, 20350, 22385, 24623, 27086, 29794, 32767,
+    ],
+    dtype=np.int32,
+)
+_IMA_INDEX_ADJUST = np.array([-1, -1, -1, -1, 2, 4, 6, 8], dtype=np.int32)
+# "<hBB": predictor and step index at the start of the chunk, then flags (bit 0: the last byte holds one sample).
+_IMA_CHUNK_HEADER = struct.Struct("<hBB")
+
+
+def _build_mulaw_tables() -> tuple[np.ndarray, np.ndarray]:
+    # Same segment search as the reference G.711 encoder (14-bit magnitude, bias 0x21).
+    samples = np.arange(-32768, 32768, dtype=np.int32)
+    reduced = samples >> 2
+    negative = reduced < 0
+    magnitude = np.minimum(np.where(negative, -reduced, reduced), _MULAW_CLIP_14BIT) + (_MULAW_BIAS >> 2)
+    segment = np.searchsorted(_MULAW_SEGMENT_ENDS, magnitude)
+    code = np.where(segment >= 8, 0x7F, (segment << 4) | ((magnitude >> (segment + 1)) & 0x0F))
+    encoded = code ^ np.where(negative, 0x7F, 0xFF)
+    # Index the encode table with the int16 sample reinterpreted as uint16.
+    encode_table = np.empty(65536, dtype=np.uint8)
+    encode_table[samples.astype(np.int16).view(np.uint16)] = encoded.astype(np.uint8)
+
+    codes = ~np.arange(256, dtype=np.int32) & 0xFF
+    code_exponent = (codes >> 4) & 0x07
+    code_mantissa = codes & 0x0F
+    decoded = (((code_mantissa << 3) + _MULAW_BIAS) << code_exponent) - _MULAW_BIAS
+    decode_table = np.where(codes & 0x80, -decoded, decoded).astype(np.int16)
+    return encode_table, decode_table
+
+
+def _build_ima_tables() -> tuple[list[list[int]], list[list[int]]]:
+    """Per (step index, 3-bit magnitude code): reconstructed delta and next step index."""
+    codes = np.arange(8, dtype=np.int32)
+    steps = _IMA_STEP_TABLE[:, None]
+    delta = (steps >> 3) + np.where(codes & 4, steps, 0) + np.where(codes & 2, steps >> 1, 0) + np.where(codes & 1, steps >> 2, 0)
+    next_index = np.clip(np.arange(len(_IMA_STEP_TABLE))[:, None] + _IMA_INDEX_ADJUST[None, :], 0, len(_IMA_STEP_TABLE) - 1)
+    return delta.tolist(), next_index.tolist()
+
+
+_MULAW_ENCODE_TABLE, _MULAW_DECODE_TABLE = _build_mulaw_tables()
+_IMA_DELTA_TABLE, _IMA_NEXT_INDEX_TABLE = _build_ima_tables()
+_IMA_STEPS = _IMA_STEP_TABLE.tolist()
+
+
+class AudioEncoder(Protocol):
+    encoding: str
+
+    def encode(self, pcm: bytes) -> bytes: ...
+
+
+class Pcm16Encoder:
+    encoding = PCM16
+
+    def encode(self, pcm: bytes) -> bytes:
+        return pcm
+
+
+class MulawEncoder:
+    """G.711 mu-law via a 64K-entry lookup table: one byte per sample."""
+
+    encoding = MULAW
+
+    def encode(self, pcm: bytes) -> bytes:
+        samples = np.frombuffer(pcm, dtype="<i2", count=len(pcm) // 2).view(np.uint16)
+        return _MULAW_ENCODE_TABLE[samples].tobytes()
+
+
+class ImaAdpcmEncoder:
+    """IMA-ADPCM, 4 bits per sample, with a small header on every chunk.
+
+    Predictor state carries across chunks for quality, and each chunk header
+    records the state it starts from so a client can decode chunks independently.
+    Each sample depends on the previous prediction, so encoding is a Python loop
+    on the event loop: about 12 ms of CPU per second of audio, a hundred times
+    mu-law. That is why the bridge only offers it when ``audio_adpcm_enabled`` is set.
+    """
+
+    encoding = IMA_ADPCM
+
+    def __init__(self) -> None:
+        self._predictor = 0
+        self._index = 0
+
+    def encode(self, pcm: bytes) -> bytes:
+        samples = np.frombuffer(pcm, dtype="<i2", count=len(pcm) // 2).tolist()
+        predictor = self._predictor
+        index = self._index
+        header = _IMA_CHUNK_HEADER.pack(predictor, index, len(samples) & 1)
+        # One code per sample (plus a zero pad nibble for odd counts), packed two to a byte below.
+        codes = bytearray(len(samples) + (len(samples) & 1))
+        steps = _IMA_STEPS
+        deltas = _IMA_DELTA_TABLE
+        next_indexes = _IMA_NEXT_INDEX_TABLE
+
+        # The predictor feeds back into every sample, so this part cannot be vectorized.
+        for position, sample in enumerate(samples):
+            diff = sample - predictor
+            sign = 0
+            if diff < 0:
+                sign = 8
+                diff = -diff
+            step = steps[index]
+            magnitude = 0
+            if diff >= step:
+                magnitude = 4
+                diff -= step
+            if diff >= step >> 1:
+                magnitude |= 2
+                diff -= step >> 1
+            if diff >= step >> 2:
+                magnitude |= 1
+            delta = deltas[index][magnitude]
+            predictor = predictor - delta if sign else predictor + delta
+            if predictor > 32767:
+                predictor = 32767
+            elif predictor < -32768:
+                predictor = -32768
+            index = next_indexes[index][magnitude]
+            codes[position] = sign | magnitude
+
+        self._predictor = predictor
+        self._index = index
+        nibbles = np.frombuffer(codes, dtype=np.uint8)
+        return header + (nibbles[0::2] | (nibbles[1::2] << 4)).tobytes()
+
+
+def decode_mulaw(data: bytes) -> bytes:
+    return _MULAW_DECODE_TABLE[np.frombuffer(data, dtype=np.uint8)].astype("<i2").tobytes()
+
+
+def decode_ima_adpcm(chunk: bytes) -> bytes:
+    """Reference decoder for one ImaAdpcmEncoder chunk (what the web client implements)."""
+    predictor, index, flags = _IMA_CHUNK_HEADER.unpack_from(chunk)
+    payload = chunk[_IMA_CHUNK_HEADER.size :]
+    sample_count = len(payload) * 2 - (flags & 1)
+    samples = np.empty(sample_count, dtype="<i2")
+    for position in range(sample_count):
+        byte = payload[position >> 1]
+        code = (byte >> 4) if position & 1 else (byte & 0x0F)
+        magnitude = code & 7
+        delta = _IMA_DELTA_TABLE[index][magnitude]
+        predictor = max(-32768, min(32767, predictor - delta if code & 8 else predictor + delta))
+        index = _IMA_NEXT_INDEX_TABLE[index][magnitude]
+        samples[position] = predictor
+    return samples.tobytes()
+
+
+def negotiate_audio_encoding(requested: str | None, *, allowed: Collection[str] = AUDIO_ENCODINGS) -> str:
+    """Picks the first ``allowed`` encoding from a comma-separated preference list, else pcm16."""
+    if not requested:
+        return PCM16
+    for candidate in requested.split(","):
+        normalized = candidate.strip().lower().replace("-", "_")
+        if normalized in {"ulaw", "pcmu", "g711_ulaw"}:
+            normalized = MULAW
+        if normalized == "adpcm":
+            normalized = IMA_ADPCM
+        if normalized in allowed:
+            return normalized
+    return PCM16
+
+
+def create_audio_encoder(encoding: str) -> AudioEncoder:
+    if encoding == MULAW:
+        return MulawEncoder()
+    if encoding == IMA_ADPCM:
+        return ImaAdpcmEncoder()
+    return Pcm16Encoder()
@@ -9,6 +9,7 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 DEPRECATED_MODELS = {
     "gemini-2.0-flash-live-001",
 }
+LIVE_MODEL_BACKENDS = {"gemini", "fake"}
 
 
 class Settings(BaseSettings):
@@ -25,6 +26,42 @@ class Settings(BaseSettings):
     profile_seed_sql_path: str = "app/data/patient_profiles.sql"
     schedule_db_url: str = "sqlite:///app/data/patient_profiles.db"
     schedule_seed_sql_path: str = "app/data/schedules.sql"
+    profile_summary_max_chars: int = 700
+    profile_summary_max_tokens: int | None = None
+    tool_cache_ttl_seconds: float = 30.0
+    live_capture_dir: str | None = None
+    live_model_backend: str = "gemini"
+    fake_live_latency_ms: float = 150.0
+    fake_live_error_turns: list[int] = []
+    fake_live_error_code: int = 1007
+    loop_monitor_enabled: bool = True
+    loop_stall_threshold_ms: float = 100.0
+    uplink_frame_ms: int = 100
+    uplink_max_frame_ms: int = 200
+    transcript_coalesce_ms: int = 50
+    upstream_idle_timeout_s: float = 60.0
+    max_live_sessions: int = 200
+    max_live_sessions_per_user: int = 3
+    admission_queue_size: int = 50
+    admission_queue_timeout_s: float = 15.0
+    overload_mode_enabled: bool = True
+    overload_enter_loop_lag_ms: float = 100.0
+    overload_exit_loop_lag_ms: float = 25.0
+    overload_enter_cpu_percent: float = 85.0
+    overload_exit_cpu_percent: float = 60.0
+    overload_enter_response_ms: float = 3000.0
+    overload_exit_response_ms: float = 1500.0
+    overload_min_degraded_s: float = 10.0
+    overload_max_switches_per_s: float = 5.0
+    session_resume_grace_s: float = 30.0
+    session_resume_buffer_frames: int = 512
+    session_resume_buffer_bytes: int = 524288
+    context_budget_tokens: int = 8000
+    context_keep_recent_events: int = 12
+    live_compression_trigger_tokens: int = 0
+    audio_adpcm_enabled: bool = False
+    mux_max_channels: int = 16
+    mux_channel_buffer_frames: int = 256
 
     @field_validator("gemini_model")
     @classmethod
@@ -36,6 +73,14 @@ class Settings(BaseSettings):
             )
         return model
 
+    @field_validator("live_model_backend")
+    @classmethod
+    def validate_live_model_backend(cls, backend: str) -> str:
+        normalized = backend.strip().lower()
+        if normalized not in LIVE_MODEL_BACKENDS:
+            raise ValueError(f"Live model backend '{backend}' is not one of: {', '.join(sorted(LIVE_MODEL_BACKENDS))}.")
+        return normalized
+
 
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
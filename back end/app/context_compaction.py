@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+from google.adk.events import Event
+from google.adk.events import EventActions
+from google.genai import types
+
+from app.metrics import MetricsRegistry
+from app.metrics import metrics_registry
+from app.profile_summary_renderer import CHARS_PER_TOKEN
+
+# Session-scoped on purpose: ADK shares "app:" keys across every session and "user:" keys across a user's sessions.
+PINNED_TOOL_RESULTS_STATE_KEY = "pinned_tool_results"
+COMPACTION_METADATA_KEY = "raksha_compaction"
+SUMMARY_HEADER = "[Summary of the earlier conversation; older turns were removed to save context.]"
+CONTEXT_TOKEN_BUCKETS = (500.0, 1000.0, 2000.0, 4000.0, 8000.0, 16000.0, 32000.0, 64000.0)
+
+MAX_DIGEST_LINES = 8
+MAX_DIGEST_LINE_CHARS = 160
+MAX_PINNED_PER_KIND = 20
+_PINNED_KINDS = ("scheduleItems", "bookings", "adherenceReports", "doctors")
+
+
+@dataclass(frozen=True)
+class ContextReport:
+    events: int
+    estimated_tokens: int
+    compacted_events: int = 0
+    tokens_before: int = 0
+
+    @property
+    def compacted(self) -> bool:
+        return self.compacted_events > 0
+
+
+def estimate_event_tokens(event: Any) -> int:
+    """Roughly what one history event costs when ADK replays the session to the model."""
+    chars = 0
+    content = getattr(event, "content", None)
+    for part in getattr(content, "parts", None) or ():
+        if getattr(part, "text", None):
+            chars += len(part.text)
+        function_call = getattr(part, "function_call", None)
+        if function_call is not None:
+            chars += len(function_call.name or "") + len(_to_json(function_call.args))
+        function_response = getattr(part, "function_response", None)
+        if function_response is not None:
+            chars += len(function_response.name or "") + len(_to_json(function_response.response))
+    for transcription in (getattr(event, "input_transcription", None), getattr(event, "output_transcription", None)):
+        if transcription is not None and getattr(transcription, "text", None):
+            chars += len(transcription.text)
+    return -(-chars // CHARS_PER_TOKEN)
+
+
+def extract_pinned_facts(events: list[Any]) -> dict[str, dict[str, Any]]:
+    """Ids from tool results that later turns may still refer to, keyed by kind and then by id."""
+    pinned: dict[str, dict[str, Any]] = {kind: {} for kind in _PINNED_KINDS}
+    for event in events:
+        for response in _function_responses(event):
+            for record in _walk_dicts(response):
+                if record.get("bookingId"):
+                    pinned["bookings"][str(record["bookingId"])] = {
+                        key: record[key]
+                        for key in ("doctorId", "doctorName", "slotId", "displayLabel", "startIso")
+                        if record.get(key) is not None
+                    }
+                elif record.get("reportId") is not None and record.get("scheduleItemId"):
+                    pinned["adherenceReports"][str(record["reportId"])] = str(record["scheduleItemId"])
+                elif record.get("scheduleItemId") and record.get("title"):
+                    pinned["scheduleItems"][str(record["scheduleItemId"])] = str(record["title"])
+                elif record.get("doctorId") and record.get("name"):
+                    pinned["doctors"][str(record["doctorId"])] = str(record["name"])
+    return {kind: values for kind, values in pinned.items() if values}
+
+
+def merge_pinned_facts(
+    current: dict[str, dict[str, Any]] | None,
+    incoming: dict[str, dict[str, Any]],
+) -> dict[str, dict[str, Any]]:
+    """Newer facts win; each kind keeps its ``MAX_PINNED_PER_KIND`` most recent ids."""
+    merged: dict[str, dict[str, Any]] = {}
+    for kind in _PINNED_KINDS:
+        values = dict((current or {}).get(kind) or {})
+        for key, value in (incoming.get(kind) or {}).items():
+            values.pop(key, None)
+            values[key] = value
+        if values:
+            merged[kind] = dict(list(values.items())[-MAX_PINNED_PER_KIND:])
+    return merged
+
+
+def render_summary_text(digest: list[str], pinned: dict[str, dict[str, Any]]) -> str:
+    lines = [SUMMARY_HEADER, *digest]
+    facts: list[str] = []
+    if pinned.get("scheduleItems"):
+        facts.append(
+            "schedule items " + ", ".join(f"{item_id} ({title})" for item_id, title in pinned["scheduleItems"].items())
+        )
+    if pinned.get("bookings"):
+        facts.append(
+            "bookings "
+            + ", ".join(
+                f"{booking_id} ({booking.get('doctorName', booking.get('doctorId', '?'))}, {booking.get('displayLabel', booking.get('slotId', '?'))})"
+                for booking_id, booking in pinned["bookings"].items()
+            )
+        )
+    if pinned.get("adherenceReports"):
+        facts.append(
+            "saved adherence reports "
+            + ", ".join(f"{report_id} (item {item_id})" for report_id, item_id in pinned["adherenceReports"].items())
+        )
+    if pinned.get("doctors"):
+        facts.append("doctors " + ", ".join(f"{doctor_id} ({name})" for doctor_id, name in pinned["doctors"].items()))
+    if facts:
+        lines.append("Still relevant: " + "; ".join(facts) + ".")
+    return "\n".join(lines)
+
+
+def plan_cut(events: list[Any], tokens: list[int], *, budget_tokens: int, keep_recent_events: int) -> int:
+    """How many of the oldest events to drop so the history fits in half the budget; 0 when it already fits.
+
+    Dropping to half rather than just under the budget keeps a long session
+    from compacting again on every turn. The newest ``keep_recent_events``
+    always stay, and a tool response is never kept without its call.
+    """
+    total = sum(tokens)
+    if budget_tokens <= 0 or total <= budget_tokens:
+        return 0
+    limit = max(0, len(events) - keep_recent_events)
+    target = budget_tokens // 2
+    cut = 0
+    while cut < limit and total > target:
+        total -= tokens[cut]
+        cut += 1
+    while 0 < cut < len(events) and _function_responses(events[cut]):
+        cut -= 1
+    if cut == 1 and _is_summary_event(events[0]):
+        # Replacing the previous summary with a new one gains nothing.
+        return 0
+    return cut
+
+
+class ContextCompactor:
+    """Keeps a live session's ADK history inside a token budget.
+
+    ADK replays the whole session history each time ``run_live`` connects
+    (idle resume, response-mode switch, error recovery) and for the text
+    fallback, so a long conversation gets slower and dearer with every turn.
+    At a turn boundary ``compact`` replaces the oldest events with one short
+    summary: the patient's and assistant's last lines from the dropped part,
+    plus the ids from dropped tool results that the agent may still need. The
+    same ids are merged into session state under
+    ``PINNED_TOOL_RESULTS_STATE_KEY``, through an event ``state_delta`` so the
+    session service persists them like any other state change.
+    """
+
+    def __init__(
+        self,
+        *,
+        budget_tokens: int,
+        keep_recent_events: int = 12,
+        registry: MetricsRegistry = metrics_registry,
+    ) -> None:
+        self.budget_tokens = budget_tokens
+        self.keep_recent_events = keep_recent_events
+        self._registry = registry
+
+    async def compact(self, session: Any, session_service: Any) -> ContextReport:
+        """Compacts ``session`` (and the service's stored copy, when it keeps a separate one) in place."""
+        events = list(session.events)
+        tokens = [estimate_event_tokens(event) for event in events]
+        tokens_before = sum(tokens)
+        cut = plan_cut(events, tokens, budget_tokens=self.budget_tokens, keep_recent_events=self.keep_recent_events)
+        if cut == 0:
+            report = ContextReport(events=len(events), estimated_tokens=tokens_before, tokens_before=tokens_before)
+            self._observe(report)
+            return report
+
+        dropped, kept = events[:cut], events[cut:]
+        pinned = merge_pinned_facts(session.state.get(PINNED_TOOL_RESULTS_STATE_KEY), extract_pinned_facts(dropped))
+        digest = _digest_lines(dropped)
+        summary = Event(
+            author="user",
+            invocation_id=getattr(kept[0], "invocation_id", "") if kept else "",
+            content=types.Content(role="user", parts=[types.Part(text=render_summary_text(digest, pinned))]),
+            custom_metadata={COMPACTION_METADATA_KEY: {"digest": digest, "droppedEvents": cut}},
+            timestamp=getattr(dropped[-1], "timestamp", None) or 0.0,
+        )
+        compacted = [summary, *kept]
+        _replace_history(session, events, compacted)
+        storage_session = stored_session_copy(session_service, session)
+        if storage_session is not None and storage_session is not session:
+            _replace_history(storage_session, events, compacted)
+        if pinned and pinned != session.state.get(PINNED_TOOL_RESULTS_STATE_KEY):
+            await session_service.append_event(
+                session,
+                Event(
+                    author="user",
+                    invocation_id=summary.invocation_id,
+                    actions=EventActions(state_delta={PINNED_TOOL_RESULTS_STATE_KEY: pinned}),
+                ),
+            )
+        report = ContextReport(
+            events=len(session.events),
+            estimated_tokens=estimate_event_tokens(summary) + sum(tokens[cut:]),
+            compacted_events=cut,
+            tokens_before=tokens_before,
+        )
+        self._registry.increment("context_compactions_total")
+        self._registry.increment("context_events_compacted_total", cut)
+        self._observe(report)
+        return report
+
+    def _observe(self, report: ContextReport) -> None:
+        self._registry.histogram("session_context_tokens", buckets=CONTEXT_TOKEN_BUCKETS).observe(
+            report.estimated_tokens
+        )
+
+
+def _digest_lines(dropped: list[Any]) -> list[str]:
+    lines: list[str] = []
+    for event in dropped:
+        if _is_summary_event(event):
+            lines.extend(event.custom_metadata[COMPACTION_METADATA_KEY].get("digest") or [])
+            continue
+        text = _event_text(event)
+        if not text:
+            continue
+        speaker = "Patient" if getattr(event, "author", None) == "user" else "Assistant"
+        if len(text) > MAX_DIGEST_LINE_CHARS:
+            text = text[: MAX_DIGEST_LINE_CHARS - 3].rstrip() + "..."
+        lines.append(f"{speaker}: {text}")
+    return lines[-MAX_DIGEST_LINES:]
+
+
+def _event_text(event: Any) -> str:
+    content = getattr(event, "content", None)
+    texts = [
+        part.text
+        for part in getattr(content, "parts", None) or ()
+        if getattr(part, "text", None) and not getattr(part, "thought", False)
+    ]
+    if not texts:
+        for transcription in (getattr(event, "input_transcription", None), getattr(event, "output_transcription", None)):
+            if transcription is not None and getattr(transcription, "text", None):
+                texts.append(transcription.text)
+    return " ".join(" ".join(texts).split())
+
+
+def stored_session_copy(session_service: Any, session: Any) -> Any | None:
+    """The service's own copy of ``session`` when it keeps one in memory, otherwise None.
+
+    ``InMemorySessionService`` hands out copies and appends each event to its
+    stored session as well, and the text fallback reads that copy back. Other
+    services reload history from their backing store, where only the working
+    session is compacted.
+    """
+    sessions = getattr(session_service, "sessions", None)
+    if not isinstance(sessions, dict):
+        return None
+    stored = sessions.get(session.app_name, {}).get(session.user_id, {}).get(session.id)
+    return stored if isinstance(getattr(stored, "events", None), list) else None
+
+
+def _replace_history(target: Any, events: list[Any], compacted: list[Any]) -> bool:
+    """Swaps the ``events`` prefix of ``target``'s history for ``compacted``; False if the histories diverged."""
+    prefix = target.events[: len(events)]
+    if [event.id for event in prefix] != [event.id for event in events]:
+        return False
+    # Events the live stream appended after `events` was read stay at the end.
+    target.events[:] = compacted + target.events[len(events) :]
+    return True
+
+
+def _is_summary_event(event: Any) -> bool:
+    metadata = getattr(event, "custom_metadata", None)
+    return isinstance(metadata, dict) and COMPACTION_METADATA_KEY in metadata
+
+
+def _function_responses(event: Any) -> list[Any]:
+    content = getattr(event, "content", None)
+    return [
+        part.function_response.response
+        for part in getattr(content, "parts", None) or ()
+        if getattr(part, "function_response", None) is not None
+    ]
+
+
+def _walk_dicts(value: Any) -> Iterator[dict[str, Any]]:
+    if isinstance(value, dict):
+        yield value
+        for child in value.values():
+            yield from _walk_dicts(child)
+    elif isinstance(value, list):
+        for child in value:
+            yield from _walk_dicts(child)
+
+
+def _to_json(value: Any) -> str:
+    if value is None:
+        return ""
+    return json.dumps(value, default=str, separators=(",", ":"))
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+from time import perf_counter
+from types import SimpleNamespace
+from typing import Any, Callable
+
+from app.loop_monitor import session_task_name
+from app.metrics import metrics_registry
+from app.tool_cache import SessionToolCache
+
+logger = logging.getLogger("raksha.tools")
+
+PREFETCH_TOOL_NAMES = ("get_current_schedule_item", "get_today_schedule", "get_doctor_catalog")
+
+
+class ContextPrefetcher:
+    """Warms the session tool cache on ptt_start with the reads most turns begin with.
+
+    The tools run on a worker thread, uninstrumented (so they are not logged as
+    model tool calls), with the same session state a real call sees. The
+    results land under the same cache keys the model's calls will use.
+    """
+
+    def __init__(
+        self,
+        tool_cache: SessionToolCache,
+        tools: list[Callable[..., Any]],
+        state: dict[str, Any],
+    ) -> None:
+        self._tool_cache = tool_cache
+        self._state = state
+        unwrapped = [inspect.unwrap(tool) for tool in tools if getattr(tool, "__name__", "") in PREFETCH_TOOL_NAMES]
+        self._tools = [(tool, "tool_context" in inspect.signature(tool).parameters) for tool in unwrapped]
+        self._task: asyncio.Task[None] | None = None
+        self.runs = 0
+
+    def start(self, trace_id: str) -> bool:
+        if not self._tools or (self._task is not None and not self._task.done()):
+            return False
+        self.runs += 1
+        self._task = asyncio.create_task(
+            asyncio.to_thread(self._warm, trace_id),
+            name=session_task_name("prefetch", trace_id),
+        )
+        return True
+
+    def cancel(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def wait(self) -> None:
+        if self._task is not None:
+            await self._task
+
+    def _warm(self, trace_id: str) -> None:
+        started_at = perf_counter()
+        tool_context = SimpleNamespace(state=self._state)
+        warmed = 0
+        with self._tool_cache.prefetching():
+            for tool, takes_context in self._tools:
+                try:
+                    if takes_context:
+                        tool(tool_context=tool_context)
+                    else:
+                        tool()
+                    warmed += 1
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning("[%s] prefetch_failed tool=%s error=%s", trace_id, tool.__name__, exc)
+        duration_ms = (perf_counter() - started_at) * 1000
+        metrics_registry.histogram("context_prefetch_ms").observe(duration_ms)
+        logger.info("[%s] context_prefetch tools=%s duration_ms=%.1f", trace_id, warmed, duration_ms)
@@ -9,10 +9,20 @@ from app.booking_state import SessionBookingState
 from app.doctor_repository import DoctorRepository
 from app.patient_profile_service import BIOMARKER_TARGETS_STATE_KEY
 from app.patient_profile_service import PATIENT_PROFILE_STATE_KEY
+from app.tool_cache import SessionToolCache
+from app.tool_cache import cached_tool_call
+from app.tool_idempotency import ToolIdempotencyLedger
+from app.tool_idempotency import idempotent_tool_call
+from app.tool_instrumentation import ToolCallRecorder
+from app.tool_instrumentation import instrument_tools
 
 
 def build_doctor_tools(
-    doctor_repository: DoctorRepository, booking_state: SessionBookingState
+    doctor_repository: DoctorRepository,
+    booking_state: SessionBookingState,
+    tool_cache: SessionToolCache | None = None,
+    recorder: ToolCallRecorder | None = None,
+    idempotency: ToolIdempotencyLedger | None = None,
 ) -> list[Callable[..., dict[str, Any]]]:
     def _extract_profile_context(tool_context: ToolContext | None) -> tuple[list[str], list[str]]:
         if tool_context is None:
@@ -54,12 +64,15 @@ def build_doctor_tools(
         Fetches doctors and current slot availability for this conversation.
         Call this before recommending doctors based on symptoms.
         """
-        doctors = booking_state.with_availability(doctor_repository.list_doctors())
-        return {
-            "type": "doctor_catalog",
-            "timezone": doctor_repository.timezone,
-            "doctors": doctors,
-        }
+        def _load_catalog() -> dict[str, Any]:
+            doctors = booking_state.with_availability(doctor_repository.list_doctors())
+            return {
+                "type": "doctor_catalog",
+                "timezone": doctor_repository.timezone,
+                "doctors": doctors,
+            }
+
+        return cached_tool_call(tool_cache, "get_doctor_catalog", {}, _load_catalog)
 
     def publish_recommendations(
         symptoms_summary: str,
@@ -118,13 +131,7 @@ def build_doctor_tools(
             "doctors": doctors,
         }
 
-    def book_doctor_slot(doctor_id: str, slot_id: str, user_confirmation: bool = False) -> dict[str, Any]:
-        """
-        Books an available doctor slot after user confirmation.
-        Set user_confirmation=true only when the user explicitly confirms.
-        """
-        normalized_doctor_id = str(doctor_id).strip()
-        normalized_slot_id = str(slot_id).strip()
+    def _book_slot(normalized_doctor_id: str, normalized_slot_id: str, user_confirmation: bool) -> dict[str, Any]:
         if not normalized_doctor_id or not normalized_slot_id:
             return {
                 "type": "booking_update",
@@ -179,6 +186,8 @@ def build_doctor_tools(
                 "message": "Booking failed unexpectedly. Please try another slot.",
             }
 
+        if tool_cache is not None:
+            tool_cache.invalidate("get_doctor_catalog")
         return {
             "type": "booking_update",
             "status": "confirmed",
@@ -189,4 +198,19 @@ def build_doctor_tools(
             ),
         }
 
-    return [get_doctor_catalog, publish_recommendations, book_doctor_slot]
+    def book_doctor_slot(doctor_id: str, slot_id: str, user_confirmation: bool = False) -> dict[str, Any]:
+        """
+        Books an available doctor slot after user confirmation.
+        Set user_confirmation=true only when the user explicitly confirms.
+        """
+        normalized_doctor_id = str(doctor_id).strip()
+        normalized_slot_id = str(slot_id).strip()
+        # A replayed turn repeats the call with the same arguments; it must not book twice.
+        return idempotent_tool_call(
+            idempotency,
+            "book_doctor_slot",
+            {"doctor_id": normalized_doctor_id, "slot_id": normalized_slot_id, "user_confirmation": bool(user_confirmation)},
+            lambda: _book_slot(normalized_doctor_id, normalized_slot_id, user_confirmation),
+        )
+
+    return instrument_tools([get_doctor_catalog, publish_recommendations, book_doctor_slot], recorder)
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import json
+import re
+from collections import deque
+from dataclasses import dataclass
+
+EMERGENCY_PHRASES: dict[str, tuple[str, ...]] = {
+    "cardiac": (
+        "chest pain",
+        "chest tightness",
+        "tight chest",
+        "pressure in my chest",
+        "heart attack",
+    ),
+    "breathing": (
+        "cant breathe",
+        "can not breathe",
+        "cannot breathe",
+        "unable to breathe",
+        "trouble breathing",
+        "difficulty breathing",
+        "hard to breathe",
+        "short of breath",
+        "shortness of breath",
+        "choking",
+    ),
+    "stroke": (
+        "stroke",
+        "face drooping",
+        "face is drooping",
+        "slurred speech",
+        "slurring my words",
+        "numb on one side",
+        "cant move my arm",
+    ),
+    "bleeding": (
+        "heavy bleeding",
+        "bleeding heavily",
+        "bleeding a lot",
+        "wont stop bleeding",
+        "coughing up blood",
+        "vomiting blood",
+    ),
+    "self_harm": (
+        "suicidal",
+        "kill myself",
+        "end my life",
+        "want to die",
+        "hurt myself",
+        "overdose",
+    ),
+    "consciousness": (
+        "passed out",
+        "fainted",
+        "unconscious",
+        "seizure",
+    ),
+    "allergic": (
+        "throat is closing",
+        "throat closing",
+        "anaphylaxis",
+        "tongue is swelling",
+    ),
+}
+
+_EMERGENCY_MESSAGES: dict[str, str] = {
+    "self_harm": (
+        "If you are thinking about harming yourself, please call your local emergency number "
+        "or a crisis line right now, or ask someone nearby to stay with you."
+    ),
+}
+_DEFAULT_EMERGENCY_MESSAGE = (
+    "This may be a medical emergency. Please call your local emergency services now "
+    "or go to the nearest emergency department."
+)
+
+
+@dataclass(frozen=True)
+class EmergencyMatch:
+    category: str
+    phrase: str
+
+
+_APOSTROPHES = str.maketrans("", "", "'’")
+_NON_ALPHANUMERIC = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_transcript(text: str) -> str:
+    """Lowercases, drops apostrophes (so "can't" == "cant") and collapses everything else to single spaces."""
+    return _NON_ALPHANUMERIC.sub(" ", text.lower().translate(_APOSTROPHES))
+
+
+def _normalize_phrase(phrase: str) -> str:
+    return " " + normalize_transcript(phrase).strip()
+
+
+class EmergencyPhraseAutomaton:
+    """Aho-Corasick automaton over phrases prefixed with a space, so every hit starts on a word boundary.
+
+    Phrases are not padded on the right: a hit fires on the last character of
+    the phrase instead of waiting for the next transcription fragment.
+    """
+
+    def __init__(self, phrases: dict[str, tuple[str, ...]]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._outputs: list[tuple[EmergencyMatch, ...]] = [()]
+
+        for category, category_phrases in phrases.items():
+            for phrase in category_phrases:
+                self._add(_normalize_phrase(phrase), EmergencyMatch(category=category, phrase=phrase))
+        self._build_failure_links()
+        self._delta = self._build_transition_table()
+
+    @property
+    def transitions(self) -> list[dict[str, int]]:
+        """Dense DFA: transitions[state].get(char, 0) never needs to follow failure links."""
+        return self._delta
+
+    def step(self, state: int, char: str) -> int:
+        return self._delta[state].get(char, 0)
+
+    def outputs(self, state: int) -> tuple[EmergencyMatch, ...]:
+        return self._outputs[state]
+
+    def _add(self, pattern: str, match: EmergencyMatch) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append(())
+            state = next_state
+        self._outputs[state] = (*self._outputs[state], match)
+
+    def _build_failure_links(self) -> None:
+        queue: deque[int] = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while char not in self._goto[fallback] and fallback != 0:
+                    fallback = self._fail[fallback]
+                candidate = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = candidate if candidate != next_state else 0
+                self._outputs[next_state] = (*self._outputs[next_state], *self._outputs[self._fail[next_state]])
+
+    def _build_transition_table(self) -> list[dict[str, int]]:
+        alphabet = {char for transitions in self._goto for char in transitions}
+        delta: list[dict[str, int]] = []
+        for state in range(len(self._goto)):
+            row: dict[str, int] = {}
+            for char in alphabet:
+                cursor = state
+                while char not in self._goto[cursor] and cursor != 0:
+                    cursor = self._fail[cursor]
+                target = self._goto[cursor].get(char, 0)
+                if target:
+                    row[char] = target
+            delta.append(row)
+        return delta
+
+
+DEFAULT_AUTOMATON = EmergencyPhraseAutomaton(EMERGENCY_PHRASES)
+
+
+class EmergencyPhraseScanner:
+    """Streaming matcher for one turn of input transcription fragments.
+
+    Automaton state is carried across fragments, so a phrase split between two
+    transcription events still matches. Each category is reported once per turn.
+    """
+
+    def __init__(self, automaton: EmergencyPhraseAutomaton = DEFAULT_AUTOMATON) -> None:
+        self._automaton = automaton
+        self.reset()
+
+    def reset(self) -> None:
+        self._state = self._automaton.step(0, " ")
+        self._last_was_space = True
+        self._last_fragment = ""
+        self._reported: set[str] = set()
+
+    def feed_fragment(self, fragment: str) -> list[EmergencyMatch]:
+        # Cumulative transcripts repeat the previous text; only scan the new suffix.
+        # A fragment no longer than the last one adds nothing to a cumulative
+        # transcript, so it must be a delta that happens to repeat it.
+        text = fragment
+        if self._last_fragment and len(fragment) > len(self._last_fragment) and fragment.startswith(self._last_fragment):
+            text = fragment[len(self._last_fragment) :]
+        self._last_fragment = fragment
+        return self.feed(text)
+
+    def feed(self, text: str) -> list[EmergencyMatch]:
+        normalized = normalize_transcript(text)
+        if not normalized:
+            return []
+        if self._last_was_space and normalized[0] == " ":
+            normalized = normalized[1:]
+            if not normalized:
+                return []
+
+        matches: list[EmergencyMatch] = []
+        delta = self._automaton.transitions
+        outputs = self._automaton.outputs
+        state = self._state
+        for char in normalized:
+            state = delta[state].get(char, 0)
+            hits = outputs(state)
+            if hits:
+                for match in hits:
+                    if match.category not in self._reported:
+                        self._reported.add(match.category)
+                        matches.append(match)
+        self._state = state
+        self._last_was_space = normalized[-1] == " "
+        return matches
+
+
+def _render_emergency_event(category: str) -> str:
+    return json.dumps(
+        {
+            "type": "emergency_guidance",
+            "category": category,
+            "message": _EMERGENCY_MESSAGES.get(category, _DEFAULT_EMERGENCY_MESSAGE),
+        },
+        separators=(",", ":"),
+    )
+
+
+# Serialized once at import so the fast path only does a websocket write.
+PRERENDERED_EMERGENCY_EVENTS: dict[str, str] = {
+    category: _render_emergency_event(category) for category in EMERGENCY_PHRASES
+}
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import math
+import struct
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, AsyncIterator
+
+from google.adk.agents import Agent
+from google.adk.agents.live_request_queue import LiveRequestQueue
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService
+from google.genai import errors as genai_errors
+from google.genai import types
+
+from app.agent import live_model_supports_text_replies
+
+_ERROR_STATUSES = {1007: "INVALID_ARGUMENT", 1008: "POLICY_VIOLATION"}
+
+
+@dataclass(frozen=True)
+class FakeLiveModelConfig:
+    """Shape of the fake model's replies; every value is deterministic."""
+
+    connect_latency_ms: float = 0.0
+    response_latency_ms: float = 150.0
+    audio_sample_rate: int = 24000
+    audio_chunk_bytes: int = 4800
+    audio_chunk_interval_ms: float = 0.0
+    response_audio_ms: int = 1000
+    # Replays the turn's uplink PCM instead of a tone; set audio_sample_rate to the uplink rate.
+    echo_input_audio: bool = False
+    input_transcript: str = "what should I do now"
+    input_transcription_every_packets: int = 5
+    output_transcript: str = "Here is what is on your plan right now."
+    output_transcription_every_chunks: int = 4
+    tool_calls: tuple[str, ...] = ("get_current_schedule_item",)
+    # 1-based turn numbers, counted per live stream, that fail with error_code instead of answering.
+    error_turns: tuple[int, ...] = ()
+    error_code: int = 1007
+
+
+class FakeLiveRunner:
+    """Offline stand-in for google.adk Runner with the same run_live/run_async surface.
+
+    Each push-to-talk turn gets cumulative input transcriptions while audio
+    streams in. After activity_end it sleeps for the configured latency, calls
+    the configured agent tools for real, then streams PCM chunks interleaved with
+    output transcription fragments and finishes with turn_complete. A stream
+    opened with the TEXT response modality answers with one text part instead,
+    unless the agent's model is a native-audio one: like the Live API, the fake
+    then rejects the connection.
+    """
+
+    def __init__(
+        self,
+        *,
+        app_name: str,
+        agent: Agent,
+        session_service: BaseSessionService,
+        config: FakeLiveModelConfig | None = None,
+    ) -> None:
+        self.app_name = app_name
+        self.agent = agent
+        self.session_service = session_service
+        self._config = config or FakeLiveModelConfig()
+        self._tools = {getattr(tool, "__name__", ""): tool for tool in agent.tools}
+        self._call_seq = 0
+        self._reply_audio = _tone(self._config.audio_sample_rate, self._config.response_audio_ms)
+
+    async def run_live(
+        self,
+        *,
+        session: Any,
+        live_request_queue: LiveRequestQueue,
+        run_config: Any = None,
+    ) -> AsyncIterator[Event]:
+        config = self._config
+        tool_context = SimpleNamespace(state=session.state)
+        modalities = getattr(run_config, "response_modalities", None) or []
+        text_only = types.Modality.TEXT in modalities
+        if text_only and not live_model_supports_text_replies(str(self.agent.model)):
+            raise genai_errors.APIError(
+                1007,
+                {
+                    "error": {
+                        "code": 1007,
+                        "message": f"Model {self.agent.model} does not support the TEXT response modality.",
+                        "status": _ERROR_STATUSES[1007],
+                    }
+                },
+            )
+        input_words = config.input_transcript.split()
+        turn_number = 0
+        turn_audio = bytearray()
+        turn_packets = 0
+        words_sent = 0
+        if config.connect_latency_ms > 0:
+            await asyncio.sleep(config.connect_latency_ms / 1000)
+
+        while True:
+            request = await live_request_queue.get()
+            if request.close:
+                return
+            if request.activity_start:
+                turn_audio.clear()
+                turn_packets = 0
+                words_sent = 0
+                continue
+            if request.blob is not None and request.blob.data:
+                turn_packets += 1
+                if config.echo_input_audio:
+                    turn_audio.extend(request.blob.data)
+                every = config.input_transcription_every_packets
+                if every > 0 and turn_packets % every == 0 and words_sent < len(input_words):
+                    words_sent += 1
+                    yield self._input_transcription(" ".join(input_words[:words_sent]))
+                continue
+            if request.content is not None:
+                await asyncio.sleep(config.response_latency_ms / 1000)
+                yield self._text_event(config.output_transcript)
+                yield Event(author=self.agent.name, turn_complete=True)
+                continue
+            if not request.activity_end:
+                continue
+
+            turn_number += 1
+            if turn_number in config.error_turns:
+                raise genai_errors.APIError(
+                    config.error_code,
+                    {
+                        "error": {
+                            "code": config.error_code,
+                            "message": f"Injected fake live error on turn {turn_number}.",
+                            "status": _ERROR_STATUSES.get(config.error_code, "UNKNOWN"),
+                        }
+                    },
+                )
+
+            if words_sent < len(input_words):
+                yield self._input_transcription(config.input_transcript)
+            await asyncio.sleep(config.response_latency_ms / 1000)
+
+            for tool_name in config.tool_calls:
+                async for event in self._call_tool(tool_name, tool_context):
+                    yield event
+
+            if text_only:
+                yield self._text_event(config.output_transcript)
+            else:
+                async for event in self._stream_audio_reply(bytes(turn_audio)):
+                    yield event
+            yield Event(author=self.agent.name, turn_complete=True)
+
+    async def run_async(
+        self,
+        *,
+        user_id: str,
+        session_id: str,
+        new_message: types.Content,
+        run_config: Any = None,
+    ) -> AsyncIterator[Event]:
+        await asyncio.sleep(self._config.response_latency_ms / 1000)
+        yield self._text_event(self._config.output_transcript)
+
+    async def _call_tool(self, tool_name: str, tool_context: Any) -> AsyncIterator[Event]:
+        tool = self._tools.get(tool_name)
+        if tool is None:
+            return
+        self._call_seq += 1
+        call_id = f"fake-call-{self._call_seq}"
+        yield Event(
+            author=self.agent.name,
+            content=types.Content(
+                role="model",
+                parts=[types.Part(function_call=types.FunctionCall(id=call_id, name=tool_name, args={}))],
+            ),
+        )
+        kwargs = {"tool_context": tool_context} if "tool_context" in inspect.signature(tool).parameters else {}
+        result = tool(**kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        yield Event(
+            author=self.agent.name,
+            content=types.Content(
+                role="user",
+                parts=[
+                    types.Part(
+                        function_response=types.FunctionResponse(id=call_id, name=tool_name, response=result)
+                    )
+                ],
+            ),
+        )
+
+    async def _stream_audio_reply(self, echoed_audio: bytes) -> AsyncIterator[Event]:
+        config = self._config
+        audio = echoed_audio or self._reply_audio
+        mime_type = f"audio/pcm;rate={config.audio_sample_rate}"
+        output_words = config.output_transcript.split()
+        every = config.output_transcription_every_chunks
+        words_per_fragment = 0
+        if every > 0:
+            fragment_slots = max(1, math.ceil(len(audio) / config.audio_chunk_bytes) // every)
+            words_per_fragment = math.ceil(len(output_words) / fragment_slots)
+        words_sent = 0
+
+        for index, start in enumerate(range(0, len(audio), config.audio_chunk_bytes), start=1):
+            if config.audio_chunk_interval_ms > 0:
+                await asyncio.sleep(config.audio_chunk_interval_ms / 1000)
+            yield Event(
+                author=self.agent.name,
+                content=types.Content(
+                    role="model",
+                    parts=[
+                        types.Part(
+                            inline_data=types.Blob(
+                                mime_type=mime_type,
+                                data=audio[start : start + config.audio_chunk_bytes],
+                            )
+                        )
+                    ],
+                ),
+            )
+            if every > 0 and index % every == 0 and words_sent < len(output_words):
+                fragment = output_words[words_sent : words_sent + words_per_fragment]
+                # Like Gemini Live, each fragment after the first carries its own leading space.
+                separator = " " if words_sent else ""
+                words_sent += len(fragment)
+                yield self._output_transcription(separator + " ".join(fragment))
+
+        if words_sent < len(output_words):
+            separator = " " if words_sent else ""
+            yield self._output_transcription(separator + " ".join(output_words[words_sent:]))
+
+    def _input_transcription(self, text: str) -> Event:
+        return Event(author="user", input_transcription=types.Transcription(text=text))
+
+    def _output_transcription(self, text: str) -> Event:
+        return Event(author=self.agent.name, output_transcription=types.Transcription(text=text))
+
+    def _text_event(self, text: str) -> Event:
+        return Event(author=self.agent.name, content=types.Content(role="model", parts=[types.Part(text=text)]))
+
+
+def _tone(sample_rate: int, duration_ms: int, frequency_hz: float = 220.0) -> bytes:
+    sample_count = sample_rate * duration_ms // 1000
+    step = 2 * math.pi * frequency_hz / sample_rate
+    samples = (int(6000 * math.sin(step * index)) for index in range(sample_count))
+    return struct.pack(f"<{sample_count}h", *samples)
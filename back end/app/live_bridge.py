@@ -6,9 +6,9 @@ import json
 import logging
 import os
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from time import perf_counter
+from time import perf_counter, perf_counter_ns
 from typing import Any, AsyncIterator
 
 from fastapi import WebSocket, WebSocketDisconnect
@@ -19,20 +19,61 @@ from google.adk.sessions import InMemorySessionService
 from google.genai import errors as genai_errors
 from google.genai import types
 
+from app.admission import AdmissionController
+from app.admission import AdmissionRejected
+from app.admission import AdmissionTicket
 from app.agent import create_agent
+from app.agent import live_model_supports_text_replies
+from app.audio_codecs import AUDIO_ENCODINGS
+from app.audio_codecs import IMA_ADPCM
+from app.audio_codecs import PCM16
+from app.audio_codecs import AudioEncoder
+from app.audio_codecs import Pcm16Encoder
+from app.audio_codecs import create_audio_encoder
+from app.audio_codecs import negotiate_audio_encoding
 from app.booking_state import SessionBookingState
+from app.context_compaction import ContextCompactor
+from app.context_prefetch import ContextPrefetcher
 from app.doctor_repository import DoctorRepository
 from app.doctor_tools import build_doctor_tools
+from app.emergency_matcher import PRERENDERED_EMERGENCY_EVENTS
+from app.emergency_matcher import EmergencyPhraseScanner
+from app.fake_live_model import FakeLiveModelConfig
+from app.fake_live_model import FakeLiveRunner
+from app.loop_monitor import session_task_name
+from app.metrics import metrics_registry
+from app.overload import OverloadGovernor
 from app.patient_profile_service import PatientProfileService
 from app.patient_profile_service import ProfileContextResult
 from app.patient_tools import build_patient_tools
+from app.pcm_framer import PcmFramer
+from app.profile_summary_renderer import ProfileSummaryStats
+from app.resampler import StreamingResampler
+from app.resampler import parse_client_sample_rate
 from app.schedule_service import SCHEDULE_TIMEZONE_STATE_KEY
 from app.schedule_service import SCHEDULE_USER_ID_STATE_KEY
 from app.schedule_service import ScheduleService
 from app.schedule_tools import build_schedule_tools
+from app.session_recorder import SessionRecorder
+from app.session_resume import Reattachment
+from app.session_resume import SessionResumeRegistry
+from app.tool_cache import SessionToolCache
+from app.tool_idempotency import ToolIdempotencyLedger
+from app.tool_instrumentation import ToolCallRecorder
+from app.transcript_stream import DELTA_TRANSCRIPTS
+from app.transcript_stream import INPUT_STREAM
+from app.transcript_stream import OUTPUT_STREAM
+from app.transcript_stream import TranscriptCoalescer
+from app.transcript_stream import negotiate_transcript_mode
+from app.upstream_link import UpstreamLink
+from app.wire_protocol import OutboundChannel
+from app.wire_protocol import negotiate_wire_protocol
 
 logger = logging.getLogger("raksha.live")
 
+UPLINK_SAMPLE_RATE = 16000
+WS_TRY_AGAIN_LATER = 1013
+
 
 @dataclass
 class LiveSessionContext:
@@ -40,6 +81,11 @@ class LiveSessionContext:
     session: Any
     live_request_queue: LiveRequestQueue
     profile_status_event: dict[str, Any]
+    tool_cache: SessionToolCache
+    profile_summary_stats: ProfileSummaryStats | None = None
+    prefetcher: ContextPrefetcher | None = None
+    bootstrap_ms: dict[str, float] = field(default_factory=dict)
+    idempotency: ToolIdempotencyLedger = field(default_factory=ToolIdempotencyLedger)
 
 
 @dataclass
@@ -47,11 +93,27 @@ class SessionMetrics:
     started_at: float
     incoming_audio_chunks: int = 0
     incoming_audio_bytes: int = 0
+    upstream_audio_frames: int = 0
     outgoing_audio_chunks: int = 0
     outgoing_audio_bytes: int = 0
+    outgoing_audio_pcm_bytes: int = 0
     incoming_text_events: int = 0
     outgoing_text_events: int = 0
     parse_errors: int = 0
+    emergency_alerts: int = 0
+    tool_cache_hits: int = 0
+    tool_cache_misses: int = 0
+    tool_cache_invalidations: int = 0
+    tool_cache_prefetched: int = 0
+    tool_cache_prefetch_hits: int = 0
+    ready_ms: float | None = None
+    recoveries: int = 0
+    resumes: int = 0
+    tool_replays: int = 0
+    ui_payloads_suppressed: int = 0
+    context_compactions: int = 0
+    context_events_compacted: int = 0
+    context_peak_tokens: int = 0
 
 
 @dataclass
@@ -65,6 +127,20 @@ class TurnState:
     last_closed_turn_transcript: str = ""
     last_input_transcript: str = ""
     fallback_attempted_turn_id: int | None = None
+    emergency_scanner: EmergencyPhraseScanner = field(default_factory=EmergencyPhraseScanner)
+    pcm_framer: PcmFramer | None = None
+    downlink_encoder: AudioEncoder = field(default_factory=Pcm16Encoder)
+    uplink_resampler: StreamingResampler | None = None
+    client_input_sample_rate: int | None = None
+    client_output_sample_rate: int | None = None
+    downlink_resampler: StreamingResampler | None = None
+    transcripts: TranscriptCoalescer | None = None
+    upstream_link: UpstreamLink | None = None
+    prefetcher: ContextPrefetcher | None = None
+    idempotency: ToolIdempotencyLedger | None = None
+    session: Any = None
+    text_only: bool = False
+    response_wait_started_at: float | None = None
 
 
 class LiveBridge:
@@ -75,48 +151,129 @@ class LiveBridge:
         gemini_api_key: str,
         patient_profile_service: PatientProfileService | None = None,
         schedule_service: ScheduleService | None = None,
+        tool_cache_ttl_seconds: float = 30.0,
+        capture_dir: Path | None = None,
+        fake_live_model: FakeLiveModelConfig | None = None,
+        uplink_frame_ms: int = 100,
+        uplink_max_frame_ms: int = 200,
+        transcript_coalesce_ms: int = 50,
+        upstream_idle_timeout_s: float = 60.0,
+        admission: AdmissionController | None = None,
+        overload_governor: OverloadGovernor | None = None,
+        session_resume: SessionResumeRegistry | None = None,
+        resume_buffer_frames: int = 512,
+        resume_buffer_bytes: int = 512 * 1024,
+        context_budget_tokens: int = 8000,
+        context_keep_recent_events: int = 12,
+        live_compression_trigger_tokens: int = 0,
+        audio_adpcm_enabled: bool = False,
     ) -> None:
         self._app_name = app_name
         self._model = model
         self._gemini_api_key = gemini_api_key
         self._patient_profile_service = patient_profile_service
         self._schedule_service = schedule_service
+        self._tool_cache_ttl_seconds = tool_cache_ttl_seconds
+        self._capture_dir = capture_dir
+        self._fake_live_model = fake_live_model
+        self._uplink_frame_ms = uplink_frame_ms
+        self._uplink_max_frame_ms = max(uplink_frame_ms, uplink_max_frame_ms)
+        self._transcript_coalesce_ms = transcript_coalesce_ms
+        self._upstream_idle_timeout_s = upstream_idle_timeout_s
+        self._admission = admission
+        self._overload_governor = overload_governor
+        self._text_replies_supported = live_model_supports_text_replies(model)
+        if overload_governor is not None and not self._text_replies_supported:
+            logger.warning("overload_text_mode_unavailable model=%s reason=audio_only_live_model", model)
+        self._session_resume = session_resume if session_resume is not None and session_resume.enabled else None
+        self._resume_buffer_frames = resume_buffer_frames
+        self._resume_buffer_bytes = resume_buffer_bytes
+        self._context_compactor = ContextCompactor(
+            budget_tokens=context_budget_tokens,
+            keep_recent_events=context_keep_recent_events,
+        )
+        self._live_compression_trigger_tokens = live_compression_trigger_tokens
+        # IMA-ADPCM costs about 100x the CPU of mu-law per audio second, so it is opt-in.
+        self._audio_encodings = tuple(
+            encoding for encoding in AUDIO_ENCODINGS if audio_adpcm_enabled or encoding != IMA_ADPCM
+        )
         self._session_service = InMemorySessionService()
         data_path = Path(__file__).resolve().parent / "data" / "mock_doctors.json"
         self._doctor_repository = DoctorRepository.from_json_file(data_path)
 
-    async def build_context(self, user_id: str, timezone_name: str | None = None) -> LiveSessionContext:
+    async def build_context(
+        self,
+        user_id: str,
+        timezone_name: str | None = None,
+        tool_recorder: ToolCallRecorder | None = None,
+        trace_id: str = "-",
+    ) -> LiveSessionContext:
+        """Bootstraps a live session as a pipeline rather than one blocking step after another.
+
+        The profile load and the doctor list run concurrently on worker
+        threads. As soon as the tools exist, the schedule and catalog reads
+        start warming the tool cache in the background. Agent and runner
+        construction follows once the profile summary is known. Stage times end
+        up in ``bootstrap_ms``.
+        """
         os.environ["GOOGLE_API_KEY"] = self._gemini_api_key
         os.environ.setdefault("GOOGLE_GENAI_USE_VERTEXAI", "FALSE")
 
-        profile_context = self._load_profile_context(user_id)
-        booking_state = SessionBookingState(self._doctor_repository.list_doctors())
-        state = {
-            **profile_context.state,
-            SCHEDULE_USER_ID_STATE_KEY: user_id,
-        }
+        started_at = perf_counter()
+        bootstrap_ms: dict[str, float] = {}
+        tool_cache = SessionToolCache(ttl_seconds=self._tool_cache_ttl_seconds)
+        idempotency = ToolIdempotencyLedger()
+        state: dict[str, Any] = {SCHEDULE_USER_ID_STATE_KEY: user_id}
         if timezone_name and timezone_name.strip():
             state[SCHEDULE_TIMEZONE_STATE_KEY] = timezone_name.strip()
-        tools = (
-            build_doctor_tools(self._doctor_repository, booking_state)
-            + build_patient_tools()
-            + build_schedule_tools(self._schedule_service)
-        )
-        agent = create_agent(
-            self._model,
-            tools=tools,
-            profile_summary=profile_context.profile_summary,
-        )
-        runner = Runner(
-            app_name=self._app_name,
-            agent=agent,
-            session_service=self._session_service,
+
+        async def _timed_in_thread(stage: str, func: Any, *args: Any) -> Any:
+            stage_started_at = perf_counter()
+            result = await asyncio.to_thread(func, *args)
+            bootstrap_ms[stage] = (perf_counter() - stage_started_at) * 1000
+            return result
+
+        async def _build_tools() -> tuple[list[Any], ContextPrefetcher]:
+            doctors = await _timed_in_thread("doctors", self._doctor_repository.list_doctors)
+            booking_state = SessionBookingState(doctors)
+            tools = (
+                build_doctor_tools(
+                    self._doctor_repository,
+                    booking_state,
+                    tool_cache=tool_cache,
+                    recorder=tool_recorder,
+                    idempotency=idempotency,
+                )
+                + build_patient_tools(recorder=tool_recorder)
+                + build_schedule_tools(
+                    self._schedule_service,
+                    tool_cache=tool_cache,
+                    recorder=tool_recorder,
+                    idempotency=idempotency,
+                )
+            )
+            # The cached reads only depend on the user id and timezone, which are already in `state`.
+            prefetcher = ContextPrefetcher(tool_cache, tools, state)
+            prefetcher.start(trace_id)
+            return tools, prefetcher
+
+        profile_context, (tools, prefetcher) = await asyncio.gather(
+            _timed_in_thread("profile", self._load_profile_context, user_id),
+            _build_tools(),
         )
+        for key, value in profile_context.state.items():
+            state.setdefault(key, value)
+        runner = await _timed_in_thread("agent", self._build_agent_runner, tools, profile_context.profile_summary)
+        session_started_at = perf_counter()
         session = await runner.session_service.create_session(
             app_name=self._app_name,
             user_id=user_id,
             state=state,
         )
+        bootstrap_ms["session"] = (perf_counter() - session_started_at) * 1000
+        bootstrap_ms["total"] = (perf_counter() - started_at) * 1000
+        for stage, duration_ms in bootstrap_ms.items():
+            metrics_registry.histogram("session_bootstrap_ms", labels={"stage": stage}).observe(duration_ms)
         queue = LiveRequestQueue()
         return LiveSessionContext(
             runner=runner,
@@ -128,31 +285,181 @@ class LiveBridge:
                 "source": profile_context.source,
                 "message": profile_context.message,
             },
+            tool_cache=tool_cache,
+            profile_summary_stats=profile_context.summary_stats,
+            prefetcher=prefetcher,
+            bootstrap_ms=bootstrap_ms,
+            idempotency=idempotency,
         )
 
-    async def run_websocket(self, websocket: WebSocket, user_id: str, timezone_name: str | None = None) -> None:
+    async def run_websocket(
+        self,
+        websocket: WebSocket,
+        user_id: str,
+        timezone_name: str | None = None,
+        audio_encoding: str | None = None,
+        input_sample_rate: int | None = None,
+        output_sample_rate: int | None = None,
+        protocol: str | None = None,
+        transcripts: str | None = None,
+        resume_token: str | None = None,
+        last_seq: int = 0,
+    ) -> None:
         trace_id = uuid.uuid4().hex[:8]
         metrics = SessionMetrics(started_at=perf_counter())
-        turn_state = TurnState()
         logger.info("[%s] websocket_connect user_id=%s", trace_id, user_id)
+        admission_ticket: AdmissionTicket | None = None
+        accepted = False
+        if resume_token and self._session_resume is not None:
+            await websocket.accept()
+            accepted = True
+            reattachment = self._session_resume.claim(
+                resume_token,
+                user_id=user_id,
+                websocket=websocket,
+                last_seq=last_seq,
+            )
+            if reattachment is not None:
+                # The parked session now drives this websocket; it stays open until the session lets go of it.
+                logger.info("[%s] session_resume_claimed last_seq=%s", trace_id, last_seq)
+                await reattachment.released.wait()
+                return
+            logger.info("[%s] session_resume_miss starting_new_session=true", trace_id)
+        if self._admission is not None:
+            admission_ticket, admitted_accepted = await self._admit(
+                websocket,
+                user_id,
+                protocol,
+                trace_id=trace_id,
+                accepted=accepted,
+            )
+            accepted = accepted or admitted_accepted
+            if admission_ticket is None:
+                return
+        bootstrap_task: asyncio.Task[LiveSessionContext] | None = None
+        session_recorder: SessionRecorder | None = None
+        # Until the session loop below takes over, a failure anywhere in setup must give the admission slot back.
+        try:
+            turn_state = TurnState(
+                pcm_framer=self._build_pcm_framer(),
+                downlink_encoder=create_audio_encoder(
+                    negotiate_audio_encoding(audio_encoding, allowed=self._audio_encodings)
+                ),
+            )
+            self._apply_client_sample_rates(
+                turn_state,
+                input_sample_rate=input_sample_rate,
+                output_sample_rate=output_sample_rate,
+                trace_id=trace_id,
+            )
+            tool_recorder = ToolCallRecorder(trace_id=trace_id)
+            if self._capture_dir is not None:
+                session_recorder = self._open_session_recorder(
+                    self._capture_dir,
+                    trace_id=trace_id,
+                    user_id=user_id,
+                    timezone_name=timezone_name,
+                )
 
-        await websocket.accept()
-        logger.info("[%s] websocket_accepted", trace_id)
+            # Bootstrap the first live context while the websocket handshake completes.
+            bootstrap_task = asyncio.create_task(
+                self.build_context(
+                    user_id=user_id,
+                    timezone_name=timezone_name,
+                    tool_recorder=tool_recorder,
+                    trace_id=trace_id,
+                ),
+                name=session_task_name("bootstrap", trace_id),
+            )
+            if not accepted:
+                await websocket.accept()
+            session_token: str | None = None
+            if self._session_resume is not None:
+                session_token = self._session_resume.new_token()
+                channel = OutboundChannel(
+                    websocket,
+                    negotiate_wire_protocol(protocol),
+                    resume_buffer_frames=self._resume_buffer_frames,
+                    resume_buffer_bytes=self._resume_buffer_bytes,
+                )
+            else:
+                channel = OutboundChannel(websocket, negotiate_wire_protocol(protocol))
+            reattachment: Reattachment | None = None
+            transcript_mode = negotiate_transcript_mode(transcripts)
+            if transcript_mode == DELTA_TRANSCRIPTS:
+                turn_state.transcripts = TranscriptCoalescer(
+                    channel.send_event,
+                    interval_ms=self._transcript_coalesce_ms,
+                    task_name=session_task_name("transcript-flush", trace_id),
+                )
+            link = UpstreamLink(LiveRequestQueue(), trace_id=trace_id, idle_timeout_s=self._upstream_idle_timeout_s)
+            turn_state.upstream_link = link
+            logger.info("[%s] websocket_accepted protocol=%s transcripts=%s", trace_id, channel.protocol, transcript_mode)
+        except BaseException:
+            if bootstrap_task is not None:
+                bootstrap_task.cancel()
+            if session_recorder is not None:
+                session_recorder.close()
+            if admission_ticket is not None:
+                self._admission.release(admission_ticket)  # type: ignore[union-attr]
+            raise
 
+        context: LiveSessionContext | None = None
+        recovery_started_at: float | None = None
+        recovery_mode = "reattach"
         try:
             while True:
-                context = await self.build_context(user_id=user_id, timezone_name=timezone_name)
-                logger.info(
-                    "[%s] live_context_ready session_id=%s model=%s",
-                    trace_id,
-                    context.session.id,
-                    self._model,
-                )
+                if context is None:
+                    if bootstrap_task is not None:
+                        context = await bootstrap_task
+                        bootstrap_task = None
+                    else:
+                        context = await self.build_context(
+                            user_id=user_id,
+                            timezone_name=timezone_name,
+                            tool_recorder=tool_recorder,
+                            trace_id=trace_id,
+                        )
+                    logger.info(
+                        "[%s] live_context_ready session_id=%s model=%s",
+                        trace_id,
+                        context.session.id,
+                        self._model,
+                    )
+                    if context.bootstrap_ms:
+                        logger.info(
+                            "[%s] session_bootstrap %s",
+                            trace_id,
+                            " ".join(f"{stage}_ms={duration_ms:.1f}" for stage, duration_ms in context.bootstrap_ms.items()),
+                        )
+                    if context.profile_summary_stats is not None:
+                        stats = context.profile_summary_stats
+                        logger.info(
+                            "[%s] profile_summary_budget used_chars=%s budget_chars=%s est_tokens=%s truncated=%s cache_hit=%s",
+                            trace_id,
+                            stats.used_chars,
+                            stats.budget_chars,
+                            stats.estimated_tokens,
+                            ",".join(stats.truncated_fields) or "none",
+                            stats.cache_hit,
+                        )
 
-                await websocket.send_json({"type": "session_ready", "sessionId": context.session.id})
+                ready_event: dict[str, Any] = {"type": "session_ready", "sessionId": context.session.id}
+                if session_token is not None:
+                    ready_event["resumeToken"] = session_token
+                await channel.send_event(ready_event)
                 metrics.outgoing_text_events += 1
+                if metrics.ready_ms is None:
+                    metrics.ready_ms = (perf_counter() - metrics.started_at) * 1000
+                    metrics_registry.histogram("session_ready_ms").observe(metrics.ready_ms)
                 logger.info("[%s] tx_event type=session_ready session_id=%s", trace_id, context.session.id)
-                await websocket.send_json(context.profile_status_event)
+                if recovery_started_at is not None:
+                    recovery_ms = (perf_counter() - recovery_started_at) * 1000
+                    recovery_started_at = None
+                    metrics.recoveries += 1
+                    metrics_registry.histogram("live_recovery_ms", labels={"mode": recovery_mode}).observe(recovery_ms)
+                    logger.info("[%s] live_recovered mode=%s recovery_ms=%.1f", trace_id, recovery_mode, recovery_ms)
+                await channel.send_event(context.profile_status_event)
                 metrics.outgoing_text_events += 1
                 logger.info(
                     "[%s] tx_event type=profile_status loaded=%s source=%s",
@@ -161,41 +468,70 @@ class LiveBridge:
                     context.profile_status_event.get("source"),
                 )
 
-                run_config = self._build_run_config()
                 logger.info("[%s] ptt_mode mode=strict aad_disabled=true", trace_id)
 
-                live_events = context.runner.run_live(
-                    session=context.session,
-                    live_request_queue=context.live_request_queue,
-                    run_config=run_config,
-                )
+                link.attach(context.live_request_queue)
+                turn_state.prefetcher = context.prefetcher
+                turn_state.idempotency = context.idempotency
+                turn_state.session = context.session
 
                 send_task = asyncio.create_task(
-                    self._send_events_to_client(
-                        websocket,
-                        live_events,
+                    self._run_upstream(
+                        channel,
+                        context,
+                        link,
                         trace_id=trace_id,
                         metrics=metrics,
                         turn_state=turn_state,
-                    )
+                        session_recorder=session_recorder,
+                    ),
+                    name=session_task_name("live-send", trace_id),
                 )
-                recv_task = asyncio.create_task(
-                    self._recv_events_from_client(
-                        websocket,
-                        context.live_request_queue,
+                while True:
+                    recv_task = asyncio.create_task(
+                        self._recv_events_from_client(
+                            websocket,
+                            link,
+                            trace_id=trace_id,
+                            metrics=metrics,
+                            turn_state=turn_state,
+                            session_recorder=session_recorder,
+                            resumable=session_token is not None,
+                        ),
+                        name=session_task_name("live-recv", trace_id),
+                    )
+
+                    done, pending = await asyncio.wait(
+                        {send_task, recv_task},
+                        return_when=asyncio.FIRST_EXCEPTION,
+                    )
+                    if (
+                        session_token is None
+                        or send_task in done
+                        or not isinstance(recv_task.exception(), WebSocketDisconnect)
+                    ):
+                        break
+                    if reattachment is not None:
+                        reattachment.released.set()
+                    reattachment = await self._park_until_resumed(
+                        channel,
+                        send_task,
+                        session_token,
+                        user_id=user_id,
+                        session_id=context.session.id,
                         trace_id=trace_id,
                         metrics=metrics,
-                        turn_state=turn_state,
                     )
-                )
-
-                done, pending = await asyncio.wait(
-                    {send_task, recv_task},
-                    return_when=asyncio.FIRST_EXCEPTION,
-                )
+                    if reattachment is None:
+                        if send_task.done() and not send_task.cancelled() and send_task.exception() is not None:
+                            logger.info("[%s] upstream_ended_while_parked error=%s", trace_id, send_task.exception())
+                        break
+                    websocket = reattachment.websocket
 
                 for task in pending:
                     task.cancel()
+                if context.prefetcher is not None:
+                    context.prefetcher.cancel()
 
                 should_end_websocket = False
                 recoverable_api_error: genai_errors.APIError | None = None
@@ -216,8 +552,9 @@ class LiveBridge:
                     raise exc
 
                 if recoverable_api_error:
+                    recovery_started_at = perf_counter()
                     recovered = await self._recover_from_live_api_error(
-                        websocket=websocket,
+                        channel=channel,
                         context=context,
                         user_id=user_id,
                         trace_id=trace_id,
@@ -225,46 +562,129 @@ class LiveBridge:
                         turn_state=turn_state,
                         error=recoverable_api_error,
                     )
-                    context.live_request_queue.close()
+                    link.close()
                     if not recovered:
                         return
                     turn_state.active = False
                     turn_state.current_turn_audio_chunks = 0
                     turn_state.current_turn_started_at = None
+                    if await self._reattach_context(context):
+                        recovery_mode = "reattach"
+                    else:
+                        recovery_mode = "rebuild"
+                        self._record_tool_cache_stats(metrics, context.tool_cache)
+                        self._record_idempotency_stats(metrics, context.idempotency)
+                        context = None
                     continue
 
-                context.live_request_queue.close()
+                link.close()
                 if should_end_websocket:
                     return
         finally:
+            if reattachment is not None:
+                reattachment.released.set()
+            if context is not None:
+                self._record_tool_cache_stats(metrics, context.tool_cache)
+                self._record_idempotency_stats(metrics, context.idempotency)
+            if admission_ticket is not None:
+                self._admission.release(admission_ticket)  # type: ignore[union-attr]
+            coalescer = turn_state.transcripts
+            if coalescer is not None:
+                coalescer.close()
+                metrics.outgoing_text_events += coalescer.events_sent
+                logger.info(
+                    "[%s] transcript_summary fragments=%s events=%s resyncs=%s",
+                    trace_id,
+                    coalescer.fragments,
+                    coalescer.events_sent,
+                    coalescer.resyncs,
+                )
+            if session_recorder is not None:
+                session_recorder.close()
+                logger.info(
+                    "[%s] session_capture_closed path=%s records=%s bytes=%s",
+                    trace_id,
+                    session_recorder.path,
+                    session_recorder.records,
+                    session_recorder.bytes_written,
+                )
             elapsed_ms = int((perf_counter() - metrics.started_at) * 1000)
             logger.info(
-                "[%s] session_summary duration_ms=%s rx_audio_chunks=%s rx_audio_bytes=%s tx_audio_chunks=%s tx_audio_bytes=%s rx_text=%s tx_text=%s parse_errors=%s",
+                "[%s] session_summary duration_ms=%s ready_ms=%s rx_audio_chunks=%s rx_audio_bytes=%s upstream_audio_frames=%s tx_audio_chunks=%s tx_audio_bytes=%s tx_audio_pcm_bytes=%s audio_encoding=%s rx_text=%s tx_text=%s tx_event_bytes=%s protocol=%s event_cache_hits=%s parse_errors=%s emergency_alerts=%s tool_cache_hits=%s tool_cache_misses=%s tool_cache_invalidations=%s tool_prefetched=%s tool_prefetch_hits=%s tool_prefetch_hit_rate=%s upstream_suspensions=%s upstream_resumes=%s recoveries=%s resumes=%s tool_replays=%s ui_payloads_suppressed=%s context_compactions=%s context_events_compacted=%s context_peak_tokens=%s",
                 trace_id,
                 elapsed_ms,
+                f"{metrics.ready_ms:.1f}" if metrics.ready_ms is not None else "n/a",
                 metrics.incoming_audio_chunks,
                 metrics.incoming_audio_bytes,
+                metrics.upstream_audio_frames,
                 metrics.outgoing_audio_chunks,
                 metrics.outgoing_audio_bytes,
+                metrics.outgoing_audio_pcm_bytes,
+                turn_state.downlink_encoder.encoding,
                 metrics.incoming_text_events,
                 metrics.outgoing_text_events,
+                channel.event_bytes,
+                channel.protocol,
+                channel.cache_hits,
                 metrics.parse_errors,
+                metrics.emergency_alerts,
+                metrics.tool_cache_hits,
+                metrics.tool_cache_misses,
+                metrics.tool_cache_invalidations,
+                metrics.tool_cache_prefetched,
+                metrics.tool_cache_prefetch_hits,
+                (
+                    f"{metrics.tool_cache_prefetch_hits / metrics.tool_cache_prefetched:.2f}"
+                    if metrics.tool_cache_prefetched
+                    else "n/a"
+                ),
+                link.suspensions,
+                link.resumes,
+                metrics.recoveries,
+                metrics.resumes,
+                metrics.tool_replays,
+                metrics.ui_payloads_suppressed,
+                metrics.context_compactions,
+                metrics.context_events_compacted,
+                metrics.context_peak_tokens,
             )
+            for tool_name, tool_summary in tool_recorder.summary().items():
+                logger.info(
+                    "[%s] tool_summary name=%s calls=%s exceptions=%s avg_ms=%s max_ms=%s avg_bytes=%s max_bytes=%s outcomes=%s",
+                    trace_id,
+                    tool_name,
+                    tool_summary["calls"],
+                    tool_summary["exceptions"],
+                    tool_summary["avgMs"],
+                    tool_summary["maxMs"],
+                    tool_summary["avgBytes"],
+                    tool_summary["maxBytes"],
+                    tool_summary["outcomes"],
+                )
 
     async def _recv_events_from_client(
         self,
         websocket: WebSocket,
-        queue: LiveRequestQueue,
+        link: UpstreamLink,
         *,
         trace_id: str,
         metrics: SessionMetrics,
         turn_state: TurnState,
+        session_recorder: SessionRecorder | None = None,
+        resumable: bool = False,
     ) -> None:
         try:
             while True:
                 message = await websocket.receive()
+                if message.get("type") == "websocket.disconnect":
+                    # Starlette reports the drop as a message; the next receive() would raise RuntimeError instead.
+                    raise WebSocketDisconnect(message.get("code", 1000))
+                link.touch()
+                queue = link.queue
                 if "bytes" in message and message["bytes"] is not None:
                     raw_bytes = message["bytes"]
+                    if session_recorder is not None:
+                        session_recorder.record_inbound_audio(raw_bytes)
                     metrics.incoming_audio_chunks += 1
                     metrics.incoming_audio_bytes += len(raw_bytes)
                     logger.info(
@@ -275,20 +695,29 @@ class LiveBridge:
                     )
                     if turn_state.active:
                         turn_state.current_turn_audio_chunks += 1
-                    audio_blob = types.Blob(mime_type="audio/pcm;rate=16000", data=raw_bytes)
-                    queue.send_realtime(audio_blob)
-                    logger.info(
-                        "[%s] queue_send_realtime seq=%s bytes=%s",
-                        trace_id,
-                        metrics.incoming_audio_chunks,
-                        len(raw_bytes),
-                    )
+                    elif link.suspended:
+                        # Nothing is listening upstream until the next ptt_start resumes the link.
+                        continue
+                    if turn_state.uplink_resampler is not None:
+                        raw_bytes = self._resample(turn_state.uplink_resampler, raw_bytes, direction="uplink")
+                        if not raw_bytes:
+                            continue
+                    framer = turn_state.pcm_framer
+                    if framer is None or not turn_state.active:
+                        self._send_upstream_audio(queue, raw_bytes, trace_id=trace_id, metrics=metrics)
+                        continue
+                    for frame in framer.push(raw_bytes):
+                        # Requests still queued from earlier frames mean the upstream sender is falling behind.
+                        framer.observe_backlog(self._upstream_backlog(queue))
+                        self._send_upstream_audio(queue, frame, trace_id=trace_id, metrics=metrics)
                     continue
 
                 text_payload = message.get("text")
                 if not text_payload:
                     logger.info("[%s] rx_non_text_non_binary_message keys=%s", trace_id, list(message.keys()))
                     continue
+                if session_recorder is not None:
+                    session_recorder.record_inbound_text(text_payload)
 
                 try:
                     data = json.loads(text_payload)
@@ -311,17 +740,66 @@ class LiveBridge:
                     data,
                 )
 
+                if event_type == "hello":
+                    # Only what the hello names changes; anything else keeps its query-param or earlier value.
+                    if "audioEncodings" in data or "audioEncoding" in data:
+                        requested = data.get("audioEncodings") or data.get("audioEncoding")
+                        if isinstance(requested, list):
+                            requested = ",".join(str(item) for item in requested)
+                        encoding = negotiate_audio_encoding(
+                            requested if isinstance(requested, str) else None,
+                            allowed=self._audio_encodings,
+                        )
+                        if encoding != turn_state.downlink_encoder.encoding:
+                            turn_state.downlink_encoder = create_audio_encoder(encoding)
+                        logger.info(
+                            "[%s] audio_encoding_negotiated requested=%r encoding=%s", trace_id, requested, encoding
+                        )
+                    if "inputSampleRate" in data or "outputSampleRate" in data:
+                        self._apply_client_sample_rates(
+                            turn_state,
+                            input_sample_rate=(
+                                parse_client_sample_rate(data.get("inputSampleRate"))
+                                if "inputSampleRate" in data
+                                else turn_state.client_input_sample_rate
+                            ),
+                            output_sample_rate=(
+                                parse_client_sample_rate(data.get("outputSampleRate"))
+                                if "outputSampleRate" in data
+                                else turn_state.client_output_sample_rate
+                            ),
+                            trace_id=trace_id,
+                        )
+                    continue
+
+                if event_type in {"ptt_start", "text_input"}:
+                    # Before resume, so a suspended stream reconnects with the compacted history.
+                    await self._compact_session_context(
+                        turn_state,
+                        trace_id=trace_id,
+                        metrics=metrics,
+                        trigger=event_type,
+                    )
+                    self._apply_response_mode(link, turn_state, trace_id=trace_id)
+                    link.resume(event_type)
+                    queue = link.queue
+
                 if event_type == "text_input":
                     text = str(data.get("text", "")).strip()
                     if not text:
                         logger.info("[%s] rx_text_input_ignored reason=empty_text", trace_id)
                         continue
 
+                    if turn_state.idempotency is not None:
+                        turn_state.idempotency.begin_turn(f"text-{metrics.incoming_text_events}")
                     content = types.Content(role="user", parts=[types.Part(text=text)])
                     queue.send_content(content)
                     logger.info("[%s] queue_send_content chars=%s", trace_id, len(text))
                     continue
 
+                if event_type in {"ptt_end", "end_turn"} and turn_state.active:
+                    self._flush_uplink_audio(queue, turn_state, trace_id=trace_id, metrics=metrics)
+
                 handled, next_active, action = self._route_control_event(
                     event_type=event_type,
                     queue=queue,
@@ -335,10 +813,20 @@ class LiveBridge:
                 logger.info("[%s] control_event_handled type=%s action=%s", trace_id, event_type, action)
 
                 if action == "start":
+                    if turn_state.prefetcher is not None:
+                        # Warm the reads this turn will probably need while the patient is still talking.
+                        turn_state.prefetcher.start(trace_id)
                     turn_state.turn_id += 1
+                    if turn_state.idempotency is not None:
+                        turn_state.idempotency.begin_turn(str(turn_state.turn_id))
                     turn_state.current_turn_audio_chunks = 0
                     turn_state.current_turn_started_at = perf_counter()
                     turn_state.current_turn_transcript = ""
+                    turn_state.emergency_scanner.reset()
+                    if turn_state.pcm_framer is not None:
+                        turn_state.pcm_framer.reset()
+                    if turn_state.uplink_resampler is not None:
+                        turn_state.uplink_resampler.reset()
                     logger.info("[%s] turn_open turn_id=%s", trace_id, turn_state.turn_id)
                     continue
 
@@ -362,6 +850,7 @@ class LiveBridge:
                         )
                     turn_state.last_closed_turn_transcript = turn_state.current_turn_transcript.strip()
                     turn_state.awaiting_response_turn_id = turn_state.turn_id
+                    turn_state.response_wait_started_at = perf_counter()
                     turn_state.current_turn_transcript = ""
                     turn_state.current_turn_audio_chunks = 0
                     turn_state.current_turn_started_at = None
@@ -372,34 +861,193 @@ class LiveBridge:
                     continue
 
                 if action == "stop":
+                    link.close()
                     break
         except WebSocketDisconnect:
-            logger.info("[%s] recv_websocket_disconnected closing_queue", trace_id)
-            queue.close()
+            if resumable:
+                # Keep the live stream open; the session may be resumed on another websocket.
+                logger.info("[%s] recv_websocket_disconnected keeping_upstream=true", trace_id)
+            else:
+                logger.info("[%s] recv_websocket_disconnected closing_queue", trace_id)
+                link.close()
             raise
 
+    async def _park_until_resumed(
+        self,
+        channel: OutboundChannel,
+        send_task: asyncio.Task[None],
+        session_token: str,
+        *,
+        user_id: str,
+        session_id: str,
+        trace_id: str,
+        metrics: SessionMetrics,
+    ) -> Reattachment | None:
+        """Keeps the session and its live stream alive after the client dropped, until it resumes or the grace ends.
+
+        Outbound frames keep being buffered while parked. On resume the frames
+        after the client's ``last_seq`` are replayed, followed by
+        ``session_resumed``. None when the grace period ran out or the live
+        stream ended meanwhile.
+        """
+        session_resume = self._session_resume
+        assert session_resume is not None
+        while True:
+            channel.detach()
+            logger.info("[%s] session_parked grace_s=%.1f seq=%s", trace_id, session_resume.grace_s, channel.seq)
+            wait_task = asyncio.create_task(
+                session_resume.wait(session_token, user_id=user_id, trace_id=trace_id),
+                name=session_task_name("resume-wait", trace_id),
+            )
+            await asyncio.wait({wait_task, send_task}, return_when=asyncio.FIRST_COMPLETED)
+            if not wait_task.done():
+                wait_task.cancel()
+                await asyncio.gather(wait_task, return_exceptions=True)
+                logger.info("[%s] session_resume_abandoned reason=upstream_ended", trace_id)
+                return None
+            reattachment = wait_task.result()
+            if reattachment is None:
+                logger.info("[%s] session_resume_expired seq=%s", trace_id, channel.seq)
+                return None
+            try:
+                replayed, missed = await channel.attach(reattachment.websocket, reattachment.last_seq)
+                resumed_event = {
+                    "type": "session_resumed",
+                    "sessionId": session_id,
+                    "seq": channel.seq + 1,
+                    "lastSeq": reattachment.last_seq,
+                    "replayed": replayed,
+                    "missed": missed,
+                }
+                await channel.send_event(resumed_event)
+            except Exception as exc:  # noqa: BLE001
+                logger.info("[%s] session_resume_replay_failed error=%s", trace_id, exc)
+                reattachment.released.set()
+                continue
+            if not channel.attached:
+                # The new websocket failed while sending; it is already closing.
+                reattachment.released.set()
+                continue
+            metrics.resumes += 1
+            metrics.outgoing_text_events += 1
+            logger.info(
+                "[%s] session_resumed last_seq=%s replayed=%s missed=%s seq=%s",
+                trace_id,
+                reattachment.last_seq,
+                replayed,
+                missed,
+                channel.seq,
+            )
+            return reattachment
+
+    async def _run_upstream(
+        self,
+        channel: OutboundChannel,
+        context: LiveSessionContext,
+        link: UpstreamLink,
+        *,
+        trace_id: str,
+        metrics: SessionMetrics,
+        turn_state: TurnState,
+        session_recorder: SessionRecorder | None = None,
+    ) -> None:
+        """Streams live events to the client, suspending the model connection while the patient is idle.
+
+        Each new ``run_live`` uses the session's current response modality, so
+        an overload switch takes effect from the turn that triggered it. A
+        stream is followed by another one whenever the link moved to a new
+        queue meanwhile, including a resume that lands while the suspended
+        stream is still closing.
+        """
+        announced_text_only = False
+        while True:
+            text_only = turn_state.text_only
+            if text_only != announced_text_only:
+                announced_text_only = text_only
+                governor = self._overload_governor
+                await channel.send_event(
+                    {
+                        "type": "response_mode",
+                        "mode": "text" if text_only else "audio",
+                        "reason": (governor.reason if governor is not None else None) or "recovered",
+                    }
+                )
+                metrics.outgoing_text_events += 1
+                logger.info("[%s] tx_event type=response_mode text_only=%s", trace_id, text_only)
+            stream_queue = link.queue
+            live_events = context.runner.run_live(
+                session=context.session,
+                live_request_queue=stream_queue,
+                run_config=self._build_run_config(
+                    text_only=text_only,
+                    compression_trigger_tokens=self._live_compression_trigger_tokens,
+                ),
+            )
+            idle_task: asyncio.Task[None] | None = None
+            if link.idle_timeout_s > 0:
+                idle_task = asyncio.create_task(
+                    link.suspend_when_idle(
+                        lambda: turn_state.active or turn_state.awaiting_response_turn_id is not None
+                    ),
+                    name=session_task_name("upstream-idle", trace_id),
+                )
+            try:
+                await self._send_events_to_client(
+                    channel,
+                    live_events,
+                    trace_id=trace_id,
+                    metrics=metrics,
+                    turn_state=turn_state,
+                    session_recorder=session_recorder,
+                )
+            finally:
+                if idle_task is not None:
+                    idle_task.cancel()
+            link.take_reconnect()
+            if link.closed:
+                return
+            if link.queue is not stream_queue:
+                # Reconnected, or resumed before the suspended stream had finished closing.
+                continue
+            if not link.suspended:
+                # The stream ended on its own while its queue was still open.
+                return
+            await link.wait_for_resume()
+            if link.closed:
+                return
+
     async def _send_events_to_client(
         self,
-        websocket: WebSocket,
+        channel: OutboundChannel,
         live_events: AsyncIterator[Any],
         *,
         trace_id: str,
         metrics: SessionMetrics,
         turn_state: TurnState,
+        session_recorder: SessionRecorder | None = None,
     ) -> None:
         announced_sample_rate: int | None = None
+        announced_encoding: str | None = None
         async for event in live_events:
+            if session_recorder is not None:
+                session_recorder.record_upstream_event(event)
             logger.info("[%s] live_event_received event_type=%s", trace_id, type(event).__name__)
 
             if getattr(event, "interrupted", None):
-                await websocket.send_json({"type": "assistant_interrupted"})
+                if turn_state.transcripts is not None:
+                    await turn_state.transcripts.end_turn()
+                if turn_state.downlink_resampler is not None:
+                    turn_state.downlink_resampler.reset()
+                await channel.send_event({"type": "assistant_interrupted"})
                 metrics.outgoing_text_events += 1
                 logger.info("[%s] tx_event type=assistant_interrupted", trace_id)
 
             for function_response in self._get_function_responses(event):
                 payload = self._extract_ui_payload_from_function_response(function_response)
+                if payload and self._is_replayed_payload(turn_state.idempotency, payload, trace_id=trace_id):
+                    continue
                 if payload:
-                    await websocket.send_json(payload)
+                    await channel.send_event(payload)
                     metrics.outgoing_text_events += 1
                     logger.info("[%s] tx_event type=%s payload=%s", trace_id, payload.get("type"), payload)
 
@@ -410,12 +1058,26 @@ class LiveBridge:
                     trace_id=trace_id,
                     source="assistant_text_output_transcription",
                 )
-                await websocket.send_json({"type": "assistant_text", "text": output_t.text})
-                metrics.outgoing_text_events += 1
-                logger.info("[%s] tx_event type=assistant_text source=output_transcription text=%r", trace_id, output_t.text)
+                if turn_state.transcripts is not None:
+                    await turn_state.transcripts.add(OUTPUT_STREAM, str(output_t.text))
+                else:
+                    await channel.send_event({"type": "assistant_text", "text": output_t.text})
+                    metrics.outgoing_text_events += 1
+                    logger.info(
+                        "[%s] tx_event type=assistant_text source=output_transcription text=%r",
+                        trace_id,
+                        output_t.text,
+                    )
 
             input_t = getattr(event, "input_transcription", None)
             if input_t and getattr(input_t, "text", None):
+                await self._send_emergency_guidance_if_matched(
+                    channel,
+                    str(input_t.text),
+                    trace_id=trace_id,
+                    metrics=metrics,
+                    turn_state=turn_state,
+                )
                 normalized_input_t = str(input_t.text).strip()
                 if normalized_input_t:
                     turn_state.last_input_transcript = self._merge_partial_transcript(
@@ -432,9 +1094,15 @@ class LiveBridge:
                             turn_state.last_closed_turn_transcript,
                             normalized_input_t,
                         )
-                await websocket.send_json({"type": "partial_transcript", "text": input_t.text})
-                metrics.outgoing_text_events += 1
-                logger.info("[%s] tx_event type=partial_transcript text=%r", trace_id, input_t.text)
+                if turn_state.transcripts is not None:
+                    await turn_state.transcripts.add(INPUT_STREAM, str(input_t.text))
+                else:
+                    await channel.send_event({"type": "partial_transcript", "text": input_t.text})
+                    metrics.outgoing_text_events += 1
+                    logger.info("[%s] tx_event type=partial_transcript text=%r", trace_id, input_t.text)
+
+            if getattr(event, "turn_complete", None) and turn_state.transcripts is not None:
+                await turn_state.transcripts.end_turn()
 
             content = getattr(event, "content", None)
             if not content:
@@ -447,40 +1115,101 @@ class LiveBridge:
                         trace_id=trace_id,
                         source="assistant_text_content_part",
                     )
-                    await websocket.send_json({"type": "assistant_text", "text": part.text})
+                    await channel.send_event({"type": "assistant_text", "text": part.text})
                     metrics.outgoing_text_events += 1
                     logger.info("[%s] tx_event type=assistant_text source=content_part text=%r", trace_id, part.text)
                 inline_data = getattr(part, "inline_data", None)
                 if inline_data and getattr(inline_data, "data", None):
-                    sample_rate = self._extract_sample_rate(getattr(inline_data, "mime_type", None))
-                    if sample_rate and sample_rate != announced_sample_rate:
+                    model_sample_rate = self._extract_sample_rate(getattr(inline_data, "mime_type", None))
+                    resampler = self._downlink_resampler_for(turn_state, model_sample_rate)
+                    sample_rate = resampler.output_rate if resampler is not None else model_sample_rate
+                    encoder = turn_state.downlink_encoder
+                    if sample_rate and (sample_rate, encoder.encoding) != (announced_sample_rate, announced_encoding):
                         announced_sample_rate = sample_rate
-                        await websocket.send_json({"type": "assistant_audio_format", "sampleRate": sample_rate})
+                        announced_encoding = encoder.encoding
+                        await channel.send_event(
+                            {
+                                "type": "assistant_audio_format",
+                                "sampleRate": sample_rate,
+                                "encoding": encoder.encoding,
+                            }
+                        )
                         metrics.outgoing_text_events += 1
-                        logger.info("[%s] tx_event type=assistant_audio_format sample_rate=%s", trace_id, sample_rate)
+                        logger.info(
+                            "[%s] tx_event type=assistant_audio_format sample_rate=%s encoding=%s",
+                            trace_id,
+                            sample_rate,
+                            encoder.encoding,
+                        )
                     payload = inline_data.data
                     payload_bytes = base64.b64decode(payload) if isinstance(payload, str) else payload
+                    if resampler is not None:
+                        payload_bytes = self._resample(resampler, payload_bytes, direction="downlink")
+                        if not payload_bytes:
+                            continue
 
                     self._mark_turn_response_started_if_needed(
                         turn_state=turn_state,
                         trace_id=trace_id,
                         source="assistant_audio_chunk",
                     )
+                    wire_bytes = payload_bytes
+                    if encoder.encoding != PCM16:
+                        encode_started_ns = perf_counter_ns()
+                        wire_bytes = encoder.encode(payload_bytes)
+                        metrics_registry.histogram(
+                            "audio_encode_us",
+                            labels={"encoding": encoder.encoding},
+                            buckets=(10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0, 10000.0),
+                        ).observe((perf_counter_ns() - encode_started_ns) / 1000)
+                    if turn_state.upstream_link is not None and sample_rate:
+                        turn_state.upstream_link.note_playback(len(payload_bytes) / (2 * sample_rate))
                     metrics.outgoing_audio_chunks += 1
-                    metrics.outgoing_audio_bytes += len(payload_bytes)
-                    await websocket.send_bytes(payload_bytes)
+                    metrics.outgoing_audio_pcm_bytes += len(payload_bytes)
+                    metrics.outgoing_audio_bytes += len(wire_bytes)
+                    await channel.send_audio(wire_bytes)
                     logger.info(
-                        "[%s] tx_audio_chunk seq=%s bytes=%s announced_sample_rate=%s",
+                        "[%s] tx_audio_chunk seq=%s bytes=%s pcm_bytes=%s announced_sample_rate=%s",
                         trace_id,
                         metrics.outgoing_audio_chunks,
+                        len(wire_bytes),
                         len(payload_bytes),
                         announced_sample_rate,
                     )
 
+    async def _send_emergency_guidance_if_matched(
+        self,
+        channel: OutboundChannel,
+        transcript_fragment: str,
+        *,
+        trace_id: str,
+        metrics: SessionMetrics,
+        turn_state: TurnState,
+    ) -> None:
+        started_ns = perf_counter_ns()
+        matches = turn_state.emergency_scanner.feed_fragment(transcript_fragment)
+        match_us = (perf_counter_ns() - started_ns) / 1000
+        metrics_registry.histogram(
+            "emergency_match_us",
+            buckets=(1.0, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 1000.0),
+        ).observe(match_us)
+        for match in matches:
+            await channel.send_rendered_event(PRERENDERED_EMERGENCY_EVENTS[match.category])
+            metrics.outgoing_text_events += 1
+            metrics.emergency_alerts += 1
+            logger.warning(
+                "[%s] tx_event type=emergency_guidance category=%s phrase=%r turn_id=%s match_us=%.1f",
+                trace_id,
+                match.category,
+                match.phrase,
+                turn_state.turn_id,
+                match_us,
+            )
+
     async def _recover_from_live_api_error(
         self,
         *,
-        websocket: WebSocket,
+        channel: OutboundChannel,
         context: LiveSessionContext,
         user_id: str,
         trace_id: str,
@@ -493,7 +1222,7 @@ class LiveBridge:
         fallback_text = self._select_fallback_text(turn_state)
         current_turn_id = turn_state.turn_id
         if turn_state.fallback_attempted_turn_id == current_turn_id:
-            await websocket.send_json(
+            await channel.send_event(
                 {
                     "type": "warning",
                     "message": "Live session failed again while recovering. Please restart the session.",
@@ -503,7 +1232,7 @@ class LiveBridge:
             return False
 
         turn_state.fallback_attempted_turn_id = current_turn_id
-        await websocket.send_json(
+        await channel.send_event(
             {
                 "type": "warning",
                 "message": (
@@ -513,7 +1242,7 @@ class LiveBridge:
             }
         )
         metrics.outgoing_text_events += 1
-        await websocket.send_json(
+        await channel.send_event(
             {
                 "type": "fallback_started",
                 "reason": "live_tool_unsupported",
@@ -523,16 +1252,17 @@ class LiveBridge:
         metrics.outgoing_text_events += 1
 
         fallback_ok = await self._execute_text_fallback_turn(
-            websocket=websocket,
+            channel=channel,
             runner=context.runner,
             session_id=context.session.id,
             user_id=user_id,
             trace_id=trace_id,
             metrics=metrics,
             fallback_text=fallback_text,
+            idempotency=context.idempotency,
         )
 
-        await websocket.send_json(
+        await channel.send_event(
             {
                 "type": "fallback_completed",
                 "turnId": str(current_turn_id),
@@ -540,14 +1270,14 @@ class LiveBridge:
             }
         )
         metrics.outgoing_text_events += 1
-        await websocket.send_json({"type": "session_recovering", "mode": "reconnect_live"})
+        await channel.send_event({"type": "session_recovering", "mode": "reconnect_live"})
         metrics.outgoing_text_events += 1
 
         turn_state.awaiting_response_turn_id = None
         turn_state.current_turn_transcript = ""
         turn_state.last_closed_turn_transcript = ""
         if not fallback_ok:
-            await websocket.send_json(
+            await channel.send_event(
                 {
                     "type": "warning",
                     "message": "Automatic recovery could not replay the failed turn. Please repeat your request.",
@@ -556,16 +1286,71 @@ class LiveBridge:
             metrics.outgoing_text_events += 1
         return True
 
+    async def _compact_session_context(
+        self,
+        turn_state: TurnState,
+        *,
+        trace_id: str,
+        metrics: SessionMetrics,
+        trigger: str,
+    ) -> None:
+        """Reports the session history's size at a turn boundary and compacts it when it is over budget."""
+        session = turn_state.session
+        if getattr(session, "events", None) is None:
+            # Replayed recordings run without an ADK session.
+            return
+        report = await self._context_compactor.compact(session, self._session_service)
+        metrics.context_peak_tokens = max(metrics.context_peak_tokens, report.tokens_before)
+        if report.compacted:
+            metrics.context_compactions += 1
+            metrics.context_events_compacted += report.compacted_events
+            logger.info(
+                "[%s] context_compacted trigger=%s dropped_events=%s tokens_before=%s tokens_after=%s",
+                trace_id,
+                trigger,
+                report.compacted_events,
+                report.tokens_before,
+                report.estimated_tokens,
+            )
+        logger.info(
+            "[%s] context_size trigger=%s last_turn_id=%s events=%s est_tokens=%s budget_tokens=%s",
+            trace_id,
+            trigger,
+            turn_state.turn_id,
+            report.events,
+            report.estimated_tokens,
+            self._context_compactor.budget_tokens,
+        )
+
+    async def _reattach_context(self, context: LiveSessionContext) -> bool:
+        """Points a context at a fresh live request queue after a live error, keeping its session and tools.
+
+        The ADK session is re-read so the next live stream sees the fallback
+        turn; the runner, booking state, tool cache and profile stay as they
+        are. False when the session is gone and a full rebuild is needed.
+        """
+        session = await context.runner.session_service.get_session(
+            app_name=self._app_name,
+            user_id=context.session.user_id,
+            session_id=context.session.id,
+        )
+        if session is None:
+            return False
+        context.session = session
+        context.live_request_queue = LiveRequestQueue()
+        return True
+
     async def _execute_text_fallback_turn(
         self,
         *,
-        websocket: WebSocket,
+        channel: OutboundChannel,
         runner: Runner,
         session_id: str,
         user_id: str,
         trace_id: str,
         metrics: SessionMetrics,
         fallback_text: str,
+        idempotency: ToolIdempotencyLedger | None = None,
     ) -> bool:
         normalized = fallback_text.strip()
         if not normalized:
@@ -583,9 +1368,9 @@ class LiveBridge:
             ):
                 for function_response in self._get_function_responses(event):
                     payload = self._extract_ui_payload_from_function_response(function_response)
-                    if not payload:
+                    if not payload or self._is_replayed_payload(idempotency, payload, trace_id=trace_id):
                         continue
-                    await websocket.send_json(payload)
+                    await channel.send_event(payload)
                     metrics.outgoing_text_events += 1
                     logger.info(
                         "[%s] fallback_tool_payload_emitted type=%s",
@@ -595,7 +1380,7 @@ class LiveBridge:
 
                 output_t = getattr(event, "output_transcription", None)
                 if output_t and getattr(output_t, "text", None):
-                    await websocket.send_json({"type": "assistant_text", "text": output_t.text})
+                    await channel.send_event({"type": "assistant_text", "text": output_t.text})
                     metrics.outgoing_text_events += 1
 
                 event_content = getattr(event, "content", None)
@@ -603,7 +1388,7 @@ class LiveBridge:
                     continue
                 for part in getattr(event_content, "parts", []) or []:
                     if getattr(part, "text", None):
-                        await websocket.send_json({"type": "assistant_text", "text": part.text})
+                        await channel.send_event({"type": "assistant_text", "text": part.text})
                         metrics.outgoing_text_events += 1
             logger.info("[%s] fallback_run_async_completed status=ok", trace_id)
             return True
@@ -611,6 +1396,188 @@ class LiveBridge:
             logger.exception("[%s] fallback_run_async_failed", trace_id, exc_info=exc)
             return False
 
+    @staticmethod
+    def _open_session_recorder(
+        capture_dir: Path,
+        *,
+        trace_id: str,
+        user_id: str,
+        timezone_name: str | None,
+    ) -> SessionRecorder | None:
+        """Starts this session's capture; a capture directory that cannot be written only costs the recording."""
+        recorder: SessionRecorder | None = None
+        try:
+            recorder = SessionRecorder.open(capture_dir, trace_id)
+            recorder.record_session_start(user_id=user_id, timezone_name=timezone_name)
+        except OSError as exc:
+            if recorder is not None:
+                recorder.close()
+            logger.warning("[%s] session_capture_failed dir=%s error=%s", trace_id, capture_dir, exc)
+            return None
+        logger.info("[%s] session_capture_started path=%s", trace_id, recorder.path)
+        return recorder
+
+    def _build_pcm_framer(self) -> PcmFramer | None:
+        if self._uplink_frame_ms <= 0:
+            return None
+        return PcmFramer(
+            frame_ms=self._uplink_frame_ms,
+            min_frame_ms=min(50, self._uplink_frame_ms),
+            max_frame_ms=self._uplink_max_frame_ms,
+            first_frame_ms=50,
+        )
+
+    @staticmethod
+    def _apply_client_sample_rates(
+        turn_state: TurnState,
+        *,
+        input_sample_rate: int | None,
+        output_sample_rate: int | None,
+        trace_id: str,
+    ) -> None:
+        # A resampler is only rebuilt when its rate changes, so an unchanged stream keeps its filter history.
+        if input_sample_rate != turn_state.client_input_sample_rate:
+            turn_state.client_input_sample_rate = input_sample_rate
+            turn_state.uplink_resampler = None
+            if input_sample_rate and input_sample_rate != UPLINK_SAMPLE_RATE:
+                turn_state.uplink_resampler = StreamingResampler(input_sample_rate, UPLINK_SAMPLE_RATE)
+        if output_sample_rate != turn_state.client_output_sample_rate:
+            turn_state.client_output_sample_rate = output_sample_rate
+            turn_state.downlink_resampler = None
+        logger.info(
+            "[%s] client_sample_rates input=%s output=%s uplink_resampling=%s",
+            trace_id,
+            input_sample_rate or UPLINK_SAMPLE_RATE,
+            output_sample_rate or "model",
+            turn_state.uplink_resampler is not None,
+        )
+
+    @staticmethod
+    def _downlink_resampler_for(turn_state: TurnState, model_sample_rate: int | None) -> StreamingResampler | None:
+        target = turn_state.client_output_sample_rate
+        if not target or not model_sample_rate or target == model_sample_rate:
+            return None
+        resampler = turn_state.downlink_resampler
+        if resampler is None or resampler.input_rate != model_sample_rate:
+            resampler = StreamingResampler(model_sample_rate, target)
+            turn_state.downlink_resampler = resampler
+        return resampler
+
+    @staticmethod
+    def _resample(resampler: StreamingResampler, data: bytes, *, direction: str) -> bytes:
+        started_ns = perf_counter_ns()
+        resampled = resampler.process(data)
+        metrics_registry.histogram(
+            "audio_resample_us",
+            labels={"direction": direction},
+            buckets=(10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0, 10000.0),
+        ).observe((perf_counter_ns() - started_ns) / 1000)
+        return resampled
+
+    def _flush_uplink_audio(
+        self,
+        queue: LiveRequestQueue,
+        turn_state: TurnState,
+        *,
+        trace_id: str,
+        metrics: SessionMetrics,
+    ) -> None:
+        """Sends the audio still held by the resampler and framer so the end of the turn reaches the model."""
+        frames: list[bytes] = []
+        if turn_state.uplink_resampler is not None:
+            resampled_tail = turn_state.uplink_resampler.flush()
+            if resampled_tail:
+                if turn_state.pcm_framer is None:
+                    frames.append(resampled_tail)
+                else:
+                    frames.extend(turn_state.pcm_framer.push(resampled_tail))
+        if turn_state.pcm_framer is not None:
+            framed_tail = turn_state.pcm_framer.flush()
+            if framed_tail is not None:
+                frames.append(framed_tail)
+        for frame in frames:
+            self._send_upstream_audio(queue, frame, trace_id=trace_id, metrics=metrics)
+
+    def _build_runner(self, agent: Any) -> Runner:
+        if self._fake_live_model is not None:
+            return FakeLiveRunner(  # type: ignore[return-value]
+                app_name=self._app_name,
+                agent=agent,
+                session_service=self._session_service,
+                config=self._fake_live_model,
+            )
+        return Runner(
+            app_name=self._app_name,
+            agent=agent,
+            session_service=self._session_service,
+        )
+
+    async def _admit(
+        self,
+        websocket: WebSocket,
+        user_id: str,
+        protocol: str | None,
+        *,
+        trace_id: str,
+        accepted: bool = False,
+    ) -> tuple[AdmissionTicket | None, bool]:
+        """Admission ticket (None when the session was turned away) and whether the websocket was accepted here.
+
+        A session admitted straight away is accepted by the caller as usual; one
+        that has to queue or is rejected is accepted first so it can be told why.
+        """
+        admission = self._admission
+        assert admission is not None
+        rejection: AdmissionRejected | None = None
+        try:
+            ticket = admission.try_admit(user_id)
+        except AdmissionRejected as exc:
+            rejection = exc
+        else:
+            if ticket is not None:
+                return ticket, False
+
+        if not accepted:
+            await websocket.accept()
+        channel = OutboundChannel(websocket, negotiate_wire_protocol(protocol))
+        if rejection is None:
+
+            async def _report_position(position: int) -> None:
+                logger.info("[%s] admission_queued position=%s active=%s", trace_id, position, admission.active)
+                await channel.send_event({"type": "session_queued", "position": position})
+
+            try:
+                ticket = await admission.admit(user_id, on_queued=_report_position)
+            except AdmissionRejected as exc:
+                rejection = exc
+            except (WebSocketDisconnect, RuntimeError) as exc:
+                logger.info("[%s] admission_abandoned error=%s", trace_id, exc)
+                return None, True
+            else:
+                logger.info(
+                    "[%s] admission_granted waited_ms=%.1f queued_at_position=%s",
+                    trace_id,
+                    ticket.waited_ms,
+                    ticket.queued_at_position,
+                )
+                return ticket, True
+
+        logger.info("[%s] admission_rejected reason=%s", trace_id, rejection.reason)
+        try:
+            await channel.send_event({"type": "session_rejected", "reason": rejection.reason, "message": rejection.message})
+            await websocket.close(code=WS_TRY_AGAIN_LATER)
+        except (WebSocketDisconnect, RuntimeError) as exc:
+            logger.info("[%s] admission_reject_send_failed error=%s", trace_id, exc)
+        return None, True
+
+    def _build_agent_runner(self, tools: list[Any], profile_summary: str | None) -> Runner:
+        agent = create_agent(
+            self._model,
+            tools=tools,
+            profile_summary=profile_summary,
+        )
+        return self._build_runner(agent)
+
     def _load_profile_context(self, user_id: str) -> ProfileContextResult:
         if self._patient_profile_service is None:
             return ProfileContextResult(
@@ -627,6 +1594,39 @@ class LiveBridge:
             )
         return self._patient_profile_service.load_profile_context(user_id)
 
+    @staticmethod
+    def _send_upstream_audio(
+        queue: LiveRequestQueue,
+        data: bytes,
+        *,
+        trace_id: str,
+        metrics: SessionMetrics,
+    ) -> None:
+        queue.send_realtime(types.Blob(mime_type=f"audio/pcm;rate={UPLINK_SAMPLE_RATE}", data=data))
+        metrics.upstream_audio_frames += 1
+        logger.info(
+            "[%s] queue_send_realtime seq=%s bytes=%s",
+            trace_id,
+            metrics.upstream_audio_frames,
+            len(data),
+        )
+
+    @staticmethod
+    def _upstream_backlog(queue: LiveRequestQueue) -> int:
+        pending = getattr(queue, "_queue", None)
+        return pending.qsize() if isinstance(pending, asyncio.Queue) else 0
+
+    @staticmethod
+    def _record_tool_cache_stats(metrics: SessionMetrics, tool_cache: SessionToolCache) -> None:
+        stats = tool_cache.stats()
+        metrics.tool_cache_hits += stats.hits
+        metrics.tool_cache_misses += stats.misses
+        metrics.tool_cache_invalidations += stats.invalidations
+        metrics.tool_cache_prefetched += stats.prefetched
+        metrics.tool_cache_prefetch_hits += stats.prefetch_hits
+        metrics_registry.increment("tool_prefetch_total", stats.prefetched)
+        metrics_registry.increment("tool_prefetch_hits_total", stats.prefetch_hits)
+
     @staticmethod
     def _get_function_responses(event: Any) -> list[Any]:
         getter = getattr(event, "get_function_responses", None)
@@ -656,6 +1656,24 @@ class LiveBridge:
             return True, False, "stop"
         return False, ptt_active, "ignored"
 
+    @staticmethod
+    def _record_idempotency_stats(metrics: SessionMetrics, ledger: ToolIdempotencyLedger) -> None:
+        metrics.tool_replays += ledger.replays
+        metrics.ui_payloads_suppressed += ledger.suppressed_payloads
+
+    @staticmethod
+    def _is_replayed_payload(
+        ledger: ToolIdempotencyLedger | None,
+        payload: dict[str, Any],
+        *,
+        trace_id: str,
+    ) -> bool:
+        """True for the UI payload of a tool call the ledger answered from a previous run of the same turn."""
+        if ledger is None or not ledger.should_suppress(payload):
+            return False
+        logger.info("[%s] tx_event_suppressed type=%s reason=replayed_tool_call", trace_id, payload.get("type"))
+        return True
+
     @staticmethod
     def _extract_ui_payload_from_function_response(function_response: Any) -> dict[str, Any] | None:
         raw_response = getattr(function_response, "response", None)
@@ -686,8 +1704,8 @@ class LiveBridge:
                     return int(value)
         return None
 
-    @staticmethod
     def _mark_turn_response_started_if_needed(
+        self,
         *,
         turn_state: TurnState,
         trace_id: str,
@@ -695,14 +1713,49 @@ class LiveBridge:
     ) -> None:
         if turn_state.awaiting_response_turn_id is None:
             return
+        latency_ms: float | None = None
+        if turn_state.response_wait_started_at is not None:
+            latency_ms = (perf_counter() - turn_state.response_wait_started_at) * 1000
+            turn_state.response_wait_started_at = None
+            metrics_registry.histogram(
+                "turn_response_ms",
+                labels={"mode": "text" if turn_state.text_only else "audio"},
+            ).observe(latency_ms)
+            if self._overload_governor is not None:
+                self._overload_governor.observe_response_latency(latency_ms)
         logger.info(
-            "[%s] turn_response_started turn_id=%s source=%s",
+            "[%s] turn_response_started turn_id=%s source=%s latency_ms=%s",
             trace_id,
             turn_state.awaiting_response_turn_id,
             source,
+            f"{latency_ms:.1f}" if latency_ms is not None else "n/a",
         )
         turn_state.awaiting_response_turn_id = None
 
+    def _apply_response_mode(self, link: UpstreamLink, turn_state: TurnState, *, trace_id: str) -> None:
+        """Switches the live stream between audio and text replies at a turn boundary when the governor says so.
+
+        Native-audio Live models reject the TEXT modality, so with one of those
+        sessions stay on audio whatever the governor says.
+        """
+        governor = self._overload_governor
+        if governor is None or not self._text_replies_supported or governor.degraded == turn_state.text_only:
+            return
+        if turn_state.active or turn_state.awaiting_response_turn_id is not None:
+            # A reply is still streaming on the current connection; switch on the next turn instead.
+            return
+        if not governor.claim_mode_switch():
+            logger.info("[%s] response_mode_switch_deferred mode=%s reason=switch_rate", trace_id, governor.mode)
+            return
+        turn_state.text_only = governor.degraded
+        logger.info(
+            "[%s] response_mode_switch mode=%s reason=%s",
+            trace_id,
+            governor.mode,
+            governor.reason or "recovered",
+        )
+        link.reconnect("response_mode")
+
     @staticmethod
     def _build_text_fallback_run_config() -> RunConfig:
         return RunConfig(response_modalities=[types.Modality.TEXT])
@@ -728,10 +1781,18 @@ class LiveBridge:
         return turn_state.last_input_transcript
 
     @staticmethod
-    def _build_run_config() -> RunConfig:
+    def _build_run_config(text_only: bool = False, compression_trigger_tokens: int = 0) -> RunConfig:
+        # Text-only turns use the same modality as _build_text_fallback_run_config, without audio transcription.
+        compression = None
+        if compression_trigger_tokens > 0:
+            # Lets the Live API slide its own window too; the context it keeps within one connection is never replayed.
+            compression = types.ContextWindowCompressionConfig(
+                trigger_tokens=compression_trigger_tokens,
+                sliding_window=types.SlidingWindow(target_tokens=compression_trigger_tokens // 2),
+            )
         return RunConfig(
-            response_modalities=[types.Modality.AUDIO],
-            output_audio_transcription=types.AudioTranscriptionConfig(),
+            response_modalities=[types.Modality.TEXT if text_only else types.Modality.AUDIO],
+            output_audio_transcription=None if text_only else types.AudioTranscriptionConfig(),
             input_audio_transcription=types.AudioTranscriptionConfig(),
             realtime_input_config=types.RealtimeInputConfig(
                 activity_handling=types.ActivityHandling.START_OF_ACTIVITY_INTERRUPTS,
@@ -743,4 +1804,5 @@ class LiveBridge:
                     silence_duration_ms=300,
                 ),
             ),
+            context_window_compression=compression,
         )
@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import uuid
+from collections import deque
+from typing import Any
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from app.live_bridge import LiveBridge
+from app.loop_monitor import session_task_name
+from app.metrics import MetricsRegistry
+from app.metrics import metrics_registry
+from app.resampler import parse_client_sample_rate
+from app.session_resume import parse_last_seq
+
+logger = logging.getLogger("raksha.mux")
+
+MAX_CHANNEL_ID = 255
+MUX_CHANNEL_BUCKETS = (1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0)
+
+CHANNEL_ENDED = "ended"
+CHANNEL_REJECTED_LIMIT = "channel_limit"
+CHANNEL_REJECTED_INVALID = "invalid_channel"
+
+
+def wrap_text_frame(channel_id: int, frame: str) -> str:
+    """Tags an already serialized JSON event with its channel without parsing it again."""
+    return f'{{"channel":{channel_id},"event":{frame}}}'
+
+
+def wrap_binary_frame(channel_id: int, frame: bytes) -> bytes:
+    return bytes((channel_id,)) + frame
+
+
+class _ChannelSocket:
+    """The websocket one multiplexed channel's LiveBridge session talks to.
+
+    Inbound messages are fed in by the multiplexer's reader; once
+    ``max_pending`` of them wait unread (a session still queued for
+    admission, say) further client frames are dropped, but a disconnect is
+    always delivered. Outbound frames are tagged with the channel id and
+    queued for the shared writer; a channel with ``max_pending`` frames
+    queued waits for the writer, so one busy patient cannot grow the
+    connection's memory without bound in either direction.
+    """
+
+    def __init__(self, mux: LiveMultiplexer, channel_id: int, *, max_pending: int) -> None:
+        self.channel_id = channel_id
+        self.outbound: deque[str | bytes] = deque()
+        self.close_code: int | None = None
+        self.frames_sent = 0
+        self.inbound_dropped = 0
+        self._mux = mux
+        self._inbound: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self._max_pending = max_pending
+        self._space = asyncio.Event()
+        self._space.set()
+
+    async def accept(self) -> None:
+        return None
+
+    async def close(self, code: int = 1000) -> None:
+        self.close_code = code
+
+    async def receive(self) -> dict[str, Any]:
+        return await self._inbound.get()
+
+    async def send_text(self, data: str) -> None:
+        await self._enqueue(wrap_text_frame(self.channel_id, data))
+
+    async def send_bytes(self, data: bytes) -> None:
+        await self._enqueue(wrap_binary_frame(self.channel_id, data))
+
+    def feed(self, message: dict[str, Any]) -> bool:
+        if message.get("type") != "websocket.disconnect" and self._inbound.qsize() >= self._max_pending:
+            self.inbound_dropped += 1
+            return False
+        self._inbound.put_nowait(message)
+        return True
+
+    def feed_disconnect(self, code: int = 1000) -> None:
+        self.feed({"type": "websocket.disconnect", "code": code})
+
+    def frame_taken(self) -> None:
+        if len(self.outbound) < self._max_pending:
+            self._space.set()
+
+    def wake(self) -> None:
+        self._space.set()
+
+    async def _enqueue(self, frame: str | bytes) -> None:
+        while len(self.outbound) >= self._max_pending and not self._mux.closed:
+            self._space.clear()
+            await self._space.wait()
+        if self._mux.closed:
+            raise WebSocketDisconnect(1006)
+        self.outbound.append(frame)
+        self._mux.schedule(self)
+
+
+class LiveMultiplexer:
+    """Carries several live sessions ("channels") over one client websocket.
+
+    A channel is opened with ``{"channel": n, "type": "channel_open", ...}``
+    (n in 1-255, the other fields are the ``/ws/live`` query params) and runs
+    as an ordinary ``LiveBridge.run_websocket`` session behind a
+    ``_ChannelSocket``. Client text frames carry ``"channel"``; client binary
+    frames start with the channel id byte. Server frames come back the same
+    way: ``{"channel": n, "event": {...}}`` text, or binary with a leading
+    channel byte. One writer sends for all channels, one frame per channel in
+    turn, so a channel streaming audio cannot starve the others.
+    """
+
+    def __init__(
+        self,
+        bridge: LiveBridge,
+        *,
+        max_channels: int = 16,
+        channel_buffer_frames: int = 256,
+        registry: MetricsRegistry = metrics_registry,
+    ) -> None:
+        self._bridge = bridge
+        self._max_channels = max_channels
+        self._channel_buffer_frames = channel_buffer_frames
+        self._registry = registry
+        self._channels: dict[int, _ChannelSocket] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._ready: deque[_ChannelSocket] = deque()
+        self._wakeup = asyncio.Event()
+        self.closed = False
+        self.channels_opened = 0
+        self.max_open_channels = 0
+        self.frames_sent = 0
+
+    def schedule(self, channel: _ChannelSocket) -> None:
+        if len(channel.outbound) == 1:
+            # It had nothing queued, so it is not in the rotation yet.
+            self._ready.append(channel)
+        self._wakeup.set()
+
+    async def run(self, websocket: WebSocket) -> None:
+        connection_id = uuid.uuid4().hex[:8]
+        await websocket.accept()
+        logger.info("[mux:%s] mux_connect max_channels=%s", connection_id, self._max_channels)
+        writer = asyncio.create_task(
+            self._write_frames(websocket, connection_id),
+            name=session_task_name("mux-write", connection_id),
+        )
+        try:
+            await self._read_frames(websocket, connection_id)
+        finally:
+            for channel in list(self._channels.values()):
+                channel.feed_disconnect(1001)
+            # With session resumption on, dropped channels stay parked here for the grace period.
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._close()
+            writer.cancel()
+            await asyncio.gather(writer, return_exceptions=True)
+            self._registry.histogram("mux_channels_per_connection", buckets=MUX_CHANNEL_BUCKETS).observe(
+                self.max_open_channels
+            )
+            logger.info(
+                "[mux:%s] mux_summary channels_opened=%s max_open_channels=%s frames_sent=%s",
+                connection_id,
+                self.channels_opened,
+                self.max_open_channels,
+                self.frames_sent,
+            )
+
+    async def _read_frames(self, websocket: WebSocket, connection_id: str) -> None:
+        while True:
+            try:
+                message = await websocket.receive()
+            except WebSocketDisconnect:
+                return
+            if message.get("type") == "websocket.disconnect":
+                return
+            raw_bytes = message.get("bytes")
+            if raw_bytes:
+                channel = self._channels.get(raw_bytes[0])
+                if channel is not None:
+                    self._feed(channel, {"type": "websocket.receive", "bytes": raw_bytes[1:]})
+                continue
+            text = message.get("text")
+            if not text:
+                continue
+            try:
+                data = json.loads(text)
+            except json.JSONDecodeError:
+                logger.warning("[mux:%s] mux_rx_parse_error payload_preview=%r", connection_id, text[:200])
+                continue
+            if not isinstance(data, dict):
+                continue
+            channel_id = data.pop("channel", None)
+            event_type = data.get("type")
+            if event_type == "channel_open":
+                self._open_channel(channel_id, data, connection_id)
+                continue
+            channel = self._channels.get(channel_id) if isinstance(channel_id, int) else None
+            if channel is None:
+                logger.info("[mux:%s] mux_rx_unknown_channel channel=%r type=%s", connection_id, channel_id, event_type)
+                continue
+            if event_type == "channel_close":
+                channel.feed({"type": "websocket.receive", "text": '{"type":"stop_session"}'})
+                channel.feed_disconnect(1000)
+                continue
+            self._feed(channel, {"type": "websocket.receive", "text": json.dumps(data)})
+
+    def _feed(self, channel: _ChannelSocket, message: dict[str, Any]) -> None:
+        if not channel.feed(message):
+            self._registry.increment("mux_inbound_dropped_total")
+
+    def _open_channel(self, channel_id: Any, params: dict[str, Any], connection_id: str) -> None:
+        reason: str | None = None
+        if not isinstance(channel_id, int) or not 1 <= channel_id <= MAX_CHANNEL_ID or channel_id in self._channels:
+            reason = CHANNEL_REJECTED_INVALID
+        elif len(self._channels) >= self._max_channels > 0:
+            reason = CHANNEL_REJECTED_LIMIT
+        if reason is not None:
+            logger.info("[mux:%s] mux_channel_rejected channel=%r reason=%s", connection_id, channel_id, reason)
+            self._registry.increment("mux_channels_rejected_total", labels={"reason": reason})
+            if isinstance(channel_id, int) and 0 <= channel_id <= MAX_CHANNEL_ID:
+                # A throwaway channel, so the rejection goes out through the writer like any other frame.
+                rejected = _ChannelSocket(self, channel_id, max_pending=1)
+                event = {"type": "channel_closed", "reason": reason, "code": None}
+                rejected.outbound.append(wrap_text_frame(channel_id, json.dumps(event, separators=(",", ":"))))
+                self.schedule(rejected)
+            return
+
+        channel = _ChannelSocket(self, channel_id, max_pending=self._channel_buffer_frames)
+        self._channels[channel_id] = channel
+        self.channels_opened += 1
+        self.max_open_channels = max(self.max_open_channels, len(self._channels))
+        self._registry.increment("mux_channels_opened_total")
+        logger.info(
+            "[mux:%s] mux_channel_open channel=%s user_id=%s open_channels=%s",
+            connection_id,
+            channel_id,
+            params.get("user_id"),
+            len(self._channels),
+        )
+        task = asyncio.create_task(
+            self._run_channel(channel, params, connection_id),
+            name=session_task_name("mux-channel", f"{connection_id}:{channel_id}"),
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_channel(self, channel: _ChannelSocket, params: dict[str, Any], connection_id: str) -> None:
+        try:
+            await self._bridge.run_websocket(
+                channel,  # type: ignore[arg-type]
+                user_id=str(params.get("user_id") or "raksha-user"),
+                timezone_name=params.get("timezone"),
+                audio_encoding=params.get("audio_encoding"),
+                input_sample_rate=parse_client_sample_rate(params.get("input_sample_rate")),
+                output_sample_rate=parse_client_sample_rate(params.get("output_sample_rate")),
+                protocol=params.get("protocol"),
+                transcripts=params.get("transcripts"),
+                resume_token=params.get("resume_token"),
+                last_seq=parse_last_seq(str(params.get("last_seq", ""))),
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("[mux:%s] mux_channel_failed channel=%s", connection_id, channel.channel_id, exc_info=exc)
+        finally:
+            self._channels.pop(channel.channel_id, None)
+            logger.info(
+                "[mux:%s] mux_channel_closed channel=%s code=%s inbound_dropped=%s",
+                connection_id,
+                channel.channel_id,
+                channel.close_code,
+                channel.inbound_dropped,
+            )
+            if not self.closed:
+                event = {"type": "channel_closed", "reason": CHANNEL_ENDED, "code": channel.close_code}
+                channel.outbound.append(wrap_text_frame(channel.channel_id, json.dumps(event, separators=(",", ":"))))
+                self.schedule(channel)
+
+    async def _write_frames(self, websocket: WebSocket, connection_id: str) -> None:
+        try:
+            while True:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                while self._ready:
+                    channel = self._ready.popleft()
+                    frame = channel.outbound.popleft()
+                    if channel.outbound:
+                        self._ready.append(channel)
+                    channel.frame_taken()
+                    if isinstance(frame, bytes):
+                        await websocket.send_bytes(frame)
+                    else:
+                        await websocket.send_text(frame)
+                    channel.frames_sent += 1
+                    self.frames_sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            logger.info("[mux:%s] mux_write_failed error=%s", connection_id, exc)
+            self._close()
+
+    def _close(self) -> None:
+        self.closed = True
+        for channel in list(self._channels.values()):
+            channel.wake()
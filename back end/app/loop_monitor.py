@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import sys
+import threading
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Any
+
+from app.metrics import MetricsRegistry
+from app.metrics import metrics_registry
+
+logger = logging.getLogger("raksha.loop_monitor")
+
+LOOP_LAG_BUCKETS_MS = (1.0, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0)
+_TRACE_ID_IN_TASK_NAME = re.compile(r"\[([^\]]+)\]$")
+_STACK_LIMIT = 16
+
+
+def session_task_name(kind: str, trace_id: str) -> str:
+    """Task name that lets stall reports point back at a websocket session."""
+    return f"{kind}[{trace_id}]"
+
+
+@dataclass
+class LoopStallReport:
+    detected_at: str
+    stalled_ms: float
+    task_name: str | None
+    trace_id: str | None
+    stack: list[str]
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "detectedAt": self.detected_at,
+            "stalledMs": round(self.stalled_ms, 1),
+            "taskName": self.task_name,
+            "traceId": self.trace_id,
+            "stack": self.stack,
+        }
+
+
+class LoopLagMonitor:
+    """Samples event-loop lag and captures the loop thread's stack while it is blocked.
+
+    A heartbeat task on the loop measures how late each sleep wakes up. A
+    watchdog thread notices when the heartbeat is overdue by more than
+    ``threshold_ms`` and snapshots the loop thread's frames plus the running
+    task, whose name carries the session trace_id (see ``session_task_name``).
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold_ms: float = 100.0,
+        interval_ms: float = 50.0,
+        max_reports: int = 50,
+        registry: MetricsRegistry = metrics_registry,
+    ) -> None:
+        self._threshold_s = threshold_ms / 1000
+        self._interval_s = interval_ms / 1000
+        self._registry = registry
+        self._reports: deque[LoopStallReport] = deque(maxlen=max_reports)
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._heartbeat_task: asyncio.Task[None] | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._last_beat = perf_counter()
+        self._beat_seq = 0
+        self._captured_seq = -1
+        self._pending_report: LoopStallReport | None = None
+        self.stalls = 0
+
+    @property
+    def running(self) -> bool:
+        return self._heartbeat_task is not None
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._last_beat = perf_counter()
+        self._heartbeat_task = self._loop.create_task(self._heartbeat(), name="loop-lag-heartbeat")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat_task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1.0)
+            self._watchdog = None
+
+    def reports(self) -> list[LoopStallReport]:
+        with self._lock:
+            return list(self._reports)
+
+    def snapshot(self) -> dict[str, Any]:
+        lag = self._registry.histogram("event_loop_lag_ms", buckets=LOOP_LAG_BUCKETS_MS)
+        return {
+            "running": self.running,
+            "thresholdMs": self._threshold_s * 1000,
+            "stalls": self.stalls,
+            "lagP50Ms": lag.quantile(0.50),
+            "lagP99Ms": lag.quantile(0.99),
+            "recent": [report.to_payload() for report in reversed(self.reports())],
+        }
+
+    async def _heartbeat(self) -> None:
+        lag_histogram = self._registry.histogram("event_loop_lag_ms", buckets=LOOP_LAG_BUCKETS_MS)
+        while True:
+            expected = perf_counter() + self._interval_s
+            await asyncio.sleep(self._interval_s)
+            now = perf_counter()
+            lag_s = max(0.0, now - expected)
+            lag_histogram.observe(lag_s * 1000)
+            with self._lock:
+                self._last_beat = now
+                self._beat_seq += 1
+                pending = self._pending_report
+                self._pending_report = None
+            if lag_s < self._threshold_s:
+                continue
+            self.stalls += 1
+            self._registry.increment("event_loop_stalls_total")
+            if pending is not None:
+                # The watchdog saw the stall while it was happening; record how long it really lasted.
+                pending.stalled_ms = lag_s * 1000
+                logger.warning(
+                    "[%s] event_loop_stall stalled_ms=%.1f task=%s at=%s",
+                    pending.trace_id or "-",
+                    pending.stalled_ms,
+                    pending.task_name,
+                    pending.stack[-1].strip().splitlines()[0] if pending.stack else "?",
+                )
+
+    def _watch(self) -> None:
+        check_interval_s = min(self._interval_s, self._threshold_s) / 2
+        while not self._stop.wait(check_interval_s):
+            with self._lock:
+                overdue_s = perf_counter() - self._last_beat - self._interval_s
+                seq = self._beat_seq
+            if overdue_s < self._threshold_s or seq == self._captured_seq:
+                continue
+            self._captured_seq = seq
+            report = self._capture(overdue_s)
+            if report is None:
+                continue
+            with self._lock:
+                if self._beat_seq == seq:
+                    self._pending_report = report
+                self._reports.append(report)
+
+    def _capture(self, overdue_s: float) -> LoopStallReport | None:
+        if self._loop is None or self._loop_thread_id is None:
+            return None
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return None
+        stack = traceback.format_stack(frame, limit=_STACK_LIMIT)
+        task = asyncio.current_task(self._loop)
+        task_name = task.get_name() if task is not None else None
+        trace_match = _TRACE_ID_IN_TASK_NAME.search(task_name) if task_name else None
+        return LoopStallReport(
+            detected_at=datetime.now(timezone.utc).isoformat(),
+            stalled_ms=overdue_s * 1000,
+            task_name=task_name,
+            trace_id=trace_match.group(1) if trace_match else None,
+            stack=stack,
+        )
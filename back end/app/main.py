@@ -1,23 +1,51 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import AsyncIterator
 
 from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.admission import AdmissionController
 from app.config import get_settings
+from app.fake_live_model import FakeLiveModelConfig
 from app.live_bridge import LiveBridge
+from app.live_mux import LiveMultiplexer
 from app.logging_config import configure_logging
+from app.loop_monitor import LoopLagMonitor
+from app.metrics import metrics_registry
+from app.overload import OverloadGovernor
+from app.overload import OverloadThresholds
 from app.patient_profile_repository import PatientProfileRepository
 from app.patient_profile_service import PatientProfileService
+from app.profile_summary_renderer import ProfileSummaryRenderer
+from app.resampler import parse_client_sample_rate
 from app.schedule_api import build_schedule_router
 from app.schedule_repository import ScheduleRepository
 from app.schedule_service import ScheduleService
+from app.session_resume import SessionResumeRegistry
+from app.session_resume import parse_last_seq
 
 
 settings = get_settings()
 configure_logging(settings.log_level)
-app = FastAPI(title="Raksha Backend", version="0.1.0")
+loop_monitor = LoopLagMonitor(threshold_ms=settings.loop_stall_threshold_ms)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    if settings.loop_monitor_enabled:
+        loop_monitor.start()
+    if overload_governor is not None:
+        overload_governor.start()
+    yield
+    if overload_governor is not None:
+        await overload_governor.stop()
+    await loop_monitor.stop()
+
+
+app = FastAPI(title="Raksha Backend", version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -45,7 +73,13 @@ patient_profile_repository = PatientProfileRepository(
     seed_sql_path=seed_sql_path,
 )
 patient_profile_repository.initialize()
-patient_profile_service = PatientProfileService(patient_profile_repository)
+patient_profile_service = PatientProfileService(
+    patient_profile_repository,
+    summary_renderer=ProfileSummaryRenderer(
+        max_chars=settings.profile_summary_max_chars,
+        max_tokens=settings.profile_summary_max_tokens,
+    ),
+)
 
 schedule_seed_sql_path = Path(settings.schedule_seed_sql_path)
 if not schedule_seed_sql_path.is_absolute():
@@ -64,12 +98,66 @@ schedule_repository = ScheduleRepository(
 schedule_repository.initialize()
 schedule_service = ScheduleService(schedule_repository)
 
+live_capture_dir: Path | None = None
+if settings.live_capture_dir:
+    live_capture_dir = Path(settings.live_capture_dir)
+    if not live_capture_dir.is_absolute():
+        live_capture_dir = (backend_root / live_capture_dir).resolve()
+
+fake_live_model: FakeLiveModelConfig | None = None
+if settings.live_model_backend == "fake":
+    fake_live_model = FakeLiveModelConfig(
+        response_latency_ms=settings.fake_live_latency_ms,
+        error_turns=tuple(settings.fake_live_error_turns),
+        error_code=settings.fake_live_error_code,
+    )
+
+admission = AdmissionController(
+    max_sessions=settings.max_live_sessions,
+    max_sessions_per_user=settings.max_live_sessions_per_user,
+    max_queue=settings.admission_queue_size,
+    queue_timeout_s=settings.admission_queue_timeout_s,
+)
+
+overload_governor: OverloadGovernor | None = None
+if settings.overload_mode_enabled:
+    overload_governor = OverloadGovernor(
+        thresholds=OverloadThresholds(
+            enter_loop_lag_ms=settings.overload_enter_loop_lag_ms,
+            exit_loop_lag_ms=settings.overload_exit_loop_lag_ms,
+            enter_cpu_percent=settings.overload_enter_cpu_percent,
+            exit_cpu_percent=settings.overload_exit_cpu_percent,
+            enter_response_ms=settings.overload_enter_response_ms,
+            exit_response_ms=settings.overload_exit_response_ms,
+        ),
+        min_degraded_s=settings.overload_min_degraded_s,
+        max_switches_per_s=settings.overload_max_switches_per_s,
+    )
+
+session_resume = SessionResumeRegistry(grace_s=settings.session_resume_grace_s)
+
 bridge = LiveBridge(
     app_name=settings.app_name,
     model=settings.gemini_model,
     gemini_api_key=settings.gemini_api_key,
     patient_profile_service=patient_profile_service,
     schedule_service=schedule_service,
+    tool_cache_ttl_seconds=settings.tool_cache_ttl_seconds,
+    capture_dir=live_capture_dir,
+    fake_live_model=fake_live_model,
+    uplink_frame_ms=settings.uplink_frame_ms,
+    uplink_max_frame_ms=settings.uplink_max_frame_ms,
+    transcript_coalesce_ms=settings.transcript_coalesce_ms,
+    upstream_idle_timeout_s=settings.upstream_idle_timeout_s,
+    admission=admission,
+    overload_governor=overload_governor,
+    session_resume=session_resume,
+    resume_buffer_frames=settings.session_resume_buffer_frames,
+    resume_buffer_bytes=settings.session_resume_buffer_bytes,
+    context_budget_tokens=settings.context_budget_tokens,
+    context_keep_recent_events=settings.context_keep_recent_events,
+    live_compression_trigger_tokens=settings.live_compression_trigger_tokens,
+    audio_adpcm_enabled=settings.audio_adpcm_enabled,
 )
 app.include_router(build_schedule_router(schedule_service))
 
@@ -79,8 +167,57 @@ async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics")
+async def metrics() -> dict[str, object]:
+    return metrics_registry.snapshot()
+
+
+@app.get("/admin/loop-stalls")
+async def loop_stalls() -> dict[str, object]:
+    return loop_monitor.snapshot()
+
+
+@app.get("/admin/admission")
+async def admission_status() -> dict[str, object]:
+    return admission.snapshot()
+
+
+@app.get("/admin/overload")
+async def overload_status() -> dict[str, object]:
+    if overload_governor is None:
+        return {"enabled": False}
+    return {"enabled": True, **overload_governor.snapshot()}
+
+
+@app.get("/admin/resume")
+async def resume_status() -> dict[str, object]:
+    return session_resume.snapshot()
+
+
 @app.websocket("/ws/live")
 async def ws_live(websocket: WebSocket) -> None:
     user_id = websocket.query_params.get("user_id", "raksha-user")
     timezone = websocket.query_params.get("timezone")
-    await bridge.run_websocket(websocket, user_id=user_id, timezone_name=timezone)
+    audio_encoding = websocket.query_params.get("audio_encoding")
+    await bridge.run_websocket(
+        websocket,
+        user_id=user_id,
+        timezone_name=timezone,
+        audio_encoding=audio_encoding,
+        input_sample_rate=parse_client_sample_rate(websocket.query_params.get("input_sample_rate")),
+        output_sample_rate=parse_client_sample_rate(websocket.query_params.get("output_sample_rate")),
+        protocol=websocket.query_params.get("protocol"),
+        transcripts=websocket.query_params.get("transcripts"),
+        resume_token=websocket.query_params.get("resume_token"),
+        last_seq=parse_last_seq(websocket.query_params.get("last_seq")),
+    )
+
+
+@app.websocket("/ws/live/mux")
+async def ws_live_mux(websocket: WebSocket) -> None:
+    multiplexer = LiveMultiplexer(
+        bridge,
+        max_channels=settings.mux_max_channels,
+        channel_buffer_frames=settings.mux_channel_buffer_frames,
+    )
+    await multiplexer.run(websocket)
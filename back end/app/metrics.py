@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import Any
+
+DEFAULT_LATENCY_BUCKETS_MS = (1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0, 5000.0)
+DEFAULT_SIZE_BUCKETS_BYTES = (256.0, 1024.0, 4096.0, 16384.0, 65536.0, 262144.0)
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self._buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self._buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self._buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+            self._max = max(self._max, value)
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bucket bound containing the q-quantile (max value for the overflow bucket)."""
+        with self._lock:
+            if self._count == 0:
+                return None
+            rank = q * self._count
+            seen = 0
+            for index, bucket_count in enumerate(self._counts):
+                seen += bucket_count
+                if seen >= rank and bucket_count:
+                    return self._buckets[index] if index < len(self._buckets) else self._max
+            return self._max
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            count = self._count
+            total = self._sum
+            maximum = self._max
+        return {
+            "count": count,
+            "sum": round(total, 3),
+            "max": round(maximum, 3),
+            "buckets": {
+                **{f"le_{bound:g}": counts[index] for index, bound in enumerate(self._buckets)},
+                "le_inf": counts[-1],
+            },
+        }
+
+
+class MetricsRegistry:
+    """Process-wide metrics store exported by the /metrics endpoint."""
+
+    def __init__(self) -> None:
+        self._histograms: dict[tuple[str, tuple[tuple[str, str], ...]], Histogram] = {}
+        self._counters: dict[tuple[str, tuple[tuple[str, str], ...]], int] = {}
+        self._lock = threading.Lock()
+
+    def histogram(
+        self,
+        name: str,
+        *,
+        labels: dict[str, str] | None = None,
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS_MS,
+    ) -> Histogram:
+        key = (name, self._label_key(labels))
+        histogram = self._histograms.get(key)
+        if histogram is not None:
+            return histogram
+        with self._lock:
+            return self._histograms.setdefault(key, Histogram(buckets))
+
+    def increment(self, name: str, amount: int = 1, *, labels: dict[str, str] | None = None) -> None:
+        key = (name, self._label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            histograms = list(self._histograms.items())
+            counters = list(self._counters.items())
+        return {
+            "histograms": [
+                {"name": name, "labels": dict(labels), **histogram.snapshot()}
+                for (name, labels), histogram in sorted(histograms, key=lambda item: item[0])
+            ],
+            "counters": [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(counters, key=lambda item: item[0])
+            ],
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    @staticmethod
+    def _label_key(labels: dict[str, str] | None) -> tuple[tuple[str, str], ...]:
+        if not labels:
+            return ()
+        return tuple(sorted((str(key), str(value)) for key, value in labels.items()))
+
+
+metrics_registry = MetricsRegistry()
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from time import perf_counter, process_time
+from typing import Any, Callable
+
+from app.metrics import MetricsRegistry
+from app.metrics import metrics_registry
+
+logger = logging.getLogger("raksha.overload")
+
+AUDIO_MODE = "audio"
+TEXT_MODE = "text"
+
+
+@dataclass(frozen=True)
+class OverloadThresholds:
+    """Enter degraded mode when any signal reaches its ``enter`` level; leave only once all are under ``exit``."""
+
+    enter_loop_lag_ms: float = 100.0
+    exit_loop_lag_ms: float = 25.0
+    enter_cpu_percent: float = 85.0
+    exit_cpu_percent: float = 60.0
+    enter_response_ms: float = 3000.0
+    exit_response_ms: float = 1500.0
+
+
+class OverloadGovernor:
+    """Decides, process-wide, whether new turns should be answered in text instead of audio.
+
+    Loop lag and process CPU are sampled every ``interval_s``; response
+    latency (``ptt_end`` to the first reply) is reported by the bridge. Each
+    signal is smoothed with an EWMA. The governor degrades as soon as one
+    smoothed signal crosses its enter threshold, and recovers only after all of
+    them have stayed under their exit thresholds and at least ``min_degraded_s``
+    has passed, so it does not flap around a single threshold.
+
+    A mode change makes every session reconnect on its next turn, right when the
+    worker is busiest, so ``claim_mode_switch`` lets at most ``max_switches_per_s``
+    sessions switch each second; the rest keep their mode until a later turn.
+    """
+
+    def __init__(
+        self,
+        *,
+        thresholds: OverloadThresholds | None = None,
+        interval_s: float = 0.5,
+        smoothing: float = 0.3,
+        min_degraded_s: float = 10.0,
+        response_stale_s: float = 30.0,
+        max_switches_per_s: float = 5.0,
+        registry: MetricsRegistry = metrics_registry,
+        clock: Callable[[], float] = perf_counter,
+    ) -> None:
+        self.thresholds = thresholds or OverloadThresholds()
+        self.degraded = False
+        self.reason: str | None = None
+        self.transitions = 0
+        self.loop_lag_ms = 0.0
+        self.cpu_percent = 0.0
+        self.response_ms: float | None = None
+        self._interval_s = interval_s
+        self._smoothing = smoothing
+        self._min_degraded_s = min_degraded_s
+        self._response_stale_s = response_stale_s
+        self._max_switches_per_s = max_switches_per_s
+        self._switch_tokens = max(1.0, max_switches_per_s)
+        self._switch_tokens_at: float | None = None
+        self._registry = registry
+        self._clock = clock
+        self._degraded_at = 0.0
+        self._response_at = 0.0
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def mode(self) -> str:
+        return TEXT_MODE if self.degraded else AUDIO_MODE
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._sample_forever(), name="overload-governor")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def observe_response_latency(self, latency_ms: float) -> None:
+        self.response_ms = latency_ms if self.response_ms is None else self._smooth(self.response_ms, latency_ms)
+        self._response_at = self._clock()
+        self._evaluate()
+
+    def claim_mode_switch(self) -> bool:
+        """Takes one of this second's session switches; False when they are used up (0 means no limit)."""
+        if self._max_switches_per_s <= 0:
+            return True
+        now = self._clock()
+        if self._switch_tokens_at is not None:
+            refill = (now - self._switch_tokens_at) * self._max_switches_per_s
+            self._switch_tokens = min(max(1.0, self._max_switches_per_s), self._switch_tokens + refill)
+        self._switch_tokens_at = now
+        if self._switch_tokens < 1:
+            self._registry.increment("overload_switches_deferred_total")
+            return False
+        self._switch_tokens -= 1
+        return True
+
+    def sample(self, *, loop_lag_ms: float, cpu_percent: float) -> None:
+        self.loop_lag_ms = self._smooth(self.loop_lag_ms, loop_lag_ms)
+        self.cpu_percent = self._smooth(self.cpu_percent, cpu_percent)
+        if self.response_ms is not None and self._clock() - self._response_at > self._response_stale_s:
+            # No turn has finished for a while; an old slow reply says nothing about load now.
+            self.response_ms = None
+        self._evaluate()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "reason": self.reason,
+            "transitions": self.transitions,
+            "loopLagMs": round(self.loop_lag_ms, 1),
+            "cpuPercent": round(self.cpu_percent, 1),
+            "responseMs": round(self.response_ms, 1) if self.response_ms is not None else None,
+        }
+
+    def _smooth(self, current: float, value: float) -> float:
+        return current + self._smoothing * (value - current)
+
+    def _evaluate(self) -> None:
+        thresholds = self.thresholds
+        response_ms = self.response_ms or 0.0
+        if not self.degraded:
+            if self.loop_lag_ms >= thresholds.enter_loop_lag_ms:
+                self._transition(True, "loop_lag")
+            elif self.cpu_percent >= thresholds.enter_cpu_percent:
+                self._transition(True, "cpu")
+            elif response_ms >= thresholds.enter_response_ms:
+                self._transition(True, "response_latency")
+            return
+        if self._clock() - self._degraded_at < self._min_degraded_s:
+            return
+        if (
+            self.loop_lag_ms <= thresholds.exit_loop_lag_ms
+            and self.cpu_percent <= thresholds.exit_cpu_percent
+            and response_ms <= thresholds.exit_response_ms
+        ):
+            self._transition(False, None)
+
+    def _transition(self, degraded: bool, reason: str | None) -> None:
+        self.degraded = degraded
+        self.reason = reason
+        self.transitions += 1
+        if degraded:
+            self._degraded_at = self._clock()
+        self._registry.increment("overload_transitions_total", labels={"mode": self.mode})
+        logger.warning(
+            "overload_mode mode=%s reason=%s loop_lag_ms=%.1f cpu_percent=%.1f response_ms=%s",
+            self.mode,
+            reason or "recovered",
+            self.loop_lag_ms,
+            self.cpu_percent,
+            f"{self.response_ms:.0f}" if self.response_ms is not None else "n/a",
+        )
+
+    async def _sample_forever(self) -> None:
+        wall_at = perf_counter()
+        cpu_at = process_time()
+        while True:
+            expected = perf_counter() + self._interval_s
+            await asyncio.sleep(self._interval_s)
+            now = perf_counter()
+            cpu_now = process_time()
+            elapsed_s = max(now - wall_at, 1e-6)
+            self.sample(
+                loop_lag_ms=max(0.0, now - expected) * 1000,
+                cpu_percent=(cpu_now - cpu_at) / elapsed_s * 100,
+            )
+            wall_at = now
+            cpu_at = cpu_now
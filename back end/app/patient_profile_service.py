@@ -3,9 +3,9 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any
 
-from app.patient_profile_models import BiomarkerTarget
-from app.patient_profile_models import PatientProfile
 from app.patient_profile_repository import PatientProfileRepository
+from app.profile_summary_renderer import ProfileSummaryRenderer
+from app.profile_summary_renderer import ProfileSummaryStats
 
 PATIENT_PROFILE_STATE_KEY = "app:patient_profile"
 BIOMARKER_TARGETS_STATE_KEY = "app:biomarker_targets"
@@ -20,11 +20,17 @@ class ProfileContextResult:
     loaded: bool
     source: str
     message: str
+    summary_stats: ProfileSummaryStats | None = None
 
 
 class PatientProfileService:
-    def __init__(self, repository: PatientProfileRepository) -> None:
+    def __init__(
+        self,
+        repository: PatientProfileRepository,
+        summary_renderer: ProfileSummaryRenderer | None = None,
+    ) -> None:
         self._repository = repository
+        self._summary_renderer = summary_renderer or ProfileSummaryRenderer()
 
     def load_profile_context(self, user_id: str) -> ProfileContextResult:
         profile = self._repository.get_by_user_id(user_id)
@@ -42,7 +48,8 @@ class PatientProfileService:
                 message="No saved patient profile found. Continuing with general guidance.",
             )
 
-        summary = self._build_summary(profile)
+        rendered = self._summary_renderer.render(profile)
+        summary = rendered.text
         return ProfileContextResult(
             state={
                 PROFILE_AVAILABLE_STATE_KEY: True,
@@ -54,33 +61,5 @@ class PatientProfileService:
             loaded=True,
             source="db",
             message="Loaded saved patient profile for personalized guidance.",
+            summary_stats=rendered.stats,
         )
-
-    @staticmethod
-    def _build_summary(profile: PatientProfile) -> str:
-        condition_names = [condition.name for condition in profile.conditions if condition.name][:3]
-        treatment_names = [treatment.name for treatment in profile.treatments if treatment.name][:3]
-        biomarker_labels = [PatientProfileService._format_biomarker_target(target) for target in profile.biomarker_targets][:4]
-
-        parts: list[str] = []
-        if profile.full_name:
-            parts.append(f"Patient: {profile.full_name}.")
-        if condition_names:
-            parts.append(f"Known conditions: {', '.join(condition_names)}.")
-        if treatment_names:
-            parts.append(f"Current or prior treatments: {', '.join(treatment_names)}.")
-        if biomarker_labels:
-            parts.append(f"Biomarker targets: {', '.join(biomarker_labels)}.")
-        if profile.allergies:
-            parts.append(f"Allergies: {', '.join(profile.allergies[:3])}.")
-        if profile.contraindications:
-            parts.append(f"Contraindications: {', '.join(profile.contraindications[:3])}.")
-        if profile.notes:
-            parts.append(f"Clinician notes: {profile.notes}.")
-
-        return " ".join(parts)
-
-    @staticmethod
-    def _format_biomarker_target(target: BiomarkerTarget) -> str:
-        unit = f" {target.unit}" if target.unit else ""
-        return f"{target.biomarker} ({target.target}{unit})"
@@ -8,9 +8,11 @@ from app.patient_profile_service import BIOMARKER_TARGETS_STATE_KEY
 from app.patient_profile_service import PATIENT_PROFILE_STATE_KEY
 from app.patient_profile_service import PROFILE_AVAILABLE_STATE_KEY
 from app.patient_profile_service import PROFILE_SUMMARY_STATE_KEY
+from app.tool_instrumentation import ToolCallRecorder
+from app.tool_instrumentation import instrument_tools
 
 
-def build_patient_tools() -> list[Callable[..., dict[str, Any]]]:
+def build_patient_tools(recorder: ToolCallRecorder | None = None) -> list[Callable[..., dict[str, Any]]]:
     def get_patient_profile_summary(tool_context: ToolContext) -> dict[str, Any]:
         """
         Returns persisted patient profile context for personalized recommendations.
@@ -43,4 +45,4 @@ def build_patient_tools() -> list[Callable[..., dict[str, Any]]]:
             "contraindications": profile.get("contraindications", []),
         }
 
-    return [get_patient_profile_summary]
+    return instrument_tools([get_patient_profile_summary], recorder)
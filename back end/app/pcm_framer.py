@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+
+class PcmFramer:
+    """Re-chunks inbound 16-bit PCM packets into larger upstream frames.
+
+    Packets are copied into one preallocated buffer; a frame is only
+    materialized as ``bytes`` when it is full. The first frame of a turn uses
+    ``first_frame_ms`` so the model starts hearing audio without extra delay;
+    later frames follow ``frame_ms``, which ``observe_backlog`` grows while the
+    upstream queue is backing up and shrinks back to the configured size once it
+    drains. ``min_frame_ms`` only bounds the first frame.
+    """
+
+    def __init__(
+        self,
+        *,
+        sample_rate: int = 16000,
+        frame_ms: int = 100,
+        min_frame_ms: int = 50,
+        max_frame_ms: int = 200,
+        first_frame_ms: int = 50,
+        high_backlog: int = 4,
+        drained_frames_to_shrink: int = 4,
+    ) -> None:
+        if not 0 < min_frame_ms <= frame_ms <= max_frame_ms:
+            raise ValueError("Frame durations must satisfy 0 < min_frame_ms <= frame_ms <= max_frame_ms.")
+        self._sample_rate = sample_rate
+        self._max_frame_ms = max_frame_ms
+        self._first_frame_ms = max(min_frame_ms, min(first_frame_ms, max_frame_ms))
+        self._high_backlog = high_backlog
+        self._drained_frames_to_shrink = drained_frames_to_shrink
+        self._base_frame_ms = frame_ms
+        self._frame_ms = frame_ms
+        self._buffer = bytearray(self._bytes_for(max_frame_ms))
+        self._view = memoryview(self._buffer)
+        self._length = 0
+        self._first_frame_pending = True
+        self._drained_frames = 0
+        self.frames_emitted = 0
+        self.packets_pushed = 0
+
+    @property
+    def frame_ms(self) -> int:
+        return self._frame_ms
+
+    @property
+    def buffered_bytes(self) -> int:
+        return self._length
+
+    def reset(self) -> None:
+        """Starts a new turn: drops buffered audio, re-arms the short first frame and restores ``frame_ms``."""
+        self._length = 0
+        self._first_frame_pending = True
+        self._frame_ms = self._base_frame_ms
+        self._drained_frames = 0
+
+    def push(self, data: bytes) -> list[bytes]:
+        self.packets_pushed += 1
+        frames: list[bytes] = []
+        offset = 0
+        remaining = len(data)
+        while remaining:
+            target = self._target_bytes()
+            if self._length >= target:
+                frames.append(self._take_frame())
+                continue
+            chunk = min(target - self._length, remaining)
+            self._view[self._length : self._length + chunk] = data[offset : offset + chunk]
+            self._length += chunk
+            offset += chunk
+            remaining -= chunk
+            if self._length >= target:
+                frames.append(self._take_frame())
+        return frames
+
+    def flush(self) -> bytes | None:
+        """Returns whatever is buffered (for ptt_end) so the tail of the turn is not held back."""
+        if not self._length:
+            return None
+        return self._take_frame()
+
+    def observe_backlog(self, backlog: int) -> None:
+        """Adapts the frame size to how many requests are still waiting in the upstream queue."""
+        if backlog >= self._high_backlog:
+            self._frame_ms = min(self._max_frame_ms, self._frame_ms * 2)
+            self._drained_frames = 0
+            return
+        if backlog:
+            self._drained_frames = 0
+            return
+        self._drained_frames += 1
+        if self._drained_frames >= self._drained_frames_to_shrink:
+            # An empty queue is the normal case, so never go below the configured size.
+            self._frame_ms = max(self._base_frame_ms, self._frame_ms // 2)
+            self._drained_frames = 0
+
+    def _target_bytes(self) -> int:
+        return self._bytes_for(self._first_frame_ms if self._first_frame_pending else self._frame_ms)
+
+    def _take_frame(self) -> bytes:
+        frame = bytes(self._view[: self._length])
+        self._length = 0
+        self._first_frame_pending = False
+        self.frames_emitted += 1
+        return frame
+
+    def _bytes_for(self, duration_ms: int) -> int:
+        return self._sample_rate * duration_ms // 1000 * 2
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from app.patient_profile_models import BiomarkerTarget
+from app.patient_profile_models import PatientProfile
+
+DEFAULT_SUMMARY_MAX_CHARS = 700
+CHARS_PER_TOKEN = 4
+
+
+@dataclass(frozen=True)
+class ProfileSummaryStats:
+    budget_chars: int
+    used_chars: int
+    estimated_tokens: int
+    included_fields: tuple[str, ...]
+    truncated_fields: tuple[str, ...]
+    cache_hit: bool = False
+
+
+@dataclass(frozen=True)
+class RenderedProfileSummary:
+    text: str
+    stats: ProfileSummaryStats
+
+
+@dataclass
+class _Section:
+    name: str
+    label: str
+    values: list[str]
+    free_text: bool = False
+    rendered: str = ""
+    truncated: bool = field(default=False)
+
+
+# Budget is granted in this order; sections are still emitted in display order.
+_FIELD_PRIORITY = (
+    "patient",
+    "allergies",
+    "contraindications",
+    "conditions",
+    "treatments",
+    "biomarker_targets",
+    "notes",
+)
+_DISPLAY_ORDER = (
+    "patient",
+    "conditions",
+    "treatments",
+    "biomarker_targets",
+    "allergies",
+    "contraindications",
+    "notes",
+)
+
+
+class ProfileSummaryRenderer:
+    def __init__(
+        self,
+        max_chars: int = DEFAULT_SUMMARY_MAX_CHARS,
+        max_tokens: int | None = None,
+        cache_size: int = 256,
+    ) -> None:
+        budget = max(0, max_chars)
+        if max_tokens is not None and max_tokens > 0:
+            budget = min(budget, max_tokens * CHARS_PER_TOKEN)
+        self._budget_chars = budget
+        self._cache_size = max(1, cache_size)
+        self._cache: OrderedDict[tuple[str, str], RenderedProfileSummary] = OrderedDict()
+        # Profiles load on worker threads, so concurrent bootstraps share this cache.
+        self._cache_lock = threading.Lock()
+
+    @property
+    def budget_chars(self) -> int:
+        return self._budget_chars
+
+    def render(self, profile: PatientProfile) -> RenderedProfileSummary:
+        cache_key = (profile.user_id, self._profile_version(profile))
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+        if cached is not None:
+            return RenderedProfileSummary(
+                text=cached.text,
+                stats=ProfileSummaryStats(
+                    budget_chars=cached.stats.budget_chars,
+                    used_chars=cached.stats.used_chars,
+                    estimated_tokens=cached.stats.estimated_tokens,
+                    included_fields=cached.stats.included_fields,
+                    truncated_fields=cached.stats.truncated_fields,
+                    cache_hit=True,
+                ),
+            )
+
+        rendered = self._render_uncached(profile)
+        with self._cache_lock:
+            self._cache[cache_key] = rendered
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return rendered
+
+    def _render_uncached(self, profile: PatientProfile) -> RenderedProfileSummary:
+        sections = {section.name: section for section in self._collect_sections(profile)}
+        remaining = self._budget_chars
+        for name in _FIELD_PRIORITY:
+            section = sections.get(name)
+            if section is None:
+                continue
+            # Every section after the first costs one joining space.
+            separator = 1 if any(s.rendered for s in sections.values()) else 0
+            available = remaining - separator
+            if available <= 0:
+                section.truncated = True
+                continue
+            section.rendered, section.truncated = self._fit_section(section, available)
+            if section.rendered:
+                remaining -= len(section.rendered) + separator
+
+        ordered = [sections[name] for name in _DISPLAY_ORDER if name in sections]
+        text = " ".join(section.rendered for section in ordered if section.rendered)
+        return RenderedProfileSummary(
+            text=text,
+            stats=ProfileSummaryStats(
+                budget_chars=self._budget_chars,
+                used_chars=len(text),
+                estimated_tokens=self.estimate_tokens(text),
+                included_fields=tuple(section.name for section in ordered if section.rendered),
+                truncated_fields=tuple(section.name for section in ordered if section.truncated),
+            ),
+        )
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        if not text:
+            return 0
+        return -(-len(text) // CHARS_PER_TOKEN)
+
+    @classmethod
+    def _collect_sections(cls, profile: PatientProfile) -> list[_Section]:
+        sections: list[_Section] = []
+        if profile.full_name:
+            sections.append(_Section(name="patient", label="Patient", values=[profile.full_name]))
+
+        candidates = [
+            ("conditions", "Known conditions", [condition.name for condition in profile.conditions]),
+            ("treatments", "Current or prior treatments", [treatment.name for treatment in profile.treatments]),
+            (
+                "biomarker_targets",
+                "Biomarker targets",
+                [cls._format_biomarker_target(target) for target in profile.biomarker_targets],
+            ),
+            ("allergies", "Allergies", list(profile.allergies)),
+            ("contraindications", "Contraindications", list(profile.contraindications)),
+        ]
+        for name, label, raw_values in candidates:
+            values = [str(value).strip() for value in raw_values if str(value).strip()]
+            if values:
+                sections.append(_Section(name=name, label=label, values=values))
+
+        notes = (profile.notes or "").strip()
+        if notes:
+            sections.append(_Section(name="notes", label="Clinician notes", values=[notes], free_text=True))
+        return sections
+
+    @staticmethod
+    def _fit_section(section: _Section, available: int) -> tuple[str, bool]:
+        prefix = f"{section.label}: "
+        if section.free_text:
+            full = f"{prefix}{section.values[0].rstrip('.')}."
+            if len(full) <= available:
+                return full, False
+            words = section.values[0].split()
+            kept: list[str] = []
+            for word in words:
+                candidate = f"{prefix}{' '.join([*kept, word])}..."
+                if len(candidate) > available:
+                    break
+                kept.append(word)
+            if not kept:
+                return "", True
+            return f"{prefix}{' '.join(kept)}...", True
+
+        total = len(section.values)
+        for count in range(total, 0, -1):
+            omitted = total - count
+            suffix = f" (+{omitted} more)" if omitted else ""
+            candidate = f"{prefix}{', '.join(section.values[:count])}{suffix}."
+            if len(candidate) <= available:
+                return candidate, omitted > 0
+        return "", True
+
+    @staticmethod
+    def _profile_version(profile: PatientProfile) -> str:
+        if profile.updated_at:
+            return profile.updated_at
+        digest = hashlib.sha1(profile.model_dump_json().encode("utf-8")).hexdigest()
+        return f"sha1:{digest}"
+
+    @staticmethod
+    def _format_biomarker_target(target: BiomarkerTarget) -> str:
+        unit = f" {target.unit}" if target.unit else ""
+        return f"{target.biomarker} ({target.target}{unit})"
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+MIN_CLIENT_SAMPLE_RATE = 8000
+MAX_CLIENT_SAMPLE_RATE = 96000
+
+
+def parse_client_sample_rate(value: object) -> int | None:
+    """Sample rate declared by a client, or None when it is missing or outside 8-96 kHz."""
+    try:
+        rate = int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+    if not MIN_CLIENT_SAMPLE_RATE <= rate <= MAX_CLIENT_SAMPLE_RATE:
+        return None
+    return rate
+
+
+def _polyphase_filters(up: int, down: int, half_taps: int) -> np.ndarray:
+    """Kaiser-windowed sinc low-pass split into ``up`` phases, each reversed for a dot with an input window."""
+    taps = 2 * half_taps * max(1, math.ceil(down / up))
+    length = taps * up
+    cutoff = 0.45 / max(up, down)  # cycles per upsampled sample, a little under Nyquist of the slower side
+    # Centre on a whole upsampled sample so equal-rate and integer-ratio streams get an integer delay.
+    offsets = np.arange(length) - length // 2
+    prototype = np.sinc(2 * cutoff * offsets) * np.kaiser(length + 1, 8.0)[:length]
+    prototype *= up / prototype.sum()
+    return np.ascontiguousarray(prototype.reshape(taps, up).T[:, ::-1], dtype=np.float32)
+
+
+class StreamingResampler:
+    """Rational-ratio polyphase resampler for 16-bit mono PCM, fed one chunk at a time.
+
+    Filter history and the output phase carry over between ``process`` calls,
+    so resampling a stream in chunks gives the same samples as resampling it
+    in one piece. Adds about ``half_taps`` input samples of delay; ``flush``
+    drains them at the end of a turn.
+    """
+
+    def __init__(self, input_rate: int, output_rate: int, *, half_taps: int = 16) -> None:
+        if input_rate <= 0 or output_rate <= 0:
+            raise ValueError("Sample rates must be positive.")
+        divisor = math.gcd(input_rate, output_rate)
+        self.input_rate = input_rate
+        self.output_rate = output_rate
+        self._up = output_rate // divisor
+        self._down = input_rate // divisor
+        self._filters = _polyphase_filters(self._up, self._down, half_taps)
+        self._taps = self._filters.shape[1]
+        self._history = np.zeros(self._taps - 1, dtype=np.float32)
+        self._consumed = 0
+        self._produced = 0
+        self._pending_byte = b""
+
+    def reset(self) -> None:
+        self._history[:] = 0
+        self._consumed = 0
+        self._produced = 0
+        self._pending_byte = b""
+
+    def process(self, pcm: bytes) -> bytes:
+        if self._pending_byte:
+            pcm = self._pending_byte + pcm
+        usable = len(pcm) & ~1
+        self._pending_byte = pcm[usable:]
+        if not usable:
+            return b""
+        samples = np.frombuffer(pcm, dtype="<i2", count=usable // 2).astype(np.float32)
+        return self._resample(samples)
+
+    def flush(self) -> bytes:
+        """Emits the samples still held back by the filter delay, then resets."""
+        tail = self._resample(np.zeros(self._taps // 2, dtype=np.float32))
+        self.reset()
+        return tail
+
+    def _resample(self, samples: np.ndarray) -> bytes:
+        buffer = np.concatenate((self._history, samples))
+        total = self._consumed + samples.size
+        # Output n sits at input position n * down / up; emit every n whose newest input sample has arrived.
+        end = (total * self._up + self._down - 1) // self._down
+        positions = np.arange(self._produced, end, dtype=np.int64) * self._down
+        window_starts = positions // self._up - self._consumed
+        phases = positions % self._up
+        windows = sliding_window_view(buffer, self._taps)
+        out = np.einsum("ij,ij->i", windows[window_starts], self._filters[phases])
+
+        self._history = buffer[buffer.size - self._taps + 1 :].copy()
+        self._consumed = total
+        self._produced = end
+        # Keep the counters small: every `up` outputs consume exactly `down` inputs.
+        cycles = self._produced // self._up
+        self._produced -= cycles * self._up
+        self._consumed -= cycles * self._down
+        return np.clip(np.rint(out), -32768, 32767).astype("<i2").tobytes()
@@ -34,4 +34,16 @@ def build_schedule_router(schedule_service: ScheduleService) -> APIRouter:
             date_str=date,
         )
 
+    @router.get("/reports/search")
+    async def search_reports(
+        user_id: str = Query(..., min_length=1),
+        q: str = Query(..., min_length=1),
+        limit: int = Query(default=5, ge=1, le=10),
+    ) -> dict[str, object]:
+        return schedule_service.search_adherence_reports(
+            user_id=user_id,
+            query=q,
+            limit=limit,
+        )
+
     return router
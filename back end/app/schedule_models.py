@@ -62,6 +62,31 @@ class AdherenceReport(BaseModel):
     created_at: str
 
 
+class AdherenceReportSearchHit(BaseModel):
+    report_id: str
+    schedule_item_id: str
+    report_date_local: str
+    activity_type: ScheduleActivityType
+    status: AdherenceStatus
+    alert_level: AlertLevel
+    reported_at_iso: str
+    snippet: str
+    rank: float
+
+
+class AdherenceItemAggregate(BaseModel):
+    schedule_item_id: str
+    title: str | None = None
+    activity_type: ScheduleActivityType
+    total_reports: int
+    done_count: int
+    partial_count: int
+    skipped_count: int
+    delayed_count: int
+    urgent_alerts: int
+    last_report_date: str
+
+
 class ScheduleItemRow(SQLModel, table=True):
     __tablename__ = "schedule_items"
 
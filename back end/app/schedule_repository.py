@@ -2,29 +2,48 @@ from __future__ import annotations
 
 import json
 import logging
+import re
 from pathlib import Path
 from typing import Any
 
 from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
 from sqlmodel import Session, SQLModel, create_engine, select
 
+from app.schedule_models import AdherenceItemAggregate
 from app.schedule_models import AdherenceReport
 from app.schedule_models import AdherenceReportRow
+from app.schedule_models import AdherenceReportSearchHit
 from app.schedule_models import ScheduleItem
 from app.schedule_models import ScheduleItemRow
 
 logger = logging.getLogger("raksha.schedule_repository")
 
+REPORT_SEARCH_TABLE = "adherence_reports_fts"
+_SEARCH_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+_SEARCH_STOPWORDS = {
+    "a", "about", "an", "and", "did", "do", "for", "have", "i", "last", "me", "mention", "mentioned",
+    "my", "of", "the", "to", "was", "what", "when", "where", "which", "with",
+}
+
 
 class ScheduleRepository:
     def __init__(self, db_url: str, seed_sql_path: Path) -> None:
         connect_args = {"check_same_thread": False} if db_url.startswith("sqlite") else {}
         self._engine = create_engine(db_url, connect_args=connect_args)
         self._seed_sql_path = seed_sql_path
+        self._search_enabled = db_url.startswith("sqlite")
+
+    @property
+    def search_enabled(self) -> bool:
+        return self._search_enabled
 
     def initialize(self) -> None:
         SQLModel.metadata.create_all(self._engine)
+        self._seed()
+        self._initialize_search_index()
 
+    def _seed(self) -> None:
         if not self._seed_sql_path.exists():
             logger.warning("schedule_seed_missing seed_sql_path=%s", self._seed_sql_path)
             return
@@ -132,9 +151,169 @@ class ScheduleRepository:
                 return None
             return self._row_to_report(row)
 
+    def aggregate_reports_by_item(
+        self,
+        user_id: str,
+        *,
+        start_date_local: str,
+        end_date_local: str,
+        activity_type: str | None = None,
+    ) -> list[AdherenceItemAggregate]:
+        normalized_user_id = user_id.strip()
+        if not normalized_user_id:
+            return []
+
+        activity_filter = "AND r.activity_type = :activity_type" if activity_type else ""
+        statement = text(
+            f"""
+            SELECT
+                r.schedule_item_id,
+                MAX(i.title) AS title,
+                MAX(r.activity_type) AS activity_type,
+                COUNT(*) AS total_reports,
+                SUM(CASE WHEN r.status = 'done' THEN 1 ELSE 0 END) AS done_count,
+                SUM(CASE WHEN r.status = 'partial' THEN 1 ELSE 0 END) AS partial_count,
+                SUM(CASE WHEN r.status = 'skipped' THEN 1 ELSE 0 END) AS skipped_count,
+                SUM(CASE WHEN r.status = 'delayed' THEN 1 ELSE 0 END) AS delayed_count,
+                SUM(CASE WHEN r.alert_level = 'urgent' THEN 1 ELSE 0 END) AS urgent_alerts,
+                MAX(r.report_date_local) AS last_report_date
+            FROM adherence_reports AS r
+            LEFT JOIN schedule_items AS i ON i.id = r.schedule_item_id AND i.user_id = r.user_id
+            WHERE r.user_id = :user_id
+              AND r.report_date_local BETWEEN :start_date AND :end_date
+              {activity_filter}
+            GROUP BY r.schedule_item_id
+            ORDER BY MIN(COALESCE(i.display_order, 0)), r.schedule_item_id
+            """
+        )
+        params: dict[str, Any] = {
+            "user_id": normalized_user_id,
+            "start_date": start_date_local,
+            "end_date": end_date_local,
+        }
+        if activity_type:
+            params["activity_type"] = activity_type
+
+        with Session(self._engine) as session:
+            rows = session.execute(statement, params).mappings().all()
+
+        aggregates: list[AdherenceItemAggregate] = []
+        for row in rows:
+            try:
+                aggregates.append(AdherenceItemAggregate.model_validate(dict(row)))
+            except Exception as exc:  # noqa: BLE001
+                logger.warning(
+                    "adherence_aggregate_invalid_shape schedule_item_id=%s error_type=%s",
+                    row["schedule_item_id"],
+                    type(exc).__name__,
+                )
+        return aggregates
+
+    def list_done_dates_by_item(
+        self,
+        user_id: str,
+        *,
+        start_date_local: str,
+        end_date_local: str,
+        activity_type: str | None = None,
+    ) -> dict[str, list[str]]:
+        normalized_user_id = user_id.strip()
+        if not normalized_user_id:
+            return {}
+
+        with Session(self._engine) as session:
+            query = (
+                select(AdherenceReportRow.schedule_item_id, AdherenceReportRow.report_date_local)
+                .where(AdherenceReportRow.user_id == normalized_user_id)
+                .where(AdherenceReportRow.status == "done")
+                .where(AdherenceReportRow.report_date_local >= start_date_local)
+                .where(AdherenceReportRow.report_date_local <= end_date_local)
+            )
+            if activity_type:
+                query = query.where(AdherenceReportRow.activity_type == activity_type)
+            rows = session.exec(
+                query.distinct().order_by(AdherenceReportRow.schedule_item_id, AdherenceReportRow.report_date_local)
+            ).all()
+
+        done_dates: dict[str, list[str]] = {}
+        for schedule_item_id, report_date_local in rows:
+            done_dates.setdefault(schedule_item_id, []).append(report_date_local)
+        return done_dates
+
+    def list_recent_reports(
+        self,
+        user_id: str,
+        *,
+        start_date_local: str,
+        end_date_local: str,
+        activity_type: str | None = None,
+        limit: int = 3,
+    ) -> list[AdherenceReport]:
+        normalized_user_id = user_id.strip()
+        if not normalized_user_id:
+            return []
+
+        with Session(self._engine) as session:
+            query = (
+                select(AdherenceReportRow)
+                .where(AdherenceReportRow.user_id == normalized_user_id)
+                .where(AdherenceReportRow.report_date_local >= start_date_local)
+                .where(AdherenceReportRow.report_date_local <= end_date_local)
+            )
+            if activity_type:
+                query = query.where(AdherenceReportRow.activity_type == activity_type)
+            rows = session.exec(
+                query.order_by(AdherenceReportRow.reported_at_iso.desc(), AdherenceReportRow.created_at.desc())
+                .limit(max(1, limit))
+            ).all()
+            return [report for row in rows if (report := self._row_to_report(row)) is not None]
+
+    def search_reports(self, user_id: str, query: str, limit: int = 5) -> list[AdherenceReportSearchHit]:
+        normalized_user_id = user_id.strip()
+        match_expression = self._build_match_expression(query)
+        if not self._search_enabled or not normalized_user_id or not match_expression:
+            return []
+
+        statement = text(
+            f"""
+            SELECT
+                r.id AS report_id,
+                r.schedule_item_id,
+                r.report_date_local,
+                r.activity_type,
+                r.status,
+                r.alert_level,
+                r.reported_at_iso,
+                snippet({REPORT_SEARCH_TABLE}, -1, '[', ']', '...', 12) AS snippet,
+                bm25({REPORT_SEARCH_TABLE}) AS rank
+            FROM {REPORT_SEARCH_TABLE}
+            JOIN adherence_reports AS r ON r.id = {REPORT_SEARCH_TABLE}.report_id
+            WHERE {REPORT_SEARCH_TABLE} MATCH :match_expression
+              AND {REPORT_SEARCH_TABLE}.user_id = :user_id
+            ORDER BY rank, r.reported_at_iso DESC
+            LIMIT :limit
+            """
+        )
+        with Session(self._engine) as session:
+            rows = session.execute(
+                statement,
+                {"match_expression": match_expression, "user_id": normalized_user_id, "limit": max(1, limit)},
+            ).mappings().all()
+
+        hits: list[AdherenceReportSearchHit] = []
+        for row in rows:
+            try:
+                hits.append(AdherenceReportSearchHit.model_validate(dict(row)))
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("adherence_search_hit_invalid id=%s error_type=%s", row["report_id"], type(exc).__name__)
+        return hits
+
     def save_report(self, report_row: AdherenceReportRow) -> AdherenceReport:
         with Session(self._engine) as session:
             session.add(report_row)
+            if self._search_enabled:
+                session.flush()
+                self._index_report(session, report_row)
             session.commit()
             session.refresh(report_row)
             parsed = self._row_to_report(report_row)
@@ -142,6 +321,60 @@ class ScheduleRepository:
                 raise ValueError("saved adherence report could not be parsed")
             return parsed
 
+    def _initialize_search_index(self) -> None:
+        if not self._search_enabled:
+            return
+        try:
+            with Session(self._engine) as session:
+                session.exec(
+                    text(
+                        f"CREATE VIRTUAL TABLE IF NOT EXISTS {REPORT_SEARCH_TABLE} USING fts5("
+                        "report_id UNINDEXED, user_id UNINDEXED, symptoms, felt_after, notes, summary, "
+                        "tokenize = 'porter unicode61')"
+                    )
+                )
+                # Backfill reports inserted outside save_report (seed SQL, older databases).
+                session.exec(
+                    text(
+                        f"INSERT INTO {REPORT_SEARCH_TABLE} (report_id, user_id, symptoms, felt_after, notes, summary) "
+                        "SELECT id, user_id, COALESCE(symptoms, ''), COALESCE(felt_after, ''), COALESCE(notes, ''), summary "
+                        "FROM adherence_reports "
+                        f"WHERE id NOT IN (SELECT report_id FROM {REPORT_SEARCH_TABLE})"
+                    )
+                )
+                session.commit()
+        except OperationalError as exc:
+            self._search_enabled = False
+            logger.warning("adherence_search_unavailable error=%s", exc)
+
+    @staticmethod
+    def _index_report(session: Session, report_row: AdherenceReportRow) -> None:
+        session.exec(
+            text(
+                f"INSERT INTO {REPORT_SEARCH_TABLE} (report_id, user_id, symptoms, felt_after, notes, summary) "
+                "VALUES (:report_id, :user_id, :symptoms, :felt_after, :notes, :summary)"
+            ).bindparams(
+                report_id=report_row.id,
+                user_id=report_row.user_id,
+                symptoms=report_row.symptoms or "",
+                felt_after=report_row.felt_after or "",
+                notes=report_row.notes or "",
+                summary=report_row.summary,
+            )
+        )
+
+    @staticmethod
+    def _build_match_expression(query: str) -> str:
+        # Quote every token so user text can never be parsed as FTS5 query syntax.
+        tokens = list(
+            dict.fromkeys(
+                token
+                for token in (raw.lower() for raw in _SEARCH_TOKEN_PATTERN.findall(query or ""))
+                if token not in _SEARCH_STOPWORDS
+            )
+        )
+        return " OR ".join(f'"{token}"' for token in tokens[:12])
+
     def _row_to_item(self, row: ScheduleItemRow) -> ScheduleItem | None:
         try:
             instructions = self._decode_list(row.instructions_json, field_name="instructions_json", row_id=row.id)
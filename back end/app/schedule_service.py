@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import UTC, datetime, time
+from datetime import UTC, date, datetime, time, timedelta
 import re
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
@@ -15,6 +15,10 @@ from app.schedule_repository import ScheduleRepository
 
 SCHEDULE_USER_ID_STATE_KEY = "app:user_id"
 SCHEDULE_TIMEZONE_STATE_KEY = "app:timezone"
+REPORT_SEARCH_MAX_RESULTS = 10
+HISTORY_MAX_DAYS = 30
+HISTORY_RECENT_SUMMARIES = 3
+HISTORY_SUMMARY_MAX_CHARS = 160
 
 
 @dataclass
@@ -234,6 +238,155 @@ class ScheduleService:
             "reports": [self._serialize_report_detail(report) for report in reports],
         }
 
+    def get_adherence_history(
+        self,
+        *,
+        user_id: str,
+        timezone_name: str | None,
+        days: int = 7,
+        activity_type: str | None = None,
+    ) -> dict[str, object]:
+        normalized_activity: ScheduleActivityType | None = None
+        if activity_type and activity_type.strip():
+            try:
+                normalized_activity = ScheduleActivityType(activity_type.strip().lower())
+            except ValueError:
+                return {
+                    "type": "adherence_history",
+                    "message": f"Invalid activity_type '{activity_type}'. Use diet, medication, sleep, or activity.",
+                    "reasonCode": "invalid_activity_type",
+                }
+
+        bounded_days = min(max(1, days), HISTORY_MAX_DAYS)
+        ctx = self._build_time_context(timezone_name=timezone_name, reported_at_iso=None)
+        end_date = ctx.local_now.date()
+        start_date = end_date - timedelta(days=bounded_days - 1)
+        activity_filter = normalized_activity.value if normalized_activity else None
+        date_range = {
+            "start_date_local": start_date.isoformat(),
+            "end_date_local": end_date.isoformat(),
+            "activity_type": activity_filter,
+        }
+
+        aggregates = self._repository.aggregate_reports_by_item(user_id, **date_range)
+        done_dates = self._repository.list_done_dates_by_item(user_id, **date_range)
+        recent = self._repository.list_recent_reports(user_id, **date_range, limit=HISTORY_RECENT_SUMMARIES)
+
+        items: list[dict[str, object]] = []
+        for aggregate in aggregates:
+            current_streak, longest_streak = self._compute_streaks(
+                done_dates.get(aggregate.schedule_item_id, []),
+                end_date=end_date,
+            )
+            items.append(
+                {
+                    "scheduleItemId": aggregate.schedule_item_id,
+                    "title": aggregate.title,
+                    "activityType": aggregate.activity_type.value,
+                    "reports": aggregate.total_reports,
+                    "done": aggregate.done_count,
+                    "partial": aggregate.partial_count,
+                    "skipped": aggregate.skipped_count,
+                    "delayed": aggregate.delayed_count,
+                    "urgentAlerts": aggregate.urgent_alerts,
+                    "currentStreakDays": current_streak,
+                    "longestStreakDays": longest_streak,
+                    "lastReportDate": aggregate.last_report_date,
+                }
+            )
+
+        return {
+            "type": "adherence_history",
+            "fromDate": start_date.isoformat(),
+            "toDate": end_date.isoformat(),
+            "timezone": ctx.timezone,
+            "days": bounded_days,
+            "activityType": activity_filter,
+            "items": items,
+            "recentSummaries": [
+                {
+                    "date": report.report_date_local,
+                    "scheduleItemId": report.schedule_item_id,
+                    "status": report.status.value,
+                    "summary": self._truncate(report.summary, HISTORY_SUMMARY_MAX_CHARS),
+                }
+                for report in recent
+            ],
+            "message": (
+                f"Summarized {sum(aggregate.total_reports for aggregate in aggregates)} report(s) over {bounded_days} day(s)."
+                if aggregates
+                else f"No adherence reports in the last {bounded_days} day(s)."
+            ),
+        }
+
+    def search_adherence_reports(
+        self,
+        *,
+        user_id: str,
+        query: str,
+        limit: int = 5,
+    ) -> dict[str, object]:
+        normalized_query = (query or "").strip()
+        bounded_limit = min(max(1, limit), REPORT_SEARCH_MAX_RESULTS)
+        if not normalized_query:
+            return {
+                "query": "",
+                "results": [],
+                "message": "Provide words to search for in past adherence reports.",
+            }
+
+        hits = self._repository.search_reports(user_id, normalized_query, limit=bounded_limit)
+        return {
+            "query": normalized_query,
+            "results": [
+                {
+                    "reportId": hit.report_id,
+                    "scheduleItemId": hit.schedule_item_id,
+                    "date": hit.report_date_local,
+                    "activityType": hit.activity_type.value,
+                    "status": hit.status.value,
+                    "alertLevel": hit.alert_level.value,
+                    "reportedAtIso": hit.reported_at_iso,
+                    "snippet": hit.snippet,
+                }
+                for hit in hits
+            ],
+            "message": (
+                f"Found {len(hits)} matching adherence report(s)."
+                if hits
+                else "No past adherence reports matched that search."
+            ),
+        }
+
+    @staticmethod
+    def _compute_streaks(done_dates: list[str], *, end_date: date) -> tuple[int, int]:
+        days = {date.fromisoformat(value) for value in done_dates}
+        if not days:
+            return 0, 0
+
+        longest = 0
+        for day in days:
+            if day - timedelta(days=1) in days:
+                continue
+            length = 1
+            while day + timedelta(days=length) in days:
+                length += 1
+            longest = max(longest, length)
+
+        # Today's item may simply not be reported yet, so a streak ending yesterday is still current.
+        cursor = end_date if end_date in days else end_date - timedelta(days=1)
+        current = 0
+        while cursor in days:
+            current += 1
+            cursor -= timedelta(days=1)
+        return current, longest
+
+    @staticmethod
+    def _truncate(value: str, max_chars: int) -> str:
+        if len(value) <= max_chars:
+            return value
+        return value[: max_chars - 3].rstrip() + "..."
+
     @staticmethod
     def _is_time_in_window(local_now: time, item: ScheduleItem) -> bool:
         start = time.fromisoformat(item.window_start_local)
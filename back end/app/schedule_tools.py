@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from time import time
 from typing import Any, Callable
 
 from google.adk.tools import ToolContext
@@ -7,9 +8,20 @@ from google.adk.tools import ToolContext
 from app.schedule_service import SCHEDULE_TIMEZONE_STATE_KEY
 from app.schedule_service import SCHEDULE_USER_ID_STATE_KEY
 from app.schedule_service import ScheduleService
+from app.tool_cache import SessionToolCache
+from app.tool_cache import cached_tool_call
+from app.tool_idempotency import ToolIdempotencyLedger
+from app.tool_idempotency import idempotent_tool_call
+from app.tool_instrumentation import ToolCallRecorder
+from app.tool_instrumentation import instrument_tools
 
 
-def build_schedule_tools(schedule_service: ScheduleService | None) -> list[Callable[..., dict[str, Any]]]:
+def build_schedule_tools(
+    schedule_service: ScheduleService | None,
+    tool_cache: SessionToolCache | None = None,
+    recorder: ToolCallRecorder | None = None,
+    idempotency: ToolIdempotencyLedger | None = None,
+) -> list[Callable[..., dict[str, Any]]]:
     if schedule_service is None:
         return []
 
@@ -38,12 +50,21 @@ def build_schedule_tools(schedule_service: ScheduleService | None) -> list[Calla
         """
         user_id = _resolve_user_id(tool_context)
         resolved_timezone = _resolve_timezone(tool_context, timezone)
-        schedule = schedule_service.get_today_schedule(
-            user_id=user_id,
-            timezone_name=resolved_timezone,
-            date_str=date,
+
+        def _load() -> dict[str, Any]:
+            schedule = schedule_service.get_today_schedule(
+                user_id=user_id,
+                timezone_name=resolved_timezone,
+                date_str=date,
+            )
+            return {"type": "schedule_snapshot", **schedule}
+
+        return cached_tool_call(
+            tool_cache,
+            "get_today_schedule",
+            {"user_id": user_id, "timezone": resolved_timezone, "date": date},
+            _load,
         )
-        return {"type": "schedule_snapshot", **schedule}
 
     def get_current_schedule_item(
         timezone: str | None = None,
@@ -56,19 +77,29 @@ def build_schedule_tools(schedule_service: ScheduleService | None) -> list[Calla
         """
         user_id = _resolve_user_id(tool_context)
         resolved_timezone = _resolve_timezone(tool_context, timezone)
-        result = schedule_service.get_current_schedule_item(
-            user_id=user_id,
-            timezone_name=resolved_timezone,
-            now_iso=now_iso,
+
+        def _load() -> dict[str, Any]:
+            result = schedule_service.get_current_schedule_item(
+                user_id=user_id,
+                timezone_name=resolved_timezone,
+                now_iso=now_iso,
+            )
+            return {
+                "timezone": result.timezone,
+                "localNowIso": result.local_now_iso,
+                "inWindow": result.in_window,
+                "currentItem": _serialize_item(result.current_item),
+                "upcomingItem": _serialize_item(result.upcoming_item),
+                "message": result.message,
+            }
+
+        # Without an explicit now_iso the answer depends on the clock, so key it by minute.
+        return cached_tool_call(
+            tool_cache,
+            "get_current_schedule_item",
+            {"user_id": user_id, "timezone": resolved_timezone, "now_iso": now_iso or f"minute:{int(time() // 60)}"},
+            _load,
         )
-        return {
-            "timezone": result.timezone,
-            "localNowIso": result.local_now_iso,
-            "inWindow": result.in_window,
-            "currentItem": _serialize_item(result.current_item),
-            "upcomingItem": _serialize_item(result.upcoming_item),
-            "message": result.message,
-        }
 
     def save_adherence_report(
         schedule_item_id: str,
@@ -94,24 +125,77 @@ def build_schedule_tools(schedule_service: ScheduleService | None) -> list[Calla
         session_id = None
         if tool_context is not None:
             session_id = str(getattr(tool_context, "invocation_id", "")).strip() or None
-        return schedule_service.save_adherence_report(
+        arguments = {
+            "user_id": user_id,
+            "schedule_item_id": schedule_item_id,
+            "status": status,
+            "followed_plan": followed_plan,
+            "changes_made": changes_made,
+            "felt_after": felt_after,
+            "symptoms": symptoms,
+            "notes": notes,
+            "alert_level": alert_level,
+            "reported_at_iso": reported_at_iso,
+            "timezone_name": resolved_timezone,
+            "summary": summary,
+            "conversation_turn_id": conversation_turn_id,
+        }
+
+        def _save() -> dict[str, Any]:
+            result = schedule_service.save_adherence_report(**arguments, session_id=session_id)
+            if tool_cache is not None and result.get("saved") and not result.get("deduped"):
+                tool_cache.invalidate("get_today_schedule")
+            return result
+
+        # The session id is the ADK invocation, which changes when a failed turn is replayed in text,
+        # so it is deliberately left out of the idempotency key.
+        return idempotent_tool_call(idempotency, "save_adherence_report", arguments, _save)
+
+    def search_adherence_notes(
+        query: str,
+        limit: int = 5,
+        tool_context: ToolContext | None = None,
+    ) -> dict[str, Any]:
+        """
+        Searches past adherence reports (symptoms, how the user felt, notes, summaries) and returns ranked snippets.
+        Use this for history questions like "when did I last mention dizziness?" instead of loading full timelines.
+        """
+        user_id = _resolve_user_id(tool_context)
+        return schedule_service.search_adherence_reports(
+            user_id=user_id,
+            query=query,
+            limit=limit,
+        )
+
+    def get_adherence_history(
+        days: int = 7,
+        activity_type: str | None = None,
+        timezone: str | None = None,
+        tool_context: ToolContext | None = None,
+    ) -> dict[str, Any]:
+        """
+        Returns compact adherence history for the last N days (max 30): per-item status counts, streaks, and the latest summaries.
+        Use this for multi-day questions like "how have I done with my medication this week?"; activity_type may be diet, medication, sleep, or activity.
+        """
+        user_id = _resolve_user_id(tool_context)
+        resolved_timezone = _resolve_timezone(tool_context, timezone)
+        return schedule_service.get_adherence_history(
             user_id=user_id,
-            schedule_item_id=schedule_item_id,
-            status=status,
-            followed_plan=followed_plan,
-            changes_made=changes_made,
-            felt_after=felt_after,
-            symptoms=symptoms,
-            notes=notes,
-            alert_level=alert_level,
-            reported_at_iso=reported_at_iso,
             timezone_name=resolved_timezone,
-            summary=summary,
-            conversation_turn_id=conversation_turn_id,
-            session_id=session_id,
+            days=days,
+            activity_type=activity_type,
         )
 
-    return [get_today_schedule, get_current_schedule_item, save_adherence_report]
+    return instrument_tools(
+        [
+            get_today_schedule,
+            get_current_schedule_item,
+            save_adherence_report,
+            search_adherence_notes,
+            get_adherence_history,
+        ],
+        recorder,
+    )
 
 
 def _serialize_item(item: Any) -> dict[str, Any] | None:
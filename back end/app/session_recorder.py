@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import struct
+from dataclasses import dataclass
+from enum import IntEnum
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, BinaryIO, Iterator
+
+logger = logging.getLogger("raksha.session_recorder")
+
+RECORDING_MAGIC = b"RKLV"
+RECORDING_VERSION = 1
+_FILE_HEADER = struct.Struct(">4sB")
+# offset_us since recording start, record kind, payload length
+_RECORD_HEADER = struct.Struct(">QBI")
+_EVENT_JSON_LENGTH = struct.Struct(">I")
+
+
+class RecordKind(IntEnum):
+    SESSION_START = 1
+    INBOUND_AUDIO = 2
+    INBOUND_TEXT = 3
+    UPSTREAM_EVENT = 4
+
+
+@dataclass(frozen=True)
+class RecordedFrame:
+    offset_us: int
+    kind: RecordKind
+    payload: bytes
+
+    def decode_json(self) -> dict[str, Any]:
+        return json.loads(self.payload.decode("utf-8"))
+
+    def decode_event(self) -> dict[str, Any]:
+        """Returns the upstream event as a dict with audio blobs restored to raw bytes."""
+        return decode_upstream_event(self.payload)
+
+
+class SessionRecorder:
+    """Appends one live websocket session to a compact binary log.
+
+    Every record is a fixed header (microsecond offset, kind, length) followed by
+    the payload: raw PCM for inbound audio, the client's JSON text frame, or an
+    upstream ADK event whose inline audio is stored as raw bytes instead of base64.
+    """
+
+    def __init__(self, stream: BinaryIO, path: Path | None = None) -> None:
+        self._stream = stream
+        self._path = path
+        self._started_ns = perf_counter_ns()
+        self._closed = False
+        self.records = 0
+        self.bytes_written = _FILE_HEADER.size
+        self._stream.write(_FILE_HEADER.pack(RECORDING_MAGIC, RECORDING_VERSION))
+
+    @classmethod
+    def open(cls, directory: Path, trace_id: str) -> "SessionRecorder":
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"live-{trace_id}.rklv"
+        return cls(path.open("wb", buffering=256 * 1024), path=path)
+
+    @property
+    def path(self) -> Path | None:
+        return self._path
+
+    def record_session_start(self, *, user_id: str, timezone_name: str | None) -> None:
+        payload = json.dumps({"userId": user_id, "timezone": timezone_name}, separators=(",", ":"))
+        self._write(RecordKind.SESSION_START, payload.encode("utf-8"))
+
+    def record_inbound_audio(self, data: bytes) -> None:
+        self._write(RecordKind.INBOUND_AUDIO, data)
+
+    def record_inbound_text(self, text: str) -> None:
+        self._write(RecordKind.INBOUND_TEXT, text.encode("utf-8"))
+
+    def record_upstream_event(self, event: Any) -> None:
+        try:
+            payload = encode_upstream_event(event)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("session_recorder_event_skipped error_type=%s", type(exc).__name__)
+            return
+        self._write(RecordKind.UPSTREAM_EVENT, payload)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._stream.close()
+
+    def _write(self, kind: RecordKind, payload: bytes) -> None:
+        if self._closed:
+            return
+        offset_us = (perf_counter_ns() - self._started_ns) // 1000
+        self._stream.write(_RECORD_HEADER.pack(offset_us, kind, len(payload)))
+        self._stream.write(payload)
+        self.records += 1
+        self.bytes_written += _RECORD_HEADER.size + len(payload)
+
+
+def encode_upstream_event(event: Any) -> bytes:
+    if hasattr(event, "model_dump"):
+        dumped = event.model_dump(mode="json", exclude_none=True, exclude_defaults=True)
+    else:
+        dumped = dict(event)
+
+    blobs: list[bytes] = []
+    for part in (dumped.get("content") or {}).get("parts") or []:
+        inline_data = part.get("inline_data")
+        if inline_data and isinstance(inline_data.get("data"), str):
+            raw = base64.urlsafe_b64decode(inline_data["data"])
+            inline_data["data"] = len(blobs)
+            blobs.append(raw)
+    if blobs:
+        dumped["_blob_sizes"] = [len(blob) for blob in blobs]
+
+    event_json = json.dumps(dumped, separators=(",", ":")).encode("utf-8")
+    return _EVENT_JSON_LENGTH.pack(len(event_json)) + event_json + b"".join(blobs)
+
+
+def decode_upstream_event(payload: bytes) -> dict[str, Any]:
+    (json_length,) = _EVENT_JSON_LENGTH.unpack_from(payload)
+    json_end = _EVENT_JSON_LENGTH.size + json_length
+    decoded = json.loads(payload[_EVENT_JSON_LENGTH.size : json_end].decode("utf-8"))
+
+    blob_sizes = decoded.pop("_blob_sizes", [])
+    blobs: list[bytes] = []
+    cursor = json_end
+    for size in blob_sizes:
+        blobs.append(payload[cursor : cursor + size])
+        cursor += size
+    for part in (decoded.get("content") or {}).get("parts") or []:
+        inline_data = part.get("inline_data")
+        if inline_data and isinstance(inline_data.get("data"), int):
+            inline_data["data"] = blobs[inline_data["data"]]
+    return decoded
+
+
+def read_recording(path: Path) -> Iterator[RecordedFrame]:
+    with path.open("rb") as stream:
+        header = stream.read(_FILE_HEADER.size)
+        if len(header) < _FILE_HEADER.size:
+            raise ValueError(f"Recording '{path}' is truncated.")
+        magic, version = _FILE_HEADER.unpack(header)
+        if magic != RECORDING_MAGIC or version != RECORDING_VERSION:
+            raise ValueError(f"Recording '{path}' has an unsupported format.")
+
+        while True:
+            record_header = stream.read(_RECORD_HEADER.size)
+            if not record_header:
+                return
+            if len(record_header) < _RECORD_HEADER.size:
+                logger.warning("session_recording_truncated path=%s", path)
+                return
+            offset_us, kind, length = _RECORD_HEADER.unpack(record_header)
+            payload = stream.read(length)
+            if len(payload) < length:
+                logger.warning("session_recording_truncated path=%s", path)
+                return
+            yield RecordedFrame(offset_us=offset_us, kind=RecordKind(kind), payload=payload)
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter_ns
+from types import SimpleNamespace
+from typing import Any, AsyncIterator
+
+from fastapi import WebSocketDisconnect
+from google.adk.agents.live_request_queue import LiveRequestQueue
+from google.adk.events import Event
+
+from app.live_bridge import LiveBridge
+from app.live_bridge import LiveSessionContext
+from app.session_recorder import RecordKind
+from app.session_recorder import RecordedFrame
+from app.session_recorder import read_recording
+from app.tool_cache import SessionToolCache
+from app.tool_instrumentation import ToolCallRecorder
+
+
+@dataclass
+class ReplayReport:
+    upstream_events: int
+    inbound_frames: int
+    wall_ms: float
+    event_overhead_p50_us: float
+    event_overhead_p99_us: float
+    inbound_overhead_p50_us: float
+    inbound_overhead_p99_us: float
+    tx_text_frames: int
+    tx_binary_frames: int
+    tx_bytes: int
+
+
+class ReplayWebSocket:
+    """Feeds recorded client frames to the bridge and counts what it sends back."""
+
+    def __init__(self, frames: list[RecordedFrame], *, speed: float = 0.0) -> None:
+        self._frames = [frame for frame in frames if frame.kind in {RecordKind.INBOUND_AUDIO, RecordKind.INBOUND_TEXT}]
+        self._speed = speed
+        self._index = 0
+        self._started_ns: int | None = None
+        self._last_receive_ns: int | None = None
+        self.query_params: dict[str, str] = {}
+        self.inbound_exhausted = asyncio.Event()
+        self.upstream_finished = asyncio.Event()
+        self.inbound_overhead_ns: list[int] = []
+        self.tx_text_frames = 0
+        self.tx_binary_frames = 0
+        self.tx_bytes = 0
+
+    async def accept(self) -> None:
+        self._started_ns = perf_counter_ns()
+
+    async def receive(self) -> dict[str, Any]:
+        now = perf_counter_ns()
+        if self._last_receive_ns is not None:
+            self.inbound_overhead_ns.append(now - self._last_receive_ns)
+
+        if self._index >= len(self._frames):
+            self.inbound_exhausted.set()
+            # Stay "connected" until every upstream event was replayed, then hang up like a client.
+            await self.upstream_finished.wait()
+            raise WebSocketDisconnect(1000)
+
+        frame = self._frames[self._index]
+        self._index += 1
+        await _pace(frame.offset_us, self._speed, self._started_ns)
+        await asyncio.sleep(0)
+        self._last_receive_ns = perf_counter_ns()
+        if frame.kind is RecordKind.INBOUND_AUDIO:
+            return {"type": "websocket.receive", "bytes": frame.payload}
+        return {"type": "websocket.receive", "text": frame.payload.decode("utf-8")}
+
+    async def send_json(self, data: Any) -> None:
+        await self.send_text(json.dumps(data))
+
+    async def send_text(self, data: str) -> None:
+        self.tx_text_frames += 1
+        self.tx_bytes += len(data.encode("utf-8"))
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.tx_binary_frames += 1
+        self.tx_bytes += len(data)
+
+    async def close(self, code: int = 1000) -> None:
+        raise WebSocketDisconnect(code)
+
+
+class ReplayRunner:
+    """Stands in for google.adk Runner: run_live yields recorded upstream events."""
+
+    def __init__(self, frames: list[RecordedFrame], websocket: ReplayWebSocket, *, speed: float = 0.0) -> None:
+        self._events = [
+            (frame.offset_us, Event.model_validate(frame.decode_event()))
+            for frame in frames
+            if frame.kind is RecordKind.UPSTREAM_EVENT
+        ]
+        self._websocket = websocket
+        self._speed = speed
+        self.event_overhead_ns: list[int] = []
+
+    @property
+    def event_count(self) -> int:
+        return len(self._events)
+
+    async def run_live(self, *, session: Any, live_request_queue: LiveRequestQueue, run_config: Any) -> AsyncIterator[Event]:
+        started_ns = perf_counter_ns()
+        for offset_us, event in self._events:
+            await _pace(offset_us, self._speed, started_ns)
+            yielded_ns = perf_counter_ns()
+            yield event
+            # The generator resumes only when the bridge asks for the next event.
+            self.event_overhead_ns.append(perf_counter_ns() - yielded_ns)
+        await self._websocket.inbound_exhausted.wait()
+        self._websocket.upstream_finished.set()
+
+    async def run_async(self, **_kwargs: Any) -> AsyncIterator[Event]:
+        return
+        yield
+
+
+class ReplayLiveBridge(LiveBridge):
+    """LiveBridge whose context uses a ReplayRunner instead of the Gemini Live API."""
+
+    def __init__(self, runner: ReplayRunner) -> None:
+        super().__init__(app_name="raksha-replay", model="replay", gemini_api_key="replay")
+        self._replay_runner = runner
+
+    async def build_context(
+        self,
+        user_id: str,
+        timezone_name: str | None = None,
+        tool_recorder: ToolCallRecorder | None = None,
+        trace_id: str = "-",
+    ) -> LiveSessionContext:
+        return LiveSessionContext(
+            runner=self._replay_runner,  # type: ignore[arg-type]
+            session=SimpleNamespace(id="replay-session", user_id=user_id),
+            live_request_queue=LiveRequestQueue(),
+            profile_status_event={"type": "profile_status", "loaded": False, "source": "none", "message": "replay"},
+            tool_cache=SessionToolCache(),
+        )
+
+
+async def replay_recording(path: Path, *, speed: float = 0.0) -> ReplayReport:
+    """Replays a capture through LiveBridge.run_websocket; speed=0 replays as fast as possible."""
+    frames = list(read_recording(path))
+    user_id = "replay-user"
+    timezone_name = None
+    for frame in frames:
+        if frame.kind is RecordKind.SESSION_START:
+            start = frame.decode_json()
+            user_id = start.get("userId") or user_id
+            timezone_name = start.get("timezone")
+            break
+
+    websocket = ReplayWebSocket(frames, speed=speed)
+    runner = ReplayRunner(frames, websocket, speed=speed)
+    bridge = ReplayLiveBridge(runner)
+
+    started_ns = perf_counter_ns()
+    await bridge.run_websocket(websocket, user_id=user_id, timezone_name=timezone_name)  # type: ignore[arg-type]
+    wall_ms = (perf_counter_ns() - started_ns) / 1e6
+
+    return ReplayReport(
+        upstream_events=runner.event_count,
+        inbound_frames=len(websocket.inbound_overhead_ns),
+        wall_ms=wall_ms,
+        event_overhead_p50_us=_percentile_us(runner.event_overhead_ns, 0.50),
+        event_overhead_p99_us=_percentile_us(runner.event_overhead_ns, 0.99),
+        inbound_overhead_p50_us=_percentile_us(websocket.inbound_overhead_ns, 0.50),
+        inbound_overhead_p99_us=_percentile_us(websocket.inbound_overhead_ns, 0.99),
+        tx_text_frames=websocket.tx_text_frames,
+        tx_binary_frames=websocket.tx_binary_frames,
+        tx_bytes=websocket.tx_bytes,
+    )
+
+
+async def _pace(offset_us: int, speed: float, started_ns: int | None) -> None:
+    if speed <= 0 or started_ns is None:
+        return
+    due_ns = started_ns + int(offset_us * 1000 / speed)
+    delay_s = (due_ns - perf_counter_ns()) / 1e9
+    if delay_s > 0:
+        await asyncio.sleep(delay_s)
+
+
+def _percentile_us(samples_ns: list[int], quantile: float) -> float:
+    if not samples_ns:
+        return 0.0
+    ordered = sorted(samples_ns)
+    index = min(len(ordered) - 1, int(len(ordered) * quantile))
+    return ordered[index] / 1000
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+import secrets
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any
+
+from app.metrics import MetricsRegistry
+from app.metrics import metrics_registry
+
+RESUME_GAP_BUCKETS_MS = (100.0, 250.0, 500.0, 1000.0, 2500.0, 5000.0, 10000.0, 30000.0, 60000.0)
+
+
+def parse_last_seq(value: str | None) -> int:
+    """The ``last_seq`` a resuming client reports; anything that is not a non-negative integer counts as 0."""
+    if value is None or not value.strip().isdigit():
+        return 0
+    return int(value.strip())
+
+
+@dataclass
+class Reattachment:
+    """A new websocket handed to a parked session, with the last frame ``seq`` its client saw."""
+
+    websocket: Any
+    last_seq: int
+    released: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+@dataclass
+class _ParkedSession:
+    user_id: str
+    trace_id: str
+    handoff: asyncio.Future[Reattachment]
+    parked_at: float = field(default_factory=perf_counter)
+
+
+class SessionResumeRegistry:
+    """Lets a live session outlive a dropped websocket for ``grace_s``.
+
+    The session that lost its client ``wait``s here under its resume token
+    while its live stream keeps running; a reconnect that presents the token
+    (for the same user) ``claim``s it and hands over its websocket. The
+    reconnecting handler has to stay alive until the session ``released`` it,
+    because the websocket closes when its handler returns.
+    """
+
+    def __init__(self, *, grace_s: float, registry: MetricsRegistry = metrics_registry) -> None:
+        self.grace_s = grace_s
+        self._registry = registry
+        self._parked: dict[str, _ParkedSession] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.grace_s > 0
+
+    @property
+    def parked(self) -> int:
+        return len(self._parked)
+
+    @staticmethod
+    def new_token() -> str:
+        return secrets.token_urlsafe(18)
+
+    async def wait(self, token: str, *, user_id: str, trace_id: str) -> Reattachment | None:
+        """Parks a session until it is claimed (the reattachment) or the grace period runs out (None)."""
+        parked = _ParkedSession(user_id=user_id, trace_id=trace_id, handoff=asyncio.get_running_loop().create_future())
+        self._parked[token] = parked
+        try:
+            reattachment = await asyncio.wait_for(asyncio.shield(parked.handoff), timeout=self.grace_s)
+        except asyncio.TimeoutError:
+            if not parked.handoff.done():
+                self._registry.increment("session_resume_expired_total")
+                return None
+            reattachment = parked.handoff.result()
+        except asyncio.CancelledError:
+            # Claimed in the same tick the session gave up: let the reconnecting handler go.
+            if parked.handoff.done():
+                parked.handoff.result().released.set()
+            raise
+        finally:
+            if self._parked.get(token) is parked:
+                del self._parked[token]
+        self._registry.histogram("session_resume_gap_ms", buckets=RESUME_GAP_BUCKETS_MS).observe(
+            (perf_counter() - parked.parked_at) * 1000
+        )
+        self._registry.increment("session_resumed_total")
+        return reattachment
+
+    def claim(self, token: str | None, *, user_id: str, websocket: Any, last_seq: int) -> Reattachment | None:
+        """Hands ``websocket`` to the session parked under ``token``; None for unknown, expired or foreign tokens."""
+        parked = self._parked.get(token) if token else None
+        if parked is None or parked.user_id != user_id or parked.handoff.done():
+            self._registry.increment("session_resume_misses_total")
+            return None
+        del self._parked[token]  # type: ignore[arg-type]
+        reattachment = Reattachment(websocket=websocket, last_seq=last_seq)
+        parked.handoff.set_result(reattachment)
+        return reattachment
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"graceS": self.grace_s, "parked": self.parked}
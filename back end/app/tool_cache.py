@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import copy
+import json
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Callable, Iterator
+
+
+@dataclass(frozen=True)
+class ToolCacheStats:
+    hits: int
+    misses: int
+    invalidations: int
+    entries: int
+    prefetched: int = 0
+    prefetch_hits: int = 0
+
+    @property
+    def prefetch_hit_rate(self) -> float | None:
+        return self.prefetch_hits / self.prefetched if self.prefetched else None
+
+
+@dataclass
+class _CacheEntry:
+    value: dict[str, Any]
+    stored_at: float
+    prefetched: bool = False
+
+
+class SessionToolCache:
+    """Memoizes read-only tool results for one live session.
+
+    Results are keyed on tool name plus normalized arguments and expire after
+    ``ttl_seconds``; write tools call ``invalidate`` for the reads they affect.
+    Calls made inside ``prefetching()`` (on a worker thread) store their result
+    without counting as a miss, and the first real call that reads it counts as
+    a prefetch hit.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0, clock: Callable[[], float] = monotonic) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: dict[tuple[str, str], _CacheEntry] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._generation = 0
+        self.prefetched = 0
+        self.prefetch_hits = 0
+
+    @contextmanager
+    def prefetching(self) -> Iterator[None]:
+        self._local.prefetching = True
+        try:
+            yield
+        finally:
+            self._local.prefetching = False
+
+    def get_or_compute(
+        self,
+        tool_name: str,
+        args: dict[str, Any],
+        compute: Callable[[], dict[str, Any]],
+    ) -> dict[str, Any]:
+        key = self.build_key(tool_name, args)
+        prefetching = getattr(self._local, "prefetching", False)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry.stored_at <= self._ttl_seconds:
+                if prefetching:
+                    return entry.value
+                self.hits += 1
+                if entry.prefetched:
+                    entry.prefetched = False
+                    self.prefetch_hits += 1
+                return copy.deepcopy(entry.value)
+            if prefetching:
+                self.prefetched += 1
+            else:
+                self.misses += 1
+            generation = self._generation
+
+        value = compute()
+        with self._lock:
+            # A write tool may have invalidated this read while a prefetch was computing it off-thread.
+            if not prefetching or generation == self._generation:
+                self._entries[key] = _CacheEntry(value=copy.deepcopy(value), stored_at=now, prefetched=prefetching)
+        return value
+
+    def invalidate(self, *tool_names: str) -> None:
+        with self._lock:
+            stale = [key for key in self._entries if key[0] in tool_names]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+            self._generation += 1
+
+    def stats(self) -> ToolCacheStats:
+        return ToolCacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            invalidations=self.invalidations,
+            entries=len(self._entries),
+            prefetched=self.prefetched,
+            prefetch_hits=self.prefetch_hits,
+        )
+
+    @staticmethod
+    def build_key(tool_name: str, args: dict[str, Any]) -> tuple[str, str]:
+        normalized = {
+            name: value.strip() if isinstance(value, str) else value
+            for name, value in args.items()
+            if value is not None and value != ""
+        }
+        return tool_name, json.dumps(normalized, sort_keys=True, default=str)
+
+
+def cached_tool_call(
+    cache: SessionToolCache | None,
+    tool_name: str,
+    args: dict[str, Any],
+    compute: Callable[[], dict[str, Any]],
+) -> dict[str, Any]:
+    if cache is None:
+        return compute()
+    return cache.get_or_compute(tool_name, args, compute)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import threading
+from typing import Any, Callable
+
+from app.metrics import MetricsRegistry
+from app.metrics import metrics_registry
+
+
+def _fingerprint(value: Any) -> str:
+    encoded = json.dumps(value, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+class ToolIdempotencyLedger:
+    """Per-session record of side-effecting tool calls, so a replayed turn cannot repeat them.
+
+    Calls are keyed by the conversation turn they ran in plus a hash of their
+    normalized arguments. When the text fallback replays a failed live turn,
+    the model's repeated ``book_doctor_slot`` or ``save_adherence_report``
+    call gets the first call's result back without running again. The UI
+    payload of such a replay is marked so the bridge does not send it twice.
+    Only the current and the previous turn are remembered, since a failed
+    turn is replayed before or just as the next one starts.
+    """
+
+    def __init__(self, registry: MetricsRegistry = metrics_registry) -> None:
+        self._registry = registry
+        self._lock = threading.Lock()
+        self._turn_id = "0"
+        self._results: dict[tuple[str, str, str], dict[str, Any]] = {}
+        self._replayed_payloads: dict[str, int] = {}
+        self.replays = 0
+        self.suppressed_payloads = 0
+
+    @property
+    def turn_id(self) -> str:
+        return self._turn_id
+
+    def begin_turn(self, turn_id: str) -> None:
+        """Starts a new conversation turn; only calls repeated within one turn count as replays."""
+        with self._lock:
+            if turn_id != self._turn_id:
+                kept = {self._turn_id, turn_id}
+                self._results = {key: result for key, result in self._results.items() if key[0] in kept}
+            self._turn_id = turn_id
+            self._replayed_payloads.clear()
+
+    @property
+    def remembered_calls(self) -> int:
+        return len(self._results)
+
+    def run(self, tool_name: str, args: dict[str, Any], compute: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+        normalized = {
+            name: value.strip() if isinstance(value, str) else value
+            for name, value in args.items()
+            if value is not None and value != ""
+        }
+        with self._lock:
+            key = (self._turn_id, tool_name, _fingerprint(normalized))
+            previous = self._results.get(key)
+            if previous is not None:
+                self.replays += 1
+                payload_key = _fingerprint(previous)
+                self._replayed_payloads[payload_key] = self._replayed_payloads.get(payload_key, 0) + 1
+                self._registry.increment("tool_replays_total", labels={"tool": tool_name})
+                return copy.deepcopy(previous)
+
+        result = compute()
+        with self._lock:
+            self._results.setdefault(key, copy.deepcopy(result))
+        return result
+
+    def should_suppress(self, payload: dict[str, Any]) -> bool:
+        """True (once per replay) for a UI payload that a replayed call returned and the client already has."""
+        payload_key = _fingerprint(payload)
+        with self._lock:
+            pending = self._replayed_payloads.get(payload_key, 0)
+            if not pending:
+                return False
+            if pending == 1:
+                del self._replayed_payloads[payload_key]
+            else:
+                self._replayed_payloads[payload_key] = pending - 1
+            self.suppressed_payloads += 1
+            return True
+
+
+def idempotent_tool_call(
+    ledger: ToolIdempotencyLedger | None,
+    tool_name: str,
+    args: dict[str, Any],
+    compute: Callable[[], dict[str, Any]],
+) -> dict[str, Any]:
+    if ledger is None:
+        return compute()
+    return ledger.run(tool_name, args, compute)
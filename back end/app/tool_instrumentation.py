@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Callable
+
+from app.metrics import DEFAULT_SIZE_BUCKETS_BYTES
+from app.metrics import MetricsRegistry
+from app.metrics import metrics_registry
+
+logger = logging.getLogger("raksha.tools")
+
+
+@dataclass
+class ToolCallStats:
+    calls: int = 0
+    exceptions: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    total_bytes: int = 0
+    max_bytes: int = 0
+    outcomes: Counter[str] = field(default_factory=Counter)
+
+    def to_summary(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "exceptions": self.exceptions,
+            "avgMs": round(self.total_ms / self.calls, 2) if self.calls else 0.0,
+            "maxMs": round(self.max_ms, 2),
+            "avgBytes": self.total_bytes // self.calls if self.calls else 0,
+            "maxBytes": self.max_bytes,
+            "outcomes": dict(self.outcomes),
+        }
+
+
+class ToolCallRecorder:
+    """Collects per-session tool timings and mirrors them into process-wide histograms."""
+
+    def __init__(self, trace_id: str | None = None, registry: MetricsRegistry = metrics_registry) -> None:
+        self._trace_id = trace_id
+        self._registry = registry
+        self._stats: dict[str, ToolCallStats] = {}
+
+    def record(
+        self,
+        tool_name: str,
+        *,
+        duration_ms: float,
+        payload_bytes: int,
+        outcome: str,
+        error_type: str | None = None,
+    ) -> None:
+        stats = self._stats.setdefault(tool_name, ToolCallStats())
+        stats.calls += 1
+        stats.total_ms += duration_ms
+        stats.max_ms = max(stats.max_ms, duration_ms)
+        stats.total_bytes += payload_bytes
+        stats.max_bytes = max(stats.max_bytes, payload_bytes)
+        stats.outcomes[outcome] += 1
+        if error_type is not None:
+            stats.exceptions += 1
+
+        labels = {"tool": tool_name}
+        self._registry.histogram("tool_call_duration_ms", labels=labels).observe(duration_ms)
+        self._registry.histogram(
+            "tool_payload_bytes",
+            labels=labels,
+            buckets=DEFAULT_SIZE_BUCKETS_BYTES,
+        ).observe(payload_bytes)
+        self._registry.increment("tool_calls_total", labels={**labels, "outcome": outcome})
+
+        logger.info(
+            "[%s] tool_call name=%s duration_ms=%.2f payload_bytes=%s outcome=%s error_type=%s",
+            self._trace_id or "-",
+            tool_name,
+            duration_ms,
+            payload_bytes,
+            outcome,
+            error_type,
+        )
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        return {name: stats.to_summary() for name, stats in sorted(self._stats.items())}
+
+
+def instrument_tools(
+    tools: list[Callable[..., Any]],
+    recorder: ToolCallRecorder | None = None,
+) -> list[Callable[..., Any]]:
+    return [instrument_tool(tool, recorder) for tool in tools]
+
+
+def instrument_tool(func: Callable[..., Any], recorder: ToolCallRecorder | None = None) -> Callable[..., Any]:
+    """Wraps a tool while preserving the name, docstring and signature ADK introspects."""
+    active_recorder = recorder or ToolCallRecorder()
+    tool_name = func.__name__
+
+    def _finish(started_at: float, result: Any, error: BaseException | None) -> None:
+        duration_ms = (perf_counter() - started_at) * 1000
+        if error is not None:
+            active_recorder.record(
+                tool_name,
+                duration_ms=duration_ms,
+                payload_bytes=0,
+                outcome="exception",
+                error_type=type(error).__name__,
+            )
+            return
+        active_recorder.record(
+            tool_name,
+            duration_ms=duration_ms,
+            payload_bytes=_payload_size(result),
+            outcome=_classify_outcome(result),
+        )
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            started_at = perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as exc:
+                _finish(started_at, None, exc)
+                raise
+            _finish(started_at, result, None)
+            return result
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        started_at = perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as exc:
+            _finish(started_at, None, exc)
+            raise
+        _finish(started_at, result, None)
+        return result
+
+    return wrapper
+
+
+def _payload_size(result: Any) -> int:
+    try:
+        return len(json.dumps(result, default=str, separators=(",", ":")).encode("utf-8"))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _classify_outcome(result: Any) -> str:
+    if not isinstance(result, dict):
+        return "ok"
+    reason_code = result.get("reasonCode")
+    if result.get("saved") is False or reason_code:
+        return f"failed:{reason_code or 'unknown'}"
+    status = result.get("status")
+    if result.get("type") == "booking_update" and isinstance(status, str):
+        return status
+    return "ok"
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger("raksha.transcripts")
+
+LEGACY_TRANSCRIPTS = "full"
+DELTA_TRANSCRIPTS = "delta"
+INPUT_STREAM = "input"
+OUTPUT_STREAM = "output"
+
+_MIN_REVISION_PREFIX = 4
+
+
+def negotiate_transcript_mode(requested: str | None) -> str:
+    normalized = (requested or "").strip().lower()
+    return DELTA_TRANSCRIPTS if normalized == DELTA_TRANSCRIPTS else LEGACY_TRANSCRIPTS
+
+
+def utf16_length(text: str) -> int:
+    """Length as JavaScript counts it: characters outside the BMP (most emoji) take two UTF-16 units."""
+    return len(text.encode("utf-16-le")) // 2
+
+
+def merge_transcript_fragment(current: str, fragment: str) -> str:
+    """Folds one transcription fragment into the running text of a stream.
+
+    Fragments are usually appended pieces (carrying their own leading space),
+    but some sources resend the whole utterance so far, possibly with earlier
+    words corrected; a fragment that extends or largely shares the current
+    prefix replaces the text instead of being appended to it.
+    """
+    if not current or fragment.startswith(current):
+        return fragment
+    shared = len(os.path.commonprefix((current, fragment)))
+    if shared >= max(_MIN_REVISION_PREFIX, len(current) // 3):
+        return fragment
+    return current + fragment
+
+
+@dataclass
+class TranscriptStream:
+    name: str
+    text: str = ""
+    client_text: str = ""
+
+    def take_update(self) -> dict[str, Any] | None:
+        """Event that brings the client from ``client_text`` to ``text``, or None when it is current."""
+        if self.text == self.client_text:
+            return None
+        if self.text.startswith(self.client_text):
+            update: dict[str, Any] = {
+                "type": "transcript_delta",
+                "stream": self.name,
+                "offset": utf16_length(self.client_text),
+                "text": self.text[len(self.client_text) :],
+            }
+        else:
+            update = {"type": "transcript_sync", "stream": self.name, "text": self.text}
+        self.client_text = self.text
+        return update
+
+    def reset(self) -> None:
+        self.text = ""
+        self.client_text = ""
+
+
+class TranscriptCoalescer:
+    """Batches transcription fragments and sends one delta per stream per interval.
+
+    The first fragment after a quiet period is sent straight away; fragments
+    arriving within ``interval_ms`` of the last send are merged and flushed by
+    a timer task. ``transcript_delta`` carries only the appended suffix and
+    the offset it starts at (in UTF-16 code units, as JavaScript indexes strings); ``transcript_sync`` resends the
+    whole text, and only happens when earlier text was rewritten.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[dict[str, Any]], Awaitable[None]],
+        *,
+        interval_ms: float = 50.0,
+        task_name: str = "transcript-flush",
+    ) -> None:
+        self._send = send
+        self._interval_s = interval_ms / 1000
+        self._task_name = task_name
+        self._streams = {
+            INPUT_STREAM: TranscriptStream(INPUT_STREAM),
+            OUTPUT_STREAM: TranscriptStream(OUTPUT_STREAM),
+        }
+        self._last_flush_at = float("-inf")
+        self._flush_task: asyncio.Task[None] | None = None
+        self.fragments = 0
+        self.events_sent = 0
+        self.resyncs = 0
+
+    def text(self, stream: str) -> str:
+        return self._streams[stream].text
+
+    async def add(self, stream: str, fragment: str) -> None:
+        if not fragment:
+            return
+        transcript = self._streams[stream]
+        transcript.text = merge_transcript_fragment(transcript.text, fragment)
+        self.fragments += 1
+        wait_s = self._last_flush_at + self._interval_s - perf_counter()
+        if wait_s <= 0:
+            await self.flush()
+            return
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later(wait_s), name=self._task_name)
+
+    async def flush(self) -> int:
+        self._cancel_timer()
+        self._last_flush_at = perf_counter()
+        sent = 0
+        for transcript in self._streams.values():
+            update = transcript.take_update()
+            if update is None:
+                continue
+            if update["type"] == "transcript_sync":
+                self.resyncs += 1
+            await self._send(update)
+            sent += 1
+        self.events_sent += sent
+        return sent
+
+    async def end_turn(self) -> int:
+        """Flushes what is pending and starts both streams over for the next turn."""
+        sent = await self.flush()
+        for transcript in self._streams.values():
+            transcript.reset()
+        return sent
+
+    def close(self) -> None:
+        self._cancel_timer()
+
+    async def _flush_later(self, delay_s: float) -> None:
+        await asyncio.sleep(delay_s)
+        self._flush_task = None
+        try:
+            await self.flush()
+        except Exception as exc:  # noqa: BLE001
+            # The websocket may already be gone; the send task reports that on its own.
+            logger.debug("transcript_flush_failed error=%s", exc)
+
+    def _cancel_timer(self) -> None:
+        task = self._flush_task
+        self._flush_task = None
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from time import perf_counter
+from typing import Callable
+
+from google.adk.agents.live_request_queue import LiveRequest
+from google.adk.agents.live_request_queue import LiveRequestQueue
+
+from app.metrics import MetricsRegistry
+from app.metrics import metrics_registry
+
+logger = logging.getLogger("raksha.live")
+
+UPSTREAM_RESUME_BUCKETS_MS = (25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0, 5000.0)
+
+
+class _ConnectTimedQueue(LiveRequestQueue):
+    """Reports how long it took until the live flow first read from it, i.e. until the model connection was up."""
+
+    def __init__(self, on_connect: Callable[[float, int], None]) -> None:
+        super().__init__()
+        self._created_at = perf_counter()
+        self._on_connect: Callable[[float, int], None] | None = on_connect
+
+    async def get(self) -> LiveRequest:
+        if self._on_connect is not None:
+            on_connect, self._on_connect = self._on_connect, None
+            on_connect((perf_counter() - self._created_at) * 1000, self._queue.qsize())
+        return await super().get()
+
+
+class UpstreamLink:
+    """A websocket session's connection to the live model, suspended while the patient is idle.
+
+    ``suspend`` closes the current LiveRequestQueue so ``run_live`` ends and
+    the model connection is released; the ADK session and its history stay.
+    ``resume`` swaps in a fresh queue straight away, so the ``ptt_start`` and
+    audio that caused it are buffered while the next ``run_live`` connects.
+    """
+
+    def __init__(
+        self,
+        queue: LiveRequestQueue,
+        *,
+        trace_id: str,
+        idle_timeout_s: float,
+        registry: MetricsRegistry = metrics_registry,
+    ) -> None:
+        self.queue = queue
+        self.idle_timeout_s = idle_timeout_s
+        self.suspended = False
+        self.closed = False
+        self.suspensions = 0
+        self.resumes = 0
+        self.reconnects = 0
+        self._trace_id = trace_id
+        self._registry = registry
+        self._resumed = asyncio.Event()
+        self._last_activity_at = perf_counter()
+        self._playback_until = 0.0
+        self._reconnect_pending = False
+
+    def attach(self, queue: LiveRequestQueue) -> None:
+        """Starts over on a new live context (after recovery) while keeping the session's counters."""
+        self.queue = queue
+        self.suspended = False
+        self.closed = False
+        self._reconnect_pending = False
+        self._resumed.clear()
+        self.touch()
+
+    def touch(self) -> None:
+        self._last_activity_at = perf_counter()
+
+    def note_playback(self, duration_s: float) -> None:
+        """Counts assistant audio as activity until the client has had time to play it."""
+        now = perf_counter()
+        self._playback_until = max(self._playback_until, now) + duration_s
+        self._last_activity_at = now
+
+    def idle_seconds(self) -> float:
+        return perf_counter() - max(self._last_activity_at, self._playback_until)
+
+    def suspend(self) -> None:
+        if self.suspended or self.closed:
+            return
+        self.suspended = True
+        self.suspensions += 1
+        self._resumed.clear()
+        self.queue.close()
+        self._registry.increment("upstream_suspensions_total")
+        logger.info("[%s] upstream_suspended idle_s=%.1f", self._trace_id, self.idle_seconds())
+
+    def resume(self, reason: str) -> bool:
+        if not self.suspended or self.closed:
+            return False
+        self.queue = _ConnectTimedQueue(self._record_connect)
+        self.suspended = False
+        self.resumes += 1
+        self.touch()
+        self._resumed.set()
+        logger.info("[%s] upstream_resuming reason=%s", self._trace_id, reason)
+        return True
+
+    def reconnect(self, reason: str) -> bool:
+        """Ends the current live stream and starts the next one straight away (for example with another modality).
+
+        Requests sent from here on are buffered in a fresh queue until the next
+        ``run_live`` connects; a suspended link just resumes instead.
+        """
+        if self.closed:
+            return False
+        if self.suspended:
+            return self.resume(reason)
+        previous = self.queue
+        self.queue = _ConnectTimedQueue(self._record_connect)
+        self.reconnects += 1
+        self._reconnect_pending = True
+        previous.close()
+        self.touch()
+        logger.info("[%s] upstream_reconnecting reason=%s", self._trace_id, reason)
+        return True
+
+    def take_reconnect(self) -> bool:
+        pending, self._reconnect_pending = self._reconnect_pending, False
+        return pending
+
+    def close(self) -> None:
+        """Ends the link for good (stop_session or disconnect), waking a stream waiting to resume."""
+        self.closed = True
+        self.queue.close()
+        self._resumed.set()
+
+    async def wait_for_resume(self) -> None:
+        await self._resumed.wait()
+
+    async def suspend_when_idle(self, is_busy: Callable[[], bool]) -> None:
+        """Runs next to a live stream and suspends it once nothing has happened for ``idle_timeout_s``."""
+        while True:
+            remaining_s = self.idle_timeout_s - self.idle_seconds()
+            if remaining_s > 0:
+                await asyncio.sleep(remaining_s)
+                continue
+            if is_busy():
+                self.touch()
+                continue
+            self.suspend()
+            return
+
+    def _record_connect(self, connect_ms: float, buffered_requests: int) -> None:
+        self._registry.histogram("upstream_resume_ms", buckets=UPSTREAM_RESUME_BUCKETS_MS).observe(connect_ms)
+        logger.info(
+            "[%s] upstream_resumed connect_ms=%.1f buffered_requests=%s",
+            self._trace_id,
+            connect_ms,
+            buffered_requests,
+        )
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import json
+import struct
+from collections import OrderedDict, deque
+from typing import Any, Protocol
+
+JSON_PROTOCOL = "json"
+BINARY_PROTOCOL = "binary"
+WIRE_PROTOCOLS = (JSON_PROTOCOL, BINARY_PROTOCOL)
+
+# Binary protocol frames start with "<BB": frame kind, then event type code (0 for audio and unknown types).
+FRAME_HEADER = struct.Struct("<BB")
+FRAME_AUDIO = 0x01
+FRAME_EVENT_JSON = 0x02
+FRAME_EVENT_TEXT = 0x03  # payload is the bare UTF-8 "text" field of a text-only event
+
+EVENT_TYPE_CODES: dict[str, int] = {
+    "session_ready": 1,
+    "profile_status": 2,
+    "partial_transcript": 3,
+    "assistant_text": 4,
+    "assistant_audio_format": 5,
+    "assistant_interrupted": 6,
+    "warning": 7,
+    "emergency_guidance": 8,
+    "fallback_started": 9,
+    "fallback_completed": 10,
+    "session_recovering": 11,
+    "doctor_recommendations": 12,
+    "booking_update": 13,
+    "schedule_snapshot": 14,
+    "adherence_report_saved": 15,
+    "session_queued": 16,
+    "session_rejected": 17,
+    "response_mode": 18,
+    "session_resumed": 19,
+}
+EVENT_TYPES_BY_CODE = {code: event_type for event_type, code in EVENT_TYPE_CODES.items()}
+TEXT_EVENT_TYPES = frozenset({"partial_transcript", "assistant_text"})
+
+_AUDIO_HEADER = FRAME_HEADER.pack(FRAME_AUDIO, 0)
+# One shared encoder: json.dumps with non-default arguments builds a new JSONEncoder on every call.
+_JSON_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+
+class _WebSocketSender(Protocol):
+    async def send_text(self, data: str) -> None: ...
+
+    async def send_bytes(self, data: bytes) -> None: ...
+
+
+def _utf8_length(text: str) -> int:
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+def negotiate_wire_protocol(requested: str | None) -> str:
+    normalized = (requested or "").strip().lower()
+    return normalized if normalized in WIRE_PROTOCOLS else JSON_PROTOCOL
+
+
+def render_json_event(payload: dict[str, Any]) -> str:
+    """Same text Starlette's ``send_json`` produces."""
+    return _JSON_ENCODER.encode(payload)
+
+
+def encode_binary_event(payload: dict[str, Any]) -> bytes:
+    event_type = payload.get("type")
+    code = EVENT_TYPE_CODES.get(event_type, 0) if isinstance(event_type, str) else 0
+    text = payload.get("text")
+    if event_type in TEXT_EVENT_TYPES and len(payload) == 2 and isinstance(text, str):
+        return FRAME_HEADER.pack(FRAME_EVENT_TEXT, code) + text.encode("utf-8")
+    return FRAME_HEADER.pack(FRAME_EVENT_JSON, code) + render_json_event(payload).encode("utf-8")
+
+
+def decode_binary_frame(frame: bytes) -> tuple[int, dict[str, Any] | bytes]:
+    """Reference decoder (what a binary-protocol client implements): audio bytes or the event dict."""
+    kind, code = FRAME_HEADER.unpack_from(frame)
+    body = frame[FRAME_HEADER.size :]
+    if kind == FRAME_AUDIO:
+        return kind, body
+    if kind == FRAME_EVENT_TEXT:
+        return kind, {"type": EVENT_TYPES_BY_CODE[code], "text": body.decode("utf-8")}
+    return kind, json.loads(body)
+
+
+class OutboundChannel:
+    """Every server -> client send goes through here, in the protocol negotiated on connect.
+
+    ``json`` keeps the original wire format: events as JSON text frames and
+    audio as raw binary frames. ``binary`` sends everything as binary frames
+    behind a two-byte header, and transcript events skip JSON entirely.
+    Events made only of scalar fields (status and format events, repeated
+    warnings) are serialized once and then served from a small LRU cache.
+
+    Every frame is numbered (``seq``, from 1). With a resume buffer, the most
+    recent frames are kept in a ring bounded by ``resume_buffer_frames`` and
+    ``resume_buffer_bytes``; while the channel is detached from a websocket,
+    frames only go to the ring, and ``attach`` replays the ones after the
+    client's last seen ``seq`` before sending live again.
+    """
+
+    def __init__(
+        self,
+        websocket: _WebSocketSender,
+        protocol: str = JSON_PROTOCOL,
+        *,
+        cache_size: int = 128,
+        resume_buffer_frames: int = 0,
+        resume_buffer_bytes: int = 0,
+    ) -> None:
+        self.protocol = protocol
+        self._websocket: _WebSocketSender | None = websocket
+        self._binary = protocol == BINARY_PROTOCOL
+        self._cache: OrderedDict[tuple[Any, ...], str | bytes] = OrderedDict()
+        self._cache_size = cache_size
+        self._ring: deque[tuple[int, str | bytes]] = deque()
+        self._ring_bytes = 0
+        self._resume_buffer_frames = resume_buffer_frames
+        self._resume_buffer_bytes = resume_buffer_bytes
+        self.seq = 0
+        self.event_bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def resumable(self) -> bool:
+        return self._resume_buffer_frames > 0
+
+    @property
+    def attached(self) -> bool:
+        return self._websocket is not None
+
+    def detach(self) -> None:
+        """Stops sending; frames keep being numbered and buffered until ``attach``."""
+        self._websocket = None
+
+    async def attach(self, websocket: _WebSocketSender, last_seq: int) -> tuple[int, int]:
+        """Replays the buffered frames after ``last_seq`` on a new websocket, then sends live on it.
+
+        Returns how many frames were replayed and how many the client missed
+        because they had already left the ring. Frames produced while the
+        replay is in flight are buffered and replayed in the same pass, so the
+        client sees them in order.
+        """
+        next_seq = max(0, min(last_seq, self.seq)) + 1
+        oldest_seq = self._ring[0][0] if self._ring else self.seq + 1
+        missed = max(0, oldest_seq - next_seq)
+        replayed = 0
+        while True:
+            pending = [(seq, frame) for seq, frame in self._ring if seq >= next_seq]
+            if not pending:
+                break
+            for seq, frame in pending:
+                if isinstance(frame, bytes):
+                    await websocket.send_bytes(frame)
+                else:
+                    await websocket.send_text(frame)
+                next_seq = seq + 1
+                replayed += 1
+        self._websocket = websocket
+        return replayed, missed
+
+    async def send_event(self, payload: dict[str, Any]) -> None:
+        if payload.get("type") in TEXT_EVENT_TYPES:
+            # Transcript text rarely repeats; caching it would only evict the events that do.
+            frame = encode_binary_event(payload) if self._binary else _JSON_ENCODER.encode(payload)
+        else:
+            frame = self._cached_frame(payload)
+        self.event_bytes += len(frame) if isinstance(frame, bytes) else _utf8_length(frame)
+        await self._transmit(frame)
+
+    async def send_rendered_event(self, rendered: str) -> None:
+        """Sends an event already serialized as JSON text (for example the prerendered emergency events)."""
+        if not self._binary:
+            self.event_bytes += _utf8_length(rendered)
+            await self._transmit(rendered)
+            return
+        frame = self._cache.get(("rendered", rendered))
+        if frame is None:
+            frame = encode_binary_event(json.loads(rendered))
+            self._remember(("rendered", rendered), frame)
+        self.event_bytes += len(frame)
+        await self._transmit(frame)
+
+    async def send_audio(self, data: bytes) -> None:
+        await self._transmit(_AUDIO_HEADER + data if self._binary else data)
+
+    async def _transmit(self, frame: str | bytes) -> None:
+        self.seq += 1
+        if self._resume_buffer_frames > 0:
+            self._buffer(frame)
+        websocket = self._websocket
+        if websocket is None:
+            return
+        try:
+            if isinstance(frame, bytes):
+                await websocket.send_bytes(frame)
+            else:
+                await websocket.send_text(frame)
+        except Exception:
+            if self._resume_buffer_frames <= 0:
+                raise
+            # The frame is in the ring; the client gets it when it resumes.
+            if self._websocket is websocket:
+                self._websocket = None
+
+    def _buffer(self, frame: str | bytes) -> None:
+        size = len(frame) if isinstance(frame, bytes) else _utf8_length(frame)
+        self._ring.append((self.seq, frame))
+        self._ring_bytes += size
+        while len(self._ring) > 1 and (
+            len(self._ring) > self._resume_buffer_frames
+            or (self._resume_buffer_bytes > 0 and self._ring_bytes > self._resume_buffer_bytes)
+        ):
+            _, evicted = self._ring.popleft()
+            self._ring_bytes -= len(evicted) if isinstance(evicted, bytes) else _utf8_length(evicted)
+
+    def _cached_frame(self, payload: dict[str, Any]) -> str | bytes:
+        try:
+            # With the value types in the key, True, 1 and 1.0 do not share a frame.
+            key = tuple((name, type(value), value) for name, value in payload.items())
+            hash(key)
+        except TypeError:
+            # Nested tool payloads are usually unique; serializing them directly is cheaper than keying them.
+            return encode_binary_event(payload) if self._binary else render_json_event(payload)
+        frame = self._cache.get(key)
+        if frame is not None:
+            self.cache_hits += 1
+            self._cache.move_to_end(key)
+            return frame
+        self.cache_misses += 1
+        frame = encode_binary_event(payload) if self._binary else render_json_event(payload)
+        self._remember(key, frame)
+        return frame
+
+    def _remember(self, key: tuple[Any, ...], frame: str | bytes) -> None:
+        self._cache[key] = frame
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
@@ -0,0 +1,50 @@
+"""Measure downlink bytes and encode CPU for each negotiable audio encoding.
+
+Run from the backend directory:
+
+    uv run python -m benchmarks.bench_audio_codecs --seconds 30 --chunk-bytes 4800
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+from time import process_time_ns
+
+import numpy as np
+
+from app.audio_codecs import AUDIO_ENCODINGS
+from app.audio_codecs import create_audio_encoder
+
+SAMPLE_RATE = 24000
+
+
+def _speechlike_pcm(seconds: float) -> bytes:
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    envelope = 0.5 + 0.5 * np.sin(2 * math.pi * 3 * t)
+    tone = 9000 * np.sin(2 * math.pi * 180 * t) + 4000 * np.sin(2 * math.pi * 1400 * t)
+    noise = np.random.default_rng(7).normal(0, 600, t.size)
+    return np.clip(envelope * tone + noise, -32768, 32767).astype("<i2").tobytes()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--chunk-bytes", type=int, default=4800)
+    args = parser.parse_args()
+    pcm = _speechlike_pcm(args.seconds)
+    chunks = [pcm[offset : offset + args.chunk_bytes] for offset in range(0, len(pcm), args.chunk_bytes)]
+
+    for encoding in AUDIO_ENCODINGS:
+        encoder = create_audio_encoder(encoding)
+        started = process_time_ns()
+        wire_bytes = sum(len(encoder.encode(chunk)) for chunk in chunks)
+        cpu_ms = (process_time_ns() - started) / 1e6
+        print(
+            f"{encoding:<10} wire_bytes={wire_bytes} saved={1 - wire_bytes / len(pcm):.1%} "
+            f"kbps={wire_bytes * 8 / args.seconds / 1000:.0f} cpu_ms_per_audio_s={cpu_ms / args.seconds:.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark the emergency-phrase fast path on long streaming transcripts.
+
+Run from the backend directory:
+
+    uv run python -m benchmarks.bench_emergency_matcher --words 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+from time import perf_counter_ns
+
+from app.emergency_matcher import EMERGENCY_PHRASES
+from app.emergency_matcher import EmergencyPhraseScanner
+from app.emergency_matcher import normalize_transcript
+
+_FILLER_WORDS = (
+    "i", "took", "my", "medicine", "after", "lunch", "and", "then", "went", "for", "a", "short", "walk",
+    "felt", "okay", "slightly", "tired", "today", "breakfast", "was", "oats", "with", "fruit", "sleep",
+    "stretch", "breathing", "exercise", "painless", "chesterfield", "strokes", "pressure", "reading",
+)
+
+
+def _build_fragments(word_count: int, fragment_words: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    words = [rng.choice(_FILLER_WORDS) for _ in range(word_count)]
+    # Plant one emergency phrase every ~5k words so the matcher also exercises its hit path.
+    phrases = [phrase for category_phrases in EMERGENCY_PHRASES.values() for phrase in category_phrases]
+    for index in range(0, word_count, 5000):
+        words[index] = rng.choice(phrases)
+    return [" " + " ".join(words[i : i + fragment_words]) for i in range(0, len(words), fragment_words)]
+
+
+def _naive_scan(fragments: list[str], turn_fragments: int) -> int:
+    """Baseline without streaming state: re-check every phrase against the whole turn transcript per fragment."""
+    phrases = [
+        (category, " " + normalize_transcript(phrase).strip())
+        for category, category_phrases in EMERGENCY_PHRASES.items()
+        for phrase in category_phrases
+    ]
+    hits = 0
+    transcript = ""
+    reported: set[str] = set()
+    for index, fragment in enumerate(fragments):
+        if index % turn_fragments == 0:
+            transcript = ""
+            reported = set()
+        transcript += fragment
+        normalized = " " + normalize_transcript(transcript)
+        for category, phrase in phrases:
+            if category not in reported and phrase in normalized:
+                reported.add(category)
+                hits += 1
+    return hits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, default=200_000)
+    parser.add_argument("--fragment-words", type=int, default=4)
+    parser.add_argument("--turn-fragments", type=int, default=500, help="fragments per PTT turn")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    fragments = _build_fragments(args.words, args.fragment_words, args.seed)
+    total_chars = sum(len(fragment) for fragment in fragments)
+
+    scanner = EmergencyPhraseScanner()
+    per_fragment_ns: list[int] = []
+    hits = 0
+    started = perf_counter_ns()
+    for index, fragment in enumerate(fragments):
+        if index % args.turn_fragments == 0:
+            scanner.reset()
+        fragment_started = perf_counter_ns()
+        hits += len(scanner.feed(fragment))
+        per_fragment_ns.append(perf_counter_ns() - fragment_started)
+    automaton_ns = perf_counter_ns() - started
+
+    naive_started = perf_counter_ns()
+    naive_hits = _naive_scan(fragments, args.turn_fragments)
+    naive_ns = perf_counter_ns() - naive_started
+
+    per_fragment_ns.sort()
+    p50 = per_fragment_ns[len(per_fragment_ns) // 2] / 1000
+    p99 = per_fragment_ns[int(len(per_fragment_ns) * 0.99)] / 1000
+    print(f"fragments={len(fragments)} chars={total_chars} phrases={sum(map(len, EMERGENCY_PHRASES.values()))}")
+    print(
+        f"aho_corasick total_ms={automaton_ns / 1e6:.1f} ns_per_char={automaton_ns / total_chars:.1f} "
+        f"fragment_p50_us={p50:.2f} fragment_p99_us={p99:.2f} hits={hits}"
+    )
+    print(f"naive_rescan total_ms={naive_ns / 1e6:.1f} ns_per_char={naive_ns / total_chars:.1f} hits={naive_hits}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,481 @@
+"""Load-test /ws/live with many concurrent push-to-talk clients against a local fake model.
+
+Run from the backend directory:
+
+    uv run python -m benchmarks.bench_live_load --sessions 10,50,100,200 --turns 3
+
+The script starts a server subprocess (``--serve``) whose LiveBridge uses the
+fake live model (``app/fake_live_model.py``) in echo mode, then for each session
+count opens that many websocket clients. Every client streams 16 kHz PCM in
+50 ms packets between ``ptt_start``/``ptt_end``; the model answers each turn
+with a transcript, a real ``get_today_schedule`` tool call and the turn audio
+echoed back. Per step it reports turn latency (``ptt_end`` to first audio
+frame), server event-loop lag, and server CPU and RSS per session.
+``--error-turns`` injects 1007 errors to measure the recovery path under load.
+``--max-sessions`` puts an AdmissionController in front of the bridge; clients
+turned away with ``session_rejected`` are counted as shed, not as errors.
+``--mux-channels N`` runs the sessions as channels of ``/ws/live/mux``, N
+patients per websocket, instead of one websocket each.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import urllib.request
+from contextlib import asynccontextmanager
+from pathlib import Path
+from time import perf_counter, process_time, sleep
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from fastapi import FastAPI, WebSocket
+
+from app.admission import AdmissionController
+from app.fake_live_model import FakeLiveModelConfig
+from app.live_bridge import LiveBridge
+from app.live_mux import LiveMultiplexer
+from app.logging_config import configure_logging
+from app.patient_profile_repository import PatientProfileRepository
+from app.patient_profile_service import PatientProfileService
+from app.schedule_repository import ScheduleRepository
+from app.schedule_service import ScheduleService
+
+SAMPLE_RATE_HZ = 16000
+PACKET_MS = 50
+PACKET_BYTES = SAMPLE_RATE_HZ * 2 * PACKET_MS // 1000
+LOAD_USER_IDS = ("raksha-user", "raksha-user-b")
+
+
+def _read_rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class _LoopLagMonitor:
+    def __init__(self, interval_s: float = 0.02) -> None:
+        self._interval_s = interval_s
+        self.reset()
+
+    def reset(self) -> None:
+        self.samples_ms: list[float] = []
+        self.baseline_rss = _read_rss_bytes()
+        self.peak_rss = self.baseline_rss
+        self.cpu_started = process_time()
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        ticks = 0
+        while True:
+            expected = loop.time() + self._interval_s
+            await asyncio.sleep(self._interval_s)
+            self.samples_ms.append(max(0.0, (loop.time() - expected) * 1000))
+            ticks += 1
+            if ticks % 25 == 0:
+                self.peak_rss = max(self.peak_rss, _read_rss_bytes())
+
+    def snapshot(self) -> dict[str, Any]:
+        ordered = sorted(self.samples_ms)
+        return {
+            "loopLagP50Ms": _percentile(ordered, 0.50),
+            "loopLagP99Ms": _percentile(ordered, 0.99),
+            "loopLagMaxMs": ordered[-1] if ordered else 0.0,
+            "cpuSeconds": process_time() - self.cpu_started,
+            "rssBaselineBytes": self.baseline_rss,
+            "rssPeakBytes": max(self.peak_rss, _read_rss_bytes()),
+        }
+
+
+def build_load_app(
+    *,
+    latency_ms: float,
+    chunk_bytes: int,
+    error_turns: tuple[int, ...] = (),
+    max_sessions: int = 0,
+    admission_queue: int = 50,
+    admission_timeout_s: float = 15.0,
+) -> FastAPI:
+    data_dir = Path(__file__).resolve().parent.parent / "app" / "data"
+    db_path = Path(tempfile.mkdtemp(prefix="raksha-load-")) / "load.db"
+    db_url = f"sqlite:///{db_path}"
+    profile_repository = PatientProfileRepository(db_url=db_url, seed_sql_path=data_dir / "patient_profiles.sql")
+    profile_repository.initialize()
+    schedule_repository = ScheduleRepository(db_url=db_url, seed_sql_path=data_dir / "schedules.sql")
+    schedule_repository.initialize()
+
+    bridge = LiveBridge(
+        app_name="raksha-load",
+        model="fake-echo",
+        gemini_api_key="load-test",
+        patient_profile_service=PatientProfileService(profile_repository),
+        schedule_service=ScheduleService(schedule_repository),
+        fake_live_model=FakeLiveModelConfig(
+            response_latency_ms=latency_ms,
+            audio_sample_rate=SAMPLE_RATE_HZ,
+            audio_chunk_bytes=chunk_bytes,
+            echo_input_audio=True,
+            input_transcript="what is on my schedule today",
+            output_transcript="Here is your plan for today.",
+            # One transcript after the audio marks the end of the turn for the client.
+            output_transcription_every_chunks=0,
+            tool_calls=("get_today_schedule",),
+            error_turns=error_turns,
+        ),
+        admission=(
+            AdmissionController(
+                max_sessions=max_sessions,
+                max_sessions_per_user=0,
+                max_queue=admission_queue,
+                queue_timeout_s=admission_timeout_s,
+            )
+            if max_sessions > 0
+            else None
+        ),
+    )
+    monitor = _LoopLagMonitor()
+
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+        task = asyncio.create_task(monitor.run())
+        yield
+        task.cancel()
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.get("/health")
+    async def health() -> dict[str, str]:
+        return {"status": "ok"}
+
+    @app.get("/bench/stats")
+    async def stats(reset: bool = False) -> dict[str, Any]:
+        snapshot = monitor.snapshot()
+        if reset:
+            monitor.reset()
+        return snapshot
+
+    @app.websocket("/ws/live")
+    async def ws_live(websocket: WebSocket) -> None:
+        user_id = websocket.query_params.get("user_id", "raksha-user")
+        await bridge.run_websocket(websocket, user_id=user_id, timezone_name="Asia/Kolkata")
+
+    @app.websocket("/ws/live/mux")
+    async def ws_live_mux(websocket: WebSocket) -> None:
+        await LiveMultiplexer(bridge, max_channels=255).run(websocket)
+
+    return app
+
+
+def _serve(args: argparse.Namespace) -> None:
+    import uvicorn
+
+    configure_logging(args.log_level)
+    app = build_load_app(
+        latency_ms=args.model_latency_ms,
+        chunk_bytes=args.chunk_bytes,
+        error_turns=_parse_turns(args.error_turns),
+        max_sessions=args.max_sessions,
+        admission_queue=args.admission_queue,
+        admission_timeout_s=args.admission_timeout_s,
+    )
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning", ws_max_size=1 << 20)
+
+
+async def _drive_session(
+    send_event: Callable[[dict[str, Any]], Awaitable[None]],
+    send_audio: Callable[[bytes], Awaitable[None]],
+    receive: Callable[[], Awaitable[dict[str, Any] | bytes]],
+    *,
+    turns: int,
+    turn_audio_ms: int,
+    latencies_ms: list[float],
+    recoveries_ms: list[float],
+    shed: list[str],
+) -> None:
+    packet = bytes(range(256)) * (PACKET_BYTES // 256) + bytes(PACKET_BYTES % 256)
+    packets_per_turn = max(1, turn_audio_ms // PACKET_MS)
+    ready = {"session_ready": False, "profile_status": False}
+    while not all(ready.values()):
+        message = await receive()
+        if isinstance(message, bytes):
+            continue
+        if message.get("type") == "session_rejected":
+            shed.append(message.get("reason", ""))
+            return
+        if message.get("type") in ready:
+            ready[message["type"]] = True
+
+    for _ in range(turns):
+        await send_event({"type": "ptt_start"})
+        next_send = perf_counter()
+        for _ in range(packets_per_turn):
+            await send_audio(packet)
+            next_send += PACKET_MS / 1000
+            await asyncio.sleep(max(0.0, next_send - perf_counter()))
+        await send_event({"type": "ptt_end"})
+        ended_at = perf_counter()
+
+        first_audio_at: float | None = None
+        recovering = False
+        while True:
+            message = await asyncio.wait_for(receive(), timeout=30)
+            if isinstance(message, bytes):
+                if first_audio_at is None:
+                    first_audio_at = perf_counter()
+                continue
+            event_type = message.get("type")
+            if event_type == "fallback_started":
+                recovering = True
+            elif event_type == "assistant_text" and not recovering:
+                break
+            elif event_type == "session_ready" and recovering:
+                # The bridge reopened the live stream; the next turn can start.
+                recoveries_ms.append((perf_counter() - ended_at) * 1000)
+                break
+        if first_audio_at is not None:
+            latencies_ms.append((first_audio_at - ended_at) * 1000)
+    await send_event({"type": "stop_session"})
+
+
+async def _run_client(
+    url: str,
+    *,
+    start_delay_s: float,
+    errors: list[str],
+    **session: Any,
+) -> None:
+    from websockets.asyncio.client import connect
+
+    await asyncio.sleep(start_delay_s)
+    try:
+        async with connect(url, max_size=1 << 20, open_timeout=30) as websocket:
+
+            async def _receive() -> dict[str, Any] | bytes:
+                message = await websocket.recv()
+                return message if isinstance(message, bytes) else json.loads(message)
+
+            await _drive_session(
+                lambda event: websocket.send(json.dumps(event)),
+                websocket.send,
+                _receive,
+                **session,
+            )
+    except Exception as exc:  # noqa: BLE001
+        errors.append(f"{type(exc).__name__}: {exc}")
+
+
+async def _run_mux_client(
+    url: str,
+    user_ids: list[str],
+    *,
+    start_delay_s: float,
+    errors: list[str],
+    **session: Any,
+) -> None:
+    """One websocket carrying a channel per patient; channel ids are 1-based positions in ``user_ids``."""
+    from websockets.asyncio.client import connect
+
+    await asyncio.sleep(start_delay_s)
+    inboxes: dict[int, asyncio.Queue[dict[str, Any] | bytes]] = {
+        channel_id: asyncio.Queue() for channel_id in range(1, len(user_ids) + 1)
+    }
+
+    async def _drive_channel(websocket: Any, channel_id: int) -> None:
+        try:
+            await _drive_session(
+                lambda event: websocket.send(json.dumps({"channel": channel_id, **event})),
+                lambda audio: websocket.send(bytes((channel_id,)) + audio),
+                inboxes[channel_id].get,
+                **session,
+            )
+        except Exception as exc:  # noqa: BLE001
+            errors.append(f"{type(exc).__name__}: {exc}")
+
+    try:
+        async with connect(url, max_size=1 << 20, open_timeout=30) as websocket:
+
+            async def _demultiplex() -> None:
+                async for message in websocket:
+                    if isinstance(message, bytes):
+                        inboxes[message[0]].put_nowait(message[1:])
+                    else:
+                        frame = json.loads(message)
+                        inboxes[frame["channel"]].put_nowait(frame["event"])
+
+            reader = asyncio.create_task(_demultiplex())
+            for channel_id, user_id in enumerate(user_ids, start=1):
+                await websocket.send(json.dumps({"channel": channel_id, "type": "channel_open", "user_id": user_id}))
+            await asyncio.gather(*(_drive_channel(websocket, channel_id) for channel_id in inboxes))
+            reader.cancel()
+    except Exception as exc:  # noqa: BLE001
+        errors.append(f"{type(exc).__name__}: {exc}")
+
+
+def _fetch_stats(base_url: str, *, reset: bool) -> dict[str, Any]:
+    with urllib.request.urlopen(f"{base_url}/bench/stats?reset={'true' if reset else 'false'}", timeout=10) as response:
+        return json.loads(response.read())
+
+
+async def _run_step(args: argparse.Namespace, sessions: int) -> dict[str, Any]:
+    base_url = f"http://127.0.0.1:{args.port}"
+    await asyncio.to_thread(_fetch_stats, base_url, reset=True)
+    latencies_ms: list[float] = []
+    recoveries_ms: list[float] = []
+    errors: list[str] = []
+    shed: list[str] = []
+    session = {
+        "turns": args.turns,
+        "turn_audio_ms": args.turn_audio_ms,
+        "latencies_ms": latencies_ms,
+        "recoveries_ms": recoveries_ms,
+        "shed": shed,
+    }
+    user_ids = [LOAD_USER_IDS[index % len(LOAD_USER_IDS)] for index in range(sessions)]
+    started = perf_counter()
+    if args.mux_channels > 0:
+        groups = [user_ids[start : start + args.mux_channels] for start in range(0, sessions, args.mux_channels)]
+        clients = [
+            _run_mux_client(
+                f"ws://127.0.0.1:{args.port}/ws/live/mux",
+                group,
+                start_delay_s=args.ramp_s * index / len(groups),
+                errors=errors,
+                **session,
+            )
+            for index, group in enumerate(groups)
+        ]
+    else:
+        clients = [
+            _run_client(
+                f"ws://127.0.0.1:{args.port}/ws/live?user_id={user_id}",
+                # Spread connects over the ramp so sessions do not all open in the same tick.
+                start_delay_s=args.ramp_s * index / sessions,
+                errors=errors,
+                **session,
+            )
+            for index, user_id in enumerate(user_ids)
+        ]
+    await asyncio.gather(*clients)
+    wall_s = perf_counter() - started
+    for error in sorted(set(errors)):
+        print(f"client_error count={errors.count(error)} {error}", file=sys.stderr)
+    server = await asyncio.to_thread(_fetch_stats, base_url, reset=False)
+    ordered = sorted(latencies_ms)
+    ordered_recoveries = sorted(recoveries_ms)
+    return {
+        "sessions": sessions,
+        "connections": len(clients),
+        "turns": len(latencies_ms),
+        "errors": len(errors),
+        "shed": len(shed),
+        "wall_s": wall_s,
+        "turn_p50_ms": _percentile(ordered, 0.50),
+        "turn_p99_ms": _percentile(ordered, 0.99),
+        "recoveries": len(recoveries_ms),
+        "recovery_p50_ms": _percentile(ordered_recoveries, 0.50),
+        "lag_p50_ms": server["loopLagP50Ms"],
+        "lag_p99_ms": server["loopLagP99Ms"],
+        "lag_max_ms": server["loopLagMaxMs"],
+        "cpu_ms_per_session": server["cpuSeconds"] * 1000 / sessions,
+        "rss_kib_per_session": max(0, server["rssPeakBytes"] - server["rssBaselineBytes"]) / 1024 / sessions,
+    }
+
+
+def _wait_for_server(base_url: str, process: subprocess.Popen[bytes], timeout_s: float = 60.0) -> None:
+    deadline = perf_counter() + timeout_s
+    while perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"load server exited with code {process.returncode}")
+        try:
+            with urllib.request.urlopen(f"{base_url}/health", timeout=1):
+                return
+        except OSError:
+            sleep(0.1)
+    raise RuntimeError("load server did not become healthy")
+
+
+def _parse_turns(value: str) -> tuple[int, ...]:
+    return tuple(int(turn) for turn in value.split(",") if turn.strip())
+
+
+def _percentile(ordered: list[float], quantile: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * quantile))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--sessions", default="10,50,100", help="comma-separated concurrent session counts")
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--turn-audio-ms", type=int, default=1000)
+    parser.add_argument("--ramp-s", type=float, default=1.0)
+    parser.add_argument("--model-latency-ms", type=float, default=150.0)
+    parser.add_argument("--chunk-bytes", type=int, default=3200)
+    parser.add_argument("--error-turns", default="", help="comma-separated turns per stream that fail with 1007")
+    parser.add_argument("--max-sessions", type=int, default=0, help="admission cap on concurrent sessions; 0 disables")
+    parser.add_argument("--admission-queue", type=int, default=50)
+    parser.add_argument("--admission-timeout-s", type=float, default=15.0)
+    parser.add_argument("--mux-channels", type=int, default=0, help="sessions per multiplexed websocket; 0 disables")
+    parser.add_argument("--log-level", default="warning", help="server log level; 'info' includes per-chunk tracing")
+    args = parser.parse_args()
+
+    if args.serve:
+        _serve(args)
+        return
+
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.bench_live_load",
+        "--serve",
+        "--port",
+        str(args.port),
+        "--model-latency-ms",
+        str(args.model_latency_ms),
+        "--chunk-bytes",
+        str(args.chunk_bytes),
+        "--log-level",
+        args.log_level,
+        "--error-turns",
+        args.error_turns,
+        "--max-sessions",
+        str(args.max_sessions),
+        "--admission-queue",
+        str(args.admission_queue),
+        "--admission-timeout-s",
+        str(args.admission_timeout_s),
+    ]
+    server = subprocess.Popen(command, cwd=Path(__file__).resolve().parent.parent)
+    try:
+        _wait_for_server(f"http://127.0.0.1:{args.port}", server)
+        print(
+            "sessions conns turns errors shed wall_s turn_p50_ms turn_p99_ms recoveries recovery_p50_ms lag_p50_ms lag_p99_ms lag_max_ms "
+            "cpu_ms/session rss_kib/session"
+        )
+        for sessions in (int(value) for value in args.sessions.split(",") if value.strip()):
+            row = asyncio.run(_run_step(args, sessions))
+            print(
+                f"{row['sessions']:>8} {row['connections']:>5} {row['turns']:>5} {row['errors']:>6} {row['shed']:>4} {row['wall_s']:>6.1f} "
+                f"{row['turn_p50_ms']:>11.1f} {row['turn_p99_ms']:>11.1f} {row['recoveries']:>10} "
+                f"{row['recovery_p50_ms']:>15.1f} {row['lag_p50_ms']:>10.2f} "
+                f"{row['lag_p99_ms']:>10.2f} {row['lag_max_ms']:>10.2f} {row['cpu_ms_per_session']:>14.1f} "
+                f"{row['rss_kib_per_session']:>15.1f}",
+                flush=True,
+            )
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Replay a captured live session through LiveBridge without the Gemini Live API.
+
+Capture a real session by starting the backend with LIVE_CAPTURE_DIR set, then
+run from the backend directory:
+
+    uv run python -m benchmarks.bench_live_replay --recording captures/live-<trace>.rklv
+
+Without --recording a deterministic synthetic session is generated first.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+from pathlib import Path
+
+from google.adk.events import Event
+from google.genai import types
+
+from app.session_recorder import SessionRecorder
+from app.session_replay import replay_recording
+
+_PHRASES = (
+    "I took my morning walk",
+    "my knee felt a little sore afterwards",
+    "what should I do before lunch",
+    "remind me about my evening medicine",
+)
+
+
+def synthesize_recording(directory: Path, *, turns: int, seed: int) -> Path:
+    """Writes a fixed-shape session: per turn 2 s of uplink PCM, transcripts and 3 s of downlink audio."""
+    rng = random.Random(seed)
+    recorder = SessionRecorder.open(directory, f"synthetic-{seed}")
+    recorder.record_session_start(user_id="replay-user", timezone_name="Asia/Kolkata")
+    uplink_frame = bytes(rng.getrandbits(8) for _ in range(1600))
+    downlink_chunk = bytes(rng.getrandbits(8) for _ in range(9600))
+
+    for _ in range(turns):
+        recorder.record_inbound_text(json.dumps({"type": "ptt_start"}))
+        for _ in range(40):
+            recorder.record_inbound_audio(uplink_frame)
+        recorder.record_inbound_text(json.dumps({"type": "ptt_end"}))
+
+        words = rng.choice(_PHRASES).split()
+        for index in range(1, len(words) + 1):
+            recorder.record_upstream_event(
+                Event(author="user", input_transcription=types.Transcription(text=" ".join(words[:index])))
+            )
+        for _ in range(15):
+            recorder.record_upstream_event(
+                Event(
+                    author="raksha",
+                    content=types.Content(
+                        role="model",
+                        parts=[types.Part(inline_data=types.Blob(mime_type="audio/pcm;rate=24000", data=downlink_chunk))],
+                    ),
+                )
+            )
+        recorder.record_upstream_event(
+            Event(author="raksha", output_transcription=types.Transcription(text="Here is what I found."))
+        )
+        recorder.record_upstream_event(Event(author="raksha", turn_complete=True))
+
+    recorder.close()
+    assert recorder.path is not None
+    return recorder.path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recording", type=Path, default=None)
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--speed", type=float, default=0.0, help="0 replays as fast as possible, 1.0 in real time")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        recording = args.recording or synthesize_recording(Path(scratch), turns=args.turns, seed=args.seed)
+        print(f"recording={recording} bytes={recording.stat().st_size}")
+        for run in range(1, args.repeat + 1):
+            report = asyncio.run(replay_recording(recording, speed=args.speed))
+            print(
+                f"run={run} events={report.upstream_events} inbound={report.inbound_frames} "
+                f"wall_ms={report.wall_ms:.1f} "
+                f"event_us p50={report.event_overhead_p50_us:.1f} p99={report.event_overhead_p99_us:.1f} "
+                f"inbound_us p50={report.inbound_overhead_p50_us:.1f} p99={report.inbound_overhead_p99_us:.1f} "
+                f"tx_text={report.tx_text_frames} tx_binary={report.tx_binary_frames} tx_bytes={report.tx_bytes}"
+            )
+
+
+if __name__ == "__main__":
+    main()
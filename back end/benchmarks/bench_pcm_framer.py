@@ -0,0 +1,79 @@
+"""Compare per-packet upstream sends with PcmFramer re-chunking on the inbound audio path.
+
+Run from the backend directory:
+
+    uv run python -m benchmarks.bench_pcm_framer --sessions 500 --turn-ms 3000
+"""
+
+from __future__ import annotations
+
+import argparse
+from time import perf_counter_ns
+
+from google.adk.agents.live_request_queue import LiveRequestQueue
+from google.genai import types
+
+from app.pcm_framer import PcmFramer
+
+PACKET = bytes(range(256)) * 6 + bytes(64)  # 1600 bytes = 50 ms of 16 kHz PCM16
+
+
+def _per_packet(queues: list[LiveRequestQueue], packets: int) -> int:
+    for queue in queues:
+        for _ in range(packets):
+            queue.send_realtime(types.Blob(mime_type="audio/pcm;rate=16000", data=PACKET))
+    return sum(queue._queue.qsize() for queue in queues)
+
+
+def _framed(queues: list[LiveRequestQueue], packets: int, frame_ms: int, *, upstream_keeps_up: bool) -> int:
+    # Same framer settings and backlog feedback as LiveBridge; a keeping-up upstream empties the queue after each send.
+    sent = 0
+    for queue in queues:
+        framer = PcmFramer(frame_ms=frame_ms, min_frame_ms=min(50, frame_ms), max_frame_ms=max(frame_ms, 200))
+        for _ in range(packets):
+            for frame in framer.push(PACKET):
+                framer.observe_backlog(queue._queue.qsize())
+                queue.send_realtime(types.Blob(mime_type="audio/pcm;rate=16000", data=frame))
+                sent += 1
+                if upstream_keeps_up:
+                    queue._queue.get_nowait()
+        tail = framer.flush()
+        if tail is not None:
+            queue.send_realtime(types.Blob(mime_type="audio/pcm;rate=16000", data=tail))
+            sent += 1
+    return sent
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--turn-ms", type=int, default=3000)
+    args = parser.parse_args()
+    packets = args.turn_ms // 50
+    total_packets = args.sessions * packets
+
+    rows = [("per-packet", lambda queues: _per_packet(queues, packets))]
+    for frame_ms in (100, 200):
+        for upstream_keeps_up, upstream in ((True, "idle"), (False, "stalled")):
+            rows.append(
+                (
+                    f"framed-{frame_ms}ms-{upstream}",
+                    lambda queues, frame_ms=frame_ms, keeps_up=upstream_keeps_up: _framed(
+                        queues, packets, frame_ms, upstream_keeps_up=keeps_up
+                    ),
+                )
+            )
+
+    for label, run in rows:
+        queues = [LiveRequestQueue() for _ in range(args.sessions)]
+        started = perf_counter_ns()
+        messages = run(queues)
+        elapsed_ns = perf_counter_ns() - started
+        print(
+            f"{label:<22} packets={total_packets} upstream_messages={messages} "
+            f"ns_per_packet={elapsed_ns / total_packets:.0f} total_ms={elapsed_ns / 1e6:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Measure StreamingResampler throughput as a real-time factor per core.
+
+Run from the backend directory:
+
+    uv run python -m benchmarks.bench_resampler --seconds 60 --chunk-ms 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+from time import process_time_ns
+
+import numpy as np
+
+from app.resampler import StreamingResampler
+
+CONVERSIONS = (
+    (48000, 16000),  # uplink from 48 kHz hardware
+    (44100, 16000),  # uplink from 44.1 kHz hardware
+    (24000, 48000),  # downlink to 48 kHz hardware
+    (24000, 44100),  # downlink to 44.1 kHz hardware
+)
+
+
+def _speechlike_pcm(sample_rate: int, seconds: float) -> bytes:
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    tone = 9000 * np.sin(2 * math.pi * 180 * t) + 4000 * np.sin(2 * math.pi * 1400 * t)
+    return np.clip(tone, -32768, 32767).astype("<i2").tobytes()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--chunk-ms", type=int, default=50)
+    args = parser.parse_args()
+
+    for input_rate, output_rate in CONVERSIONS:
+        pcm = _speechlike_pcm(input_rate, args.seconds)
+        chunk_bytes = input_rate * args.chunk_ms // 1000 * 2
+        resampler = StreamingResampler(input_rate, output_rate)
+        started = process_time_ns()
+        out_bytes = 0
+        for offset in range(0, len(pcm), chunk_bytes):
+            out_bytes += len(resampler.process(pcm[offset : offset + chunk_bytes]))
+        cpu_s = (process_time_ns() - started) / 1e9
+        realtime_factor = args.seconds / cpu_s
+        print(
+            f"{input_rate:>5}->{output_rate:<5} chunk_ms={args.chunk_ms} out_samples={out_bytes // 2} "
+            f"rtf_per_core={realtime_factor:.0f}x cpu_us_per_chunk={cpu_s * 1e6 * chunk_bytes / len(pcm):.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
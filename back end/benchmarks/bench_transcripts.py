@@ -0,0 +1,59 @@
+"""Compare transcript events and bytes for per-fragment and coalesced delta streaming.
+
+Fragments arrive in real time, so a run takes about fragments * fragment-interval-ms.
+Run from the backend directory:
+
+    uv run python -m benchmarks.bench_transcripts --fragments 150 --fragment-interval-ms 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from typing import Any
+
+from app.transcript_stream import OUTPUT_STREAM
+from app.transcript_stream import TranscriptCoalescer
+from app.wire_protocol import render_json_event
+
+_ANSWER = (
+    "Your blood pressure readings this week are a little higher than your target, so keep taking the "
+    "evening dose with food, cut back on salty snacks, and check again tomorrow morning before breakfast."
+).split()
+
+
+def _fragments(count: int) -> list[str]:
+    return [(" " if index else "") + _ANSWER[index % len(_ANSWER)] for index in range(count)]
+
+
+async def _coalesced(fragments: list[str], fragment_interval_s: float, coalesce_ms: int) -> tuple[int, int]:
+    sizes: list[int] = []
+
+    async def _send(update: dict[str, Any]) -> None:
+        sizes.append(len(render_json_event(update).encode("utf-8")))
+
+    coalescer = TranscriptCoalescer(_send, interval_ms=coalesce_ms)
+    for fragment in fragments:
+        await coalescer.add(OUTPUT_STREAM, fragment)
+        await asyncio.sleep(fragment_interval_s)
+    await coalescer.end_turn()
+    return len(sizes), sum(sizes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fragments", type=int, default=150)
+    parser.add_argument("--fragment-interval-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    fragments = _fragments(args.fragments)
+
+    legacy_bytes = sum(len(render_json_event({"type": "assistant_text", "text": text}).encode("utf-8")) for text in fragments)
+    print(f"{'per-fragment':<14} events={len(fragments)} bytes={legacy_bytes}")
+    for coalesce_ms in (0, 50, 100, 200):
+        events, sent_bytes = asyncio.run(_coalesced(fragments, args.fragment_interval_ms / 1000, coalesce_ms))
+        label = f"delta-{coalesce_ms}ms"
+        print(f"{label:<14} events={events} bytes={sent_bytes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Compare event encoding CPU and bytes per session for the JSON and binary websocket protocols.
+
+Run from the backend directory:
+
+    uv run python -m benchmarks.bench_wire_protocol --sessions 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from time import process_time_ns
+from typing import Any
+
+from app.wire_protocol import BINARY_PROTOCOL
+from app.wire_protocol import JSON_PROTOCOL
+from app.wire_protocol import OutboundChannel
+
+_USER_WORDS = "I have been feeling dizzy since this morning and my chest feels tight after the walk".split()
+_ASSISTANT_WORDS = (
+    "I am sorry you are feeling that way. Please sit down, take slow breaths, and tell me if the "
+    "tightness spreads to your arm or jaw. I have your evening schedule here if you need it."
+).split()
+
+
+def _session_events(turns: int) -> list[dict[str, Any]]:
+    """Roughly what one push-to-talk session sends besides audio."""
+    events: list[dict[str, Any]] = [
+        {"type": "session_ready", "sessionId": "5f0c1e2a-7d4b-4c1e-9a51-2d9c0b7e6f11"},
+        {"type": "profile_status", "loaded": True, "source": "db", "message": "Loaded patient profile."},
+    ]
+    for _ in range(turns):
+        for index in range(1, len(_USER_WORDS) + 1):
+            events.append({"type": "partial_transcript", "text": " ".join(_USER_WORDS[:index])})
+        events.append({"type": "assistant_audio_format", "sampleRate": 24000, "encoding": "pcm16"})
+        for word in _ASSISTANT_WORDS:
+            events.append({"type": "assistant_text", "text": f" {word}"})
+        events.append(
+            {
+                "type": "schedule_snapshot",
+                "date": "2026-10-19",
+                "timezone": "Asia/Kolkata",
+                "items": [{"id": f"item-{slot}", "title": "Metformin 500 mg", "time": f"{8 + slot}:00"} for slot in range(6)],
+            }
+        )
+    events.append({"type": "assistant_interrupted"})
+    return events
+
+
+class _NullWebSocket:
+    def __init__(self) -> None:
+        self.frames = 0
+
+    async def send_text(self, data: str) -> None:
+        data.encode("utf-8")  # Starlette encodes text frames before writing them
+        self.frames += 1
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.frames += 1
+
+
+async def _send_json_baseline(websocket: _NullWebSocket, events: list[dict[str, Any]]) -> int:
+    sent = 0
+    for event in events:
+        text = json.dumps(event, separators=(",", ":"), ensure_ascii=False)
+        sent += len(text.encode("utf-8"))
+        await websocket.send_text(text)
+    return sent
+
+
+async def _send_channel(protocol: str, events: list[dict[str, Any]], sessions: int) -> tuple[int, int]:
+    event_bytes = 0
+    cache_hits = 0
+    for _ in range(sessions):
+        channel = OutboundChannel(_NullWebSocket(), protocol)
+        for event in events:
+            await channel.send_event(event)
+        event_bytes += channel.event_bytes
+        cache_hits += channel.cache_hits
+    return event_bytes, cache_hits
+
+
+async def _run(sessions: int, turns: int) -> None:
+    events = _session_events(turns)
+    started = process_time_ns()
+    baseline_bytes = 0
+    for _ in range(sessions):
+        baseline_bytes += await _send_json_baseline(_NullWebSocket(), events)
+    baseline_ns = process_time_ns() - started
+    print(
+        f"send_json  events_per_session={len(events)} bytes_per_session={baseline_bytes // sessions} "
+        f"cpu_us_per_session={baseline_ns / sessions / 1000:.1f}"
+    )
+
+    for protocol in (JSON_PROTOCOL, BINARY_PROTOCOL):
+        started = process_time_ns()
+        event_bytes, cache_hits = await _send_channel(protocol, events, sessions)
+        elapsed_ns = process_time_ns() - started
+        print(
+            f"{protocol:<10} events_per_session={len(events)} bytes_per_session={event_bytes // sessions} "
+            f"cpu_us_per_session={elapsed_ns / sessions / 1000:.1f} cache_hits_per_session={cache_hits // sessions}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--turns", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(_run(args.sessions, args.turns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, Callable
+
+import pytest
+from fastapi import WebSocketDisconnect
+
+from app.fake_live_model import FakeLiveModelConfig
+from app.live_bridge import LiveBridge
+
+
+class ScriptedWebSocket:
+    """A client that plays ``frames`` and then stays connected until ``done(sent)`` holds.
+
+    Dicts are sent as text, bytes as binary, and floats pause for that many
+    seconds. With ``drop_when_exhausted`` the connection drops (the way
+    Starlette reports it) as soon as the script runs out instead.
+    """
+
+    def __init__(
+        self,
+        frames: list[Any],
+        done: Callable[[list[dict[str, Any]]], bool],
+        *,
+        drop_when_exhausted: bool = False,
+    ) -> None:
+        self.query_params: dict[str, str] = {}
+        self._frames = list(frames)
+        self._done = done
+        self._drop_when_exhausted = drop_when_exhausted
+        self.sent: list[dict[str, Any]] = []
+        self.binary_frames = 0
+        self.binary_bytes = b""
+        self.binary_payloads: list[bytes] = []
+        self.close_code: int | None = None
+
+    async def accept(self) -> None:
+        return None
+
+    async def close(self, code: int = 1000) -> None:
+        self.close_code = code
+
+    async def receive(self) -> dict[str, Any]:
+        while self._frames:
+            frame = self._frames.pop(0)
+            await asyncio.sleep(0)
+            if isinstance(frame, float):
+                await asyncio.sleep(frame)
+                continue
+            if isinstance(frame, bytes):
+                return {"type": "websocket.receive", "bytes": frame}
+            return {"type": "websocket.receive", "text": json.dumps(frame)}
+        if self._drop_when_exhausted:
+            return {"type": "websocket.disconnect", "code": 1006}
+        while not self._done(self.sent):
+            await asyncio.sleep(0.001)
+        raise WebSocketDisconnect(1000)
+
+    async def send_json(self, data: dict[str, Any]) -> None:
+        self.sent.append(data)
+
+    async def send_text(self, data: str) -> None:
+        self.sent.append(json.loads(data))
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.binary_frames += 1
+        self.binary_bytes += data
+        self.binary_payloads.append(data)
+
+
+@pytest.fixture
+def scripted_websocket() -> type[ScriptedWebSocket]:
+    return ScriptedWebSocket
+
+
+@pytest.fixture
+def fake_bridge() -> Callable[..., LiveBridge]:
+    """Builds a LiveBridge on the offline fake model; keyword arguments go to LiveBridge."""
+
+    def _build(fake_live_model: FakeLiveModelConfig | None = None, *, model: str = "fake", **kwargs: Any) -> LiveBridge:
+        return LiveBridge(
+            app_name="raksha-test",
+            model=model,
+            gemini_api_key="fake-key",
+            fake_live_model=fake_live_model or FakeLiveModelConfig(response_latency_ms=0, tool_calls=()),
+            **kwargs,
+        )
+
+    return _build
+
+
+@pytest.fixture
+def run_session() -> Callable[..., None]:
+    """Runs one ``run_websocket`` session to completion, failing after ``timeout`` seconds."""
+
+    def _run(bridge: LiveBridge, websocket: Any, *, user_id: str = "raksha-user", timeout: float = 10, **kwargs: Any) -> None:
+        asyncio.run(asyncio.wait_for(bridge.run_websocket(websocket, user_id=user_id, **kwargs), timeout=timeout))
+
+    return _run
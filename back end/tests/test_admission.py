@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable
+
+import pytest
+
+from app.admission import REJECT_QUEUE_FULL
+from app.admission import REJECT_QUEUE_TIMEOUT
+from app.admission import REJECT_USER_LIMIT
+from app.admission import AdmissionController
+from app.admission import AdmissionRejected
+from app.live_bridge import LiveBridge
+from app.metrics import MetricsRegistry
+
+
+def _controller(**overrides: float) -> AdmissionController:
+    settings = {"max_sessions": 2, "max_sessions_per_user": 2, "max_queue": 2, "queue_timeout_s": 1.0, **overrides}
+    return AdmissionController(registry=MetricsRegistry(), **settings)  # type: ignore[arg-type]
+
+
+def test_per_user_cap_rejects_without_taking_a_slot() -> None:
+    controller = _controller(max_sessions=10)
+    controller.try_admit("u1")
+    controller.try_admit("u1")
+
+    with pytest.raises(AdmissionRejected) as exc_info:
+        controller.try_admit("u1")
+
+    assert exc_info.value.reason == REJECT_USER_LIMIT
+    assert controller.try_admit("u2") is not None
+    assert controller.active == 3
+
+
+def test_queued_sessions_hear_positions_and_get_released_slots_in_order() -> None:
+    controller = _controller(max_sessions=1)
+    positions: dict[str, list[int]] = {"b": [], "c": []}
+
+    async def _run() -> list[str]:
+        first = controller.try_admit("a")
+        assert first is not None
+        admitted: list[str] = []
+
+        async def _wait(user_id: str) -> None:
+            async def _on_queued(position: int) -> None:
+                positions[user_id].append(position)
+
+            ticket = await controller.admit(user_id, on_queued=_on_queued)
+            admitted.append(user_id)
+            await asyncio.sleep(0.01)
+            controller.release(ticket)
+
+        waiters = [asyncio.create_task(_wait("b")), asyncio.create_task(_wait("c"))]
+        await asyncio.sleep(0.01)
+        assert controller.queued == 2
+        controller.release(first)
+        await asyncio.gather(*waiters)
+        return admitted
+
+    assert asyncio.run(_run()) == ["b", "c"]
+    assert positions == {"b": [1], "c": [2, 1]}
+    assert (controller.active, controller.queued) == (0, 0)
+
+
+def test_full_queue_and_queue_timeout_shed_load() -> None:
+    registry = MetricsRegistry()
+    controller = AdmissionController(
+        max_sessions=1,
+        max_sessions_per_user=0,
+        max_queue=1,
+        queue_timeout_s=0.05,
+        registry=registry,
+    )
+
+    async def _run() -> tuple[str, str]:
+        controller.try_admit("a")
+        queued = asyncio.create_task(controller.admit("b"))
+        await asyncio.sleep(0.01)
+        with pytest.raises(AdmissionRejected) as full:
+            await controller.admit("c")
+        with pytest.raises(AdmissionRejected) as timed_out:
+            await queued
+        return full.value.reason, timed_out.value.reason
+
+    assert asyncio.run(_run()) == (REJECT_QUEUE_FULL, REJECT_QUEUE_TIMEOUT)
+    assert (controller.active, controller.queued) == (1, 0)
+    rejected = {
+        counter["labels"]["reason"]: counter["value"]
+        for counter in registry.snapshot()["counters"]
+        if counter["name"] == "admission_rejected_total"
+    }
+    assert rejected == {REJECT_QUEUE_FULL: 1, REJECT_QUEUE_TIMEOUT: 1}
+
+
+def test_cancelled_waiter_leaves_the_queue() -> None:
+    controller = _controller(max_sessions=1)
+
+    async def _run() -> None:
+        first = controller.try_admit("a")
+        waiter = asyncio.create_task(controller.admit("b"))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert controller.queued == 0
+        controller.release(first)  # type: ignore[arg-type]
+
+    asyncio.run(_run())
+    assert controller.active == 0
+    assert controller.try_admit("b") is not None
+
+
+def test_bridge_queues_sessions_over_capacity_and_sheds_when_queue_is_full(
+    fake_bridge: Callable[..., LiveBridge],
+    scripted_websocket: Callable[..., Any],
+) -> None:
+    admission = AdmissionController(max_sessions=1, max_sessions_per_user=0, max_queue=1, queue_timeout_s=5.0)
+    bridge = fake_bridge(admission=admission)
+
+    def _ready(sent: list[dict[str, Any]]) -> bool:
+        return any(event.get("type") == "profile_status" for event in sent)
+
+    first = scripted_websocket([0.05], done=_ready)
+    queued = scripted_websocket([], done=_ready)
+    shed = scripted_websocket([], done=_ready)
+
+    async def _run() -> None:
+        await asyncio.gather(
+            *(
+                bridge.run_websocket(websocket, user_id=f"user-{index}")
+                for index, websocket in enumerate((first, queued, shed))
+            )
+        )
+
+    asyncio.run(asyncio.wait_for(_run(), timeout=10))
+
+    assert [event["type"] for event in queued.sent][:2] == ["session_queued", "session_ready"]
+    assert queued.sent[0]["position"] == 1
+    assert shed.sent == [
+        {
+            "type": "session_rejected",
+            "reason": "queue_full",
+            "message": "The assistant is at capacity right now. Please try again in a minute.",
+        }
+    ]
+    assert shed.close_code == 1013
+    assert (admission.active, admission.queued) == (0, 0)
+
+
+def test_bridge_releases_the_slot_when_session_setup_fails(
+    fake_bridge: Callable[..., LiveBridge],
+    scripted_websocket: Callable[..., Any],
+    run_session: Callable[..., None],
+) -> None:
+    admission = AdmissionController(max_sessions=1, max_sessions_per_user=1, max_queue=0, queue_timeout_s=1.0)
+    bridge = fake_bridge(admission=admission)
+
+    def _broken_framer() -> None:
+        raise RuntimeError("framer unavailable")
+
+    bridge._build_pcm_framer = _broken_framer  # type: ignore[method-assign]
+
+    with pytest.raises(RuntimeError, match="framer unavailable"):
+        run_session(bridge, scripted_websocket([], done=lambda sent: True))
+
+    assert (admission.active, admission.queued) == (0, 0)
+    # The per-user count came back down too, so the same patient can connect again.
+    assert admission.try_admit("raksha-user") is not None
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Callable
+
+import numpy as np
+
+from app.audio_codecs import IMA_ADPCM
+from app.audio_codecs import MULAW
+from app.audio_codecs import PCM16
+from app.audio_codecs import ImaAdpcmEncoder
+from app.audio_codecs import MulawEncoder
+from app.audio_codecs import create_audio_encoder
+from app.audio_codecs import decode_ima_adpcm
+from app.audio_codecs import decode_mulaw
+from app.audio_codecs import negotiate_audio_encoding
+from app.fake_live_model import FakeLiveModelConfig
+from app.live_bridge import LiveBridge
+
+
+def _tone(seconds: float = 0.5, sample_rate: int = 24000) -> np.ndarray:
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return (8000 * np.sin(2 * math.pi * 220 * t) + 3000 * np.sin(2 * math.pi * 1330 * t)).astype("<i2")
+
+
+def _snr_db(reference: np.ndarray, decoded: np.ndarray) -> float:
+    signal = np.sum(reference.astype(np.float64) ** 2)
+    noise = np.sum((reference.astype(np.float64) - decoded.astype(np.float64)) ** 2)
+    return 10 * math.log10(signal / noise)
+
+
+def test_mulaw_matches_g711_reference_codes() -> None:
+    samples = np.array([0, -1, 32767, -32768, 1000], dtype="<i2")
+
+    encoded = MulawEncoder().encode(samples.tobytes())
+
+    assert list(encoded) == [0xFF, 0x7E, 0x80, 0x00, 0xCE]
+
+
+def test_mulaw_round_trip_halves_bytes_and_keeps_speech_quality() -> None:
+    tone = _tone()
+
+    encoded = MulawEncoder().encode(tone.tobytes())
+    decoded = np.frombuffer(decode_mulaw(encoded), dtype="<i2")
+
+    assert len(encoded) == tone.size
+    assert _snr_db(tone, decoded) > 30
+
+
+def test_ima_adpcm_round_trip_and_chunks_decode_independently() -> None:
+    tone = _tone()
+    encoder = ImaAdpcmEncoder()
+    raw = tone.tobytes()
+    chunk_bytes = 4802  # odd sample count exercises the half-filled last byte
+
+    chunks = [encoder.encode(raw[offset : offset + chunk_bytes]) for offset in range(0, len(raw), chunk_bytes)]
+    in_order = np.frombuffer(b"".join(decode_ima_adpcm(chunk) for chunk in chunks), dtype="<i2")
+
+    assert in_order.size == tone.size
+    assert sum(len(chunk) for chunk in chunks) < len(raw) // 3
+    assert _snr_db(tone, in_order) > 25
+    # Each chunk carries its own starting state, so a chunk decodes the same on its own.
+    third = np.frombuffer(decode_ima_adpcm(chunks[2]), dtype="<i2")
+    assert np.array_equal(third, in_order[2 * 2401 : 3 * 2401])
+
+
+def test_negotiation_picks_first_supported_encoding() -> None:
+    assert negotiate_audio_encoding(None) == PCM16
+    assert negotiate_audio_encoding("opus, PCMU") == MULAW
+    assert negotiate_audio_encoding("adpcm,mulaw") == IMA_ADPCM
+    assert negotiate_audio_encoding("adpcm,mulaw", allowed=(PCM16, MULAW)) == MULAW
+    assert negotiate_audio_encoding("flac") == PCM16
+    assert create_audio_encoder(IMA_ADPCM).encoding == IMA_ADPCM
+
+
+def test_bridge_encodes_downlink_audio_with_negotiated_codec(
+    fake_bridge: Callable[..., LiveBridge],
+    scripted_websocket: Callable[..., Any],
+    run_session: Callable[..., None],
+) -> None:
+    bridge = fake_bridge(
+        FakeLiveModelConfig(
+            response_latency_ms=0,
+            audio_sample_rate=16000,
+            audio_chunk_bytes=1 << 20,
+            echo_input_audio=True,
+            tool_calls=(),
+            output_transcription_every_chunks=0,
+        )
+    )
+    packets = [b"\x10\x00\xf0\xff" * 400] * 4
+    websocket = scripted_websocket(
+        [
+            {"type": "hello", "audioEncodings": ["ima_adpcm", "opus", "ulaw"]},
+            {"type": "ptt_start"},
+            *packets,
+            {"type": "ptt_end"},
+        ],
+        done=lambda sent: any(event.get("type") == "assistant_text" for event in sent),
+    )
+
+    run_session(bridge, websocket)
+
+    # IMA-ADPCM is off unless audio_adpcm_enabled is set, so the client gets its next supported choice.
+    audio_format = next(event for event in websocket.sent if event.get("type") == "assistant_audio_format")
+    assert audio_format == {"type": "assistant_audio_format", "sampleRate": 16000, "encoding": "mulaw"}
+    assert len(websocket.binary_bytes) == len(b"".join(packets)) // 2
+    assert decode_mulaw(websocket.binary_bytes)[:4] == b"\x10\x00\xf0\xff"
+
+
+def test_hello_with_only_sample_rates_keeps_the_query_audio_encoding(
+    fake_bridge: Callable[..., LiveBridge],
+    scripted_websocket: Callable[..., Any],
+    run_session: Callable[..., None],
+) -> None:
+    bridge = fake_bridge(
+        FakeLiveModelConfig(
+            response_latency_ms=0,
+            audio_sample_rate=16000,
+            audio_chunk_bytes=1 << 20,
+            echo_input_audio=True,
+            tool_calls=(),
+            output_transcription_every_chunks=0,
+        )
+    )
+    packets = [b"\x10\x00\xf0\xff" * 400] * 4
+    websocket = scripted_websocket(
+        [
+            {"type": "hello", "inputSampleRate": 16000, "outputSampleRate": 16000},
+            {"type": "ptt_start"},
+            *packets,
+            {"type": "ptt_end"},
+        ],
+        done=lambda sent: any(event.get("type") == "assistant_text" for event in sent),
+    )
+
+    run_session(bridge, websocket, audio_encoding="mulaw")
+
+    audio_format = next(event for event in websocket.sent if event.get("type") == "assistant_audio_format")
+    assert audio_format == {"type": "assistant_audio_format", "sampleRate": 16000, "encoding": "mulaw"}
+    assert len(websocket.binary_bytes) == len(b"".join(packets)) // 2
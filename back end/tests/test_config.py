@@ -23,3 +23,22 @@ def test_deprecated_model_rejected(monkeypatch: pytest.MonkeyPatch) -> None:
 
     with pytest.raises(Exception):
         get_settings()
+
+
+def test_live_model_backend_validated(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setenv("GEMINI_MODEL", "gemini-2.5-flash-native-audio-preview-12-2025")
+    monkeypatch.setenv("LIVE_MODEL_BACKEND", "Fake")
+    monkeypatch.setenv("FAKE_LIVE_ERROR_TURNS", "[2, 4]")
+    get_settings.cache_clear()
+
+    settings = get_settings()
+
+    assert settings.live_model_backend == "fake"
+    assert settings.fake_live_error_turns == [2, 4]
+
+    monkeypatch.setenv("LIVE_MODEL_BACKEND", "other")
+    get_settings.cache_clear()
+    with pytest.raises(Exception):
+        get_settings()
+    get_settings.cache_clear()
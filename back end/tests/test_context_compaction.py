@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService
+from google.adk.sessions import Session
+from google.genai import types
+
+from app.context_compaction import COMPACTION_METADATA_KEY
+from app.context_compaction import PINNED_TOOL_RESULTS_STATE_KEY
+from app.context_compaction import ContextCompactor
+from app.context_compaction import estimate_event_tokens
+from app.context_compaction import plan_cut
+from app.live_bridge import LiveBridge
+from app.live_bridge import SessionMetrics
+from app.live_bridge import TurnState
+from app.metrics import MetricsRegistry
+
+
+class _ServiceWithoutStorage:
+    """A session service that keeps no in-memory copy of its own, like a database-backed one."""
+
+    def __init__(self) -> None:
+        self.appended: list[Event] = []
+
+    async def append_event(self, session: Any, event: Event) -> Event:
+        self.appended.append(event)
+        session.state.update(event.actions.state_delta)
+        session.events.append(event)
+        return event
+
+
+def _text_event(author: str, text: str) -> Event:
+    role = "user" if author == "user" else "model"
+    return Event(author=author, invocation_id="inv", content=types.Content(role=role, parts=[types.Part(text=text)]))
+
+
+def _tool_events(name: str, response: dict[str, Any]) -> list[Event]:
+    call = types.Part(function_call=types.FunctionCall(id=f"call-{name}", name=name, args={}))
+    result = types.Part(function_response=types.FunctionResponse(id=f"call-{name}", name=name, response=response))
+    return [
+        Event(author="raksha", invocation_id="inv", content=types.Content(role="model", parts=[call])),
+        Event(author="raksha", invocation_id="inv", content=types.Content(role="user", parts=[result])),
+    ]
+
+
+def _long_conversation() -> list[Event]:
+    events = [_text_event("user", "What is on my schedule today? " + "please " * 40)]
+    events += _tool_events(
+        "get_today_schedule",
+        {"items": [{"scheduleItemId": "sched_walk", "title": "Morning walk", "latestReport": None}]},
+    )
+    events.append(_text_event("raksha", "You have a morning walk. " + "detail " * 60))
+    events += _tool_events(
+        "book_doctor_slot",
+        {
+            "type": "booking_update",
+            "status": "confirmed",
+            "booking": {"bookingId": "bk_1", "doctorId": "doc_1", "doctorName": "Dr. Rao", "displayLabel": "Mon 10:00"},
+        },
+    )
+    for index in range(6):
+        events.append(_text_event("user", f"Follow-up question {index} " + "words " * 30))
+        events.append(_text_event("raksha", f"Answer {index} " + "words " * 30))
+    return events
+
+
+async def _stored_session(service: InMemorySessionService, events: list[Event]) -> Any:
+    session = await service.create_session(app_name="raksha-test", user_id="raksha-user", state={})
+    for event in events:
+        await service.append_event(session, event)
+    return session
+
+
+def test_history_under_budget_is_left_alone() -> None:
+    compactor = ContextCompactor(budget_tokens=100_000, registry=MetricsRegistry())
+    service = InMemorySessionService()
+    session = asyncio.run(_stored_session(service, _long_conversation()))
+
+    report = asyncio.run(compactor.compact(session, service))
+
+    assert not report.compacted
+    assert report.events == len(session.events)
+    assert report.estimated_tokens == sum(estimate_event_tokens(event) for event in session.events)
+
+
+def test_cut_never_keeps_a_tool_response_without_its_call() -> None:
+    events = [_text_event("user", "x" * 400), *_tool_events("get_today_schedule", {"items": []}), _text_event("raksha", "ok")]
+    tokens = [100, 1, 1, 1]
+
+    # Dropping the first two events would be enough, but event 2 is the response to event 1.
+    assert plan_cut(events, tokens, budget_tokens=100, keep_recent_events=0) == 1
+
+
+def test_compaction_summarizes_old_turns_and_pins_tool_ids_in_state() -> None:
+    registry = MetricsRegistry()
+    service = InMemorySessionService()
+    session = asyncio.run(_stored_session(service, _long_conversation()))
+    compactor = ContextCompactor(budget_tokens=400, keep_recent_events=4, registry=registry)
+
+    report = asyncio.run(compactor.compact(session, service))
+
+    assert report.compacted and report.estimated_tokens < report.tokens_before
+    summary = session.events[0]
+    assert COMPACTION_METADATA_KEY in summary.custom_metadata
+    text = summary.content.parts[0].text
+    assert "sched_walk (Morning walk)" in text and "bk_1 (Dr. Rao, Mon 10:00)" in text
+    assert session.state[PINNED_TOOL_RESULTS_STATE_KEY] == {
+        "scheduleItems": {"sched_walk": "Morning walk"},
+        "bookings": {
+            "bk_1": {"doctorId": "doc_1", "doctorName": "Dr. Rao", "displayLabel": "Mon 10:00"},
+        },
+    }
+    assert len(session.events) == report.events and len(session.events) >= 5
+    # The text fallback re-reads the stored session, so it sees the same compacted history.
+    fallback_view = asyncio.run(
+        service.get_session(app_name="raksha-test", user_id="raksha-user", session_id=session.id)
+    )
+    assert [event.id for event in fallback_view.events] == [event.id for event in session.events]
+    assert fallback_view.state[PINNED_TOOL_RESULTS_STATE_KEY] == session.state[PINNED_TOOL_RESULTS_STATE_KEY]
+    counters = {entry["name"]: entry["value"] for entry in registry.snapshot()["counters"]}
+    assert counters["context_compactions_total"] == 1
+
+
+def test_repeated_compaction_folds_the_previous_summary() -> None:
+    compactor = ContextCompactor(budget_tokens=400, keep_recent_events=4, registry=MetricsRegistry())
+    service = InMemorySessionService()
+    session = asyncio.run(_stored_session(service, _long_conversation()))
+    asyncio.run(compactor.compact(session, service))
+    first_digest = session.events[0].custom_metadata[COMPACTION_METADATA_KEY]["digest"]
+
+    for index in range(6):
+        asyncio.run(service.append_event(session, _text_event("user", f"Later question {index} " + "more " * 40)))
+        asyncio.run(service.append_event(session, _text_event("raksha", f"Later answer {index} " + "more " * 40)))
+    report = asyncio.run(compactor.compact(session, service))
+
+    summaries = [event for event in session.events if COMPACTION_METADATA_KEY in (event.custom_metadata or {})]
+    assert report.compacted and summaries == [session.events[0]]
+    digest = session.events[0].custom_metadata[COMPACTION_METADATA_KEY]["digest"]
+    assert digest[-1].startswith("Patient: Later question") or digest[-1].startswith("Assistant: Later answer")
+    assert set(digest) - set(first_digest)
+    assert "bk_1" in session.events[0].content.parts[0].text
+
+
+def test_services_without_an_in_memory_copy_only_compact_the_working_session() -> None:
+    service = _ServiceWithoutStorage()
+    session = Session(id="s1", app_name="raksha-test", user_id="raksha-user", events=_long_conversation())
+    compactor = ContextCompactor(budget_tokens=400, keep_recent_events=4, registry=MetricsRegistry())
+
+    report = asyncio.run(compactor.compact(session, service))
+
+    assert report.compacted and session.events[0].custom_metadata[COMPACTION_METADATA_KEY]
+    assert [event.actions.state_delta for event in service.appended] == [
+        {PINNED_TOOL_RESULTS_STATE_KEY: session.state[PINNED_TOOL_RESULTS_STATE_KEY]}
+    ]
+    assert session.events[-1] is service.appended[0]
+
+
+def test_bridge_compacts_at_the_turn_boundary_and_reports_context_size() -> None:
+    bridge = LiveBridge(
+        app_name="raksha-test",
+        model="fake",
+        gemini_api_key="fake-key",
+        context_budget_tokens=400,
+        context_keep_recent_events=4,
+    )
+    session = asyncio.run(_stored_session(bridge._session_service, _long_conversation()))
+    metrics = SessionMetrics(started_at=0.0)
+    turn_state = TurnState(session=session)
+
+    async def _two_turns() -> None:
+        for _ in range(2):
+            await bridge._compact_session_context(turn_state, trace_id="t1", metrics=metrics, trigger="ptt_start")
+
+    asyncio.run(_two_turns())
+
+    assert metrics.context_compactions == 1
+    # The history is now the summary, the kept events and the event carrying the pinned state.
+    assert metrics.context_events_compacted == len(_long_conversation()) - len(session.events) + 2
+    assert metrics.context_peak_tokens > 400
+
+
+def test_live_compression_is_only_configured_when_asked_for() -> None:
+    assert LiveBridge._build_run_config().context_window_compression is None
+
+    compression = LiveBridge._build_run_config(compression_trigger_tokens=16000).context_window_compression
+
+    assert compression is not None
+    assert (compression.trigger_tokens, compression.sliding_window.target_tokens) == (16000, 8000)
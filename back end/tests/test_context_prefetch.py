@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.context_prefetch import ContextPrefetcher
+from app.schedule_tools import build_schedule_tools
+from app.tool_cache import SessionToolCache
+
+
+class _ScheduleServiceStub:
+    def __init__(self) -> None:
+        self.today_calls = 0
+
+    def get_today_schedule(self, **kwargs):
+        self.today_calls += 1
+        return {"date": "2026-02-22", "timezone": kwargs.get("timezone_name") or "UTC", "items": [], "timeline": []}
+
+    def get_current_schedule_item(self, **_kwargs):
+        class _Result:
+            timezone = "UTC"
+            local_now_iso = "2026-02-22T13:20:00+00:00"
+            in_window = True
+            current_item = None
+            upcoming_item = None
+            message = "Lunch now."
+
+        return _Result()
+
+
+class _ToolContextStub:
+    state = {
+        "app:user_id": "patient-1",
+        "app:timezone": "Asia/Kolkata",
+    }
+
+
+def test_prefetch_warms_schedule_reads_the_model_then_hits() -> None:
+    service = _ScheduleServiceStub()
+    cache = SessionToolCache()
+    tools = build_schedule_tools(service, tool_cache=cache)
+    prefetcher = ContextPrefetcher(cache, tools, dict(_ToolContextStub.state))
+
+    async def _run() -> None:
+        assert prefetcher.start("trace-1") is True
+        await prefetcher.wait()
+
+    asyncio.run(_run())
+    assert service.today_calls == 1
+    assert cache.stats().prefetched == 2
+
+    get_today_schedule = tools[0]
+    snapshot = get_today_schedule(tool_context=_ToolContextStub())
+    assert snapshot["timezone"] == "Asia/Kolkata"
+    assert service.today_calls == 1
+    stats = cache.stats()
+    assert (stats.misses, stats.prefetch_hits) == (0, 1)
+    assert stats.prefetch_hit_rate == 0.5
+
+
+def test_prefetch_skips_while_a_run_is_in_flight_and_ignores_other_tools() -> None:
+    cache = SessionToolCache()
+
+    def publish_recommendations() -> dict:
+        raise AssertionError("write tools are never prefetched")
+
+    def get_doctor_catalog() -> dict:
+        return cache.get_or_compute("get_doctor_catalog", {}, lambda: {"doctors": []})
+
+    prefetcher = ContextPrefetcher(cache, [publish_recommendations, get_doctor_catalog], {})
+
+    async def _run() -> None:
+        assert prefetcher.start("trace-1") is True
+        assert prefetcher.start("trace-1") is False
+        await prefetcher.wait()
+
+    asyncio.run(_run())
+    assert prefetcher.runs == 1
+    assert cache.stats().prefetched == 1
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+from app.emergency_matcher import PRERENDERED_EMERGENCY_EVENTS
+from app.emergency_matcher import EmergencyPhraseAutomaton
+from app.emergency_matcher import EmergencyPhraseScanner
+from app.live_bridge import LiveBridge
+from app.live_bridge import SessionMetrics
+from app.live_bridge import TurnState
+from app.wire_protocol import OutboundChannel
+
+
+def test_scanner_matches_phrases_split_across_fragments() -> None:
+    scanner = EmergencyPhraseScanner()
+
+    assert scanner.feed_fragment("I have a sudden ches") == []
+    matches = scanner.feed_fragment("t pain and I can’t breathe")
+
+    assert [match.category for match in matches] == ["cardiac", "breathing"]
+
+
+def test_scanner_handles_cumulative_transcripts_and_reports_once_per_turn() -> None:
+    scanner = EmergencyPhraseScanner()
+
+    assert scanner.feed_fragment("I think") == []
+    assert [m.phrase for m in scanner.feed_fragment("I think I fainted")] == ["fainted"]
+    assert scanner.feed_fragment("I think I fainted, I passed out") == []
+
+    scanner.reset()
+    assert [m.category for m in scanner.feed("passed out")] == ["consciousness"]
+
+
+def test_scanner_scans_delta_fragments_that_repeat_the_previous_one() -> None:
+    scanner = EmergencyPhraseScanner()
+
+    assert scanner.feed_fragment("heavy bl") == []
+    assert scanner.feed_fragment("e") == []
+    assert scanner.feed_fragment("e") == []
+    matches = scanner.feed_fragment("ding")
+
+    assert [match.category for match in matches] == ["bleeding"]
+
+
+def test_scanner_requires_word_start_boundary() -> None:
+    scanner = EmergencyPhraseScanner()
+
+    assert scanner.feed("heatstroke yesterday") == []
+    assert [m.category for m in scanner.feed(" and maybe a STROKE")] == ["stroke"]
+
+
+def test_automaton_reports_overlapping_patterns() -> None:
+    automaton = EmergencyPhraseAutomaton({"a": ("pain",), "b": ("chest pain now",)})
+    scanner = EmergencyPhraseScanner(automaton)
+
+    assert [m.category for m in scanner.feed("chest pain now")] == ["a", "b"]
+
+
+def test_bridge_pushes_prerendered_emergency_event() -> None:
+    class _WebSocketStub:
+        def __init__(self) -> None:
+            self.sent: list[str] = []
+
+        async def send_text(self, data: str) -> None:
+            self.sent.append(data)
+
+        async def send_bytes(self, data: bytes) -> None:
+            raise AssertionError("emergency guidance is a text frame in the JSON protocol")
+
+    bridge = LiveBridge(app_name="raksha", model="gemini-test", gemini_api_key="fake-key")
+    websocket = _WebSocketStub()
+    channel = OutboundChannel(websocket)
+    metrics = SessionMetrics(started_at=0.0)
+    turn_state = TurnState()
+
+    for fragment in ("my chest", " pain is bad", " chest pain"):
+        asyncio.run(
+            bridge._send_emergency_guidance_if_matched(
+                channel,
+                fragment,
+                trace_id="t1",
+                metrics=metrics,
+                turn_state=turn_state,
+            )
+        )
+
+    assert websocket.sent == [PRERENDERED_EMERGENCY_EVENTS["cardiac"]]
+    assert json.loads(websocket.sent[0])["type"] == "emergency_guidance"
+    assert metrics.emergency_alerts == 1
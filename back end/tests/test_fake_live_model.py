@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+from google.adk.agents.live_request_queue import LiveRequestQueue
+from google.adk.sessions import InMemorySessionService
+from google.genai import errors as genai_errors
+from google.genai import types
+
+from app.agent import create_agent
+from app.fake_live_model import FakeLiveModelConfig
+from app.fake_live_model import FakeLiveRunner
+
+
+def get_current_schedule_item(tool_context: Any = None) -> dict[str, Any]:
+    """Returns a fixed schedule item."""
+    return {"type": "schedule_current_item", "userId": tool_context.state["user"]}
+
+
+def _runner(config: FakeLiveModelConfig) -> FakeLiveRunner:
+    return FakeLiveRunner(
+        app_name="raksha-test",
+        agent=create_agent("fake", tools=[get_current_schedule_item]),
+        session_service=InMemorySessionService(),
+        config=config,
+    )
+
+
+async def _collect_turn(runner: FakeLiveRunner, packets: int) -> list[Any]:
+    queue = LiveRequestQueue()
+    session = type("Session", (), {"state": {"user": "raksha-user"}})()
+    queue.send_activity_start()
+    for _ in range(packets):
+        queue.send_realtime(types.Blob(mime_type="audio/pcm;rate=16000", data=b"\x01\x00" * 800))
+    queue.send_activity_end()
+    events = []
+    async for event in runner.run_live(session=session, live_request_queue=queue):
+        events.append(event)
+        if event.turn_complete:
+            queue.close()
+    return events
+
+
+def test_fake_runner_streams_transcripts_tool_call_and_audio() -> None:
+    config = FakeLiveModelConfig(
+        response_latency_ms=0,
+        audio_sample_rate=16000,
+        audio_chunk_bytes=3200,
+        response_audio_ms=400,
+        input_transcription_every_packets=2,
+        output_transcription_every_chunks=2,
+        input_transcript="one two three",
+        output_transcript="alpha beta",
+    )
+
+    events = asyncio.run(_collect_turn(_runner(config), packets=4))
+
+    inputs = [event.input_transcription.text for event in events if event.input_transcription]
+    assert inputs == ["one", "one two", "one two three"]
+    calls = [call.name for event in events for call in event.get_function_calls()]
+    responses = [event.get_function_responses()[0].response for event in events if event.get_function_responses()]
+    assert calls == ["get_current_schedule_item"]
+    assert responses == [{"type": "schedule_current_item", "userId": "raksha-user"}]
+    chunks = [
+        part.inline_data
+        for event in events
+        if event.content
+        for part in event.content.parts
+        if part.inline_data is not None
+    ]
+    assert [len(chunk.data) for chunk in chunks] == [3200, 3200, 3200, 3200]
+    assert {chunk.mime_type for chunk in chunks} == {"audio/pcm;rate=16000"}
+    outputs = [event.output_transcription.text for event in events if event.output_transcription]
+    assert outputs == ["alpha", " beta"]
+    assert events[-1].turn_complete is True
+
+
+def test_fake_runner_echoes_input_audio() -> None:
+    config = FakeLiveModelConfig(response_latency_ms=0, audio_chunk_bytes=1600, echo_input_audio=True, tool_calls=())
+
+    events = asyncio.run(_collect_turn(_runner(config), packets=3))
+
+    audio = b"".join(part.inline_data.data for event in events if event.content for part in event.content.parts)
+    assert audio == b"\x01\x00" * 800 * 3
+
+
+def test_fake_runner_injects_configured_error() -> None:
+    config = FakeLiveModelConfig(response_latency_ms=0, error_turns=(1,), error_code=1008)
+
+    with pytest.raises(genai_errors.APIError) as exc_info:
+        asyncio.run(_collect_turn(_runner(config), packets=1))
+
+    assert exc_info.value.code == 1008
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Callable
+
+from app.live_bridge import LiveBridge
+from app.metrics import metrics_registry
+from app.patient_profile_service import ProfileContextResult
+
+
+class _SlowProfileService:
+    def load_profile_context(self, user_id: str) -> ProfileContextResult:
+        time.sleep(0.1)
+        return ProfileContextResult(
+            state={"app:profile_available": True, "app:user_id": "overridden"},
+            profile_summary="Type 2 diabetes.",
+            loaded=True,
+            source="db",
+            message=f"Loaded {user_id}.",
+        )
+
+
+def test_bridge_bootstraps_profile_and_doctors_concurrently(
+    fake_bridge: Callable[..., LiveBridge],
+    scripted_websocket: Callable[..., Any],
+    run_session: Callable[..., None],
+) -> None:
+    bridge = fake_bridge(patient_profile_service=_SlowProfileService())
+    list_doctors = bridge._doctor_repository.list_doctors
+
+    def _slow_list_doctors() -> list[dict[str, Any]]:
+        time.sleep(0.1)
+        return list_doctors()
+
+    bridge._doctor_repository.list_doctors = _slow_list_doctors  # type: ignore[method-assign]
+    ready_before = metrics_registry.histogram("session_ready_ms").count
+    websocket = scripted_websocket([], done=lambda sent: any(event.get("type") == "profile_status" for event in sent))
+
+    context = asyncio.run(bridge.build_context(user_id="raksha-user", timezone_name="Asia/Kolkata"))
+    run_session(bridge, websocket)
+
+    assert set(context.bootstrap_ms) == {"profile", "doctors", "agent", "session", "total"}
+    assert context.bootstrap_ms["profile"] >= 100 and context.bootstrap_ms["doctors"] >= 100
+    assert context.bootstrap_ms["total"] < 190
+    assert context.session.state["app:user_id"] == "raksha-user"
+    assert context.session.state["app:profile_available"] is True
+    assert metrics_registry.histogram("session_ready_ms").count == ready_before + 1
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from app.fake_live_model import FakeLiveModelConfig
+from app.live_bridge import LiveBridge
+from app.metrics import metrics_registry
+
+
+def test_bridge_recovers_from_injected_fake_error(
+    fake_bridge: Callable[..., LiveBridge],
+    scripted_websocket: Callable[..., Any],
+    run_session: Callable[..., None],
+) -> None:
+    bridge = fake_bridge(
+        FakeLiveModelConfig(
+            response_latency_ms=0,
+            error_turns=(1,),
+            tool_calls=(),
+            input_transcription_every_packets=1,
+        )
+    )
+    frames: list[Any] = [{"type": "ptt_start"}, *[b"\x00\x00" * 800] * 5, {"type": "ptt_end"}]
+    websocket = scripted_websocket(
+        frames,
+        done=lambda sent: sum(1 for event in sent if event.get("type") == "session_ready") >= 2,
+    )
+    recoveries = metrics_registry.histogram("live_recovery_ms", labels={"mode": "reattach"})
+    recoveries_before = recoveries.count
+
+    run_session(bridge, websocket)
+
+    types_sent = [event.get("type") for event in websocket.sent]
+    assert "fallback_started" in types_sent
+    completed = next(event for event in websocket.sent if event.get("type") == "fallback_completed")
+    assert completed["result"] == "ok"
+    # The new live stream is reattached to the same ADK session instead of a freshly built one.
+    session_ids = [event["sessionId"] for event in websocket.sent if event.get("type") == "session_ready"]
+    assert len(session_ids) == 2 and session_ids[0] == session_ids[1]
+    assert recoveries.count == recoveries_before + 1
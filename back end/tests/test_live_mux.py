@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, Callable
+
+from app.fake_live_model import FakeLiveModelConfig
+from app.live_bridge import LiveBridge
+from app.live_mux import CHANNEL_ENDED
+from app.live_mux import CHANNEL_REJECTED_LIMIT
+from app.live_mux import LiveMultiplexer
+from app.live_mux import _ChannelSocket
+from app.metrics import MetricsRegistry
+
+
+class _RecordingWebSocket:
+    def __init__(self) -> None:
+        self.frames: list[str | bytes] = []
+
+    async def send_text(self, data: str) -> None:
+        self.frames.append(data)
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.frames.append(data)
+
+
+class _MuxClientWebSocket:
+    """Plays a client script: dicts are sent as text, bytes as binary, callables wait until they return True."""
+
+    def __init__(self, script: list[Any]) -> None:
+        self._script = list(script)
+        self.events: dict[int, list[dict[str, Any]]] = {}
+        self.audio_bytes: dict[int, int] = {}
+
+    async def accept(self) -> None:
+        return None
+
+    async def receive(self) -> dict[str, Any]:
+        while self._script:
+            step = self._script.pop(0)
+            await asyncio.sleep(0)
+            if callable(step):
+                while not step(self):
+                    await asyncio.sleep(0.001)
+                continue
+            if isinstance(step, bytes):
+                return {"type": "websocket.receive", "bytes": step}
+            return {"type": "websocket.receive", "text": json.dumps(step)}
+        return {"type": "websocket.disconnect", "code": 1000}
+
+    async def send_text(self, data: str) -> None:
+        frame = json.loads(data)
+        self.events.setdefault(frame["channel"], []).append(frame["event"])
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.audio_bytes[data[0]] = self.audio_bytes.get(data[0], 0) + len(data) - 1
+
+    def types(self, channel_id: int) -> list[str]:
+        return [event["type"] for event in self.events.get(channel_id, [])]
+
+
+def test_writer_sends_one_frame_per_channel_in_turn() -> None:
+    mux = LiveMultiplexer(None, registry=MetricsRegistry())  # type: ignore[arg-type]
+    websocket = _RecordingWebSocket()
+    busy = _ChannelSocket(mux, 1, max_pending=8)
+    quiet = _ChannelSocket(mux, 2, max_pending=8)
+
+    async def _run() -> None:
+        for index in range(3):
+            await busy.send_text(f'{{"n":{index}}}')
+        await quiet.send_bytes(b"\x07")
+        writer = asyncio.create_task(mux._write_frames(websocket, "test"))  # type: ignore[arg-type]
+        while len(websocket.frames) < 4:
+            await asyncio.sleep(0)
+        writer.cancel()
+        await asyncio.gather(writer, return_exceptions=True)
+
+    asyncio.run(_run())
+
+    assert websocket.frames == [
+        '{"channel":1,"event":{"n":0}}',
+        b"\x02\x07",
+        '{"channel":1,"event":{"n":1}}',
+        '{"channel":1,"event":{"n":2}}',
+    ]
+
+
+def test_channel_waits_for_the_writer_when_its_buffer_is_full() -> None:
+    mux = LiveMultiplexer(None, registry=MetricsRegistry())  # type: ignore[arg-type]
+    websocket = _RecordingWebSocket()
+    channel = _ChannelSocket(mux, 1, max_pending=2)
+
+    async def _run() -> list[int]:
+        pending_before_writer: list[int] = []
+        sender = asyncio.create_task(channel.send_bytes(b"\x01"))
+        await channel.send_bytes(b"\x00")
+        await channel.send_bytes(b"\x00")
+        await asyncio.sleep(0.01)
+        pending_before_writer.append(len(channel.outbound))
+        assert not sender.done()
+        writer = asyncio.create_task(mux._write_frames(websocket, "test"))  # type: ignore[arg-type]
+        await asyncio.wait_for(sender, timeout=1)
+        while len(websocket.frames) < 3:
+            await asyncio.sleep(0)
+        writer.cancel()
+        await asyncio.gather(writer, return_exceptions=True)
+        return pending_before_writer
+
+    assert asyncio.run(_run()) == [2]
+    assert len(websocket.frames) == 3
+
+
+def test_one_websocket_carries_independent_sessions_per_channel() -> None:
+    bridge = LiveBridge(
+        app_name="raksha-test",
+        model="fake",
+        gemini_api_key="fake-key",
+        fake_live_model=FakeLiveModelConfig(response_latency_ms=0, tool_calls=()),
+    )
+
+    def turn_done(channel_id: int) -> Callable[[_MuxClientWebSocket], bool]:
+        return lambda client: "assistant_text" in client.types(channel_id) and client.audio_bytes.get(channel_id, 0) >= 48000
+
+    audio = b"\x00\x00" * 800
+    client = _MuxClientWebSocket(
+        [
+            {"channel": 1, "type": "channel_open", "user_id": "raksha-user"},
+            {"channel": 2, "type": "channel_open", "user_id": "raksha-user-b"},
+            {"channel": 3, "type": "channel_open", "user_id": "raksha-user-c"},
+            lambda client: "session_ready" in client.types(1) and "session_ready" in client.types(2),
+            {"channel": 1, "type": "ptt_start"},
+            {"channel": 2, "type": "ptt_start"},
+            *[bytes((channel_id,)) + audio for _ in range(3) for channel_id in (1, 2)],
+            {"channel": 1, "type": "ptt_end"},
+            {"channel": 2, "type": "ptt_end"},
+            turn_done(1),
+            turn_done(2),
+            {"channel": 1, "type": "channel_close"},
+            {"channel": 2, "type": "channel_close"},
+            lambda client: "channel_closed" in client.types(1) and "channel_closed" in client.types(2),
+        ]
+    )
+    mux = LiveMultiplexer(bridge, max_channels=2, registry=MetricsRegistry())
+
+    asyncio.run(asyncio.wait_for(mux.run(client), timeout=10))  # type: ignore[arg-type]
+
+    ready = {channel_id: client.events[channel_id][0] for channel_id in (1, 2)}
+    assert ready[1]["type"] == ready[2]["type"] == "session_ready"
+    assert ready[1]["sessionId"] != ready[2]["sessionId"]
+    assert client.audio_bytes == {1: 48000, 2: 48000}
+    assert client.events[1][-1] == {"type": "channel_closed", "reason": CHANNEL_ENDED, "code": None}
+    assert client.events[3] == [{"type": "channel_closed", "reason": CHANNEL_REJECTED_LIMIT, "code": None}]
+    assert (mux.channels_opened, mux.max_open_channels) == (2, 2)
+
+
+def test_channel_drops_client_frames_past_its_inbound_buffer_but_keeps_the_disconnect() -> None:
+    mux = LiveMultiplexer(None, registry=MetricsRegistry())  # type: ignore[arg-type]
+    channel = _ChannelSocket(mux, 1, max_pending=2)
+
+    async def _run() -> list[dict[str, Any]]:
+        accepted = [channel.feed({"type": "websocket.receive", "bytes": b"\x00\x00"}) for _ in range(4)]
+        assert accepted == [True, True, False, False]
+        channel.feed_disconnect(1000)
+        return [await channel.receive() for _ in range(3)]
+
+    received = asyncio.run(_run())
+
+    assert [message["type"] for message in received] == ["websocket.receive", "websocket.receive", "websocket.disconnect"]
+    assert channel.inbound_dropped == 2
+
+
+def test_channel_rejection_is_sent_by_the_writer_after_queued_frames() -> None:
+    mux = LiveMultiplexer(None, max_channels=1, registry=MetricsRegistry())  # type: ignore[arg-type]
+    websocket = _RecordingWebSocket()
+    busy = _ChannelSocket(mux, 1, max_pending=8)
+    mux._channels[1] = busy
+
+    async def _run() -> None:
+        await busy.send_text('{"n":0}')
+        await busy.send_text('{"n":1}')
+        mux._open_channel(2, {}, "test")
+        assert websocket.frames == []
+        writer = asyncio.create_task(mux._write_frames(websocket, "test"))  # type: ignore[arg-type]
+        while len(websocket.frames) < 3:
+            await asyncio.sleep(0)
+        writer.cancel()
+        await asyncio.gather(writer, return_exceptions=True)
+
+    asyncio.run(_run())
+
+    assert websocket.frames == [
+        '{"channel":1,"event":{"n":0}}',
+        '{"channel":2,"event":{"type":"channel_closed","reason":"channel_limit","code":null}}',
+        '{"channel":1,"event":{"n":1}}',
+    ]
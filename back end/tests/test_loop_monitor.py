@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from app.loop_monitor import LoopLagMonitor
+from app.loop_monitor import session_task_name
+from app.metrics import MetricsRegistry
+
+
+def _blocking_tool_call() -> None:
+    time.sleep(0.25)
+
+
+async def _run_with_monitor(monitor: LoopLagMonitor) -> None:
+    monitor.start()
+    await asyncio.sleep(0.05)
+
+    async def _session_work() -> None:
+        _blocking_tool_call()
+
+    await asyncio.create_task(_session_work(), name=session_task_name("live-send", "abcd1234"))
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+
+
+def test_monitor_captures_stack_and_trace_id_of_blocking_task() -> None:
+    registry = MetricsRegistry()
+    monitor = LoopLagMonitor(threshold_ms=60, interval_ms=10, registry=registry)
+
+    asyncio.run(_run_with_monitor(monitor))
+
+    reports = monitor.reports()
+    assert len(reports) == 1
+    report = reports[0]
+    assert report.trace_id == "abcd1234"
+    assert report.task_name == "live-send[abcd1234]"
+    assert report.stalled_ms >= 200
+    assert any("_blocking_tool_call" in line for line in report.stack)
+    assert monitor.stalls == 1
+    counters = {counter["name"]: counter["value"] for counter in registry.snapshot()["counters"]}
+    assert counters["event_loop_stalls_total"] == 1
+    assert registry.histogram("event_loop_lag_ms").count > 0
+
+
+def test_monitor_snapshot_lists_recent_reports_first() -> None:
+    registry = MetricsRegistry()
+    monitor = LoopLagMonitor(threshold_ms=60, interval_ms=10, registry=registry)
+
+    asyncio.run(_run_with_monitor(monitor))
+    snapshot = monitor.snapshot()
+
+    assert snapshot["running"] is False
+    assert snapshot["stalls"] == 1
+    assert snapshot["recent"][0]["traceId"] == "abcd1234"
+    assert snapshot["lagP99Ms"] is not None
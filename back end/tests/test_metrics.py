@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from app.metrics import Histogram
+from app.metrics import MetricsRegistry
+
+
+def test_histogram_buckets_and_quantiles() -> None:
+    histogram = Histogram((10.0, 100.0))
+    for value in (1.0, 5.0, 50.0, 500.0):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 4
+    assert snapshot["buckets"] == {"le_10": 2, "le_100": 1, "le_inf": 1}
+    assert histogram.quantile(0.5) == 10.0
+    assert histogram.quantile(0.99) == 500.0
+
+
+def test_registry_keys_histograms_by_labels() -> None:
+    registry = MetricsRegistry()
+    registry.histogram("latency_ms", labels={"tool": "a"}).observe(1.0)
+    registry.histogram("latency_ms", labels={"tool": "a"}).observe(2.0)
+    registry.histogram("latency_ms", labels={"tool": "b"}).observe(3.0)
+    registry.increment("calls_total", labels={"tool": "a"})
+
+    snapshot = registry.snapshot()
+    assert [(h["labels"]["tool"], h["count"]) for h in snapshot["histograms"]] == [("a", 2), ("b", 1)]
+    assert snapshot["counters"] == [{"name": "calls_total", "labels": {"tool": "a"}, "value": 1}]
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from app.fake_live_model import FakeLiveModelConfig
+from app.live_bridge import LiveBridge
+from app.metrics import MetricsRegistry
+from app.overload import OverloadGovernor
+from app.overload import OverloadThresholds
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _governor(clock: _Clock, registry: MetricsRegistry) -> OverloadGovernor:
+    return OverloadGovernor(
+        thresholds=OverloadThresholds(enter_loop_lag_ms=100, exit_loop_lag_ms=25, enter_cpu_percent=85, exit_cpu_percent=60),
+        smoothing=0.5,
+        min_degraded_s=5.0,
+        registry=registry,
+        clock=clock,
+    )
+
+
+def test_governor_degrades_on_smoothed_lag_and_recovers_with_hysteresis() -> None:
+    clock = _Clock()
+    registry = MetricsRegistry()
+    governor = _governor(clock, registry)
+
+    governor.sample(loop_lag_ms=150, cpu_percent=10)
+    assert not governor.degraded  # one spike only moves the average halfway
+    governor.sample(loop_lag_ms=150, cpu_percent=10)
+    assert governor.degraded and governor.reason == "loop_lag" and governor.mode == "text"
+
+    # Under the enter threshold but above the exit threshold keeps text mode.
+    for _ in range(6):
+        clock.now += 1
+        governor.sample(loop_lag_ms=50, cpu_percent=10)
+    assert governor.degraded
+
+    governor.sample(loop_lag_ms=0, cpu_percent=10)
+    governor.sample(loop_lag_ms=0, cpu_percent=10)
+    assert not governor.degraded and governor.mode == "audio"
+    assert governor.transitions == 2
+    transitions = {
+        counter["labels"]["mode"]: counter["value"]
+        for counter in registry.snapshot()["counters"]
+        if counter["name"] == "overload_transitions_total"
+    }
+    assert transitions == {"text": 1, "audio": 1}
+
+
+def test_governor_holds_degraded_mode_for_the_minimum_time() -> None:
+    clock = _Clock()
+    governor = _governor(clock, MetricsRegistry())
+    for _ in range(3):
+        governor.sample(loop_lag_ms=0, cpu_percent=100)
+    assert governor.degraded and governor.reason == "cpu"
+
+    for _ in range(5):
+        governor.sample(loop_lag_ms=0, cpu_percent=0)
+    assert governor.degraded
+
+    clock.now = 5.0
+    governor.sample(loop_lag_ms=0, cpu_percent=0)
+    assert not governor.degraded
+
+
+def test_slow_replies_degrade_and_go_stale_without_new_turns() -> None:
+    clock = _Clock()
+    governor = OverloadGovernor(min_degraded_s=0, response_stale_s=30, registry=MetricsRegistry(), clock=clock)
+
+    governor.observe_response_latency(4000)
+    assert governor.degraded and governor.reason == "response_latency"
+
+    clock.now = 31.0
+    governor.sample(loop_lag_ms=0, cpu_percent=0)
+    assert governor.response_ms is None
+    assert not governor.degraded
+
+
+def test_mode_switches_are_rate_limited_across_sessions() -> None:
+    clock = _Clock()
+    registry = MetricsRegistry()
+    governor = OverloadGovernor(max_switches_per_s=2, registry=registry, clock=clock)
+
+    assert [governor.claim_mode_switch() for _ in range(3)] == [True, True, False]
+    clock.now += 0.5
+    assert [governor.claim_mode_switch() for _ in range(2)] == [True, False]
+    assert OverloadGovernor(max_switches_per_s=0, registry=MetricsRegistry()).claim_mode_switch()
+    deferred = {counter["name"]: counter["value"] for counter in registry.snapshot()["counters"]}
+    assert deferred["overload_switches_deferred_total"] == 2
+
+
+def test_bridge_switches_new_turns_to_text_replies_under_overload(
+    fake_bridge: Callable[..., LiveBridge],
+    scripted_websocket: Callable[..., Any],
+    run_session: Callable[..., None],
+) -> None:
+    # Any reply slower than 1 ms counts as overload, so the first (audio) turn degrades the second.
+    governor = OverloadGovernor(
+        thresholds=OverloadThresholds(enter_response_ms=1, exit_response_ms=0),
+        smoothing=1.0,
+        registry=MetricsRegistry(),
+    )
+    bridge = fake_bridge(
+        FakeLiveModelConfig(
+            response_latency_ms=10,
+            audio_sample_rate=16000,
+            tool_calls=(),
+            output_transcription_every_chunks=0,
+        ),
+        overload_governor=governor,
+    )
+    turn = [{"type": "ptt_start"}, b"\x00\x01" * 800, {"type": "ptt_end"}]
+    websocket = scripted_websocket(
+        [*turn, 0.2, *turn],
+        done=lambda sent: sum(1 for event in sent if event.get("type") == "assistant_text") >= 2,
+    )
+
+    run_session(bridge, websocket)
+
+    assert governor.degraded and governor.reason == "response_latency"
+    types_sent = [event.get("type") for event in websocket.sent]
+    mode_event = next(event for event in websocket.sent if event.get("type") == "response_mode")
+    assert mode_event == {"type": "response_mode", "mode": "text", "reason": "response_latency"}
+    # Only the first turn's one second of 16 kHz audio was sent; the second is answered with a single text part.
+    assert len(websocket.binary_bytes) == 16000 * 2
+    assert types_sent.index("response_mode") > types_sent.index("assistant_text")
+    assert types_sent[-1] == "assistant_text"
+    assert types_sent.count("session_ready") == 1
+
+
+def test_bridge_keeps_audio_replies_for_native_audio_models_under_overload(
+    fake_bridge: Callable[..., LiveBridge],
+    scripted_websocket: Callable[..., Any],
+    run_session: Callable[..., None],
+) -> None:
+    governor = OverloadGovernor(
+        thresholds=OverloadThresholds(enter_response_ms=1, exit_response_ms=0),
+        smoothing=1.0,
+        registry=MetricsRegistry(),
+    )
+    # The fake runner rejects the TEXT modality for native-audio models, the way the Live API does.
+    bridge = fake_bridge(
+        FakeLiveModelConfig(
+            response_latency_ms=10,
+            audio_sample_rate=16000,
+            tool_calls=(),
+            output_transcription_every_chunks=0,
+        ),
+        model="gemini-2.5-flash-native-audio-preview-12-2025",
+        overload_governor=governor,
+    )
+    turn = [{"type": "ptt_start"}, b"\x00\x01" * 800, {"type": "ptt_end"}]
+    websocket = scripted_websocket(
+        [*turn, 0.2, *turn],
+        done=lambda sent: sum(1 for event in sent if event.get("type") == "assistant_text") >= 2,
+    )
+
+    run_session(bridge, websocket)
+
+    assert governor.degraded
+    types_sent = [event.get("type") for event in websocket.sent]
+    assert "response_mode" not in types_sent and "error" not in types_sent
+    # Both turns were answered with one second of 16 kHz audio on the same connection.
+    assert len(websocket.binary_bytes) == 2 * 16000 * 2
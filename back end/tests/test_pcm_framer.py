@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import pytest
+
+from app.fake_live_model import FakeLiveModelConfig
+from app.live_bridge import LiveBridge
+from app.pcm_framer import PcmFramer
+
+PACKET = b"\x01\x02" * 800  # 50 ms at 16 kHz
+
+
+def test_first_frame_is_short_then_frames_follow_frame_ms() -> None:
+    framer = PcmFramer(frame_ms=100, first_frame_ms=50)
+
+    sizes = [len(frame) for _ in range(5) for frame in framer.push(PACKET)]
+
+    # 50 ms first frame, then one 100 ms frame per two packets.
+    assert sizes == [1600, 3200, 3200]
+    assert framer.buffered_bytes == 0
+
+
+def test_flush_returns_tail_and_reset_rearms_first_frame() -> None:
+    framer = PcmFramer(frame_ms=100, first_frame_ms=50)
+    framer.push(PACKET)
+    framer.push(PACKET)
+
+    assert framer.flush() == PACKET
+    assert framer.flush() is None
+
+    framer.reset()
+    assert [len(frame) for frame in framer.push(PACKET)] == [1600]
+
+
+def test_push_splits_oversized_packets_across_frames() -> None:
+    framer = PcmFramer(frame_ms=50, min_frame_ms=50, first_frame_ms=50)
+    data = bytes(range(256)) * 25  # 6400 bytes = 200 ms
+
+    frames = framer.push(data)
+
+    assert [len(frame) for frame in frames] == [1600, 1600, 1600, 1600]
+    assert b"".join(frames) == data
+
+
+def test_observe_backlog_grows_and_shrinks_frame_size() -> None:
+    framer = PcmFramer(frame_ms=100, min_frame_ms=50, max_frame_ms=200, high_backlog=3, drained_frames_to_shrink=2)
+
+    framer.observe_backlog(3)
+    assert framer.frame_ms == 200
+    framer.observe_backlog(5)
+    assert framer.frame_ms == 200
+    framer.observe_backlog(1)
+    framer.observe_backlog(0)
+    assert framer.frame_ms == 200
+    framer.observe_backlog(0)
+    assert framer.frame_ms == 100
+    framer.observe_backlog(0)
+    framer.observe_backlog(0)
+    framer.observe_backlog(0)
+    framer.observe_backlog(0)
+    # A drained queue only takes the frame size back to frame_ms, never below it.
+    assert framer.frame_ms == 100
+
+
+def test_reset_restores_the_configured_frame_size() -> None:
+    framer = PcmFramer(frame_ms=100, max_frame_ms=200, high_backlog=1)
+    framer.observe_backlog(1)
+    assert framer.frame_ms == 200
+
+    framer.reset()
+
+    assert framer.frame_ms == 100
+    # With an idle upstream every later turn still combines two 50 ms packets per frame.
+    sizes = []
+    for _ in range(20):
+        framer.observe_backlog(0)
+        sizes += [len(frame) for frame in framer.push(PACKET)]
+    assert sizes == [1600] + [3200] * 9
+
+
+def test_invalid_frame_durations_rejected() -> None:
+    with pytest.raises(ValueError):
+        PcmFramer(frame_ms=300, max_frame_ms=200)
+
+
+def test_bridge_reframes_uplink_audio_and_flushes_tail_on_ptt_end(
+    fake_bridge: Callable[..., LiveBridge],
+    scripted_websocket: Callable[..., Any],
+    run_session: Callable[..., None],
+) -> None:
+    bridge = fake_bridge(
+        FakeLiveModelConfig(
+            response_latency_ms=0,
+            audio_sample_rate=16000,
+            audio_chunk_bytes=1 << 20,
+            echo_input_audio=True,
+            tool_calls=(),
+            output_transcription_every_chunks=0,
+        ),
+        uplink_frame_ms=100,
+    )
+    packets = [bytes([index]) * 1600 for index in range(5)]
+    websocket = scripted_websocket(
+        [{"type": "ptt_start"}, *packets, {"type": "ptt_end"}],
+        done=lambda sent: any(event.get("type") == "assistant_text" for event in sent),
+    )
+
+    run_session(bridge, websocket)
+
+    # Frames of 50 + 100 + 100 ms plus the flushed 50 ms tail reach the model intact and in order.
+    assert websocket.binary_bytes == b"".join(packets)
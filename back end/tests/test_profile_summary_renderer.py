@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+from app.patient_profile_models import BiomarkerTarget
+from app.patient_profile_models import ConditionRecord
+from app.patient_profile_models import PatientProfile
+from app.patient_profile_models import TreatmentRecord
+from app.profile_summary_renderer import ProfileSummaryRenderer
+
+
+def _profile(notes: str | None = None, updated_at: str = "2026-02-20T10:00:00Z") -> PatientProfile:
+    return PatientProfile(
+        user_id="patient-1",
+        full_name="Demo User",
+        conditions=[
+            ConditionRecord(name="Type 2 diabetes"),
+            ConditionRecord(name="Hypertension"),
+            ConditionRecord(name="Hyperlipidemia"),
+            ConditionRecord(name="Obesity"),
+        ],
+        treatments=[TreatmentRecord(name="Metformin"), TreatmentRecord(name="Losartan")],
+        biomarker_targets=[BiomarkerTarget(biomarker="HbA1c", target="< 7.0", unit="%")],
+        allergies=["Penicillin"],
+        contraindications=["Systemic steroids"],
+        notes=notes,
+        updated_at=updated_at,
+    )
+
+
+def test_render_fits_everything_within_large_budget() -> None:
+    renderer = ProfileSummaryRenderer(max_chars=2000)
+
+    rendered = renderer.render(_profile(notes="Prioritize medication adherence"))
+
+    assert rendered.text.startswith("Patient: Demo User.")
+    assert "Known conditions: Type 2 diabetes, Hypertension, Hyperlipidemia, Obesity." in rendered.text
+    assert rendered.text.endswith("Clinician notes: Prioritize medication adherence.")
+    assert rendered.stats.used_chars == len(rendered.text)
+    assert rendered.stats.truncated_fields == ()
+
+
+def test_render_respects_budget_and_keeps_safety_fields() -> None:
+    long_notes = " ".join(["Discussed lifestyle changes at length."] * 40)
+    renderer = ProfileSummaryRenderer(max_chars=160)
+
+    rendered = renderer.render(_profile(notes=long_notes))
+
+    assert len(rendered.text) <= 160
+    assert "Allergies: Penicillin." in rendered.text
+    assert "Contraindications: Systemic steroids." in rendered.text
+    assert "notes" in rendered.stats.truncated_fields
+
+
+def test_render_summarizes_omitted_list_items() -> None:
+    renderer = ProfileSummaryRenderer(max_chars=130)
+
+    rendered = renderer.render(_profile())
+
+    assert "more)" in rendered.text
+    assert "conditions" in rendered.stats.truncated_fields or "treatments" in rendered.stats.truncated_fields
+
+
+def test_token_budget_caps_character_budget() -> None:
+    renderer = ProfileSummaryRenderer(max_chars=1000, max_tokens=25)
+
+    rendered = renderer.render(_profile(notes="x " * 200))
+
+    assert renderer.budget_chars == 100
+    assert rendered.stats.used_chars <= 100
+    assert rendered.stats.estimated_tokens <= 25
+
+
+def test_render_is_cached_per_profile_version() -> None:
+    renderer = ProfileSummaryRenderer(max_chars=400)
+
+    first = renderer.render(_profile(notes="v1"))
+    second = renderer.render(_profile(notes="v1"))
+    updated = renderer.render(_profile(notes="v2", updated_at="2026-02-21T10:00:00Z"))
+
+    assert first.stats.cache_hit is False
+    assert second.stats.cache_hit is True
+    assert second.text == first.text
+    assert updated.stats.cache_hit is False
+    assert "v2" in updated.text
+
+
+def test_concurrent_renders_share_a_bounded_cache() -> None:
+    renderer = ProfileSummaryRenderer(max_chars=400, cache_size=4)
+    profiles = [_profile(notes=f"v{index % 8}", updated_at=f"2026-02-{10 + index % 8}T10:00:00Z") for index in range(400)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        rendered = list(pool.map(renderer.render, profiles))
+
+    assert [summary.text for summary in rendered] == [renderer.render(profile).text for profile in profiles]
+    assert len(renderer._cache) == 4
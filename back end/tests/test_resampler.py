@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Callable
+
+import numpy as np
+import pytest
+
+from app.fake_live_model import FakeLiveModelConfig
+from app.live_bridge import LiveBridge
+from app.resampler import StreamingResampler
+from app.resampler import parse_client_sample_rate
+
+
+def _tone(sample_rate: int, frequency: float = 440.0, seconds: float = 0.5) -> np.ndarray:
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    return (10000 * np.sin(2 * math.pi * frequency * t)).astype("<i2")
+
+
+def _tone_snr_db(samples: np.ndarray, sample_rate: int, frequency: float = 440.0) -> float:
+    n = np.arange(samples.size)[200:-200]
+    omega = 2 * math.pi * frequency / sample_rate
+    basis = np.stack([np.sin(omega * n), np.cos(omega * n)], axis=1)
+    measured = samples[200:-200].astype(np.float64)
+    coefficients, *_ = np.linalg.lstsq(basis, measured, rcond=None)
+    fitted = basis @ coefficients
+    return 10 * math.log10(np.sum(fitted**2) / np.sum((measured - fitted) ** 2))
+
+
+@pytest.mark.parametrize(("input_rate", "output_rate"), [(48000, 16000), (44100, 16000), (24000, 44100), (24000, 48000)])
+def test_resampler_preserves_tone_and_length(input_rate: int, output_rate: int) -> None:
+    resampler = StreamingResampler(input_rate, output_rate)
+
+    out = resampler.process(_tone(input_rate).tobytes()) + resampler.flush()
+    samples = np.frombuffer(out, dtype="<i2")
+
+    assert abs(samples.size - output_rate // 2) <= 32
+    assert _tone_snr_db(samples, output_rate) > 60
+
+
+def test_chunked_stream_matches_one_shot_output() -> None:
+    raw = _tone(44100).tobytes()
+    one_shot = StreamingResampler(44100, 16000)
+    chunked = StreamingResampler(44100, 16000)
+
+    expected = one_shot.process(raw) + one_shot.flush()
+    # Odd chunk sizes split samples across calls.
+    actual = b"".join(chunked.process(raw[offset : offset + 1001]) for offset in range(0, len(raw), 1001))
+    actual += chunked.flush()
+
+    assert actual == expected
+
+
+def test_parse_client_sample_rate_rejects_out_of_range_values() -> None:
+    assert parse_client_sample_rate("48000") == 48000
+    assert parse_client_sample_rate(44100) == 44100
+    assert parse_client_sample_rate("4000") is None
+    assert parse_client_sample_rate("fast") is None
+    assert parse_client_sample_rate(None) is None
+
+
+def test_bridge_resamples_to_client_declared_rates(
+    fake_bridge: Callable[..., LiveBridge],
+    scripted_websocket: Callable[..., Any],
+    run_session: Callable[..., None],
+) -> None:
+    bridge = fake_bridge(
+        FakeLiveModelConfig(
+            response_latency_ms=0,
+            audio_sample_rate=16000,
+            audio_chunk_bytes=1 << 20,
+            echo_input_audio=True,
+            tool_calls=(),
+            output_transcription_every_chunks=0,
+        )
+    )
+    packets = [b"\x00\x10" * 2400] * 4  # 4 x 50 ms at 48 kHz
+    websocket = scripted_websocket(
+        [{"type": "ptt_start"}, *packets, {"type": "ptt_end"}],
+        done=lambda sent: any(event.get("type") == "assistant_text" for event in sent),
+    )
+
+    run_session(bridge, websocket, input_sample_rate=48000, output_sample_rate=44100)
+
+    audio_format = next(event for event in websocket.sent if event.get("type") == "assistant_audio_format")
+    assert audio_format["sampleRate"] == 44100
+    # 200 ms went up at 16 kHz and came back at 44.1 kHz, give or take the filter delay at each end.
+    assert abs(len(websocket.binary_bytes) // 2 - 8820) <= 64
+
+
+def test_hello_with_only_an_input_rate_keeps_the_query_output_rate(
+    fake_bridge: Callable[..., LiveBridge],
+    scripted_websocket: Callable[..., Any],
+    run_session: Callable[..., None],
+) -> None:
+    bridge = fake_bridge(
+        FakeLiveModelConfig(
+            response_latency_ms=0,
+            audio_sample_rate=16000,
+            audio_chunk_bytes=1 << 20,
+            echo_input_audio=True,
+            tool_calls=(),
+            output_transcription_every_chunks=0,
+        )
+    )
+    packets = [b"\x00\x10" * 2400] * 4  # 4 x 50 ms at 48 kHz
+    websocket = scripted_websocket(
+        [{"type": "hello", "inputSampleRate": 48000}, {"type": "ptt_start"}, *packets, {"type": "ptt_end"}],
+        done=lambda sent: any(event.get("type") == "assistant_text" for event in sent),
+    )
+
+    run_session(bridge, websocket, output_sample_rate=44100)
+
+    audio_format = next(event for event in websocket.sent if event.get("type") == "assistant_audio_format")
+    assert audio_format["sampleRate"] == 44100
+    assert abs(len(websocket.binary_bytes) // 2 - 8820) <= 64
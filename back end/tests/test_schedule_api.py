@@ -10,6 +10,7 @@ class _ScheduleServiceStub:
     def __init__(self) -> None:
         self.today_calls = 0
         self.reports_calls = 0
+        self.search_calls: list[dict] = []
 
     def get_today_schedule(self, **_kwargs):
         self.today_calls += 1
@@ -24,6 +25,10 @@ class _ScheduleServiceStub:
             "reports": [],
         }
 
+    def search_adherence_reports(self, **kwargs):
+        self.search_calls.append(kwargs)
+        return {"query": kwargs["query"], "results": [], "message": "No past adherence reports matched that search."}
+
 
 def test_schedule_today_endpoint() -> None:
     service = _ScheduleServiceStub()
@@ -47,3 +52,21 @@ def test_schedule_item_reports_endpoint() -> None:
     assert response.status_code == 200
     assert response.json()["scheduleItemId"] == "sched_1"
     assert service.reports_calls == 1
+
+
+def test_schedule_report_search_endpoint() -> None:
+    service = _ScheduleServiceStub()
+    app = FastAPI()
+    app.include_router(build_schedule_router(service))
+    client = TestClient(app)
+
+    response = client.get(
+        "/api/schedule/reports/search",
+        params={"user_id": "patient-1", "q": "dizziness", "limit": 3},
+    )
+    assert response.status_code == 200
+    assert response.json()["query"] == "dizziness"
+    assert service.search_calls == [{"user_id": "patient-1", "query": "dizziness", "limit": 3}]
+
+    too_many = client.get("/api/schedule/reports/search", params={"user_id": "patient-1", "q": "x", "limit": 50})
+    assert too_many.status_code == 422
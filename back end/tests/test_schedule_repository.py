@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import sqlite3
 from pathlib import Path
 
 from app.schedule_models import AdherenceReportRow
+from app.schedule_repository import REPORT_SEARCH_TABLE
 from app.schedule_repository import ScheduleRepository
 
 
@@ -96,3 +98,122 @@ def test_find_duplicate_report_by_session_and_turn(tmp_path: Path) -> None:
     )
     assert duplicate is not None
     assert duplicate.alert_level.value == "watch"
+
+
+def test_search_reports_ranks_matching_snippets(tmp_path: Path) -> None:
+    seed_path = tmp_path / "schedule_seed.sql"
+    db_path = tmp_path / "schedule.db"
+    _write_seed(seed_path)
+
+    repo = ScheduleRepository(db_url=f"sqlite:///{db_path}", seed_sql_path=seed_path)
+    repo.initialize()
+    repo.save_report(
+        AdherenceReportRow(
+            user_id="patient-1",
+            schedule_item_id="sched_1",
+            report_date_local="2026-02-21",
+            activity_type="diet",
+            status="done",
+            followed_plan=True,
+            symptoms="Mild dizziness after standing up.",
+            summary="Lunch done.",
+            alert_level="watch",
+            reported_at_iso="2026-02-21T13:10:00+00:00",
+        )
+    )
+    repo.save_report(
+        AdherenceReportRow(
+            user_id="patient-1",
+            schedule_item_id="sched_1",
+            report_date_local="2026-02-22",
+            activity_type="diet",
+            status="done",
+            followed_plan=True,
+            felt_after="Energetic.",
+            summary="Lunch done.",
+            alert_level="none",
+            reported_at_iso="2026-02-22T13:10:00+00:00",
+        )
+    )
+
+    hits = repo.search_reports("patient-1", "When did I last mention dizziness?")
+    assert len(hits) == 1
+    assert hits[0].report_date_local == "2026-02-21"
+    assert "[dizziness]" in hits[0].snippet
+
+    assert repo.search_reports("other-user", "dizziness") == []
+    assert repo.search_reports("patient-1", '"* OR (') == []
+
+
+def test_search_index_backfills_existing_reports(tmp_path: Path) -> None:
+    seed_path = tmp_path / "schedule_seed.sql"
+    db_path = tmp_path / "schedule.db"
+    _write_seed(seed_path)
+
+    repo = ScheduleRepository(db_url=f"sqlite:///{db_path}", seed_sql_path=seed_path)
+    repo.initialize()
+    repo.save_report(
+        AdherenceReportRow(
+            user_id="patient-1",
+            schedule_item_id="sched_1",
+            report_date_local="2026-02-22",
+            activity_type="diet",
+            status="skipped",
+            followed_plan=False,
+            notes="Nausea in the morning.",
+            summary="Skipped lunch.",
+            alert_level="watch",
+            reported_at_iso="2026-02-22T13:10:00+00:00",
+        )
+    )
+
+    # Recreate a database from before the search index existed.
+    with sqlite3.connect(db_path) as connection:
+        connection.execute(f"DROP TABLE {REPORT_SEARCH_TABLE}")
+
+    reopened = ScheduleRepository(db_url=f"sqlite:///{db_path}", seed_sql_path=seed_path)
+    reopened.initialize()
+
+    hits = reopened.search_reports("patient-1", "nausea")
+    assert len(hits) == 1
+    assert hits[0].report_date_local == "2026-02-22"
+
+
+def test_aggregate_reports_by_item_counts_statuses(tmp_path: Path) -> None:
+    seed_path = tmp_path / "schedule_seed.sql"
+    db_path = tmp_path / "schedule.db"
+    _write_seed(seed_path)
+
+    repo = ScheduleRepository(db_url=f"sqlite:///{db_path}", seed_sql_path=seed_path)
+    repo.initialize()
+    for day, status, alert in [("2026-02-20", "done", "none"), ("2026-02-21", "done", "none"), ("2026-02-22", "skipped", "urgent")]:
+        repo.save_report(
+            AdherenceReportRow(
+                user_id="patient-1",
+                schedule_item_id="sched_1",
+                report_date_local=day,
+                activity_type="diet",
+                status=status,
+                followed_plan=status == "done",
+                summary=f"Lunch {status}.",
+                alert_level=alert,
+                reported_at_iso=f"{day}T13:10:00+00:00",
+            )
+        )
+    date_range = {"start_date_local": "2026-02-21", "end_date_local": "2026-02-22"}
+
+    aggregates = repo.aggregate_reports_by_item("patient-1", **date_range)
+    assert len(aggregates) == 1
+    assert aggregates[0].title == "Lunch"
+    assert aggregates[0].total_reports == 2
+    assert aggregates[0].done_count == 1
+    assert aggregates[0].skipped_count == 1
+    assert aggregates[0].urgent_alerts == 1
+    assert aggregates[0].last_report_date == "2026-02-22"
+
+    assert repo.aggregate_reports_by_item("patient-1", **date_range, activity_type="sleep") == []
+    assert repo.list_done_dates_by_item("patient-1", start_date_local="2026-02-01", end_date_local="2026-02-28") == {
+        "sched_1": ["2026-02-20", "2026-02-21"]
+    }
+    recent = repo.list_recent_reports("patient-1", **date_range, limit=1)
+    assert [report.report_date_local for report in recent] == ["2026-02-22"]
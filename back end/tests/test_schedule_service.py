@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from datetime import date
+
+from app.schedule_models import AdherenceItemAggregate
 from app.schedule_models import AdherenceReport
 from app.schedule_models import AdherenceStatus
 from app.schedule_models import AlertLevel
@@ -100,6 +103,30 @@ class _ScheduleRepositoryStub:
             }
         )
 
+    def aggregate_reports_by_item(self, _user_id: str, **kwargs):
+        self.history_range = kwargs
+        return [
+            AdherenceItemAggregate(
+                schedule_item_id="sched_lunch",
+                title="Lunch",
+                activity_type=ScheduleActivityType.DIET,
+                total_reports=3,
+                done_count=3,
+                partial_count=0,
+                skipped_count=0,
+                delayed_count=0,
+                urgent_alerts=0,
+                last_report_date=kwargs["end_date_local"],
+            )
+        ]
+
+    def list_done_dates_by_item(self, _user_id: str, **kwargs):
+        end = date.fromisoformat(kwargs["end_date_local"])
+        return {"sched_lunch": [date.fromordinal(end.toordinal() - offset).isoformat() for offset in (3, 2, 1)]}
+
+    def list_recent_reports(self, _user_id: str, **_kwargs):
+        return self.reports
+
     def list_reports_for_item(self, _user_id: str, _schedule_item_id: str, report_date_local: str | None = None):
         if report_date_local:
             return [report for report in self.reports if report.report_date_local == report_date_local]
@@ -207,3 +234,27 @@ def test_save_adherence_report_returns_reason_code_for_invalid_item() -> None:
 
     assert payload["saved"] is False
     assert payload["reasonCode"] == "invalid_item_id"
+
+
+def test_get_adherence_history_returns_counts_and_streaks() -> None:
+    repo = _ScheduleRepositoryStub()
+    service = ScheduleService(repo)
+
+    history = service.get_adherence_history(user_id="patient-1", timezone_name="UTC", days=90, activity_type="Diet")
+
+    assert history["days"] == 30
+    assert history["activityType"] == "diet"
+    assert repo.history_range["activity_type"] == "diet"
+    item = history["items"][0]
+    assert item["done"] == 3
+    assert item["currentStreakDays"] == 3
+    assert item["longestStreakDays"] == 3
+    assert history["recentSummaries"][0]["summary"] == "Lunch done."
+
+
+def test_get_adherence_history_rejects_unknown_activity_type() -> None:
+    service = ScheduleService(_ScheduleRepositoryStub())
+
+    history = service.get_adherence_history(user_id="patient-1", timezone_name="UTC", activity_type="swimming")
+
+    assert history["reasonCode"] == "invalid_activity_type"
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 from app.schedule_tools import build_schedule_tools
+from app.tool_cache import SessionToolCache
 
 
 class _ScheduleServiceStub:
+    def __init__(self) -> None:
+        self.today_calls = 0
+
     def get_today_schedule(self, **kwargs):
+        self.today_calls += 1
         return {"date": "2026-02-22", "timezone": kwargs.get("timezone_name") or "UTC", "items": [], "timeline": []}
 
     def get_current_schedule_item(self, **_kwargs):
@@ -21,6 +26,12 @@ class _ScheduleServiceStub:
     def save_adherence_report(self, **kwargs):
         return {"type": "adherence_report_saved", "saved": True, "status": kwargs["status"]}
 
+    def search_adherence_reports(self, **kwargs):
+        return {"query": kwargs["query"], "userId": kwargs["user_id"], "results": []}
+
+    def get_adherence_history(self, **kwargs):
+        return {"type": "adherence_history", "days": kwargs["days"], "timezone": kwargs["timezone_name"]}
+
 
 class _ToolContextStub:
     state = {
@@ -32,7 +43,7 @@ class _ToolContextStub:
 
 def test_schedule_tools_emit_expected_payloads() -> None:
     tools = build_schedule_tools(_ScheduleServiceStub())
-    assert len(tools) == 3
+    assert len(tools) == 5
 
     get_today_schedule = tools[0]
     save_adherence_report = tools[2]
@@ -49,3 +60,36 @@ def test_schedule_tools_emit_expected_payloads() -> None:
     )
     assert saved["type"] == "adherence_report_saved"
     assert saved["saved"] is True
+
+
+def test_search_adherence_notes_uses_session_user() -> None:
+    tools = build_schedule_tools(_ScheduleServiceStub())
+    search_adherence_notes = tools[3]
+
+    result = search_adherence_notes(query="dizziness", tool_context=_ToolContextStub())
+    assert result["userId"] == "patient-1"
+    assert result["query"] == "dizziness"
+
+
+def test_get_adherence_history_resolves_session_timezone() -> None:
+    tools = build_schedule_tools(_ScheduleServiceStub())
+    get_adherence_history = tools[4]
+
+    result = get_adherence_history(days=14, tool_context=_ToolContextStub())
+    assert result == {"type": "adherence_history", "days": 14, "timezone": "Asia/Kolkata"}
+
+
+def test_today_schedule_is_memoized_until_report_saved() -> None:
+    service = _ScheduleServiceStub()
+    cache = SessionToolCache()
+    tools = build_schedule_tools(service, tool_cache=cache)
+    get_today_schedule, save_adherence_report = tools[0], tools[2]
+
+    get_today_schedule(tool_context=_ToolContextStub())
+    get_today_schedule(tool_context=_ToolContextStub())
+    assert service.today_calls == 1
+
+    save_adherence_report(schedule_item_id="sched_1", status="done", followed_plan=True, tool_context=_ToolContextStub())
+    get_today_schedule(tool_context=_ToolContextStub())
+    assert service.today_calls == 2
+    assert cache.stats().hits == 1
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, Callable
+
+from google.adk.events import Event
+from google.genai import types
+
+from app.live_bridge import LiveBridge
+from app.session_recorder import RecordKind
+from app.session_recorder import SessionRecorder
+from app.session_recorder import decode_upstream_event
+from app.session_recorder import encode_upstream_event
+from app.session_recorder import read_recording
+from app.session_replay import replay_recording
+
+
+def _audio_event(data: bytes) -> Event:
+    return Event(
+        author="raksha",
+        content=types.Content(
+            role="model",
+            parts=[types.Part(inline_data=types.Blob(mime_type="audio/pcm;rate=24000", data=data))],
+        ),
+    )
+
+
+def _write_sample_recording(directory: Path) -> Path:
+    recorder = SessionRecorder.open(directory, "sample")
+    recorder.record_session_start(user_id="user-1", timezone_name="Asia/Kolkata")
+    recorder.record_inbound_text(json.dumps({"type": "ptt_start"}))
+    recorder.record_inbound_audio(b"\x01\x00" * 800)
+    recorder.record_inbound_text(json.dumps({"type": "ptt_end"}))
+    recorder.record_upstream_event(Event(author="user", input_transcription=types.Transcription(text="hello")))
+    recorder.record_upstream_event(_audio_event(b"\x02\x00" * 2400))
+    recorder.close()
+    assert recorder.path is not None
+    return recorder.path
+
+
+def test_upstream_event_round_trip_stores_audio_as_raw_bytes() -> None:
+    audio = bytes(range(256)) * 8
+    payload = encode_upstream_event(_audio_event(audio))
+
+    # Raw blob is appended once instead of being base64-inflated inside the JSON.
+    assert len(payload) < len(audio) + 400
+    decoded = Event.model_validate(decode_upstream_event(payload))
+    assert decoded.content.parts[0].inline_data.data == audio
+    assert decoded.content.parts[0].inline_data.mime_type == "audio/pcm;rate=24000"
+
+
+def test_read_recording_yields_frames_in_order(tmp_path: Path) -> None:
+    path = _write_sample_recording(tmp_path)
+
+    frames = list(read_recording(path))
+
+    assert [frame.kind for frame in frames] == [
+        RecordKind.SESSION_START,
+        RecordKind.INBOUND_TEXT,
+        RecordKind.INBOUND_AUDIO,
+        RecordKind.INBOUND_TEXT,
+        RecordKind.UPSTREAM_EVENT,
+        RecordKind.UPSTREAM_EVENT,
+    ]
+    assert frames[0].decode_json() == {"userId": "user-1", "timezone": "Asia/Kolkata"}
+    assert frames[2].payload == b"\x01\x00" * 800
+    assert frames[4].decode_event()["input_transcription"]["text"] == "hello"
+    offsets = [frame.offset_us for frame in frames]
+    assert offsets == sorted(offsets)
+
+
+def test_read_recording_stops_at_truncated_tail(tmp_path: Path) -> None:
+    path = _write_sample_recording(tmp_path)
+    data = path.read_bytes()
+    path.write_bytes(data[:-10])
+
+    frames = list(read_recording(path))
+
+    assert len(frames) == 5
+
+
+def test_replay_recording_drives_the_bridge(tmp_path: Path) -> None:
+    path = _write_sample_recording(tmp_path)
+
+    report = asyncio.run(replay_recording(path))
+
+    assert report.upstream_events == 2
+    assert report.tx_binary_frames == 1
+    # session_ready, profile_status, partial_transcript, assistant_audio_format
+    assert report.tx_text_frames == 4
+
+
+def test_bridge_runs_without_capture_when_the_capture_dir_is_unusable(
+    tmp_path: Path,
+    fake_bridge: Callable[..., LiveBridge],
+    scripted_websocket: Callable[..., Any],
+    run_session: Callable[..., None],
+) -> None:
+    not_a_dir = tmp_path / "captures"
+    not_a_dir.write_text("")
+    bridge = fake_bridge(capture_dir=not_a_dir)
+    websocket = scripted_websocket(
+        [{"type": "text_input", "text": "hello"}],
+        done=lambda sent: any(event.get("type") == "assistant_text" for event in sent),
+    )
+
+    run_session(bridge, websocket)
+
+    assert [event.get("type") for event in websocket.sent][0] == "session_ready"
+    assert websocket.close_code is None
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable
+
+from app.fake_live_model import FakeLiveModelConfig
+from app.live_bridge import LiveBridge
+from app.metrics import MetricsRegistry
+from app.session_resume import SessionResumeRegistry
+from app.session_resume import parse_last_seq
+
+
+def test_claim_hands_the_websocket_to_the_parked_session() -> None:
+    registry = SessionResumeRegistry(grace_s=1.0, registry=MetricsRegistry())
+
+    async def _run() -> tuple[object, int, bool]:
+        waiter = asyncio.create_task(registry.wait("token-1", user_id="u1", trace_id="t1"))
+        await asyncio.sleep(0)
+        assert registry.parked == 1
+        assert registry.claim("token-1", user_id="u2", websocket="ws", last_seq=3) is None
+        claimed = registry.claim("token-1", user_id="u1", websocket="ws", last_seq=3)
+        reattachment = await waiter
+        assert reattachment is claimed
+        return reattachment.websocket, reattachment.last_seq, reattachment.released.is_set()  # type: ignore[union-attr]
+
+    assert asyncio.run(_run()) == ("ws", 3, False)
+    assert registry.parked == 0
+
+
+def test_unclaimed_session_expires_after_the_grace_period() -> None:
+    metrics = MetricsRegistry()
+    registry = SessionResumeRegistry(grace_s=0.02, registry=metrics)
+
+    assert asyncio.run(registry.wait("token-1", user_id="u1", trace_id="t1")) is None
+    assert registry.claim("token-1", user_id="u1", websocket="ws", last_seq=0) is None
+    counters = {counter["name"]: counter["value"] for counter in metrics.snapshot()["counters"]}
+    assert counters["session_resume_expired_total"] == 1
+    assert counters["session_resume_misses_total"] == 1
+
+
+def test_parse_last_seq_defaults_to_zero() -> None:
+    assert parse_last_seq(" 42 ") == 42
+    assert parse_last_seq("-1") == 0
+    assert parse_last_seq(None) == 0
+
+
+def test_bridge_resumes_dropped_websocket_and_replays_only_missed_frames(
+    fake_bridge: Callable[..., LiveBridge],
+    scripted_websocket: Callable[..., Any],
+) -> None:
+    session_resume = SessionResumeRegistry(grace_s=0.5, registry=MetricsRegistry())
+    bridge = fake_bridge(
+        FakeLiveModelConfig(response_latency_ms=100, tool_calls=()),
+        session_resume=session_resume,
+    )
+    # The first websocket drops right after ptt_end, before the reply arrives, the way Starlette reports it.
+    first = scripted_websocket(
+        [{"type": "ptt_start"}, *[b"\x00\x00" * 800] * 5, {"type": "ptt_end"}],
+        done=lambda sent: True,
+        drop_when_exhausted=True,
+    )
+    second = scripted_websocket([], done=lambda sent: any(event.get("type") == "session_resumed" for event in sent))
+
+    async def _run() -> None:
+        session = asyncio.create_task(bridge.run_websocket(first, user_id="raksha-user"))
+        while session_resume.parked == 0:
+            await asyncio.sleep(0.005)
+        await asyncio.sleep(0.3)
+        await bridge.run_websocket(
+            second,
+            user_id="raksha-user",
+            resume_token=first.sent[0]["resumeToken"],
+            last_seq=len(first.sent) + first.binary_frames,
+        )
+        await session
+
+    asyncio.run(asyncio.wait_for(_run(), timeout=10))
+
+    resumed = second.sent[-1]
+    assert resumed["type"] == "session_resumed"
+    assert resumed["sessionId"] == first.sent[0]["sessionId"]
+    assert resumed["missed"] == 0
+    assert resumed["replayed"] == len(second.sent) - 1 + second.binary_frames > 0
+    assert resumed["seq"] == resumed["lastSeq"] + resumed["replayed"] + 1
+    # Every reply frame reached the client exactly once across the two websockets.
+    assert len(first.binary_bytes) + len(second.binary_bytes) == 24000 * 2
+    assert "assistant_text" in [event.get("type") for event in second.sent]
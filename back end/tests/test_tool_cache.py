@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from app.tool_cache import SessionToolCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_hits_on_normalized_arguments() -> None:
+    cache = SessionToolCache()
+    calls: list[int] = []
+
+    def _compute() -> dict:
+        calls.append(1)
+        return {"value": len(calls)}
+
+    first = cache.get_or_compute("get_today_schedule", {"timezone": " UTC ", "date": None}, _compute)
+    second = cache.get_or_compute("get_today_schedule", {"timezone": "UTC"}, _compute)
+
+    assert first == second == {"value": 1}
+    assert cache.stats().hits == 1
+    assert cache.stats().misses == 1
+
+
+def test_cached_values_are_isolated_from_caller_mutation() -> None:
+    cache = SessionToolCache()
+    first = cache.get_or_compute("get_doctor_catalog", {}, lambda: {"doctors": [{"id": "d1"}]})
+    first["doctors"].clear()
+
+    second = cache.get_or_compute("get_doctor_catalog", {}, lambda: {"doctors": []})
+    assert second == {"doctors": [{"id": "d1"}]}
+
+
+def test_invalidate_and_ttl_expire_entries() -> None:
+    clock = _Clock()
+    cache = SessionToolCache(ttl_seconds=10.0, clock=clock)
+    cache.get_or_compute("get_doctor_catalog", {}, lambda: {"v": 1})
+    cache.get_or_compute("get_today_schedule", {}, lambda: {"v": 1})
+
+    cache.invalidate("get_doctor_catalog")
+    assert cache.get_or_compute("get_doctor_catalog", {}, lambda: {"v": 2}) == {"v": 2}
+    assert cache.get_or_compute("get_today_schedule", {}, lambda: {"v": 2}) == {"v": 1}
+
+    clock.now = 11.0
+    assert cache.get_or_compute("get_today_schedule", {}, lambda: {"v": 3}) == {"v": 3}
+    assert cache.stats().invalidations == 1
+
+
+def test_prefetched_entries_count_hits_once_and_not_as_misses() -> None:
+    cache = SessionToolCache()
+    with cache.prefetching():
+        cache.get_or_compute("get_doctor_catalog", {}, lambda: {"v": 1})
+        cache.get_or_compute("get_doctor_catalog", {}, lambda: {"v": 2})
+
+    assert cache.get_or_compute("get_doctor_catalog", {}, lambda: {"v": 3}) == {"v": 1}
+    assert cache.get_or_compute("get_doctor_catalog", {}, lambda: {"v": 3}) == {"v": 1}
+    stats = cache.stats()
+    assert (stats.misses, stats.hits) == (0, 2)
+    assert (stats.prefetched, stats.prefetch_hits) == (1, 1)
+    assert stats.prefetch_hit_rate == 1.0
+
+
+def test_prefetch_result_is_dropped_when_invalidated_while_computing() -> None:
+    cache = SessionToolCache()
+
+    def _compute() -> dict:
+        cache.invalidate("get_today_schedule")
+        return {"v": "stale"}
+
+    with cache.prefetching():
+        cache.get_or_compute("get_today_schedule", {}, _compute)
+
+    assert cache.get_or_compute("get_today_schedule", {}, lambda: {"v": "fresh"}) == {"v": "fresh"}
+    assert cache.stats().prefetch_hits == 0
+    assert cache.stats().prefetch_hit_rate == 0.0
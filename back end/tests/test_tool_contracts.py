@@ -5,6 +5,7 @@ from pathlib import Path
 from app.booking_state import SessionBookingState
 from app.doctor_repository import DoctorRepository
 from app.doctor_tools import build_doctor_tools
+from app.tool_cache import SessionToolCache
 
 
 def _build_tools():
@@ -65,3 +66,22 @@ def test_publish_recommendations_includes_profile_reasoning() -> None:
     reason = response["doctors"][0]["matchReason"]
     assert "Aligned with biomarker goals" in reason
     assert "Considers your history of Type 2 diabetes, Hypertension." in reason
+
+
+def test_doctor_catalog_cache_is_invalidated_by_booking() -> None:
+    repo = DoctorRepository.from_json_file(Path("app/data/mock_doctors.json"))
+    cache = SessionToolCache()
+    get_doctor_catalog, _, book_doctor_slot = build_doctor_tools(
+        repo,
+        SessionBookingState(repo.list_doctors()),
+        tool_cache=cache,
+    )
+    doctor = repo.list_doctors()[0]
+    slot_id = doctor["slots"][0]["slotId"]
+
+    assert get_doctor_catalog()["doctors"][0]["slots"][0]["isAvailable"] is True
+    assert get_doctor_catalog()["doctors"][0]["slots"][0]["isAvailable"] is True
+    assert cache.stats().hits == 1
+
+    assert book_doctor_slot(doctor["doctorId"], slot_id, True)["status"] == "confirmed"
+    assert get_doctor_catalog()["doctors"][0]["slots"][0]["isAvailable"] is False
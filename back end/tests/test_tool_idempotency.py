@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, AsyncIterator
+
+from app.booking_state import SessionBookingState
+from app.doctor_repository import DoctorRepository
+from app.doctor_tools import build_doctor_tools
+from app.live_bridge import LiveBridge
+from app.live_bridge import SessionMetrics
+from app.metrics import MetricsRegistry
+from app.schedule_tools import build_schedule_tools
+from app.tool_idempotency import ToolIdempotencyLedger
+from app.wire_protocol import OutboundChannel
+
+
+class _ScheduleServiceStub:
+    def __init__(self) -> None:
+        self.saved: list[dict[str, Any]] = []
+
+    def save_adherence_report(self, **kwargs: Any) -> dict[str, Any]:
+        self.saved.append(kwargs)
+        return {"type": "adherence_report_saved", "saved": True, "reportId": len(self.saved)}
+
+
+class _RecordingWebSocket:
+    def __init__(self) -> None:
+        self.sent: list[dict[str, Any]] = []
+
+    async def send_text(self, data: str) -> None:
+        self.sent.append(json.loads(data))
+
+    async def send_bytes(self, data: bytes) -> None:
+        raise AssertionError("binary frames are not expected")
+
+
+def _booking_tools(ledger: ToolIdempotencyLedger) -> tuple[DoctorRepository, SessionBookingState, Any]:
+    repo = DoctorRepository.from_json_file(Path("app/data/mock_doctors.json"))
+    booking_state = SessionBookingState(repo.list_doctors())
+    book_doctor_slot = build_doctor_tools(repo, booking_state, idempotency=ledger)[2]
+    return repo, booking_state, book_doctor_slot
+
+
+def test_replayed_booking_in_the_same_turn_returns_the_first_result() -> None:
+    ledger = ToolIdempotencyLedger(registry=MetricsRegistry())
+    repo, booking_state, book_doctor_slot = _booking_tools(ledger)
+    doctor = repo.list_doctors()[0]
+    slot_id = doctor["slots"][0]["slotId"]
+    ledger.begin_turn("1")
+
+    first = book_doctor_slot(doctor["doctorId"], slot_id, True)
+    replayed = book_doctor_slot(f" {doctor['doctorId']} ", slot_id, True)
+
+    assert first["status"] == "confirmed"
+    assert replayed == first
+    assert ledger.replays == 1
+    assert not booking_state.is_slot_available(doctor["doctorId"], slot_id)
+
+    ledger.begin_turn("2")
+    assert book_doctor_slot(doctor["doctorId"], slot_id, True)["status"] == "unavailable"
+
+
+def test_adherence_report_is_saved_once_per_turn_and_arguments() -> None:
+    ledger = ToolIdempotencyLedger(registry=MetricsRegistry())
+    service = _ScheduleServiceStub()
+    tools = build_schedule_tools(service, idempotency=ledger)  # type: ignore[arg-type]
+    save_adherence_report = tools[2]
+    ledger.begin_turn("1")
+
+    first = save_adherence_report("item-1", "done", True, tool_context=SimpleNamespace(state={}, invocation_id="live"))
+    replayed = save_adherence_report(
+        "item-1", "done", True, tool_context=SimpleNamespace(state={}, invocation_id="fallback")
+    )
+    other = save_adherence_report("item-2", "done", True)
+
+    assert replayed == first
+    assert other["reportId"] == 2
+    assert [report["schedule_item_id"] for report in service.saved] == ["item-1", "item-2"]
+
+
+def test_ledger_only_remembers_the_current_and_previous_turn() -> None:
+    ledger = ToolIdempotencyLedger(registry=MetricsRegistry())
+    calls: list[int] = []
+
+    def _save(turn: int) -> dict[str, Any]:
+        calls.append(turn)
+        return {"saved": True, "turn": turn}
+
+    for turn in range(1, 51):
+        ledger.begin_turn(str(turn))
+        ledger.run("save_adherence_report", {"schedule_item_id": f"item-{turn}"}, lambda turn=turn: _save(turn))
+
+    assert ledger.remembered_calls == 2
+    ledger.run("save_adherence_report", {"schedule_item_id": "item-50"}, lambda: _save(0))
+    assert calls[-1] == 50 and ledger.replays == 1
+
+
+def test_text_fallback_does_not_resend_payloads_of_replayed_calls() -> None:
+    ledger = ToolIdempotencyLedger(registry=MetricsRegistry())
+    repo, _, book_doctor_slot = _booking_tools(ledger)
+    doctor = repo.list_doctors()[0]
+    slot_id = doctor["slots"][0]["slotId"]
+    ledger.begin_turn("1")
+    # The live stream booked the slot and sent the confirmation before it failed.
+    book_doctor_slot(doctor["doctorId"], slot_id, True)
+
+    class _ReplayingRunner:
+        async def run_async(self, **_kwargs: Any) -> AsyncIterator[Any]:
+            result = book_doctor_slot(doctor["doctorId"], slot_id, True)
+            yield SimpleNamespace(get_function_responses=lambda: [SimpleNamespace(response=result)], content=None)
+
+    bridge = LiveBridge(app_name="raksha-test", model="fake", gemini_api_key="fake-key")
+    websocket = _RecordingWebSocket()
+
+    ok = asyncio.run(
+        bridge._execute_text_fallback_turn(
+            channel=OutboundChannel(websocket),  # type: ignore[arg-type]
+            runner=_ReplayingRunner(),  # type: ignore[arg-type]
+            session_id="s1",
+            user_id="raksha-user",
+            trace_id="t1",
+            metrics=SessionMetrics(started_at=0.0),
+            fallback_text="book the first slot",
+            idempotency=ledger,
+        )
+    )
+
+    assert ok
+    assert websocket.sent == []
+    assert (ledger.replays, ledger.suppressed_payloads) == (1, 1)
+    # A payload is suppressed once per replay; a fresh identical send still goes out.
+    assert not ledger.should_suppress({"type": "booking_update", "status": "confirmed"})
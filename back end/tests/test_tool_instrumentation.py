@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import inspect
+
+import pytest
+
+from app.metrics import MetricsRegistry
+from app.tool_instrumentation import ToolCallRecorder
+from app.tool_instrumentation import instrument_tool
+
+
+def _sample_tool(query: str, limit: int = 5, tool_context: object | None = None) -> dict:
+    """Sample tool docstring."""
+    return {"type": "booking_update", "status": "confirmed", "query": query, "limit": limit}
+
+
+def test_instrumented_tool_preserves_introspected_metadata() -> None:
+    wrapped = instrument_tool(_sample_tool, ToolCallRecorder(registry=MetricsRegistry()))
+
+    assert wrapped.__name__ == "_sample_tool"
+    assert wrapped.__doc__ == "Sample tool docstring."
+    assert inspect.signature(wrapped) == inspect.signature(_sample_tool)
+    assert wrapped("headache", limit=2) == _sample_tool("headache", limit=2)
+
+
+def test_recorder_tracks_outcomes_sizes_and_histograms() -> None:
+    registry = MetricsRegistry()
+    recorder = ToolCallRecorder(trace_id="t1", registry=registry)
+
+    def save_adherence_report() -> dict:
+        return {"saved": False, "reasonCode": "invalid_item_id"}
+
+    def explode() -> dict:
+        raise RuntimeError("boom")
+
+    instrument_tool(_sample_tool, recorder)("x")
+    instrument_tool(save_adherence_report, recorder)()
+    with pytest.raises(RuntimeError):
+        instrument_tool(explode, recorder)()
+
+    summary = recorder.summary()
+    assert summary["_sample_tool"]["outcomes"] == {"confirmed": 1}
+    assert summary["_sample_tool"]["maxBytes"] > 0
+    assert summary["save_adherence_report"]["outcomes"] == {"failed:invalid_item_id": 1}
+    assert summary["explode"]["exceptions"] == 1
+
+    snapshot = registry.snapshot()
+    durations = [h for h in snapshot["histograms"] if h["name"] == "tool_call_duration_ms"]
+    assert {h["labels"]["tool"] for h in durations} == {"_sample_tool", "save_adherence_report", "explode"}
+    assert all(h["count"] == 1 for h in durations)
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable
+
+from app.fake_live_model import FakeLiveModelConfig
+from app.live_bridge import LiveBridge
+from app.transcript_stream import DELTA_TRANSCRIPTS
+from app.transcript_stream import INPUT_STREAM
+from app.transcript_stream import LEGACY_TRANSCRIPTS
+from app.transcript_stream import OUTPUT_STREAM
+from app.transcript_stream import TranscriptCoalescer
+from app.transcript_stream import merge_transcript_fragment
+from app.transcript_stream import negotiate_transcript_mode
+
+
+def _apply(client: dict[str, str], update: dict[str, Any]) -> None:
+    """What a delta-mode client does with each update."""
+    if update["type"] == "transcript_sync":
+        client[update["stream"]] = update["text"]
+        return
+    client[update["stream"]] = client.get(update["stream"], "")[: update["offset"]] + update["text"]
+
+
+def _apply_utf16(client: dict[str, str], update: dict[str, Any]) -> None:
+    """The same, slicing by UTF-16 code units the way a JavaScript client's string indices do."""
+    if update["type"] == "transcript_sync":
+        client[update["stream"]] = update["text"]
+        return
+    kept = client.get(update["stream"], "").encode("utf-16-le")[: update["offset"] * 2].decode("utf-16-le")
+    client[update["stream"]] = kept + update["text"]
+
+
+def test_merge_appends_pieces_and_replaces_cumulative_or_revised_text() -> None:
+    assert merge_transcript_fragment("Take your", " medicine") == "Take your medicine"
+    assert merge_transcript_fragment("I have", "I have chest pain") == "I have chest pain"
+    assert merge_transcript_fragment("I have chest pain", "I have a chest pain") == "I have a chest pain"
+    assert merge_transcript_fragment("", "hello") == "hello"
+
+
+def test_coalescer_batches_fragments_and_sends_suffixes() -> None:
+    sent: list[dict[str, Any]] = []
+
+    async def _send(update: dict[str, Any]) -> None:
+        sent.append(update)
+
+    async def _run() -> None:
+        coalescer = TranscriptCoalescer(_send, interval_ms=10_000)
+        await coalescer.add(OUTPUT_STREAM, "Here is")
+        for fragment in (" what", " is on", " your plan."):
+            await coalescer.add(OUTPUT_STREAM, fragment)
+        await coalescer.end_turn()
+        assert (coalescer.fragments, coalescer.events_sent, coalescer.resyncs) == (4, 2, 0)
+
+    asyncio.run(_run())
+
+    assert sent == [
+        {"type": "transcript_delta", "stream": "output", "offset": 0, "text": "Here is"},
+        {"type": "transcript_delta", "stream": "output", "offset": 7, "text": " what is on your plan."},
+    ]
+
+
+def test_coalescer_resyncs_only_when_text_is_rewritten() -> None:
+    sent: list[dict[str, Any]] = []
+
+    async def _send(update: dict[str, Any]) -> None:
+        sent.append(update)
+
+    async def _run() -> None:
+        coalescer = TranscriptCoalescer(_send, interval_ms=0)
+        await coalescer.add(INPUT_STREAM, "I have chest")
+        await coalescer.add(INPUT_STREAM, "I have chest pain")
+        await coalescer.add(INPUT_STREAM, "I have a chest pain")
+
+    asyncio.run(_run())
+
+    assert [update["type"] for update in sent] == ["transcript_delta", "transcript_delta", "transcript_sync"]
+    client: dict[str, str] = {}
+    for update in sent:
+        _apply(client, update)
+    assert client == {"input": "I have a chest pain"}
+
+
+def test_coalescer_timer_flushes_trailing_fragments() -> None:
+    sent: list[dict[str, Any]] = []
+
+    async def _send(update: dict[str, Any]) -> None:
+        sent.append(update)
+
+    async def _run() -> None:
+        coalescer = TranscriptCoalescer(_send, interval_ms=20)
+        await coalescer.add(OUTPUT_STREAM, "one")
+        await coalescer.add(OUTPUT_STREAM, " two")
+        await coalescer.add(OUTPUT_STREAM, " three")
+        assert len(sent) == 1
+        await asyncio.sleep(0.06)
+        coalescer.close()
+
+    asyncio.run(_run())
+
+    assert sent[-1] == {"type": "transcript_delta", "stream": "output", "offset": 3, "text": " two three"}
+
+
+def test_negotiation_defaults_to_full_transcripts() -> None:
+    assert negotiate_transcript_mode(None) == LEGACY_TRANSCRIPTS
+    assert negotiate_transcript_mode("Delta") == DELTA_TRANSCRIPTS
+
+
+def test_delta_offsets_count_utf16_units_so_emoji_do_not_desync_the_client() -> None:
+    sent: list[dict[str, Any]] = []
+
+    async def _send(update: dict[str, Any]) -> None:
+        sent.append(update)
+
+    async def _run() -> None:
+        coalescer = TranscriptCoalescer(_send, interval_ms=0)
+        for fragment in ("Great job \U0001F44F", " keep", " going \U0001F4AA", "!"):
+            await coalescer.add(OUTPUT_STREAM, fragment)
+
+    asyncio.run(_run())
+
+    client: dict[str, str] = {}
+    for update in sent:
+        _apply_utf16(client, update)
+    assert sent[1]["offset"] == 12
+    assert client[OUTPUT_STREAM] == "Great job \U0001F44F keep going \U0001F4AA!"
+
+
+def test_bridge_streams_coalesced_transcript_deltas(
+    fake_bridge: Callable[..., LiveBridge],
+    scripted_websocket: Callable[..., Any],
+    run_session: Callable[..., None],
+) -> None:
+    bridge = fake_bridge(
+        FakeLiveModelConfig(
+            response_latency_ms=0,
+            audio_sample_rate=16000,
+            audio_chunk_bytes=1600,
+            response_audio_ms=800,
+            tool_calls=(),
+            input_transcript="my chest feels tight today",
+            input_transcription_every_packets=1,
+            output_transcript="Please sit down and take slow breaths now",
+            output_transcription_every_chunks=1,
+        ),
+        transcript_coalesce_ms=10_000,
+    )
+    websocket = scripted_websocket(
+        [{"type": "ptt_start"}, *[b"\x00\x00" * 800] * 5, {"type": "ptt_end"}],
+        done=lambda sent: any(event.get("stream") == "output" for event in sent),
+    )
+
+    run_session(bridge, websocket, transcripts="delta")
+
+    types_sent = {event.get("type") for event in websocket.sent}
+    assert not types_sent & {"partial_transcript", "assistant_text"}
+    client: dict[str, str] = {}
+    for update in websocket.sent:
+        if update.get("type") == "transcript_delta":
+            _apply_utf16(client, update)
+    assert client == {"input": "my chest feels tight today", "output": "Please sit down and take slow breaths now"}
+    # 5 input and 8 output fragments arrive well inside one interval: the first goes out at once, the rest at turn end.
+    assert sum(1 for event in websocket.sent if event.get("type") == "transcript_delta") == 3
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, AsyncIterator, Callable
+
+from google.adk.agents.live_request_queue import LiveRequestQueue
+
+from app.fake_live_model import FakeLiveModelConfig
+from app.fake_live_model import FakeLiveRunner
+from app.live_bridge import LiveBridge
+from app.metrics import MetricsRegistry
+from app.metrics import metrics_registry
+from app.upstream_link import UpstreamLink
+
+
+class _SlowClosingRunner(FakeLiveRunner):
+    """Takes a while to finish each stream after its queue closes, like a real model connection."""
+
+    async def run_live(self, **kwargs: Any) -> AsyncIterator[Any]:
+        async for event in super().run_live(**kwargs):
+            yield event
+        await asyncio.sleep(0.5)
+
+
+def test_suspend_closes_queue_and_resume_buffers_into_a_fresh_one() -> None:
+    registry = MetricsRegistry()
+
+    async def _run() -> None:
+        first = LiveRequestQueue()
+        link = UpstreamLink(first, trace_id="t1", idle_timeout_s=1.0, registry=registry)
+        link.suspend()
+        assert first.closed and link.suspended
+        assert link.resume("ptt_start") is True
+        assert link.resume("ptt_start") is False
+        link.queue.send_activity_start()
+        await asyncio.sleep(0.02)
+        request = await link.queue.get()
+        assert request.activity_start is not None
+        await link.wait_for_resume()
+
+    asyncio.run(_run())
+
+    assert registry.histogram("upstream_resume_ms").count == 1
+    assert registry.histogram("upstream_resume_ms").quantile(0.5) >= 10
+
+
+def test_idle_watcher_waits_while_busy_and_for_playback() -> None:
+    async def _run() -> tuple[float, float]:
+        link = UpstreamLink(LiveRequestQueue(), trace_id="t1", idle_timeout_s=0.03)
+        busy = [True]
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.05, busy.clear)
+        started = loop.time()
+        link.note_playback(0.05)
+        await asyncio.wait_for(link.suspend_when_idle(lambda: bool(busy)), timeout=2)
+        assert link.suspended
+        return started, loop.time()
+
+    started, suspended_at = asyncio.run(_run())
+
+    assert suspended_at - started >= 0.08
+
+
+def test_close_wakes_a_suspended_stream() -> None:
+    async def _run() -> None:
+        link = UpstreamLink(LiveRequestQueue(), trace_id="t1", idle_timeout_s=1.0)
+        link.suspend()
+        waiter = asyncio.create_task(link.wait_for_resume())
+        link.close()
+        await asyncio.wait_for(waiter, timeout=1)
+        assert link.closed and link.resume("ptt_start") is False
+
+    asyncio.run(_run())
+
+
+def test_reconnect_swaps_in_a_fresh_queue_and_flags_the_stream_once() -> None:
+    async def _run() -> None:
+        first = LiveRequestQueue()
+        link = UpstreamLink(first, trace_id="t1", idle_timeout_s=1.0, registry=MetricsRegistry())
+        assert link.reconnect("response_mode") is True
+        assert first.closed and not link.suspended
+        assert link.take_reconnect() is True
+        assert link.take_reconnect() is False
+        assert link.reconnects == 1
+
+        link.suspend()
+        assert link.reconnect("response_mode") is True
+        assert not link.suspended and link.resumes == 1
+        assert link.take_reconnect() is False
+
+    asyncio.run(_run())
+
+
+def test_bridge_suspends_idle_upstream_and_resumes_on_ptt_start(
+    fake_bridge: Callable[..., LiveBridge],
+    scripted_websocket: Callable[..., Any],
+    run_session: Callable[..., None],
+) -> None:
+    bridge = fake_bridge(
+        FakeLiveModelConfig(
+            connect_latency_ms=30,
+            response_latency_ms=0,
+            audio_sample_rate=16000,
+            audio_chunk_bytes=1 << 20,
+            echo_input_audio=True,
+            tool_calls=(),
+            output_transcription_every_chunks=0,
+        ),
+        upstream_idle_timeout_s=0.05,
+    )
+    resumes_before = metrics_registry.histogram("upstream_resume_ms").count
+    turn = [{"type": "ptt_start"}, b"\x00\x01" * 800, {"type": "ptt_end"}]
+    websocket = scripted_websocket(
+        [*turn, 0.3, *turn],
+        done=lambda sent: sum(1 for event in sent if event.get("type") == "assistant_text") >= 2,
+    )
+
+    run_session(bridge, websocket)
+
+    # The second turn's start and audio were buffered while the upstream reconnected, so nothing was lost.
+    assert websocket.binary_bytes == b"\x00\x01" * 1600
+    assert [event.get("type") for event in websocket.sent].count("session_ready") == 1
+    resume_ms = metrics_registry.histogram("upstream_resume_ms")
+    assert resume_ms.count == resumes_before + 1
+    assert resume_ms.quantile(1.0) >= 25
+
+
+def test_bridge_serves_a_turn_that_resumes_while_the_suspended_stream_is_closing(
+    fake_bridge: Callable[..., LiveBridge],
+    scripted_websocket: Callable[..., Any],
+    run_session: Callable[..., None],
+) -> None:
+    config = FakeLiveModelConfig(
+        response_latency_ms=0,
+        audio_sample_rate=16000,
+        audio_chunk_bytes=1 << 20,
+        echo_input_audio=True,
+        tool_calls=(),
+        output_transcription_every_chunks=0,
+    )
+    bridge = fake_bridge(config, upstream_idle_timeout_s=0.05)
+    bridge._build_runner = lambda agent: _SlowClosingRunner(  # type: ignore[method-assign]
+        app_name="raksha-test",
+        agent=agent,
+        session_service=bridge._session_service,
+        config=config,
+    )
+    turn = [{"type": "ptt_start"}, b"\x00\x01" * 800, {"type": "ptt_end"}]
+    # The link suspends about 100 ms after the first reply, and the second turn lands while that stream is still closing.
+    websocket = scripted_websocket(
+        [*turn, 0.25, *turn],
+        done=lambda sent: sum(1 for event in sent if event.get("type") == "assistant_text") >= 2,
+    )
+
+    run_session(bridge, websocket, timeout=3)
+
+    assert [event.get("type") for event in websocket.sent].count("assistant_text") == 2
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, Callable
+
+from app.fake_live_model import FakeLiveModelConfig
+from app.live_bridge import LiveBridge
+from app.wire_protocol import BINARY_PROTOCOL
+from app.wire_protocol import FRAME_AUDIO
+from app.wire_protocol import FRAME_EVENT_JSON
+from app.wire_protocol import FRAME_EVENT_TEXT
+from app.wire_protocol import JSON_PROTOCOL
+from app.wire_protocol import OutboundChannel
+from app.wire_protocol import decode_binary_frame
+from app.wire_protocol import encode_binary_event
+from app.wire_protocol import negotiate_wire_protocol
+
+
+class _RecordingWebSocket:
+    def __init__(self) -> None:
+        self.text_frames: list[str] = []
+        self.binary_frames: list[bytes] = []
+
+    async def send_text(self, data: str) -> None:
+        self.text_frames.append(data)
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.binary_frames.append(data)
+
+
+def test_text_events_skip_json_in_binary_frames() -> None:
+    frame = encode_binary_event({"type": "partial_transcript", "text": "chest pain – since noon"})
+
+    kind, event = decode_binary_frame(frame)
+
+    assert frame[0] == FRAME_EVENT_TEXT
+    assert len(frame) == 2 + len("chest pain – since noon".encode("utf-8"))
+    assert kind == FRAME_EVENT_TEXT
+    assert event == {"type": "partial_transcript", "text": "chest pain – since noon"}
+
+
+def test_structured_events_round_trip_as_json_frames() -> None:
+    payload = {"type": "booking_update", "status": "confirmed", "booking": {"slotId": "s1"}}
+
+    kind, event = decode_binary_frame(encode_binary_event(payload))
+
+    assert kind == FRAME_EVENT_JSON
+    assert event == payload
+
+
+def test_json_channel_keeps_original_wire_format_and_caches_scalar_events() -> None:
+    websocket = _RecordingWebSocket()
+    channel = OutboundChannel(websocket, JSON_PROTOCOL)
+
+    async def _send() -> None:
+        for _ in range(3):
+            await channel.send_event({"type": "assistant_interrupted"})
+        await channel.send_event({"type": "schedule_snapshot", "items": [{"id": 1}]})
+        await channel.send_audio(b"\x01\x02")
+
+    asyncio.run(_send())
+
+    assert websocket.text_frames[0] == '{"type":"assistant_interrupted"}'
+    assert json.loads(websocket.text_frames[-1]) == {"type": "schedule_snapshot", "items": [{"id": 1}]}
+    assert websocket.binary_frames == [b"\x01\x02"]
+    assert (channel.cache_hits, channel.cache_misses) == (2, 1)
+
+
+def test_equal_values_of_different_types_do_not_share_a_cached_frame() -> None:
+    websocket = _RecordingWebSocket()
+    channel = OutboundChannel(websocket, JSON_PROTOCOL)
+
+    async def _send() -> None:
+        for value in (True, 1, 1.0, True):
+            await channel.send_event({"type": "profile_status", "loaded": value})
+
+    asyncio.run(_send())
+
+    assert websocket.text_frames == [
+        '{"type":"profile_status","loaded":true}',
+        '{"type":"profile_status","loaded":1}',
+        '{"type":"profile_status","loaded":1.0}',
+        '{"type":"profile_status","loaded":true}',
+    ]
+    assert (channel.cache_hits, channel.cache_misses) == (1, 3)
+
+
+def test_binary_channel_prefixes_audio_and_rendered_events() -> None:
+    websocket = _RecordingWebSocket()
+    channel = OutboundChannel(websocket, BINARY_PROTOCOL)
+
+    async def _send() -> None:
+        await channel.send_audio(b"\x01\x02")
+        await channel.send_rendered_event('{"type":"emergency_guidance","category":"cardiac","message":"Call"}')
+
+    asyncio.run(_send())
+
+    assert websocket.text_frames == []
+    assert decode_binary_frame(websocket.binary_frames[0]) == (FRAME_AUDIO, b"\x01\x02")
+    assert decode_binary_frame(websocket.binary_frames[1])[1]["category"] == "cardiac"  # type: ignore[index]
+
+
+def test_negotiation_defaults_to_json() -> None:
+    assert negotiate_wire_protocol(None) == JSON_PROTOCOL
+    assert negotiate_wire_protocol(" Binary ") == BINARY_PROTOCOL
+    assert negotiate_wire_protocol("msgpack") == JSON_PROTOCOL
+
+
+class _FailingWebSocket(_RecordingWebSocket):
+    async def send_text(self, data: str) -> None:
+        raise RuntimeError("websocket is closed")
+
+
+def test_resumable_channel_buffers_while_detached_and_replays_after_last_seq() -> None:
+    first = _RecordingWebSocket()
+    channel = OutboundChannel(first, JSON_PROTOCOL, resume_buffer_frames=8)
+    resumed = _RecordingWebSocket()
+
+    async def _run() -> tuple[int, int]:
+        await channel.send_event({"type": "session_ready", "sessionId": "s1"})
+        await channel.send_event({"type": "assistant_text", "text": "one"})
+        channel.detach()
+        await channel.send_audio(b"\x01\x02")
+        await channel.send_event({"type": "assistant_text", "text": "two"})
+        # The client only saw the first frame before the drop.
+        replayed_missed = await channel.attach(resumed, last_seq=1)
+        await channel.send_event({"type": "assistant_text", "text": "three"})
+        return replayed_missed
+
+    assert asyncio.run(_run()) == (3, 0)
+    assert len(first.text_frames) == 2
+    assert [json.loads(frame)["text"] for frame in resumed.text_frames] == ["one", "two", "three"]
+    assert resumed.binary_frames == [b"\x01\x02"]
+    assert channel.seq == 5
+
+
+def test_resumable_channel_reports_frames_evicted_from_the_ring() -> None:
+    channel = OutboundChannel(_FailingWebSocket(), JSON_PROTOCOL, resume_buffer_frames=2)
+    resumed = _RecordingWebSocket()
+
+    async def _run() -> tuple[int, int]:
+        # A send on the dead websocket detaches the channel instead of failing the session.
+        for index in range(4):
+            await channel.send_event({"type": "assistant_text", "text": str(index)})
+        assert not channel.attached
+        return await channel.attach(resumed, last_seq=0)
+
+    assert asyncio.run(_run()) == (2, 2)
+    assert [json.loads(frame)["text"] for frame in resumed.text_frames] == ["2", "3"]
+
+
+def test_bridge_binary_protocol_multiplexes_events_and_audio(
+    fake_bridge: Callable[..., LiveBridge],
+    scripted_websocket: Callable[..., Any],
+    run_session: Callable[..., None],
+) -> None:
+    bridge = fake_bridge(
+        FakeLiveModelConfig(
+            response_latency_ms=0,
+            audio_sample_rate=16000,
+            audio_chunk_bytes=1600,
+            echo_input_audio=True,
+            tool_calls=(),
+            input_transcription_every_packets=1,
+            output_transcription_every_chunks=0,
+        )
+    )
+    packets = [b"\x01\x00" * 800] * 2
+    events: list[dict[str, Any]] = []
+
+    def _done(_: list[dict[str, Any]]) -> bool:
+        decoded = [decode_binary_frame(frame) for frame in websocket.binary_payloads]
+        events[:] = [body for kind, body in decoded if kind != FRAME_AUDIO]  # type: ignore[misc]
+        return any(event.get("type") == "assistant_text" for event in events)
+
+    websocket = scripted_websocket([{"type": "ptt_start"}, *packets, {"type": "ptt_end"}], done=_done)
+
+    run_session(bridge, websocket, protocol="binary")
+
+    assert websocket.sent == []
+    event_types = [event["type"] for event in events]
+    assert event_types[:2] == ["session_ready", "profile_status"]
+    assert "partial_transcript" in event_types
+    audio = b"".join(body for kind, body in map(decode_binary_frame, websocket.binary_payloads) if kind == FRAME_AUDIO)  # type: ignore[misc]
+    assert audio == b"".join(packets)